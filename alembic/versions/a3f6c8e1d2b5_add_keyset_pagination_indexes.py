@@ -0,0 +1,43 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: a3f6c8e1d2b5
+Revises: d2a7e4c9b6f1
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3f6c8e1d2b5"
+down_revision: Union[str, Sequence[str], None] = "d2a7e4c9b6f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - index the (created_at, id) sort key of cursor-paginated lists."""
+    op.create_index(
+        "idx_fingerprints_created_id", "audio_fingerprints", ["created_at", "id"], unique=False
+    )
+    # Fingerprint listing filtered to one video
+    op.create_index(
+        "idx_fingerprints_video_created_id",
+        "audio_fingerprints",
+        ["video_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_match_results_created_id", "match_results", ["created_at", "id"], unique=False
+    )
+    op.create_index("idx_videos_created_id", "videos", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema - remove keyset pagination indexes."""
+    op.drop_index("idx_videos_created_id", table_name="videos")
+    op.drop_index("idx_match_results_created_id", table_name="match_results")
+    op.drop_index("idx_fingerprints_video_created_id", table_name="audio_fingerprints")
+    op.drop_index("idx_fingerprints_created_id", table_name="audio_fingerprints")
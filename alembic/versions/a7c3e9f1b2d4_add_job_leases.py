@@ -0,0 +1,42 @@
+"""add_job_leases
+
+Revision ID: a7c3e9f1b2d4
+Revises: f78a03bf92c3
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e9f1b2d4"
+down_revision: Union[str, Sequence[str], None] = "f78a03bf92c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add worker leases to processing jobs."""
+    op.add_column("processing_jobs", sa.Column("worker_id", sa.String(length=255), nullable=True))
+    op.add_column("processing_jobs", sa.Column("lease_expires_at", sa.DateTime(), nullable=True))
+    op.add_column("processing_jobs", sa.Column("heartbeat_at", sa.DateTime(), nullable=True))
+
+    # Partial index for reclaiming expired leases of crashed workers
+    op.create_index(
+        "idx_jobs_running_lease",
+        "processing_jobs",
+        ["job_type", "lease_expires_at"],
+        unique=False,
+        postgresql_where="status = 'running'",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - remove worker leases from processing jobs."""
+    op.drop_index("idx_jobs_running_lease", table_name="processing_jobs")
+    op.drop_column("processing_jobs", "heartbeat_at")
+    op.drop_column("processing_jobs", "lease_expires_at")
+    op.drop_column("processing_jobs", "worker_id")
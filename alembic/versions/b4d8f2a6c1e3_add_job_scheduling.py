@@ -0,0 +1,60 @@
+"""add_job_scheduling
+
+Revision ID: b4d8f2a6c1e3
+Revises: a7c3e9f1b2d4
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b4d8f2a6c1e3"
+down_revision: Union[str, Sequence[str], None] = "a7c3e9f1b2d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add priority, tenant and lane to processing jobs."""
+    op.add_column("processing_jobs", sa.Column("tenant_id", sa.Integer(), nullable=True))
+    op.add_column(
+        "processing_jobs",
+        sa.Column("priority", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "processing_jobs",
+        sa.Column("lane", sa.String(length=20), nullable=False, server_default="bulk"),
+    )
+    op.create_foreign_key(
+        "fk_processing_jobs_tenant_id", "processing_jobs", "tenants", ["tenant_id"], ["id"]
+    )
+
+    # Partial index for picking the next pending job of a lane and tenant
+    op.create_index(
+        "idx_jobs_pending_queue",
+        "processing_jobs",
+        ["job_type", "lane", "tenant_id", "priority", "created_at"],
+        unique=False,
+        postgresql_where="status = 'pending'",
+    )
+    # Counting recently started jobs per tenant for fair-share scheduling
+    op.create_index(
+        "idx_jobs_type_started",
+        "processing_jobs",
+        ["job_type", "started_at", "tenant_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - remove scheduling columns from processing jobs."""
+    op.drop_index("idx_jobs_type_started", table_name="processing_jobs")
+    op.drop_index("idx_jobs_pending_queue", table_name="processing_jobs")
+    op.drop_constraint("fk_processing_jobs_tenant_id", "processing_jobs", type_="foreignkey")
+    op.drop_column("processing_jobs", "lane")
+    op.drop_column("processing_jobs", "priority")
+    op.drop_column("processing_jobs", "tenant_id")
@@ -0,0 +1,83 @@
+"""add_fingerprint_statistics
+
+Revision ID: b7d3e9f2a4c6
+Revises: a3f6c8e1d2b5
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d3e9f2a4c6"
+down_revision: Union[str, Sequence[str], None] = "a3f6c8e1d2b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add the fingerprint statistics snapshot, ledger and counted videos."""
+    op.create_table(
+        "fingerprint_statistics_snapshot",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("ledger_id", sa.BigInteger(), nullable=False),
+        sa.Column("total_fingerprints", sa.BigInteger(), nullable=False),
+        sa.Column("total_videos", sa.BigInteger(), nullable=False),
+        sa.Column("confidence_sum", sa.Float(), nullable=False),
+        sa.Column("confidence_count", sa.BigInteger(), nullable=False),
+        sa.Column("peaks_sum", sa.BigInteger(), nullable=False),
+        sa.Column("peaks_count", sa.BigInteger(), nullable=False),
+        sa.Column("duration_sum", sa.Float(), nullable=False),
+        sa.Column("reconciled_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "fingerprint_statistics",
+        sa.Column("id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), nullable=False),
+        sa.Column("video_id", sa.Integer(), nullable=False),
+        sa.Column("new_videos", sa.Integer(), nullable=False),
+        sa.Column("total_fingerprints", sa.BigInteger(), nullable=False),
+        sa.Column("confidence_sum", sa.Float(), nullable=False),
+        sa.Column("confidence_count", sa.BigInteger(), nullable=False),
+        sa.Column("peaks_sum", sa.BigInteger(), nullable=False),
+        sa.Column("peaks_count", sa.BigInteger(), nullable=False),
+        sa.Column("duration_sum", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True,
+    )
+    op.create_table(
+        "fingerprint_statistics_videos",
+        sa.Column("video_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.PrimaryKeyConstraint("video_id"),
+    )
+    # Seed the snapshot and the counted videos from the existing fingerprints
+    op.execute(
+        """
+        INSERT INTO fingerprint_statistics_snapshot (
+            id, ledger_id, total_fingerprints, total_videos, confidence_sum,
+            confidence_count, peaks_sum, peaks_count, duration_sum, reconciled_at
+        )
+        SELECT
+            1, 0, COUNT(id), COUNT(DISTINCT video_id), COALESCE(SUM(confidence_score), 0),
+            COUNT(confidence_score), COALESCE(SUM(peak_count), 0), COUNT(peak_count),
+            COALESCE(SUM(segment_length), 0), CURRENT_TIMESTAMP
+        FROM audio_fingerprints
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO fingerprint_statistics_videos (video_id)
+        SELECT DISTINCT video_id FROM audio_fingerprints
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - remove fingerprint statistics."""
+    op.drop_table("fingerprint_statistics_videos")
+    op.drop_table("fingerprint_statistics")
+    op.drop_table("fingerprint_statistics_snapshot")
@@ -0,0 +1,44 @@
+"""add_hot_path_indexes
+
+Revision ID: c1e7f4a9d2b8
+Revises: e9b4c2f7a1d3
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c1e7f4a9d2b8"
+down_revision: Union[str, Sequence[str], None] = "e9b4c2f7a1d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add indexes for the ingestion and matching hot paths."""
+    # check_fingerprints_exist / get_fingerprint_resume_point: the segment key
+    # only narrows by video; this covers the parameter filter and max(end_time)
+    op.create_index(
+        "idx_fingerprints_video_params",
+        "audio_fingerprints",
+        ["video_id", "sample_rate", "n_fft", "hop_length", "end_time"],
+        unique=False,
+    )
+
+    # get_pending_jobs(job_type): pending jobs of a type in creation order
+    op.create_index(
+        "idx_jobs_pending_type_created",
+        "processing_jobs",
+        ["job_type", "created_at"],
+        unique=False,
+        postgresql_where="status = 'pending'",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - remove hot path indexes."""
+    op.drop_index("idx_jobs_pending_type_created", table_name="processing_jobs")
+    op.drop_index("idx_fingerprints_video_params", table_name="audio_fingerprints")
@@ -0,0 +1,55 @@
+"""add_fingerprint_segment_key
+
+Revision ID: c5e1a9d3f7b2
+Revises: b4d8f2a6c1e3
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e1a9d3f7b2"
+down_revision: Union[str, Sequence[str], None] = "b4d8f2a6c1e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Maps every duplicate segment fingerprint to the oldest row of its segment
+DUPLICATES = """
+    SELECT id, keep_id FROM (
+        SELECT id, MIN(id) OVER (
+            PARTITION BY video_id, start_time, n_fft, hop_length, sample_rate
+        ) AS keep_id
+        FROM audio_fingerprints
+    ) ranked
+    WHERE id <> keep_id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema - make segment fingerprints unique for idempotent upserts."""
+    # Reprocessing could store the same segment twice; keep the oldest row and
+    # point match results at it before removing the duplicates
+    for column in ("query_fingerprint_id", "matched_fingerprint_id"):
+        op.execute(
+            f"""
+            UPDATE match_results SET {column} = dupes.keep_id
+            FROM ({DUPLICATES}) dupes
+            WHERE match_results.{column} = dupes.id
+            """
+        )
+    op.execute(f"DELETE FROM audio_fingerprints WHERE id IN (SELECT id FROM ({DUPLICATES}) dupes)")
+
+    op.create_index(
+        "uq_fingerprints_segment",
+        "audio_fingerprints",
+        ["video_id", "start_time", "n_fft", "hop_length", "sample_rate"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop the segment fingerprint key."""
+    op.drop_index("uq_fingerprints_segment", table_name="audio_fingerprints")
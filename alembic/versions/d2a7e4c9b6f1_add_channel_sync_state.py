@@ -0,0 +1,34 @@
+"""add_channel_sync_state
+
+Revision ID: d2a7e4c9b6f1
+Revises: c5e1a9d3f7b2
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a7e4c9b6f1"
+down_revision: Union[str, Sequence[str], None] = "c5e1a9d3f7b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add incremental sync watermarks to channels."""
+    op.add_column("channels", sa.Column("sync_last_video_id", sa.String(length=255), nullable=True))
+    op.add_column("channels", sa.Column("sync_last_upload_date", sa.DateTime(), nullable=True))
+    op.add_column("channels", sa.Column("sync_etag", sa.String(length=255), nullable=True))
+    op.add_column("channels", sa.Column("last_deep_sync", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema - remove channel sync watermarks."""
+    op.drop_column("channels", "last_deep_sync")
+    op.drop_column("channels", "sync_etag")
+    op.drop_column("channels", "sync_last_upload_date")
+    op.drop_column("channels", "sync_last_video_id")
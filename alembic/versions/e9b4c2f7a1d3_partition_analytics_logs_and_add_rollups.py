@@ -0,0 +1,228 @@
+"""partition_analytics_logs_and_add_rollups
+
+Revision ID: e9b4c2f7a1d3
+Revises: b7d3e9f2a4c6
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e9b4c2f7a1d3"
+down_revision: Union[str, Sequence[str], None] = "b7d3e9f2a4c6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Log table, partition key, partition interval (see src/database/partitions.py)
+PARTITIONED = (
+    ("api_usage_logs", "timestamp", "day"),
+    ("analytics_events", "created_at", "month"),
+)
+PARTITIONS_AHEAD_DAYS = 7
+
+
+def _log_columns(table: str) -> list[sa.Column]:
+    """Columns of a log table, matching the models."""
+    columns = [
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("tenant_id", sa.Integer(), sa.ForeignKey("tenants.id"), nullable=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+    ]
+    if table == "api_usage_logs":
+        return columns + [
+            sa.Column("api_key_id", sa.Integer(), sa.ForeignKey("api_keys.id"), nullable=True),
+            sa.Column("endpoint", sa.String(length=500), nullable=False),
+            sa.Column("method", sa.String(length=10), nullable=False),
+            sa.Column("path_params", sa.JSON(), nullable=True),
+            sa.Column("query_params", sa.JSON(), nullable=True),
+            sa.Column("status_code", sa.Integer(), nullable=False),
+            sa.Column("response_time_ms", sa.Integer(), nullable=True),
+            sa.Column("response_size_bytes", sa.Integer(), nullable=True),
+            sa.Column("ip_address", sa.String(length=45), nullable=True),
+            sa.Column("user_agent", sa.String(length=500), nullable=True),
+            sa.Column("error_message", sa.Text(), nullable=True),
+            sa.Column("error_type", sa.String(length=100), nullable=True),
+            sa.Column("timestamp", sa.DateTime(), nullable=False),
+        ]
+    return columns + [
+        sa.Column("event_type", sa.String(length=100), nullable=False),
+        sa.Column("event_category", sa.String(length=100), nullable=False),
+        sa.Column("event_name", sa.String(length=200), nullable=False),
+        sa.Column("session_id", sa.String(length=255), nullable=True),
+        sa.Column("ip_address", sa.String(length=45), nullable=True),
+        sa.Column("user_agent", sa.String(length=500), nullable=True),
+        sa.Column("referrer", sa.String(length=1000), nullable=True),
+        sa.Column("properties", sa.JSON(), nullable=True),
+        sa.Column("duration_ms", sa.Integer(), nullable=True),
+        sa.Column("value", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    ]
+
+
+def _partition_start(day: date, interval: str) -> date:
+    return day.replace(day=1) if interval == "month" else day
+
+
+def _next_start(start: date, interval: str) -> date:
+    if interval == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def _partition_name(table: str, start: date, interval: str) -> str:
+    return f"{table}_p{start:%Y%m}" if interval == "month" else f"{table}_p{start:%Y%m%d}"
+
+
+def _index_name(table: str, column: str) -> str:
+    return f"idx_{table}_{column}"
+
+
+def _create_log_table(table: str, column: str, partitioned: bool) -> None:
+    if partitioned:
+        op.create_table(
+            table,
+            *_log_columns(table),
+            sa.PrimaryKeyConstraint("id", column),
+            postgresql_partition_by=f'RANGE ("{column}")',
+        )
+    else:
+        op.create_table(table, *_log_columns(table), sa.PrimaryKeyConstraint("id"))
+    op.create_index(_index_name(table, column), table, [column], unique=False)
+
+
+def _move_aside(table: str, new_name: str) -> None:
+    """Rename a table along with the schema-wide names (primary key, id sequence) it owns."""
+    op.rename_table(table, new_name)
+    op.execute(f"ALTER TABLE {new_name} RENAME CONSTRAINT {table}_pkey TO {new_name}_pkey")
+    op.execute(f"ALTER SEQUENCE IF EXISTS {table}_id_seq RENAME TO {new_name}_id_seq")
+
+
+def _copy_rows(table: str, source: str) -> None:
+    columns = ", ".join(f'"{c.name}"' for c in _log_columns(table))
+    op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {source}")
+    op.execute(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+        f"COALESCE((SELECT max(id) FROM {table}), 0) + 1, false)"
+    )
+
+
+def _create_rollup_tables() -> None:
+    op.create_table(
+        "api_usage_rollups",
+        sa.Column("id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), nullable=False),
+        sa.Column("granularity", sa.String(length=10), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("tenant_id", sa.Integer(), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("endpoint", sa.String(length=500), nullable=False),
+        sa.Column("status_code", sa.Integer(), nullable=False),
+        sa.Column("request_count", sa.BigInteger(), nullable=False),
+        sa.Column("response_time_sum", sa.BigInteger(), nullable=False),
+        sa.Column("response_time_count", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "idx_api_usage_rollups_bucket",
+        "api_usage_rollups",
+        ["granularity", "bucket_start"],
+        unique=False,
+    )
+    op.create_table(
+        "analytics_event_rollups",
+        sa.Column("id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), nullable=False),
+        sa.Column("granularity", sa.String(length=10), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("tenant_id", sa.Integer(), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("event_category", sa.String(length=100), nullable=False),
+        sa.Column("event_count", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "idx_analytics_event_rollups_bucket",
+        "analytics_event_rollups",
+        ["granularity", "bucket_start"],
+        unique=False,
+    )
+    op.create_table(
+        "analytics_rollup_state",
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("rolled_up_to", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema - partition the analytics log tables by time and add rollup tables."""
+    _create_rollup_tables()
+
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if bind.dialect.name != "postgresql":
+        # Plain tables elsewhere; only index the time column rollups and retention scan
+        for table, column, _ in PARTITIONED:
+            if inspector.has_table(table) and _index_name(table, column) not in {
+                index["name"] for index in inspector.get_indexes(table)
+            }:
+                op.create_index(_index_name(table, column), table, [column], unique=False)
+        return
+
+    today = datetime.now(timezone.utc).date()
+    for table, column, interval in PARTITIONED:
+        legacy = f"{table}_unpartitioned"
+        exists = inspector.has_table(table)
+        if exists:
+            _move_aside(table, legacy)
+            op.execute(f"DROP INDEX IF EXISTS {_index_name(table, column)}")
+
+        _create_log_table(table, column, partitioned=True)
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+        # Partitions from the oldest existing row through the coming days
+        first = None
+        if exists:
+            first = bind.execute(sa.text(f'SELECT min("{column}") FROM {legacy}')).scalar()
+        start = _partition_start(first.date() if first else today, interval)
+        while start <= today + timedelta(days=PARTITIONS_AHEAD_DAYS):
+            end = _next_start(start, interval)
+            op.execute(
+                f"CREATE TABLE {_partition_name(table, start, interval)} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            start = end
+
+        if exists:
+            _copy_rows(table, legacy)
+            op.drop_table(legacy)
+
+
+def downgrade() -> None:
+    """Downgrade schema - restore unpartitioned analytics log tables and drop rollups."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table, column, _ in PARTITIONED:
+        if not inspector.has_table(table):
+            continue
+        op.drop_index(_index_name(table, column), table_name=table)
+        if bind.dialect.name != "postgresql":
+            continue
+
+        partitioned = f"{table}_partitioned"
+        _move_aside(table, partitioned)
+        _create_log_table(table, column, partitioned=False)
+        _copy_rows(table, partitioned)
+        # Drops the partitions with it
+        op.drop_table(partitioned)
+
+    op.drop_table("analytics_rollup_state")
+    op.drop_index("idx_analytics_event_rollups_bucket", table_name="analytics_event_rollups")
+    op.drop_table("analytics_event_rollups")
+    op.drop_index("idx_api_usage_rollups_bucket", table_name="api_usage_rollups")
+    op.drop_table("api_usage_rollups")
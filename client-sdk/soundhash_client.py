@@ -30,6 +30,7 @@ Usage:
 import asyncio
 import json
 import logging
+import struct
 import uuid
 from typing import Optional
 
@@ -48,6 +49,10 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Framed audio header: magic, version, codec, sample rate, channels, reserved, sequence
+FRAME_HEADER = struct.Struct("<4sBBIBBH")
+CODEC_INT16 = 1
+
 
 class SoundHashClient:
     """Client for streaming audio to SoundHash API."""
@@ -57,7 +62,7 @@ class SoundHashClient:
         api_url: str,
         api_key: str,
         client_id: Optional[str] = None,
-        sample_rate: int = 22050,
+        sample_rate: int = 16000,
     ):
         """
         Initialize SoundHash client.
@@ -66,7 +71,7 @@ class SoundHashClient:
             api_url: WebSocket API URL (e.g., 'ws://localhost:8000')
             api_key: API authentication key
             client_id: Unique client identifier (auto-generated if not provided)
-            sample_rate: Audio sample rate in Hz
+            sample_rate: Microphone sample rate in Hz (the server resamples)
         """
         if api_url.startswith('https://'):
             self.api_url = 'wss://' + api_url[len('https://'):]
@@ -82,6 +87,15 @@ class SoundHashClient:
         self.audio: Optional[pyaudio.PyAudio] = None
         self.stream: Optional[pyaudio.Stream] = None
         self._running = False
+        self._sequence = 0
+
+    def _frame(self, pcm: bytes, sample_rate: int, channels: int = 1) -> bytes:
+        """Prefix int16 PCM audio with a framed-protocol header."""
+        header = FRAME_HEADER.pack(
+            b"SHAF", 1, CODEC_INT16, sample_rate, channels, 0, self._sequence % 65536
+        )
+        self._sequence += 1
+        return header + pcm
     
     async def connect(self):
         """Connect to SoundHash WebSocket."""
@@ -104,7 +118,7 @@ class SoundHashClient:
         
         # Open audio stream
         self.stream = self.audio.open(
-            format=pyaudio.paFloat32,
+            format=pyaudio.paInt16,
             channels=1,
             rate=self.sample_rate,
             input=True,
@@ -126,7 +140,7 @@ class SoundHashClient:
                 
                 # Send to server
                 if self.ws and not self.ws.closed:
-                    await self.ws.send(audio_data)
+                    await self.ws.send(self._frame(audio_data, self.sample_rate))
                 
                 # Small delay to prevent overwhelming the server
                 await asyncio.sleep(0.01)
@@ -146,6 +160,10 @@ class SoundHashClient:
             
             with wave.open(file_path, 'rb') as wav_file:
                 logger.info(f"Streaming audio file: {file_path}")
+                if wav_file.getsampwidth() != 2:
+                    raise ValueError("Only 16-bit PCM WAV files are supported")
+                rate = wav_file.getframerate()
+                channels = wav_file.getnchannels()
                 
                 while True:
                     data = wav_file.readframes(chunk_size)
@@ -153,10 +171,10 @@ class SoundHashClient:
                         break
                     
                     if self.ws and not self.ws.closed:
-                        await self.ws.send(data)
+                        await self.ws.send(self._frame(data, rate, channels))
                     
                     # Delay to simulate real-time streaming
-                    await asyncio.sleep(chunk_size / self.sample_rate)
+                    await asyncio.sleep(chunk_size / rate)
                 
                 logger.info("Finished streaming audio file")
         except Exception as e:
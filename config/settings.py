@@ -22,6 +22,12 @@ class Config:
     DATABASE_POOL_RECYCLE = int(os.getenv("DATABASE_POOL_RECYCLE", 3600))
     DATABASE_ECHO = os.getenv("DATABASE_ECHO", "false").lower() == "true"
     DATABASE_STATEMENT_TIMEOUT = int(os.getenv("DATABASE_STATEMENT_TIMEOUT", 30000))  # milliseconds
+    DATABASE_SERVER_TIMING = (
+        os.getenv("DATABASE_SERVER_TIMING", "true").lower() == "true"
+    )  # Report each API request's query count and time in a Server-Timing header
+    DATABASE_N_PLUS_ONE_THRESHOLD = int(
+        os.getenv("DATABASE_N_PLUS_ONE_THRESHOLD", 10)
+    )  # Warn when one statement runs more often than this in a single request
 
     # Redis for Caching
     REDIS_ENABLED = os.getenv("REDIS_ENABLED", "false").lower() == "true"
@@ -30,9 +36,16 @@ class Config:
     REDIS_DB = int(os.getenv("REDIS_DB", 0))
     REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
     CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", 300))
+    FINGERPRINT_STATS_CACHE_SECONDS = float(
+        os.getenv("FINGERPRINT_STATS_CACHE_SECONDS", "30")
+    )  # How long each API worker serves /fingerprints/stats from memory
 
     # API Keys
     YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+    YOUTUBE_API_MAX_CONCURRENT_REQUESTS = int(os.getenv("YOUTUBE_API_MAX_CONCURRENT_REQUESTS", 8))
+    YOUTUBE_API_QUOTA_UNITS_PER_SECOND = float(
+        os.getenv("YOUTUBE_API_QUOTA_UNITS_PER_SECOND", "20.0")
+    )  # Bounds the async Data API client's request rate
     TWITTER_BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
     TWITTER_CONSUMER_KEY = os.getenv("TWITTER_CONSUMER_KEY")
     TWITTER_CONSUMER_SECRET = os.getenv("TWITTER_CONSUMER_SECRET")
@@ -103,6 +116,26 @@ class Config:
     LSH_HASH_SIZE = int(os.getenv("LSH_HASH_SIZE", 12))
     LSH_MAX_CANDIDATES = int(os.getenv("LSH_MAX_CANDIDATES", 100))
     
+    # Staged video processing pipeline (download -> decode -> fingerprint -> write)
+    VIDEO_PIPELINE_ENABLED = os.getenv("VIDEO_PIPELINE_ENABLED", "true").lower() == "true"
+    PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", 2))
+    PIPELINE_WRITE_BATCH_SIZE = int(os.getenv("PIPELINE_WRITE_BATCH_SIZE", 4))
+    JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", 300))  # Claimed jobs are reclaimed after this
+    JOB_HEARTBEAT_SECONDS = int(os.getenv("JOB_HEARTBEAT_SECONDS", 60))  # Lease renewal interval
+    JOB_PROGRESS_MIN_INTERVAL = float(os.getenv("JOB_PROGRESS_MIN_INTERVAL", "1.0"))  # Seconds between DB writes
+    JOB_PROGRESS_MIN_DELTA = float(os.getenv("JOB_PROGRESS_MIN_DELTA", "0.1"))  # Progress change forcing a write
+    JOB_PROGRESS_TTL_SECONDS = int(os.getenv("JOB_PROGRESS_TTL_SECONDS", 300))  # Live progress snapshot TTL
+    JOB_FAIR_SHARE_WINDOW_SECONDS = int(os.getenv("JOB_FAIR_SHARE_WINDOW_SECONDS", 600))  # Per-tenant usage window
+    FINGERPRINT_WRITE_CHUNK_SIZE = int(os.getenv("FINGERPRINT_WRITE_CHUNK_SIZE", 10))  # Segments per commit
+
+    # Live streaming (WebSocket) processing
+    STREAMING_MAX_WORKERS = int(os.getenv("STREAMING_MAX_WORKERS", 4))
+    STREAMING_METADATA_CACHE_SIZE = int(os.getenv("STREAMING_METADATA_CACHE_SIZE", 1024))
+    STREAMING_INDEX_REFRESH_SECONDS = int(os.getenv("STREAMING_INDEX_REFRESH_SECONDS", 30))
+    STREAMING_HEARTBEAT_SECONDS = int(os.getenv("STREAMING_HEARTBEAT_SECONDS", 5))
+    STREAMING_MAX_STREAMS_PER_WORKER = int(os.getenv("STREAMING_MAX_STREAMS_PER_WORKER", 0))  # 0 = unlimited
+    STREAMING_REBALANCE_MARGIN = int(os.getenv("STREAMING_REBALANCE_MARGIN", 0))  # 0 = disabled
+
     # Multi-Resolution Fingerprinting
     USE_MULTI_RESOLUTION = os.getenv("USE_MULTI_RESOLUTION", "false").lower() == "true"
 
@@ -138,6 +171,8 @@ class Config:
     # Ingestion backoff settings
     CHANNEL_RETRY_DELAY = int(os.getenv("CHANNEL_RETRY_DELAY", 5))  # seconds
     CHANNEL_MAX_RETRIES = int(os.getenv("CHANNEL_MAX_RETRIES", 3))
+    # Routine syncs only fetch new uploads; a full re-enumeration catches edits
+    CHANNEL_DEEP_SYNC_INTERVAL_HOURS = int(os.getenv("CHANNEL_DEEP_SYNC_INTERVAL_HOURS", 168))
 
     # File management
     KEEP_ORIGINAL_AUDIO = os.getenv("KEEP_ORIGINAL_AUDIO", "true").lower() == "true"
@@ -158,6 +193,10 @@ class Config:
         "YT_BROWSER_PROFILE"
     )  # e.g., 'Default', 'Profile 1', or a Firefox profile name
     YT_PLAYER_CLIENT = os.getenv("YT_PLAYER_CLIENT")  # e.g., 'android', 'web_safari', 'tv'
+    # Run yt-dlp in-process with warm, reused YoutubeDL instances (false = one CLI call each)
+    YT_DLP_IN_PROCESS = os.getenv("YT_DLP_IN_PROCESS", "true").lower() == "true"
+    YT_DLP_MAX_CONCURRENT = int(os.getenv("YT_DLP_MAX_CONCURRENT", 4))
+    YT_DLP_REQUESTS_PER_SECOND = float(os.getenv("YT_DLP_REQUESTS_PER_SECOND", "1.0"))  # Per host
 
     # Target channels
     TARGET_CHANNELS = os.getenv("TARGET_CHANNELS", "").split(",")
@@ -207,6 +246,30 @@ class Config:
     RETENTION_FAILED_JOBS_DAYS = int(
         os.getenv("RETENTION_FAILED_JOBS_DAYS", 90)
     )  # Keep failed jobs longer for debugging
+    RETENTION_API_USAGE_LOGS_DAYS = int(
+        os.getenv("RETENTION_API_USAGE_LOGS_DAYS", 30)
+    )  # Raw API usage rows; rollups keep the totals
+    RETENTION_ANALYTICS_EVENTS_DAYS = int(
+        os.getenv("RETENTION_ANALYTICS_EVENTS_DAYS", 365)
+    )  # Raw analytics events
+    ANALYTICS_PARTITIONS_AHEAD_DAYS = int(
+        os.getenv("ANALYTICS_PARTITIONS_AHEAD_DAYS", 7)
+    )  # Create analytics log partitions this far ahead
+    ANALYTICS_ROLLUP_DELAY_SECONDS = float(
+        os.getenv("ANALYTICS_ROLLUP_DELAY_SECONDS", "120")
+    )  # Roll up a minute only once late writes for it have landed
+    API_USAGE_BUFFER_SIZE = int(
+        os.getenv("API_USAGE_BUFFER_SIZE", 10000)
+    )  # API usage rows held in memory per worker before the oldest are dropped
+    API_USAGE_FLUSH_ROWS = int(
+        os.getenv("API_USAGE_FLUSH_ROWS", 500)
+    )  # Write buffered API usage rows once this many are waiting
+    API_USAGE_FLUSH_INTERVAL_MS = int(
+        os.getenv("API_USAGE_FLUSH_INTERVAL_MS", 1000)
+    )  # ...or at least this often
+    API_USAGE_SAMPLE_ABOVE = float(
+        os.getenv("API_USAGE_SAMPLE_ABOVE", "0.5")
+    )  # Sample API usage rows once the buffer is this full (fraction)
     LOG_DIR = os.getenv("LOG_DIR", "./logs")  # Directory for log files
 
     # Alerting settings
@@ -407,6 +470,12 @@ class Config:
     DATABASE_READER_ENDPOINTS = os.getenv("DATABASE_READER_ENDPOINTS", "").split(",") if os.getenv("DATABASE_READER_ENDPOINTS") else []
     DATABASE_REPLICA_EU_ENDPOINT = os.getenv("DATABASE_REPLICA_EU_ENDPOINT", "")
     DATABASE_REPLICA_APAC_ENDPOINT = os.getenv("DATABASE_REPLICA_APAC_ENDPOINT", "")
+    DATABASE_REPLICA_MAX_LAG_SECONDS = float(
+        os.getenv("DATABASE_REPLICA_MAX_LAG_SECONDS", "10")
+    )  # Read replicas further behind the primary stop serving reads
+    DATABASE_REPLICA_CHECK_SECONDS = float(
+        os.getenv("DATABASE_REPLICA_CHECK_SECONDS", "15")
+    )  # How often read replica health and lag are checked
     
     # Geographic Routing
     GEO_ROUTING_ENABLED = os.getenv("GEO_ROUTING_ENABLED", "false").lower() == "true"
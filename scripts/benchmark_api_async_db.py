@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Load test for the routes served from the async database session.
+
+Serves video and fingerprint reads in-process and drives them with
+concurrent clients (httpx over ASGI) in two configurations:
+
+- ``sync``: handlers querying the sync ``get_db`` session, as the routes did
+  before the async migration
+- ``async``: the current routes on ``get_async_db``
+
+For each concurrency level it reports requests/sec and p99 latency, then the
+best throughput whose p99 stays under ``--p99-ms``.
+
+Against SQLite every query takes microseconds, which hides event-loop
+blocking, so ``--latency-ms`` adds a simulated database round trip to each
+statement on the thread that runs it: the sync driver sleeps on the event
+loop, the async driver on its worker thread. Pass ``--database-url`` to run
+against a scratch PostgreSQL database instead (tables are created and seeded;
+no latency is simulated).
+
+Usage:
+    python scripts/benchmark_api_async_db.py --latency-ms 2 --concurrency 1,8,32,64
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated
+
+from fastapi import Depends, FastAPI, HTTPException
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, desc, event
+from sqlalchemy.orm import Session, sessionmaker
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import Config
+from src.api.dependencies import get_async_db, get_async_read_db, get_current_user_async
+from src.api.routes import fingerprints, videos
+from src.database.connection import DatabaseManager
+from src.database.models import AudioFingerprint, Base, Channel, User, Video
+
+
+def seed(session: Session, video_count: int, segments: int) -> None:
+    """Insert a channel, ``video_count`` videos and their fingerprints."""
+    channel = Channel(channel_id="UC_BENCH", channel_name="Benchmark Channel")
+    session.add(channel)
+    session.flush()
+    for i in range(video_count):
+        video = Video(video_id=f"bench{i}", channel_id=channel.id, title=f"Video {i}")
+        session.add(video)
+        session.flush()
+        session.add_all(
+            AudioFingerprint(
+                video_id=video.id,
+                start_time=s * 90.0,
+                end_time=(s + 1) * 90.0,
+                fingerprint_hash=f"{i}-{s}",
+                sample_rate=22050,
+                segment_length=90.0,
+            )
+            for s in range(segments)
+        )
+    session.commit()
+
+
+def add_latency(engine, seconds: float, is_async: bool) -> None:
+    """Sleep ``seconds`` per SQLite statement on the thread executing it."""
+
+    def trace(_statement: str) -> None:
+        time.sleep(seconds)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, _record):
+        if is_async:
+            dbapi_connection.run_async(lambda conn: conn.set_trace_callback(trace))
+        else:
+            dbapi_connection.set_trace_callback(trace)
+
+
+def build_app(
+    mode: str, database_url: str, latency: float, pool_size: int
+) -> tuple[FastAPI, DatabaseManager]:
+    """Build an app serving GET /videos/{id} and GET /fingerprints/ in ``mode``."""
+    app = FastAPI()
+    manager = DatabaseManager()
+    user = User(id=1, username="bench", email="bench@example.com", is_active=True)
+    is_sqlite = database_url.startswith("sqlite")
+
+    if mode == "async":
+        Config.DATABASE_URL = database_url
+        manager.initialize_async()
+        assert manager.async_engine is not None
+        if is_sqlite and latency:
+            add_latency(manager.async_engine.sync_engine, latency, is_async=True)
+
+        async def get_bench_async_db():
+            async with manager.get_async_session() as session:
+                yield session
+
+        app.include_router(videos.router, prefix="/videos")
+        app.include_router(fingerprints.router, prefix="/fingerprints")
+        app.dependency_overrides[get_async_db] = get_bench_async_db
+        app.dependency_overrides[get_async_read_db] = get_bench_async_db
+        app.dependency_overrides[get_current_user_async] = lambda: user
+        return app, manager
+
+    # A blocking checkout on the event loop can never be satisfied (the
+    # connections are held by requests waiting on the loop), so give the
+    # sync pool one connection per client
+    connect_args = {"check_same_thread": False} if is_sqlite else {}
+    manager.engine = create_engine(
+        database_url, connect_args=connect_args, pool_size=pool_size, max_overflow=0
+    )
+    manager.Session = sessionmaker(bind=manager.engine)
+    if is_sqlite and latency:
+        add_latency(manager.engine, latency, is_async=False)
+
+    def get_db():
+        session = manager.get_session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    # The pre-migration handlers: async def routes running sync queries
+    @app.get("/videos/{video_id}")
+    async def get_video(video_id: str, db: Annotated[Session, Depends(get_db)]):
+        video = db.query(Video).filter(Video.video_id == video_id).first()
+        if not video:
+            raise HTTPException(status_code=404, detail="Video not found")
+        return {"id": video.id, "video_id": video.video_id, "title": video.title}
+
+    @app.get("/fingerprints/")
+    async def list_fingerprints(video_id: int, db: Annotated[Session, Depends(get_db)]):
+        query = db.query(AudioFingerprint).filter(AudioFingerprint.video_id == video_id)
+        total = query.count()
+        rows = query.order_by(desc(AudioFingerprint.created_at)).limit(20).all()
+        return {"total": total, "data": [{"id": f.id} for f in rows]}
+
+    return app, manager
+
+
+async def run_level(
+    client: AsyncClient, concurrency: int, requests: int, video_count: int
+) -> dict[str, float]:
+    """Issue ``requests`` requests from ``concurrency`` clients; return rps and p99."""
+    latencies: list[float] = []
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for i in counter:
+            if i % 2:
+                path = f"/videos/bench{i % video_count}"
+            else:
+                path = f"/fingerprints/?video_id={i % video_count + 1}"
+            started = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    p99 = statistics.quantiles(latencies, n=100)[98] if len(latencies) > 1 else latencies[0]
+    return {"rps": requests / elapsed, "p99_ms": p99 * 1000}
+
+
+async def benchmark(mode: str, args: argparse.Namespace) -> list[dict[str, float]]:
+    """Run every concurrency level against one app configuration."""
+    app, manager = build_app(mode, args.database_url, args.latency_ms / 1000, max(args.concurrency))
+    results = []
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        await run_level(client, 1, 20, args.videos)  # warm-up
+        for concurrency in args.concurrency:
+            result = await run_level(client, concurrency, args.requests, args.videos)
+            results.append({"concurrency": concurrency, **result})
+    manager.close()
+    await manager.close_async()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", help="Scratch database (default: temporary SQLite)")
+    parser.add_argument("--videos", type=int, default=200)
+    parser.add_argument("--segments", type=int, default=10, help="Fingerprints per video")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per level")
+    parser.add_argument("--concurrency", default="1,8,32,64")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Simulated (SQLite only)")
+    parser.add_argument("--p99-ms", type=float, default=100.0, help="Latency budget")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    args.concurrency = [int(c) for c in args.concurrency.split(",")]
+
+    tmp_dir = None
+    if not args.database_url:
+        tmp_dir = tempfile.TemporaryDirectory()
+        args.database_url = f"sqlite:///{Path(tmp_dir.name) / 'bench.db'}"
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        seed(session, args.videos, args.segments)
+    engine.dispose()
+
+    report = {mode: asyncio.run(benchmark(mode, args)) for mode in ("sync", "async")}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'mode':<6} {'clients':>7} {'req/s':>9} {'p99 ms':>9}")
+        for mode, rows in report.items():
+            for row in rows:
+                print(f"{mode:<6} {row['concurrency']:>7} {row['rps']:>9.1f} {row['p99_ms']:>9.1f}")
+        print(f"\nBest throughput with p99 <= {args.p99_ms:g} ms:")
+        for mode, rows in report.items():
+            within = [row for row in rows if row["p99_ms"] <= args.p99_ms]
+            best = max(within, key=lambda row: row["rps"]) if within else None
+            if best:
+                print(f"  {mode:<6} {best['rps']:.1f} req/s ({best['concurrency']} clients)")
+            else:
+                print(f"  {mode:<6} none within budget")
+
+    if tmp_dir:
+        tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Simulation benchmark for job queue scheduling.
+
+Replays a mixed workload against an in-memory SQLite queue and compares the
+old FIFO ordering (``created_at`` only) with ``JobRepository.claim_jobs``
+(fast lane, per-tenant fair share and priority):
+
+- one tenant ingests a large channel backlog
+- several small tenants each queue a handful of bulk jobs
+- interactive uploads arrive steadily while the backlog drains
+
+Time is simulated in ticks: every tick each worker claims one batch and
+finishes it before the next tick. Wait times are reported in ticks.
+
+Usage:
+    python scripts/benchmark_job_scheduling.py --backlog 2000 --workers 4
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database.models import Base, ProcessingJob, Tenant
+from src.database.repositories import JobRepository
+from src.database.repositories.job_repository import INTERACTIVE_LANE
+
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def fifo_claim(repo: JobRepository, limit: int, worker_id: str) -> list[ProcessingJob]:
+    """Claim jobs in plain creation order (the scheduling before fair share)."""
+    jobs = repo.get_pending_jobs("video_process", limit)
+    for job in jobs:
+        job.status = "running"
+        job.worker_id = worker_id
+        job.started_at = datetime.now(timezone.utc)
+    repo.session.commit()
+    return jobs
+
+
+def build_workload(args: argparse.Namespace) -> list[tuple[int, str, str, dict]]:
+    """Build the arrival schedule as (tick, target, class, job kwargs) tuples."""
+    rng = random.Random(args.seed)
+    arrivals: list[tuple[int, str, str, dict]] = []
+    for i in range(args.backlog):
+        arrivals.append((0, f"backlog{i}", "backlog", {"tenant": 0}))
+    for t in range(1, args.small_tenants + 1):
+        for i in range(args.small_jobs):
+            arrivals.append((0, f"small{t}-{i}", "small tenants", {"tenant": t}))
+    for i in range(args.uploads):
+        tick = i * args.upload_every
+        tenant = rng.randint(1, args.small_tenants)
+        arrivals.append(
+            (
+                tick,
+                f"upload{i}",
+                "uploads",
+                {"tenant": tenant, "lane": INTERACTIVE_LANE, "priority": 5},
+            )
+        )
+    return sorted(arrivals, key=lambda a: a[0])
+
+
+def simulate(strategy: str, args: argparse.Namespace) -> dict[str, dict[str, float]]:
+    """Run the workload with one claiming strategy and return wait statistics."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    repo = JobRepository(session)
+
+    tenants = [
+        Tenant(name=f"Tenant {i}", slug=f"tenant-{i}", admin_email=f"t{i}@example.com")
+        for i in range(args.small_tenants + 1)
+    ]
+    session.add_all(tenants)
+    session.commit()
+
+    arrivals = build_workload(args)
+    enqueued: dict[str, tuple[int, str]] = {}
+    waits: dict[str, list[int]] = {}
+    tick = 0
+    next_arrival = 0
+    finished = 0
+
+    while finished < len(arrivals) and tick <= args.max_ticks:
+        while next_arrival < len(arrivals) and arrivals[next_arrival][0] <= tick:
+            _, target, kind, spec = arrivals[next_arrival]
+            job = repo.create_job(
+                "video_process",
+                target,
+                tenant_id=tenants[spec["tenant"]].id,
+                lane=spec.get("lane", "bulk"),
+                priority=spec.get("priority", 0),
+            )
+            job.created_at = EPOCH + timedelta(seconds=tick, microseconds=next_arrival)
+            enqueued[target] = (tick, kind)
+            next_arrival += 1
+        session.commit()
+
+        for worker in range(args.workers):
+            worker_id = f"worker-{worker}"
+            if strategy == "fifo":
+                jobs = fifo_claim(repo, args.batch_size, worker_id)
+            else:
+                jobs = repo.claim_jobs("video_process", args.batch_size, worker_id)
+            for job in jobs:
+                arrived, kind = enqueued[str(job.target_id)]
+                waits.setdefault(kind, []).append(tick - arrived)
+                job.status = "completed"
+                finished += 1
+            session.commit()
+
+        tick += 1
+
+    session.close()
+    return {
+        kind: {
+            "jobs": len(values),
+            "mean_wait": statistics.mean(values),
+            "p95_wait": percentile(values, 95),
+            "max_wait": max(values),
+        }
+        for kind, values in sorted(waits.items())
+    }
+
+
+def percentile(values: list[int], pct: int) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main() -> int:
+    """Run both strategies and print a comparison."""
+    parser = argparse.ArgumentParser(description="Job scheduling simulation benchmark")
+    parser.add_argument("--backlog", type=int, default=2000, help="Jobs queued by the large tenant")
+    parser.add_argument("--small-tenants", type=int, default=5, help="Tenants with a few jobs each")
+    parser.add_argument("--small-jobs", type=int, default=5, help="Bulk jobs per small tenant")
+    parser.add_argument("--uploads", type=int, default=20, help="Interactive uploads")
+    parser.add_argument("--upload-every", type=int, default=5, help="Ticks between uploads")
+    parser.add_argument("--workers", type=int, default=4, help="Workers claiming per tick")
+    parser.add_argument("--batch-size", type=int, default=5, help="Jobs claimed per worker")
+    parser.add_argument("--max-ticks", type=int, default=10_000, help="Simulation cut-off")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print("Job Scheduling Simulation")
+    print("=" * 72)
+
+    results = {}
+    for strategy in ("fifo", "fair_share"):
+        started = time.time()
+        results[strategy] = simulate(strategy, args)
+        print(f"\n{strategy} ({time.time() - started:.1f}s)")
+        print(f"  {'class':<15} {'jobs':>6} {'mean wait':>10} {'p95 wait':>10} {'max wait':>10}")
+        for kind, stats in results[strategy].items():
+            print(
+                f"  {kind:<15} {stats['jobs']:>6} {stats['mean_wait']:>10.1f} "
+                f"{stats['p95_wait']:>10.1f} {stats['max_wait']:>10.1f}"
+            )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nResults saved to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
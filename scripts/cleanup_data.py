@@ -33,7 +33,8 @@ def main():
         help=(
             "Comma-separated list of cleanup targets: "
             "'temp' (audio files), 'logs' (log files), "
-            "'jobs' (old processing jobs), 'fingerprints' (orphaned fingerprints). "
+            "'jobs' (old processing jobs), 'fingerprints' (orphaned fingerprints), "
+            "'analytics' (expired API usage logs and analytics events). "
             "Default: temp,logs,jobs"
         ),
     )
@@ -106,7 +107,7 @@ def main():
 
     # Parse targets
     targets = [t.strip().lower() for t in args.targets.split(",") if t.strip()]
-    valid_targets = {"temp", "logs", "jobs", "fingerprints"}
+    valid_targets = {"temp", "logs", "jobs", "fingerprints", "analytics"}
     invalid_targets = [t for t in targets if t not in valid_targets]
 
     if invalid_targets:
@@ -13,6 +13,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.logging_config import create_section_logger, setup_logging
 from config.settings import Config
+from src.core.fingerprint_pool import shutdown_fingerprint_pool
+from src.core.ytdlp_pool import shutdown_ytdlp_pool
 from src.ingestion.channel_ingester import ChannelIngester, VideoJobProcessor
 
 
@@ -106,6 +108,9 @@ async def main():
         logger.log_error_box("Ingestion failed", str(e))
         logger.log_section_end("SoundHash Channel Ingestion", success=False)
         sys.exit(1)
+    finally:
+        shutdown_fingerprint_pool()
+        shutdown_ytdlp_pool()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Recount the fingerprint statistics served by GET /api/v1/fingerprints/stats.
+
+The fingerprint writers keep the totals up to date incrementally; run this
+periodically (e.g. hourly from cron) to correct drift from deleted or
+rewritten fingerprints, and to fold the statistics ledger into a new snapshot.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.logging_config import setup_logging
+from src.database.connection import db_manager
+from src.database.fingerprint_stats import reconcile_fingerprint_stats
+
+
+def main():
+    """Recount and store the fingerprint statistics."""
+    parser = argparse.ArgumentParser(description="Recount fingerprint statistics")
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Set logging level",
+    )
+    args = parser.parse_args()
+
+    setup_logging(log_level=args.log_level, log_file="reconcile_stats.log")
+
+    db_manager.initialize()
+    session = db_manager.get_session()
+    try:
+        totals = reconcile_fingerprint_stats(session)
+        print(
+            f"Reconciled: {totals['total_fingerprints']} fingerprints "
+            f"across {totals['total_videos']} videos"
+        )
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
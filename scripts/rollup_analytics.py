@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Maintain the analytics rollups and log partitions.
+
+Run every minute (e.g. from cron). Each run creates the api_usage_logs and
+analytics_events partitions needed for the coming days (PostgreSQL) and rolls
+the newly completed minutes and hours up into api_usage_rollups and
+analytics_event_rollups, which the /api/v1/analytics routes read.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.logging_config import setup_logging
+from config.settings import Config
+from src.database.analytics_rollups import roll_up_analytics
+from src.database.connection import db_manager
+from src.database.partitions import ensure_partitions
+
+
+def main():
+    """Create upcoming partitions and roll up completed minutes and hours."""
+    parser = argparse.ArgumentParser(description="Maintain analytics rollups and partitions")
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Set logging level",
+    )
+    args = parser.parse_args()
+
+    setup_logging(log_level=args.log_level, log_file="rollup_analytics.log")
+
+    db_manager.initialize()
+    session = db_manager.get_session()
+    try:
+        ensure_partitions(session, Config.ANALYTICS_PARTITIONS_AHEAD_DAYS)
+        marks = roll_up_analytics(session, Config.ANALYTICS_ROLLUP_DELAY_SECONDS)
+        for name, (minute_mark, hour_mark) in marks.items():
+            print(f"{name}: minutes rolled up to {minute_mark}, hours to {hour_mark}")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,12 @@
 
 This script measures the performance of common database queries to ensure
 they meet performance targets (< 100ms for most operations).
+
+With ``--explain`` it runs a query plan regression suite instead: it fills
+the large tables with synthetic rows, runs every repository lookup, and
+fails when the plan of any statement they send scans one of those tables
+sequentially. All synthetic rows are rolled back. Run it against a database
+migrated with ``alembic upgrade head`` so the schema has every index.
 """
 
 import argparse
@@ -18,11 +24,22 @@ from typing import Any, Callable
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
 from config.logging_config import setup_logging
 from config.settings import Config
+from src.database.bulk import bulk_insert
 from src.database.connection import db_manager
+from src.database.models import AudioFingerprint, Channel, MatchResult, ProcessingJob, Video
 from src.database.monitoring import get_query_metrics, reset_query_metrics
-from src.database.repositories import get_job_repo_session, get_video_repo_session
+from src.database.query_plans import capture_statements, explain, sequential_scans
+from src.database.repositories import (
+    JobRepository,
+    VideoRepository,
+    get_job_repo_session,
+    get_video_repo_session,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -220,6 +237,234 @@ def run_benchmarks() -> list[dict[str, Any]]:
     return results
 
 
+# Tables filled with synthetic rows; a sequential scan of any of them fails the plan suite
+LARGE_TABLES = ("videos", "audio_fingerprints", "match_results", "processing_jobs")
+
+# Repository lookups checked by the plan suite: name -> call(video_repo, job_repo, sample)
+PLAN_CASES: list[tuple[str, Callable[[VideoRepository, JobRepository, dict[str, Any]], Any]]] = [
+    ("get_channel_by_id", lambda v, j, s: v.get_channel_by_id(s["channel_id"])),
+    ("get_video_by_id", lambda v, j, s: v.get_video_by_id(s["video_id"])),
+    ("get_videos_by_ids", lambda v, j, s: v.get_videos_by_ids(s["video_ids"])),
+    ("get_unprocessed_videos", lambda v, j, s: v.get_unprocessed_videos(limit=100)),
+    (
+        "get_fingerprint_resume_point",
+        lambda v, j, s: v.get_fingerprint_resume_point(s["video_pk"], 22050, 2048, 512),
+    ),
+    (
+        "check_fingerprints_exist",
+        lambda v, j, s: v.check_fingerprints_exist(s["video_pk"], 22050, 2048, 512),
+    ),
+    (
+        "fingerprints_exist_for_videos",
+        lambda v, j, s: v.fingerprints_exist_for_videos(s["video_pks"], 22050, 2048, 512),
+    ),
+    ("find_matching_fingerprints", lambda v, j, s: v.find_matching_fingerprints(s["hash"])),
+    ("get_top_matches", lambda v, j, s: v.get_top_matches(s["fingerprint_pk"])),
+    ("get_pending_jobs", lambda v, j, s: j.get_pending_jobs(limit=10)),
+    (
+        "get_pending_jobs (by type)",
+        lambda v, j, s: j.get_pending_jobs(job_type="video_process", limit=10),
+    ),
+    (
+        "job_exists",
+        lambda v, j, s: j.job_exists("video_process", s["target_id"], ["pending", "running"]),
+    ),
+    (
+        "jobs_exist_batch",
+        lambda v, j, s: j.jobs_exist_batch("video_process", s["target_ids"], ["pending"]),
+    ),
+    ("get_jobs_by_target", lambda v, j, s: j.get_jobs_by_target("video_process", s["target_id"])),
+    ("count_jobs_by_status", lambda v, j, s: j.count_jobs_by_status("pending")),
+    ("claim_jobs", lambda v, j, s: j.claim_jobs("video_process", 5, "plan-check")),
+]
+
+
+def seed_synthetic_data(session: Session, rows: int) -> dict[str, Any]:
+    """Fill the large tables with synthetic rows (about ``rows`` fingerprints).
+
+    Most videos are processed and most jobs finished, as in production, so
+    that lookups of the unprocessed and pending ones are selective.
+
+    Returns:
+        Keys of existing rows for the plan cases to look up
+    """
+    now = datetime.now()
+    channel_pk = bulk_insert(
+        session, Channel, [{"channel_id": "plan_check_channel"}], return_ids=True
+    )[0]
+
+    video_count = max(rows // 50, 100)
+    video_pks = bulk_insert(
+        session,
+        Video,
+        [
+            {
+                "video_id": f"plan_check_{i}",
+                "channel_id": channel_pk,
+                "processed": i % 20 != 0,
+                "created_at": now - timedelta(minutes=i),
+            }
+            for i in range(video_count)
+        ],
+        return_ids=True,
+    )
+
+    fingerprint_pks = bulk_insert(
+        session,
+        AudioFingerprint,
+        [
+            {
+                "video_id": video_pks[i % video_count],
+                "start_time": float(i // video_count * 10),
+                "end_time": float(i // video_count * 10 + 10),
+                "fingerprint_hash": f"{i:032x}",
+                "sample_rate": 22050,
+                "n_fft": 2048,
+                "hop_length": 512,
+                "confidence_score": 0.9,
+                "peak_count": 100,
+                "segment_length": 10.0,
+            }
+            for i in range(rows)
+        ],
+        return_ids=True,
+    )
+
+    bulk_insert(
+        session,
+        MatchResult,
+        [
+            {
+                "query_fingerprint_id": fingerprint_pks[i % rows],
+                "matched_fingerprint_id": fingerprint_pks[(i * 7) % rows],
+                "similarity_score": (i % 100) / 100,
+            }
+            for i in range(rows // 2)
+        ],
+    )
+
+    statuses = ["completed"] * 18 + ["failed", "pending"]
+    bulk_insert(
+        session,
+        ProcessingJob,
+        [
+            {
+                "job_type": "video_process" if i % 3 else "channel_ingest",
+                "status": statuses[i % len(statuses)],
+                "target_id": f"plan_check_target_{i}",
+                "lane": "bulk",
+                "created_at": now - timedelta(seconds=i),
+            }
+            for i in range(rows // 2)
+        ],
+    )
+
+    # Plan with statistics of the synthetic rows
+    if session.get_bind().dialect.name == "postgresql":
+        for table in LARGE_TABLES:
+            session.execute(text(f"ANALYZE {table}"))
+    else:
+        session.execute(text("ANALYZE"))
+
+    return {
+        "channel_id": "plan_check_channel",
+        "video_id": "plan_check_1",
+        "video_ids": [f"plan_check_{i}" for i in range(0, 50, 5)],
+        "video_pk": video_pks[1],
+        "video_pks": video_pks[:50:5],
+        "hash": f"{rows // 2:032x}",
+        "fingerprint_pk": fingerprint_pks[1],
+        "target_id": "plan_check_target_1",
+        "target_ids": [f"plan_check_target_{i}" for i in range(0, 50, 5)],
+    }
+
+
+def run_plan_checks(rows: int) -> list[dict[str, Any]]:
+    """Explain every repository lookup over synthetic data.
+
+    Args:
+        rows: Number of synthetic fingerprints (other tables scale with it)
+
+    Returns:
+        Result per plan case
+    """
+    logger.info(f"Seeding {rows} synthetic fingerprints for the query plan suite...")
+    db_manager.initialize()
+    assert db_manager.engine is not None
+
+    results = []
+    with db_manager.engine.connect() as connection:
+        transaction = connection.begin()
+        if connection.dialect.name == "sqlite":
+            # pysqlite defers BEGIN to the first write, which would let the
+            # first savepoint's RELEASE commit; start the transaction now
+            connection.exec_driver_sql("BEGIN")
+        # Repository commits only release savepoints; everything is rolled back below
+        session = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            sample = seed_synthetic_data(session, rows)
+            video_repo, job_repo = VideoRepository(session), JobRepository(session)
+            dialect = connection.dialect.name
+
+            for name, call in PLAN_CASES:
+                try:
+                    with capture_statements(connection) as captured:
+                        call(video_repo, job_repo, sample)
+                    scans = [
+                        table
+                        for statement in captured
+                        for table in sequential_scans(
+                            explain(connection, statement), dialect, LARGE_TABLES
+                        )
+                    ]
+                except Exception as e:
+                    logger.error(f"{name} failed: {e}")
+                    results.append({"name": name, "error": str(e), "success": False})
+                    continue
+                results.append(
+                    {
+                        "name": name,
+                        "statements": len(captured),
+                        "scans": scans,
+                        "success": not scans,
+                    }
+                )
+        finally:
+            session.close()
+            transaction.rollback()
+
+    return results
+
+
+def print_plan_results(results: list[dict[str, Any]]) -> None:
+    """Print query plan suite results.
+
+    Args:
+        results: List of plan check result dictionaries
+    """
+    print("\n" + "=" * 80)
+    print("Repository Query Plan Results")
+    print("=" * 80)
+    print(f"Sequential scans allowed on none of: {', '.join(LARGE_TABLES)}")
+    print("-" * 80)
+    print(f"{'Query Name':<40} {'Statements':<12} {'Status':<10}")
+    print("-" * 80)
+
+    for result in results:
+        if "error" in result:
+            print(f"{result['name']:<40} {'ERROR':<12} {'FAILED':<10}")
+        elif result["scans"]:
+            scans = ", ".join(result["scans"])
+            print(f"{result['name']:<40} {result['statements']:<12} ✗ SCAN {scans}")
+        else:
+            print(f"{result['name']:<40} {result['statements']:<12} ✓ PASS")
+
+    failed = sum(1 for r in results if not r["success"])
+    print("-" * 80)
+    print(f"Results: {len(results) - failed} passed, {failed} failed")
+    print("=" * 80 + "\n")
+
+
 def print_query_metrics() -> None:
     """Print query performance metrics from monitoring."""
     metrics = get_query_metrics()
@@ -248,6 +493,17 @@ def main() -> int:
         default=10,
         help="Number of iterations per query (default: 10)",
     )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Run the query plan regression suite instead of the benchmarks",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=100000,
+        help="Synthetic fingerprints seeded for --explain (default: 100000)",
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -258,8 +514,18 @@ def main() -> int:
     args = parser.parse_args()
     
     # Setup logging
-    setup_logging(level=args.log_level)
+    setup_logging(log_level=args.log_level)
     
+    if args.explain:
+        plan_results = run_plan_checks(args.rows)
+        print_plan_results(plan_results)
+        failed = sum(1 for r in plan_results if not r["success"])
+        if failed > 0:
+            logger.error(f"{failed} queries scan large tables or failed")
+            return 1
+        logger.info("Query plan suite complete")
+        return 0
+
     # Reset metrics before starting
     reset_query_metrics()
     
@@ -1,9 +1,12 @@
 """FastAPI dependencies for authentication and database."""
 
+from collections.abc import AsyncIterator
 from typing import Annotated
 
 from fastapi import Depends, HTTPException, Security, status
 from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.api.auth import decode_token, verify_api_key
@@ -24,11 +27,29 @@ def get_db() -> Session:
         session.close()
 
 
-async def get_current_user_from_token(
-    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)] = None,
-    db: Annotated[Session, Depends(get_db)] = None,
-) -> User | None:
-    """Get current user from JWT token (optional)."""
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Get async database session dependency (doesn't block the event loop)."""
+    async with db_manager.get_async_session() as session:
+        yield session
+
+
+def get_read_db() -> Session:
+    """Get read-only database session dependency, served by a read replica when one is healthy."""
+    session = db_manager.get_read_session()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+async def get_async_read_db() -> AsyncIterator[AsyncSession]:
+    """Get async read-only database session dependency (see get_read_db)."""
+    async with db_manager.get_async_read_session() as session:
+        yield session
+
+
+def _username_from_credentials(credentials: HTTPAuthorizationCredentials | None) -> str | None:
+    """Return the username of a valid access token, or None."""
     if credentials is None:
         return None
 
@@ -44,6 +65,18 @@ async def get_current_user_from_token(
     if username is None or token_type != "access":
         return None
 
+    return username
+
+
+async def get_current_user_from_token(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)] = None,
+    db: Annotated[Session, Depends(get_db)] = None,
+) -> User | None:
+    """Get current user from JWT token (optional)."""
+    username = _username_from_credentials(credentials)
+    if username is None:
+        return None
+
     user = db.query(User).filter(User.username == username).first()
 
     return user
@@ -75,13 +108,47 @@ async def get_current_user_from_api_key(
     return None
 
 
-async def get_current_user(
-    user_from_token: Annotated[User | None, Depends(get_current_user_from_token)] = None,
-    user_from_api_key: Annotated[User | None, Depends(get_current_user_from_api_key)] = None,
-) -> User:
-    """Get current user from either JWT token or API key."""
-    user = user_from_token or user_from_api_key
+async def get_current_user_from_token_async(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)] = None,
+    db: Annotated[AsyncSession, Depends(get_async_db)] = None,
+) -> User | None:
+    """Get current user from JWT token (optional), using the async session."""
+    username = _username_from_credentials(credentials)
+    if username is None:
+        return None
+
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalars().first()
+
 
+async def get_current_user_from_api_key_async(
+    api_key: Annotated[str | None, Security(api_key_header)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+) -> User | None:
+    """Get current user from API key (optional), using the async session."""
+    if api_key is None:
+        return None
+
+    # Query all active API keys and verify
+    result = await db.execute(select(APIKey).where(APIKey.is_active == True))
+
+    for key_record in result.scalars().all():
+        if verify_api_key(api_key, key_record.key_hash):
+            # Update last used timestamp
+            from datetime import datetime, timezone
+            key_record.last_used_at = datetime.now(timezone.utc)
+            await db.commit()
+
+            # Get and return the user
+            user = await db.get(User, key_record.user_id)
+            if user:
+                return user
+
+    return None
+
+
+def _require_active_user(user: User | None) -> User:
+    """Raise 401 for a missing user and 403 for an inactive one."""
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -98,6 +165,29 @@ async def get_current_user(
     return user
 
 
+async def get_current_user(
+    user_from_token: Annotated[User | None, Depends(get_current_user_from_token)] = None,
+    user_from_api_key: Annotated[User | None, Depends(get_current_user_from_api_key)] = None,
+) -> User:
+    """Get current user from either JWT token or API key."""
+    return _require_active_user(user_from_token or user_from_api_key)
+
+
+async def get_current_user_async(
+    user_from_token: Annotated[User | None, Depends(get_current_user_from_token_async)] = None,
+    user_from_api_key: Annotated[
+        User | None, Depends(get_current_user_from_api_key_async)
+    ] = None,
+) -> User:
+    """
+    Get current user from either JWT token or API key.
+
+    Same as :func:`get_current_user` but loads the user through
+    :func:`get_async_db`, for routes that use the async session.
+    """
+    return _require_active_user(user_from_token or user_from_api_key)
+
+
 async def get_current_active_user(
     current_user: Annotated[User, Depends(get_current_user)],
 ) -> User:
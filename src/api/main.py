@@ -48,6 +48,10 @@ app.add_middleware(TenantMiddleware)
 from src.api.middleware.analytics_middleware import AnalyticsMiddleware
 app.add_middleware(AnalyticsMiddleware)
 
+# Add query timing middleware (Server-Timing header and N+1 warnings)
+from src.api.middleware.query_timing_middleware import QueryTimingMiddleware
+app.add_middleware(QueryTimingMiddleware)
+
 app.middleware("http")(request_logging_middleware)
 app.state.limiter = limiter
 add_exception_handlers(app)
@@ -58,13 +62,39 @@ async def startup_event():
     """Initialize services on startup."""
     logger.info("Starting SoundHash API...")
     db_manager.initialize()
+    db_manager.initialize_async()
     logger.info("Database connection initialized")
+    await db_manager.start_replica_checks()
+
+    from src.api.session_registry import get_session_registry
+    from src.api.websocket import collect_live_load, handle_stream_control
+
+    registry = get_session_registry()
+    registry.on_control(handle_stream_control)
+    await registry.start(collect_live_load)
+    logger.info(f"Live session registry started ({registry.backend}, worker {registry.worker_id})")
+
+    from src.api.usage_buffer import get_usage_buffer
+
+    await get_usage_buffer().start()
+
+    from src.core.streaming_processor import warm_match_index
+
+    warm_match_index()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("Shutting down SoundHash API...")
+    from src.api.session_registry import get_session_registry
+    from src.api.usage_buffer import get_usage_buffer
+    from src.core.streaming_processor import shutdown_streaming_executor
+
+    await get_session_registry().stop()
+    await get_usage_buffer().stop()
+    shutdown_streaming_executor()
+    await db_manager.close_async()
 
 
 @app.get("/")
@@ -192,6 +222,7 @@ app.include_router(monetization.router, prefix="/api/v1/monetization", tags=["Mo
 # WebSocket endpoint for real-time audio streaming
 from fastapi import WebSocket, WebSocketDisconnect
 
+from src.api.session_registry import get_session_registry
 from src.api.websocket import manager
 from src.core.streaming_processor import cleanup_processor, process_audio_chunk
 
@@ -203,8 +234,24 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
     
     Clients connect with a unique client_id and stream audio data.
     The server processes the audio in real-time and sends back match results.
+    Workers that are at capacity (or much busier than their peers) close new
+    connections with code 1013 so clients retry against another worker.
     """
+    registry = get_session_registry()
+    try:
+        accept = await registry.should_accept_stream(len(manager.active_connections))
+    except Exception as e:
+        logger.warning(f"Session registry unavailable, accepting {client_id}: {e}")
+        accept = True
+
+    if not accept:
+        await websocket.accept()
+        await websocket.close(code=1013, reason="Worker at capacity, retry later")
+        logger.info(f"Rejected stream {client_id}: worker {registry.worker_id} at capacity")
+        return
+
     await manager.connect(websocket, client_id)
+    await _registry_call(registry.register_stream(client_id, manager.connection_times[client_id]))
     await manager.send_status(client_id, "Connected to SoundHash streaming service")
 
     try:
@@ -217,12 +264,20 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
 
     except WebSocketDisconnect:
         logger.info(f"Client {client_id} disconnected")
-        manager.disconnect(client_id)
-        cleanup_processor(client_id)
     except Exception as e:
         logger.error(f"WebSocket error for {client_id}: {e}")
+    finally:
         manager.disconnect(client_id)
         cleanup_processor(client_id)
+        await _registry_call(registry.unregister_stream(client_id))
+
+
+async def _registry_call(coro):
+    """Await a session registry update without letting a registry outage end the stream."""
+    try:
+        await coro
+    except Exception as e:
+        logger.warning(f"Session registry update failed: {e}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,52 @@
+"""Middleware for per-request database query accounting."""
+
+import logging
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.responses import Response
+
+from config.settings import Config
+from src.database.monitoring import track_queries
+
+if Config.METRICS_ENABLED:
+    from src.observability.metrics import metrics
+else:
+    metrics = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+
+class QueryTimingMiddleware(BaseHTTPMiddleware):
+    """Middleware to count and time the database queries of each request.
+
+    Adds a ``Server-Timing`` header (``db;dur=<ms>;desc="<n> queries"``) and
+    warns about statements repeated more than
+    ``DATABASE_N_PLUS_ONE_THRESHOLD`` times, which usually means a lookup
+    runs once per row instead of once per request.
+    """
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        """Track the queries executed while serving the request."""
+        with track_queries() as stats:
+            response = await call_next(request)
+
+        if Config.DATABASE_SERVER_TIMING:
+            response.headers.append(
+                "Server-Timing", f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"'
+            )
+
+        repeated = stats.repeated(Config.DATABASE_N_PLUS_ONE_THRESHOLD)
+        for statement, count in repeated.items():
+            logger.warning(
+                f"Possible N+1 query in {request.method} {request.url.path}: "
+                f"statement ran {count} times: {statement}",
+                extra={"path": request.url.path, "query_count": count, "query": statement},
+            )
+
+        if metrics:
+            metrics.db_queries_per_request.observe(stats.count)
+            for statement in repeated:
+                metrics.db_n_plus_one.labels(statement=statement).inc()
+
+        return response
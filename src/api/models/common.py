@@ -1,7 +1,7 @@
 """Common Pydantic models for API responses."""
 
 from datetime import datetime
-from typing import Generic, TypeVar
+from typing import Generic, Literal, TypeVar
 
 from pydantic import BaseModel, Field
 
@@ -27,18 +27,26 @@ class ErrorResponse(BaseModel):
 class PaginationParams(BaseModel):
     """Pagination parameters."""
 
-    page: int = Field(default=1, ge=1, description="Page number")
+    page: int = Field(default=1, ge=1, description="Page number (ignored with a cursor)")
     per_page: int = Field(default=20, ge=1, le=100, description="Items per page")
+    cursor: str | None = Field(
+        default=None, description="Fetch the page after this one (a previous next_cursor)"
+    )
+    count: Literal["exact", "approximate", "none"] | None = Field(
+        default=None,
+        description="How to compute total; defaults to exact for page numbers, none for cursors",
+    )
 
 
 class PaginatedResponse(BaseModel, Generic[DataT]):
     """Paginated response wrapper."""
 
     data: list[DataT]
-    total: int
-    page: int
+    total: int | None = None
+    page: int | None = None
     per_page: int
-    total_pages: int
+    total_pages: int | None = None
+    next_cursor: str | None = None
 
 
 class SuccessResponse(BaseModel):
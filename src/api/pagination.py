@@ -0,0 +1,180 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+OFFSET pagination makes the database read and throw away every row before the
+requested page, and the COUNT(*) behind ``total`` scans the whole filtered set
+on every request, so deep pages on the large tables get slower as they grow.
+Keyset pagination instead orders by ``(created_at, id)`` (or another
+non-null column plus ``id``) and asks for the rows after the last one already
+returned, which an index on those columns serves at the same cost on any page.
+
+Each page returns an opaque ``next_cursor`` encoding its last row's sort key;
+passing it back as ``cursor`` fetches the following page. Page numbers still
+work for the first pages and for sorts that cannot use a cursor. Totals are
+exact by default on page-numbered requests, skipped on cursor requests, and
+can be requested as a ``pg_class.reltuples`` estimate instead.
+"""
+
+import base64
+import binascii
+import json
+import math
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy import (
+    BigInteger,
+    Select,
+    asc,
+    case,
+    cast,
+    column,
+    desc,
+    func,
+    literal,
+    select,
+    tuple_,
+)
+from sqlalchemy import table as sql_table
+from sqlalchemy.dialects.postgresql import REGCLASS
+
+from src.api.models.common import PaginatedResponse, PaginationParams
+
+pg_class = sql_table("pg_class", column("oid"), column("reltuples"))
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode a row's sort key as an opaque, URL-safe cursor."""
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> list[Any]:
+    """
+    Decode a cursor made by encode_cursor() into values for ``columns``.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or for another sort
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("wrong number of cursor values")
+        return [
+            datetime.fromisoformat(value) if col.type.python_type is datetime else value
+            for col, value in zip(columns, values, strict=True)
+        ]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        ) from None
+
+
+def supports_cursor(order_column: Any) -> bool:
+    """Whether a cursor can follow ``order_column`` (NULL sort keys cannot be compared)."""
+    return not order_column.expression.nullable
+
+
+def paginate(
+    query: Select,
+    pagination: PaginationParams,
+    order_column: Any,
+    id_column: Any,
+    descending: bool = True,
+) -> Select:
+    """
+    Order ``query`` by ``(order_column, id_column)`` and select the requested page.
+
+    Rows after ``pagination.cursor`` are selected when one is given, otherwise
+    the page is found by offset. One extra row is fetched so split_page() can
+    tell whether there is a next page.
+
+    Raises:
+        HTTPException: 400 if a cursor is given for a sort that cannot use one
+    """
+    direction = desc if descending else asc
+    query = query.order_by(direction(order_column), direction(id_column))
+
+    if pagination.cursor:
+        if not supports_cursor(order_column):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cursor pagination is not supported when ordering by {order_column.key}",
+            )
+        columns = (order_column, id_column)
+        values = decode_cursor(pagination.cursor, columns)
+        key = tuple_(*columns)
+        after = tuple_(
+            *(literal(value, col.type) for col, value in zip(columns, values, strict=True))
+        )
+        query = query.where(key < after if descending else key > after)
+    else:
+        query = query.offset((pagination.page - 1) * pagination.per_page)
+
+    return query.limit(pagination.per_page + 1)
+
+
+def split_page(
+    rows: Sequence[Any], pagination: PaginationParams, order_column: Any, id_column: Any
+) -> tuple[list[Any], str | None]:
+    """
+    Drop the look-ahead row fetched by paginate().
+
+    Returns:
+        The page's rows and the cursor for the next page (None on the last
+        page, or when the sort cannot use a cursor)
+    """
+    rows = list(rows)
+    if len(rows) <= pagination.per_page:
+        return rows, None
+
+    rows = rows[: pagination.per_page]
+    if not supports_cursor(order_column):
+        return rows, None
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, order_column.key), getattr(last, id_column.key))
+
+
+def count_statement(query: Select, pagination: PaginationParams, dialect: str) -> Select | None:
+    """
+    Build the statement computing ``total`` for ``query``, or None to skip it.
+
+    ``count="approximate"`` reads the planner's row estimate for the table
+    from ``pg_class.reltuples`` on PostgreSQL when the list is unfiltered
+    (falling back to COUNT if the table has never been analyzed); filtered
+    lists and other databases always count exactly.
+    """
+    mode = pagination.count or ("none" if pagination.cursor else "exact")
+    if mode == "none":
+        return None
+
+    exact = select(func.count()).select_from(query.order_by(None).subquery())
+    if mode == "exact" or dialect != "postgresql" or query.whereclause is not None:
+        return exact
+
+    (target,) = query.get_final_froms()
+    reltuples = (
+        select(cast(pg_class.c.reltuples, BigInteger))
+        .where(pg_class.c.oid == cast(literal(target.name), REGCLASS))
+        .scalar_subquery()
+    )
+    return select(case((reltuples >= 0, reltuples), else_=exact.scalar_subquery()))
+
+
+def page_response(
+    data: list[Any], pagination: PaginationParams, total: int | None, next_cursor: str | None
+) -> PaginatedResponse:
+    """Build the paginated response for one page of ``data``."""
+    return PaginatedResponse(
+        data=data,
+        total=total,
+        page=None if pagination.cursor else pagination.page,
+        per_page=pagination.per_page,
+        total_pages=math.ceil(total / pagination.per_page) if total is not None else None,
+        next_cursor=next_cursor,
+    )
@@ -1,15 +1,15 @@
 """Admin routes."""
 
-import math
 from datetime import UTC, datetime, timedelta
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import desc, func, text
+from sqlalchemy import func, select, text
 from sqlalchemy.orm import Session
 
 from src.api.dependencies import get_admin_user, get_db
 from src.api.models.common import PaginatedResponse, PaginationParams, SuccessResponse
+from src.api.pagination import count_statement, page_response, paginate, split_page
 from src.database.models import Channel, ProcessingJob, User, Video
 
 router = APIRouter()
@@ -73,22 +73,23 @@ async def list_jobs(
     job_type: str | None = Query(None),
 ):
     """List processing jobs (admin only)."""
-    query = db.query(ProcessingJob)
+    query = select(ProcessingJob)
 
     if status_filter:
-        query = query.filter(ProcessingJob.status == status_filter)
+        query = query.where(ProcessingJob.status == status_filter)
 
     if job_type:
-        query = query.filter(ProcessingJob.job_type == job_type)
+        query = query.where(ProcessingJob.job_type == job_type)
 
-    query = query.order_by(desc(ProcessingJob.created_at))
+    count = count_statement(query, pagination, db.get_bind().dialect.name)
+    total = db.scalar(count) if count is not None else None
 
-    total = query.count()
-    offset = (pagination.page - 1) * pagination.per_page
-    jobs = query.offset(offset).limit(pagination.per_page).all()
+    order_column, id_column = ProcessingJob.created_at, ProcessingJob.id
+    rows = db.scalars(paginate(query, pagination, order_column, id_column)).all()
+    jobs, next_cursor = split_page(rows, pagination, order_column, id_column)
 
-    return PaginatedResponse(
-        data=[{
+    return page_response(
+        [{
             "id": j.id,
             "job_type": j.job_type,
             "status": j.status,
@@ -100,10 +101,9 @@ async def list_jobs(
             "started_at": j.started_at.isoformat() if j.started_at else None,
             "completed_at": j.completed_at.isoformat() if j.completed_at else None,
         } for j in jobs],
-        total=total,
-        page=pagination.page,
-        per_page=pagination.per_page,
-        total_pages=math.ceil(total / pagination.per_page),
+        pagination,
+        total,
+        next_cursor,
     )
 
 
@@ -150,19 +150,20 @@ async def list_users(
     is_active: bool | None = Query(None),
 ):
     """List all users (admin only)."""
-    query = db.query(User)
+    query = select(User)
 
     if is_active is not None:
-        query = query.filter(User.is_active == is_active)
+        query = query.where(User.is_active == is_active)
 
-    query = query.order_by(desc(User.created_at))
+    count = count_statement(query, pagination, db.get_bind().dialect.name)
+    total = db.scalar(count) if count is not None else None
 
-    total = query.count()
-    offset = (pagination.page - 1) * pagination.per_page
-    users = query.offset(offset).limit(pagination.per_page).all()
+    order_column, id_column = User.created_at, User.id
+    rows = db.scalars(paginate(query, pagination, order_column, id_column)).all()
+    users, next_cursor = split_page(rows, pagination, order_column, id_column)
 
-    return PaginatedResponse(
-        data=[{
+    return page_response(
+        [{
             "id": u.id,
             "username": u.username,
             "email": u.email,
@@ -173,10 +174,9 @@ async def list_users(
             "created_at": u.created_at.isoformat() if u.created_at else None,
             "last_login": u.last_login.isoformat() if u.last_login else None,
         } for u in users],
-        total=total,
-        page=pagination.page,
-        per_page=pagination.per_page,
-        total_pages=math.ceil(total / pagination.per_page),
+        pagination,
+        total,
+        next_cursor,
     )
 
 
@@ -5,14 +5,30 @@ from datetime import UTC, datetime, timedelta
 from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, desc, func, text
+from sqlalchemy import BigInteger, and_, case, cast, desc, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.api.dependencies import get_current_user, get_db
+from src.api.dependencies import (
+    get_async_db,
+    get_async_read_db,
+    get_current_user,
+    get_current_user_async,
+    get_db,
+)
 from src.api.models.common import PaginatedResponse, PaginationParams, SuccessResponse
+from src.database.analytics_rollups import (
+    ANALYTICS_EVENTS,
+    API_USAGE,
+    analytics_event_rows,
+    api_usage_rows,
+    split_range,
+    truncate_datetime,
+    watermarks,
+)
 from src.database.models import (
-    APIUsageLog,
     AnalyticsEvent,
+    AnalyticsRollupState,
     CohortAnalysis,
     DashboardConfig,
     ReportConfig,
@@ -24,10 +40,28 @@ from src.database.models import (
 router = APIRouter()
 
 
+def _usage_scope(user: User) -> dict[str, int]:
+    """Rows a user may see: their own, or their tenant's for admins."""
+    if not user.is_admin:
+        return {"user_id": user.id}
+    if user.tenant_id:
+        return {"tenant_id": user.tenant_id}
+    return {}
+
+
+def _total(column: Any) -> Any:
+    """SUM of a count column as an integer (PostgreSQL sums BIGINT as NUMERIC)."""
+    return cast(func.coalesce(func.sum(column), 0), BigInteger)
+
+
+def _average(total: int | None, count: int | None) -> float:
+    return total / count if count else 0.0
+
+
 @router.post("/events")
 async def track_event(
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     event_type: str,
     event_category: str,
     event_name: str,
@@ -47,15 +81,15 @@ async def track_event(
         value=value,
     )
     db.add(event)
-    db.commit()
+    await db.commit()
     
     return SuccessResponse(message="Event tracked successfully", data={"event_id": event.id})
 
 
 @router.get("/overview")
 async def get_analytics_overview(
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
     start_date: datetime | None = Query(None),
     end_date: datetime | None = Query(None),
 ):
@@ -66,53 +100,51 @@ async def get_analytics_overview(
     if not start_date:
         start_date = end_date - timedelta(days=30)
     
-    # Build base query filters
-    filters = [AnalyticsEvent.created_at >= start_date, AnalyticsEvent.created_at <= end_date]
-    
-    if not current_user.is_admin:
-        filters.append(AnalyticsEvent.user_id == current_user.id)
-    elif current_user.tenant_id:
-        filters.append(AnalyticsEvent.tenant_id == current_user.tenant_id)
-    
-    # Total events
-    total_events = db.query(func.count(AnalyticsEvent.id)).filter(and_(*filters)).scalar() or 0
-    
+    scope = _usage_scope(current_user)
+    dialect_name = db.get_bind().dialect.name
+    states = (await db.execute(select(AnalyticsRollupState))).scalars().all()
+
+    # Events from the rollups plus the raw rows they don't cover yet
+    events = analytics_event_rows(
+        split_range(start_date, end_date, *watermarks(states, ANALYTICS_EVENTS)),
+        scope,
+        dialect_name,
+    )
+    total_events, active_users = (
+        await db.execute(
+            select(
+                _total(events.c.event_count),
+                func.count(func.distinct(events.c.user_id)),
+            )
+        )
+    ).one()
+
     # Events by category
     events_by_category = (
-        db.query(AnalyticsEvent.event_category, func.count(AnalyticsEvent.id))
-        .filter(and_(*filters))
-        .group_by(AnalyticsEvent.event_category)
-        .all()
-    )
-    
-    # Active users
-    active_users = (
-        db.query(func.count(func.distinct(AnalyticsEvent.user_id)))
-        .filter(and_(*filters))
-        .scalar() or 0
-    )
-    
-    # API calls
-    api_filters = [APIUsageLog.timestamp >= start_date, APIUsageLog.timestamp <= end_date]
-    if not current_user.is_admin:
-        api_filters.append(APIUsageLog.user_id == current_user.id)
-    elif current_user.tenant_id:
-        api_filters.append(APIUsageLog.tenant_id == current_user.tenant_id)
-    
-    total_api_calls = db.query(func.count(APIUsageLog.id)).filter(and_(*api_filters)).scalar() or 0
-    
-    avg_response_time = (
-        db.query(func.avg(APIUsageLog.response_time_ms))
-        .filter(and_(*api_filters))
-        .scalar() or 0
+        await db.execute(
+            select(events.c.event_category, _total(events.c.event_count)).group_by(
+                events.c.event_category
+            )
+        )
+    ).all()
+
+    # Calls, latency and errors in one scan
+    usage = api_usage_rows(
+        split_range(start_date, end_date, *watermarks(states, API_USAGE)), scope, dialect_name
     )
-    
+    total_api_calls, response_time_sum, response_time_count, error_count = (
+        await db.execute(
+            select(
+                _total(usage.c.request_count),
+                _total(usage.c.response_time_sum),
+                _total(usage.c.response_time_count),
+                _total(case((usage.c.status_code >= 400, usage.c.request_count), else_=0)),
+            )
+        )
+    ).one()
+    avg_response_time = _average(response_time_sum, response_time_count)
+
     # Error rate
-    error_count = (
-        db.query(func.count(APIUsageLog.id))
-        .filter(and_(*api_filters), APIUsageLog.status_code >= 400)
-        .scalar() or 0
-    )
     error_rate = (error_count / total_api_calls * 100) if total_api_calls > 0 else 0
     
     return {
@@ -133,8 +165,8 @@ async def get_analytics_overview(
 
 @router.get("/api-usage")
 async def get_api_usage_stats(
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
     start_date: datetime | None = Query(None),
     end_date: datetime | None = Query(None),
     group_by: str = Query("day", regex="^(hour|day|week|month)$"),
@@ -145,56 +177,45 @@ async def get_api_usage_stats(
     if not start_date:
         start_date = end_date - timedelta(days=30)
     
-    # Build filters
-    filters = [APIUsageLog.timestamp >= start_date, APIUsageLog.timestamp <= end_date]
-    if not current_user.is_admin:
-        filters.append(APIUsageLog.user_id == current_user.id)
-    elif current_user.tenant_id:
-        filters.append(APIUsageLog.tenant_id == current_user.tenant_id)
-    
-    # Time grouping format
-    date_trunc_format = {
-        "hour": "hour",
-        "day": "day",
-        "week": "week",
-        "month": "month",
-    }[group_by]
-    
-    # Query usage over time
-    usage_over_time = (
-        db.query(
-            func.date_trunc(date_trunc_format, APIUsageLog.timestamp).label("period"),
-            func.count(APIUsageLog.id).label("count"),
-            func.avg(APIUsageLog.response_time_ms).label("avg_response_time"),
-        )
-        .filter(and_(*filters))
-        .group_by(text("period"))
-        .order_by(text("period"))
-        .all()
+    states = (await db.execute(select(AnalyticsRollupState))).scalars().all()
+    usage = api_usage_rows(
+        split_range(start_date, end_date, *watermarks(states, API_USAGE)),
+        _usage_scope(current_user),
+        db.get_bind().dialect.name,
     )
-    
+    request_count = _total(usage.c.request_count).label("count")
+    response_time_sum = _total(usage.c.response_time_sum).label("response_time_sum")
+    response_time_count = _total(usage.c.response_time_count).label("response_time_count")
+
+    # Per-minute totals, folded into periods below
+    usage_by_minute = (
+        await db.execute(
+            select(usage.c.bucket_start, request_count, response_time_sum, response_time_count)
+            .group_by(usage.c.bucket_start)
+        )
+    ).all()
+    periods: dict[datetime, list[int]] = {}
+    for row in usage_by_minute:
+        totals = periods.setdefault(truncate_datetime(row.bucket_start, group_by), [0, 0, 0])
+        totals[0] += row.count
+        totals[1] += row.response_time_sum
+        totals[2] += row.response_time_count
+
     # Top endpoints
     top_endpoints = (
-        db.query(
-            APIUsageLog.endpoint,
-            func.count(APIUsageLog.id).label("count"),
-            func.avg(APIUsageLog.response_time_ms).label("avg_response_time"),
+        await db.execute(
+            select(usage.c.endpoint, request_count, response_time_sum, response_time_count)
+            .group_by(usage.c.endpoint)
+            .order_by(desc(text("count")))
+            .limit(10)
         )
-        .filter(and_(*filters))
-        .group_by(APIUsageLog.endpoint)
-        .order_by(desc(text("count")))
-        .limit(10)
-        .all()
-    )
-    
+    ).all()
+
     # Status code distribution
     status_distribution = (
-        db.query(APIUsageLog.status_code, func.count(APIUsageLog.id))
-        .filter(and_(*filters))
-        .group_by(APIUsageLog.status_code)
-        .all()
-    )
-    
+        await db.execute(select(usage.c.status_code, request_count).group_by(usage.c.status_code))
+    ).all()
+
     return {
         "period": {
             "start": start_date.isoformat(),
@@ -203,17 +224,19 @@ async def get_api_usage_stats(
         },
         "usage_over_time": [
             {
-                "period": row.period.isoformat(),
-                "count": row.count,
-                "avg_response_time_ms": round(row.avg_response_time, 2) if row.avg_response_time else 0,
+                "period": period.isoformat(),
+                "count": count,
+                "avg_response_time_ms": round(_average(rt_sum, rt_count), 2),
             }
-            for row in usage_over_time
+            for period, (count, rt_sum, rt_count) in sorted(periods.items())
         ],
         "top_endpoints": [
             {
                 "endpoint": row.endpoint,
                 "count": row.count,
-                "avg_response_time_ms": round(row.avg_response_time, 2) if row.avg_response_time else 0,
+                "avg_response_time_ms": round(
+                    _average(row.response_time_sum, row.response_time_count), 2
+                ),
             }
             for row in top_endpoints
         ],
@@ -223,8 +246,8 @@ async def get_api_usage_stats(
 
 @router.get("/funnel")
 async def get_funnel_analysis(
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
     journey_type: str = Query(...),
     start_date: datetime | None = Query(None),
     end_date: datetime | None = Query(None),
@@ -244,30 +267,25 @@ async def get_funnel_analysis(
     if not current_user.is_admin:
         filters.append(UserJourney.user_id == current_user.id)
     
-    # Total started
-    total_started = db.query(func.count(UserJourney.id)).filter(and_(*filters)).scalar() or 0
-    
-    # Completed
-    completed = (
-        db.query(func.count(UserJourney.id))
-        .filter(and_(*filters), UserJourney.is_completed.is_(True))
-        .scalar() or 0
-    )
-    
-    # Dropped off
-    dropped_off = (
-        db.query(func.count(UserJourney.id))
-        .filter(and_(*filters), UserJourney.dropped_off.is_(True))
-        .scalar() or 0
-    )
+    # Started, completed and dropped off in one scan
+    total_started, completed, dropped_off = (
+        await db.execute(
+            select(
+                func.count(UserJourney.id),
+                func.count(UserJourney.id).filter(UserJourney.is_completed.is_(True)),
+                func.count(UserJourney.id).filter(UserJourney.dropped_off.is_(True)),
+            ).where(and_(*filters))
+        )
+    ).one()
     
     # Drop-off by step
     drop_off_by_step = (
-        db.query(UserJourney.drop_off_step, func.count(UserJourney.id))
-        .filter(and_(*filters), UserJourney.dropped_off.is_(True))
-        .group_by(UserJourney.drop_off_step)
-        .all()
-    )
+        await db.execute(
+            select(UserJourney.drop_off_step, func.count(UserJourney.id))
+            .where(and_(*filters), UserJourney.dropped_off.is_(True))
+            .group_by(UserJourney.drop_off_step)
+        )
+    ).all()
     
     conversion_rate = (completed / total_started * 100) if total_started > 0 else 0
     
@@ -290,8 +308,8 @@ async def get_funnel_analysis(
 
 @router.get("/cohorts")
 async def get_cohort_analysis(
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
     cohort_type: str = Query("signup"),
     period_type: str = Query("week", regex="^(day|week|month)$"),
 ):
@@ -308,11 +326,12 @@ async def get_cohort_analysis(
         filters.append(CohortAnalysis.tenant_id == current_user.tenant_id)
     
     cohorts = (
-        db.query(CohortAnalysis)
-        .filter(and_(*filters))
-        .order_by(CohortAnalysis.cohort_date, CohortAnalysis.period_number)
-        .all()
-    )
+        await db.execute(
+            select(CohortAnalysis)
+            .where(and_(*filters))
+            .order_by(CohortAnalysis.cohort_date, CohortAnalysis.period_number)
+        )
+    ).scalars().all()
     
     # Group by cohort
     cohort_data = {}
@@ -341,8 +360,8 @@ async def get_cohort_analysis(
 
 @router.get("/revenue")
 async def get_revenue_analytics(
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
     period_type: str = Query("monthly", regex="^(daily|weekly|monthly)$"),
     start_date: datetime | None = Query(None),
     end_date: datetime | None = Query(None),
@@ -369,11 +388,10 @@ async def get_revenue_analytics(
         filters.append(RevenueMetric.tenant_id == current_user.tenant_id)
     
     metrics = (
-        db.query(RevenueMetric)
-        .filter(and_(*filters))
-        .order_by(RevenueMetric.period_start)
-        .all()
-    )
+        await db.execute(
+            select(RevenueMetric).where(and_(*filters)).order_by(RevenueMetric.period_start)
+        )
+    ).scalars().all()
     
     # Calculate summary
     total_revenue = sum(m.total_revenue for m in metrics if m.total_revenue)
@@ -7,7 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import desc, func
 from sqlalchemy.orm import Session
 
-from src.api.dependencies import get_current_user, get_db
+from src.api.dependencies import get_current_user, get_db, get_read_db
 from src.api.models.channels import (
     ChannelIngestRequest,
     ChannelIngestResponse,
@@ -24,7 +24,7 @@ router = APIRouter()
 @router.get("/", response_model=PaginatedResponse[ChannelResponse])
 async def list_channels(
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     pagination: PaginationParams = Depends(),
     is_active: bool | None = Query(None),
 ):
@@ -131,7 +131,7 @@ async def get_channel(
 async def get_channel_videos(
     channel_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     pagination: PaginationParams = Depends(),
 ):
     """Get videos for a channel."""
@@ -170,7 +170,7 @@ async def get_channel_videos(
 async def get_channel_stats(
     channel_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
 ):
     """Get channel statistics."""
     channel = db.query(Channel).filter(Channel.channel_id == channel_id).first()
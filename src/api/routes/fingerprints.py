@@ -1,82 +1,85 @@
 """Fingerprint routes."""
 
-import math
+import time
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import desc, func
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.dependencies import get_current_user, get_db
+from config.settings import Config
+from src.api.dependencies import get_async_read_db, get_current_user_async
 from src.api.models.common import PaginatedResponse, PaginationParams
 from src.api.models.matches import FingerprintResponse, FingerprintStats
+from src.api.pagination import count_statement, page_response, paginate, split_page
+from src.database.fingerprint_stats import stats_statement
 from src.database.models import AudioFingerprint, User
 
 router = APIRouter()
 
+# (expires at, response) of the last statistics read by this worker
+_stats_cache: tuple[float, FingerprintStats] | None = None
+
 
 @router.get("/", response_model=PaginatedResponse[FingerprintResponse])
 async def list_fingerprints(
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
     pagination: PaginationParams = Depends(),
     video_id: int | None = Query(None),
 ):
     """List audio fingerprints."""
-    query = db.query(AudioFingerprint)
+    query = select(AudioFingerprint)
 
     if video_id:
-        query = query.filter(AudioFingerprint.video_id == video_id)
-
-    query = query.order_by(desc(AudioFingerprint.created_at))
+        query = query.where(AudioFingerprint.video_id == video_id)
 
-    total = query.count()
-    offset = (pagination.page - 1) * pagination.per_page
-    fingerprints = query.offset(offset).limit(pagination.per_page).all()
+    count = count_statement(query, pagination, db.get_bind().dialect.name)
+    total = await db.scalar(count) if count is not None else None
 
-    return PaginatedResponse(
-        data=fingerprints,
-        total=total,
-        page=pagination.page,
-        per_page=pagination.per_page,
-        total_pages=math.ceil(total / pagination.per_page),
+    order_column, id_column = AudioFingerprint.created_at, AudioFingerprint.id
+    result = await db.execute(paginate(query, pagination, order_column, id_column))
+    fingerprints, next_cursor = split_page(
+        result.scalars().all(), pagination, order_column, id_column
     )
 
+    return page_response(fingerprints, pagination, total, next_cursor)
+
 
 @router.get("/stats", response_model=FingerprintStats)
 async def get_fingerprint_stats(
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
 ):
     """Get fingerprint statistics."""
-    total_fingerprints = db.query(func.count(AudioFingerprint.id)).scalar() or 0
-
-    total_videos = db.query(func.count(func.distinct(AudioFingerprint.video_id))).scalar() or 0
-
-    avg_confidence = db.query(func.avg(AudioFingerprint.confidence_score)).scalar() or 0.0
-
-    avg_peaks = db.query(func.avg(AudioFingerprint.peak_count)).scalar() or 0.0
-
-    total_duration = db.query(func.sum(AudioFingerprint.segment_length)).scalar() or 0.0
-    total_duration_hours = total_duration / 3600.0
-
-    return FingerprintStats(
-        total_fingerprints=total_fingerprints,
-        total_videos=total_videos,
-        avg_confidence=float(avg_confidence),
-        avg_peaks=float(avg_peaks),
-        total_duration_hours=total_duration_hours,
+    global _stats_cache
+    if _stats_cache and time.monotonic() < _stats_cache[0]:
+        return _stats_cache[1]
+
+    # Snapshot plus the writes since it, kept by the fingerprint writers, not the table
+    totals = (await db.execute(stats_statement())).one()
+
+    stats = FingerprintStats(
+        total_fingerprints=totals.total_fingerprints,
+        total_videos=totals.total_videos,
+        avg_confidence=(
+            totals.confidence_sum / totals.confidence_count if totals.confidence_count else 0.0
+        ),
+        avg_peaks=totals.peaks_sum / totals.peaks_count if totals.peaks_count else 0.0,
+        total_duration_hours=totals.duration_sum / 3600.0,
     )
+    _stats_cache = (time.monotonic() + Config.FINGERPRINT_STATS_CACHE_SECONDS, stats)
+    return stats
 
 
 @router.get("/{fingerprint_id}", response_model=FingerprintResponse)
 async def get_fingerprint(
     fingerprint_id: int,
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
 ):
     """Get fingerprint details."""
-    fingerprint = db.query(AudioFingerprint).filter(AudioFingerprint.id == fingerprint_id).first()
+    fingerprint = await db.get(AudioFingerprint, fingerprint_id)
 
     if not fingerprint:
         raise HTTPException(
@@ -1,14 +1,13 @@
 """Audio matching routes."""
 
-import math
 import time
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.dependencies import get_current_user, get_db
+from src.api.dependencies import get_async_read_db, get_current_user_async
 from src.api.models.common import PaginatedResponse, PaginationParams
 from src.api.models.matches import (
     BulkMatchRequest,
@@ -17,6 +16,7 @@ from src.api.models.matches import (
     MatchResponse,
     MatchSegment,
 )
+from src.api.pagination import count_statement, page_response, paginate, split_page
 from src.database.models import MatchResult, User, Video
 
 router = APIRouter()
@@ -25,8 +25,8 @@ router = APIRouter()
 @router.post("/find", response_model=MatchResponse)
 async def find_matches(
     match_request: MatchRequest,
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
 ):
     """Find audio matches for uploaded clip or URL."""
     start_time = time.time()
@@ -48,7 +48,10 @@ async def find_matches(
     mock_matches = []
 
     # Query some videos as examples
-    videos = db.query(Video).filter(Video.processed == True).limit(match_request.max_results).all()
+    result = await db.execute(
+        select(Video).where(Video.processed == True).limit(match_request.max_results)
+    )
+    videos = result.scalars().all()
 
     for idx, video in enumerate(videos):
         mock_matches.append(MatchSegment(
@@ -78,11 +81,11 @@ async def find_matches(
 @router.get("/{match_id}", response_model=dict)
 async def get_match_details(
     match_id: int,
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
 ):
     """Get details of a specific match."""
-    match = db.query(MatchResult).filter(MatchResult.id == match_id).first()
+    match = await db.get(MatchResult, match_id)
 
     if not match:
         raise HTTPException(
@@ -105,48 +108,51 @@ async def get_match_details(
 
 @router.get("/", response_model=PaginatedResponse[dict])
 async def list_matches(
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
     pagination: PaginationParams = Depends(),
 ):
     """List user's match queries."""
     # In production, would filter by user
-    query = db.query(MatchResult).order_by(desc(MatchResult.created_at))
+    query = select(MatchResult)
+    count = count_statement(query, pagination, db.get_bind().dialect.name)
+    total = await db.scalar(count) if count is not None else None
 
-    total = query.count()
-    offset = (pagination.page - 1) * pagination.per_page
-    matches = query.offset(offset).limit(pagination.per_page).all()
+    order_column, id_column = MatchResult.created_at, MatchResult.id
+    result = await db.execute(paginate(query, pagination, order_column, id_column))
+    matches, next_cursor = split_page(result.scalars().all(), pagination, order_column, id_column)
 
-    return PaginatedResponse(
-        data=[{
+    return page_response(
+        [{
             "id": m.id,
             "similarity_score": m.similarity_score,
             "query_source": m.query_source,
             "created_at": m.created_at.isoformat() if m.created_at else None,
         } for m in matches],
-        total=total,
-        page=pagination.page,
-        per_page=pagination.per_page,
-        total_pages=math.ceil(total / pagination.per_page),
+        pagination,
+        total,
+        next_cursor,
     )
 
 
 @router.post("/bulk", response_model=BulkMatchResponse)
 async def bulk_match(
     bulk_request: BulkMatchRequest,
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
 ):
     """Batch match multiple audio clips."""
     results = []
     successful = 0
     failed = 0
 
+    # Loaded once; every placeholder result uses it
+    first_video = (await db.execute(select(Video).limit(1))).scalars().first()
+
     for query in bulk_request.queries:
         try:
             # Process each query
             # In production, would actually process the query
-            first_video = db.query(Video).first()
             result = MatchResponse(
                 query_id=0,
                 total_matches=0,
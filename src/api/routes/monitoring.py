@@ -6,8 +6,10 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from src.api.dependencies import get_current_user
-from src.api.websocket import manager
-from src.core.streaming_processor import cleanup_processor, processors
+from src.api.session_registry import get_session_registry
+from src.api.websocket import handle_stream_control, manager
+from src.core.match_index import get_match_index_stats
+from src.core.streaming_processor import get_executor_stats, processors
 from src.database.models import User
 
 logger = logging.getLogger(__name__)
@@ -23,7 +25,9 @@ async def get_live_streams(
     Get all active live streams.
 
     Requires admin authentication. Returns information about all active
-    WebSocket connections and their processing status.
+    WebSocket connections across API workers and their processing status,
+    including per-stream queue depth, lag and dropped (coalesced) hops, plus
+    the load reported by each worker.
     """
     # Check if user is admin
     if not current_user.is_admin:
@@ -32,26 +36,36 @@ async def get_live_streams(
             detail="Admin privileges required to view live streams"
         )
 
-    connections = manager.get_active_connections()
+    registry = get_session_registry()
+
+    # Streams served by other workers carry the stats from their last heartbeat
+    streams_by_id = {s["client_id"]: s for s in await registry.get_streams()}
 
-    # Enrich with processor information
-    stream_info = []
-    for conn in connections:
+    # Streams on this worker are reported live
+    for conn in manager.get_active_connections():
         client_id = conn["client_id"]
         processor = processors.get(client_id)
 
         info = {
             **conn,
+            "worker_id": registry.worker_id,
             "has_processor": processor is not None,
         }
 
         if processor:
             info.update(processor.get_stats())
 
-        stream_info.append(info)
+        streams_by_id[client_id] = info
+
+    stream_info = list(streams_by_id.values())
 
     return {
         "total_streams": len(stream_info),
+        "worker_id": registry.worker_id,
+        "registry_backend": registry.backend,
+        "workers": await registry.get_workers(),
+        "executor": get_executor_stats(),
+        "match_indexes": get_match_index_stats(),
         "streams": stream_info
     }
 
@@ -65,7 +79,8 @@ async def disconnect_stream(
     Disconnect a live stream.
 
     Requires admin authentication. Forcefully disconnects a client
-    and cleans up their resources.
+    and cleans up their resources. Streams owned by another worker are
+    disconnected by a control message routed through the session registry.
     """
     # Check if user is admin
     if not current_user.is_admin:
@@ -75,20 +90,25 @@ async def disconnect_stream(
         )
 
     if client_id in manager.active_connections:
-        # Send disconnect message
-        await manager.send_status(client_id, "Connection terminated by administrator")
-
-        # Disconnect and cleanup
-        manager.disconnect(client_id)
-        cleanup_processor(client_id)
+        # Notify, close and clean up the stream on this worker
+        await handle_stream_control(
+            client_id, "disconnect", {"message": "Connection terminated by administrator"}
+        )
 
         return {"message": f"Disconnected stream {client_id}"}
-    else:
+
+    # The stream may be served by another worker; route the request to it
+    worker_id = await get_session_registry().send_control(
+        client_id, "disconnect", {"message": "Connection terminated by administrator"}
+    )
+    if worker_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Stream {client_id} not found"
         )
 
+    return {"message": f"Disconnect requested for stream {client_id} on worker {worker_id}"}
+
 
 @router.get("/live-streams/{client_id}")
 async def get_stream_details(
@@ -108,10 +128,14 @@ async def get_stream_details(
         )
 
     if client_id not in manager.active_connections:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Stream {client_id} not found"
-        )
+        # Fall back to the last stats published by the owning worker
+        entry = await get_session_registry().get_stream(client_id)
+        if entry is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Stream {client_id} not found"
+            )
+        return entry
 
     # Get connection info
     connections = manager.get_active_connections()
@@ -128,6 +152,7 @@ async def get_stream_details(
 
     result = {
         **conn_info,
+        "worker_id": get_session_registry().worker_id,
         "has_processor": processor is not None,
     }
 
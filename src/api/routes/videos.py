@@ -1,13 +1,20 @@
 """Video management routes."""
 
-import math
+import json
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import asc, desc, or_
+from sqlalchemy import desc, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.api.dependencies import get_current_user, get_db
+from src.api.dependencies import (
+    get_async_db,
+    get_async_read_db,
+    get_current_user,
+    get_current_user_async,
+    get_db,
+)
 from src.api.models.common import PaginatedResponse, PaginationParams, SuccessResponse
 from src.api.models.videos import (
     VideoProcessingStatus,
@@ -15,8 +22,11 @@ from src.api.models.videos import (
     VideoUploadRequest,
     VideoUploadResponse,
 )
+from src.api.pagination import count_statement, page_response, paginate, split_page
 from src.database.models import ProcessingJob, User, Video
+from src.database.progress import get_progress_channel
 from src.database.repositories import get_job_repository, get_video_repository
+from src.database.repositories.job_repository import INTERACTIVE_LANE
 
 router = APIRouter()
 
@@ -53,11 +63,14 @@ async def upload_video(
                 message="Video is already queued for processing",
             )
 
-        # Create new processing job
+        # Create new processing job in the interactive fast lane
         job = job_repo.create_job(
             job_type='video_process',
             target_id=video_id,
-            parameters=f'{{"priority": {video_data.priority}}}',
+            parameters=json.dumps({"url": video_url, "priority": video_data.priority}),
+            priority=video_data.priority,
+            lane=INTERACTIVE_LANE,
+            tenant_id=current_user.tenant_id,
         )
 
         return VideoUploadResponse(
@@ -92,12 +105,15 @@ async def upload_video(
     db.commit()
     db.refresh(new_video)
 
-    # Create processing job
+    # Create processing job in the interactive fast lane
     job_repo = get_job_repository()
     job = job_repo.create_job(
         job_type='video_process',
         target_id=video_id,
-        parameters=f'{{"priority": {video_data.priority}}}',
+        parameters=json.dumps({"url": video_url, "priority": video_data.priority}),
+        priority=video_data.priority,
+        lane=INTERACTIVE_LANE,
+        tenant_id=current_user.tenant_id,
     )
 
     return VideoUploadResponse(
@@ -111,11 +127,12 @@ async def upload_video(
 @router.get("/{video_id}", response_model=VideoResponse)
 async def get_video(
     video_id: str,
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ):
     """Get video metadata by ID."""
-    video = db.query(Video).filter(Video.video_id == video_id).first()
+    result = await db.execute(select(Video).where(Video.video_id == video_id))
+    video = result.scalars().first()
 
     if not video:
         raise HTTPException(
@@ -128,8 +145,8 @@ async def get_video(
 
 @router.get("/", response_model=PaginatedResponse[VideoResponse])
 async def list_videos(
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
     pagination: PaginationParams = Depends(),
     channel_id: int | None = Query(None),
     processed: bool | None = Query(None),
@@ -138,17 +155,17 @@ async def list_videos(
     order_dir: str = Query("desc", pattern="^(asc|desc)$"),
 ):
     """List videos with filters and pagination."""
-    query = db.query(Video)
+    query = select(Video)
 
     # Apply filters
     if channel_id:
-        query = query.filter(Video.channel_id == channel_id)
+        query = query.where(Video.channel_id == channel_id)
 
     if processed is not None:
-        query = query.filter(Video.processed == processed)
+        query = query.where(Video.processed == processed)
 
     if search:
-        query = query.filter(
+        query = query.where(
             or_(
                 Video.title.ilike(f"%{search}%"),
                 Video.description.ilike(f"%{search}%"),
@@ -156,38 +173,42 @@ async def list_videos(
             )
         )
 
-    # Apply ordering
+    # Get total count
+    count = count_statement(query, pagination, db.get_bind().dialect.name)
+    total = await db.scalar(count) if count is not None else None
+
+    # Order by the requested column, then id; cursors need a non-null column
     order_column = getattr(Video, order_by, Video.created_at)
-    if order_dir == "desc":
-        query = query.order_by(desc(order_column))
-    else:
-        query = query.order_by(asc(order_column))
+    query = paginate(query, pagination, order_column, Video.id, descending=order_dir == "desc")
+    result = await db.execute(query)
+    videos, next_cursor = split_page(result.scalars().all(), pagination, order_column, Video.id)
 
-    # Get total count
-    total = query.count()
-
-    # Apply pagination
-    offset = (pagination.page - 1) * pagination.per_page
-    videos = query.offset(offset).limit(pagination.per_page).all()
-
-    return PaginatedResponse(
-        data=videos,
-        total=total,
-        page=pagination.page,
-        per_page=pagination.per_page,
-        total_pages=math.ceil(total / pagination.per_page),
-    )
+    return page_response(videos, pagination, total, next_cursor)
 
 
 @router.get("/{video_id}/status", response_model=VideoProcessingStatus)
 async def get_video_status(
     video_id: str,
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ):
     """Get video processing status."""
+    # Live progress published by the job processor; avoids the database while a job runs
+    snapshot = get_progress_channel().get("video_process", video_id)
+    if snapshot:
+        return VideoProcessingStatus(
+            video_id=video_id,
+            status=snapshot["status"],
+            progress=snapshot["progress"] or 0.0,
+            current_step=snapshot["current_step"],
+            error_message=snapshot["error_message"],
+            started_at=snapshot["started_at"],
+            completed_at=snapshot["completed_at"],
+        )
+
     # Find the video
-    video = db.query(Video).filter(Video.video_id == video_id).first()
+    result = await db.execute(select(Video.id).where(Video.video_id == video_id))
+    video = result.first()
 
     if not video:
         raise HTTPException(
@@ -196,10 +217,16 @@ async def get_video_status(
         )
 
     # Find the latest processing job
-    job = db.query(ProcessingJob).filter(
-        ProcessingJob.target_id == video_id,
-        ProcessingJob.job_type == 'video_process'
-    ).order_by(desc(ProcessingJob.created_at)).first()
+    result = await db.execute(
+        select(ProcessingJob)
+        .where(
+            ProcessingJob.target_id == video_id,
+            ProcessingJob.job_type == 'video_process',
+        )
+        .order_by(desc(ProcessingJob.created_at))
+        .limit(1)
+    )
+    job = result.scalars().first()
 
     if not job:
         return VideoProcessingStatus(
@@ -254,11 +281,14 @@ async def reprocess_video(
             message="Video is already queued for processing",
         )
 
-    # Create new job
+    # Create new job in the interactive fast lane
     job = job_repo.create_job(
         job_type='video_process',
         target_id=video_id,
-        parameters='{"priority": 5}',
+        parameters=json.dumps({"url": video.url, "priority": 5}),
+        priority=5,
+        lane=INTERACTIVE_LANE,
+        tenant_id=current_user.tenant_id,
     )
 
     return VideoUploadResponse(
@@ -272,11 +302,12 @@ async def reprocess_video(
 @router.delete("/{video_id}", response_model=SuccessResponse)
 async def delete_video(
     video_id: str,
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user_async)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ):
     """Delete a video (admin only - simplified for now)."""
-    video = db.query(Video).filter(Video.video_id == video_id).first()
+    result = await db.execute(select(Video).where(Video.video_id == video_id))
+    video = result.scalars().first()
 
     if not video:
         raise HTTPException(
@@ -285,7 +316,7 @@ async def delete_video(
         )
 
     # Note: In production, should also delete associated fingerprints and jobs
-    db.delete(video)
-    db.commit()
+    await db.delete(video)
+    await db.commit()
 
     return SuccessResponse(message="Video deleted successfully")
@@ -0,0 +1,420 @@
+"""Cross-worker registry of live WebSocket streaming sessions.
+
+Each API worker keeps its WebSocket connections and streaming processors in
+process-local dicts. The registry records which worker owns which stream,
+publishes per-stream statistics and per-worker load, and routes control
+messages (e.g. an admin disconnect) to the owning worker.
+
+With Redis enabled the registry state lives in Redis hashes and control
+messages travel over pub/sub, so every worker sees every stream. Without Redis
+an in-process stand-in with the same interface is used, which is exact for a
+single worker.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+STREAMS_KEY = "soundhash:live:streams"
+WORKERS_KEY = "soundhash:live:workers"
+CONTROL_CHANNEL_PREFIX = "soundhash:live:control:"
+# Backoff between attempts to resubscribe to the control channel after Redis errors
+LISTEN_RETRY_SECONDS = 1.0
+LISTEN_MAX_RETRY_SECONDS = 30.0
+
+ControlHandler = Callable[[str, str, dict[str, Any]], Awaitable[None]]
+LoadProvider = Callable[[], tuple[dict[str, Any], dict[str, dict[str, Any]]]]
+
+
+def _default_worker_id() -> str:
+    """Build a worker id that is unique across hosts and restarts."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class SessionRegistry:
+    """
+    In-process session registry.
+
+    Used as-is when Redis is disabled; :class:`RedisSessionRegistry` overrides
+    the storage and messaging primitives to share state between workers.
+    """
+
+    def __init__(
+        self,
+        worker_id: str | None = None,
+        heartbeat_interval: float | None = None,
+    ) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            worker_id: Identifier of this worker (generated if not provided)
+            heartbeat_interval: Seconds between load/stat publications
+                (default: Config.STREAMING_HEARTBEAT_SECONDS)
+        """
+        self.worker_id = worker_id or _default_worker_id()
+        self.heartbeat_interval = heartbeat_interval or Config.STREAMING_HEARTBEAT_SECONDS
+        # Workers that miss three heartbeats are considered gone
+        self.worker_ttl = self.heartbeat_interval * 3
+
+        self._streams: dict[str, str] = {}
+        self._workers: dict[str, str] = {}
+        self._control_handler: ControlHandler | None = None
+        self._load_provider: LoadProvider | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def backend(self) -> str:
+        """Name of the storage backend."""
+        return "local"
+
+    # Storage primitives (overridden by the Redis backend)
+
+    async def _hset(self, key: str, field: str, value: str) -> None:
+        self._hash(key)[field] = value
+
+    async def _hdel(self, key: str, *fields: str) -> None:
+        for field in fields:
+            self._hash(key).pop(field, None)
+
+    async def _hget(self, key: str, field: str) -> str | None:
+        return self._hash(key).get(field)
+
+    async def _hgetall(self, key: str) -> dict[str, str]:
+        return dict(self._hash(key))
+
+    async def _publish(self, worker_id: str, message: str) -> None:
+        if worker_id == self.worker_id:
+            await self._dispatch(message)
+        else:
+            logger.warning(f"Cannot route control message to worker {worker_id} without Redis")
+
+    def _hash(self, key: str) -> dict[str, str]:
+        return self._streams if key == STREAMS_KEY else self._workers
+
+    # Stream ownership
+
+    async def register_stream(self, client_id: str, connected_at: float | None = None) -> None:
+        """Record that this worker owns a stream."""
+        await self._hset(
+            STREAMS_KEY,
+            client_id,
+            json.dumps(
+                {
+                    "client_id": client_id,
+                    "worker_id": self.worker_id,
+                    "connected_at": connected_at or time.time(),
+                    "updated_at": time.time(),
+                }
+            ),
+        )
+
+    async def unregister_stream(self, client_id: str) -> None:
+        """Remove a stream owned by this worker."""
+        entry = await self.get_stream(client_id)
+        if entry is not None and entry["worker_id"] == self.worker_id:
+            await self._hdel(STREAMS_KEY, client_id)
+
+    async def get_stream(self, client_id: str) -> dict[str, Any] | None:
+        """Get the registry entry (owner and last published stats) for a stream."""
+        raw = await self._hget(STREAMS_KEY, client_id)
+        return json.loads(raw) if raw else None
+
+    async def get_streams(self) -> list[dict[str, Any]]:
+        """Get all streams owned by live workers."""
+        live_workers = {w["worker_id"] for w in await self.get_workers()}
+        live_workers.add(self.worker_id)
+
+        streams, stale = [], []
+        for client_id, raw in (await self._hgetall(STREAMS_KEY)).items():
+            entry = json.loads(raw)
+            if entry["worker_id"] in live_workers:
+                streams.append(entry)
+            else:
+                stale.append(client_id)
+
+        if stale:
+            # Streams left behind by a worker that died without cleaning up
+            await self._hdel(STREAMS_KEY, *stale)
+        return streams
+
+    # Worker load
+
+    async def heartbeat(self, load: dict[str, Any], streams: dict[str, dict[str, Any]]) -> None:
+        """
+        Publish this worker's load and the latest stats of its streams.
+
+        Args:
+            load: Worker-level load (stream count, queue depth, lag)
+            streams: Mapping of client id to stream statistics for every
+                stream this worker currently serves
+        """
+        now = time.time()
+        await self._hset(
+            WORKERS_KEY,
+            self.worker_id,
+            json.dumps({**load, "worker_id": self.worker_id, "heartbeat_at": now}),
+        )
+
+        existing = await self._hgetall(STREAMS_KEY)
+        for client_id, stats in streams.items():
+            entry = {
+                **stats,
+                "client_id": client_id,
+                "worker_id": self.worker_id,
+                "updated_at": now,
+            }
+            await self._hset(STREAMS_KEY, client_id, json.dumps(entry, default=str))
+
+        # Entries for streams that closed while a heartbeat was in flight;
+        # streams registered after this heartbeat started are left alone.
+        ghosts = []
+        for client_id, raw in existing.items():
+            entry = json.loads(raw)
+            if (
+                entry["worker_id"] == self.worker_id
+                and client_id not in streams
+                and entry.get("updated_at", 0) < now
+            ):
+                ghosts.append(client_id)
+        if ghosts:
+            await self._hdel(STREAMS_KEY, *ghosts)
+
+    async def get_workers(self) -> list[dict[str, Any]]:
+        """Get the load of every worker with a recent heartbeat."""
+        cutoff = time.time() - self.worker_ttl
+        workers, stale = [], []
+        for worker_id, raw in (await self._hgetall(WORKERS_KEY)).items():
+            entry = json.loads(raw)
+            if entry.get("heartbeat_at", 0) >= cutoff:
+                workers.append(entry)
+            else:
+                stale.append(worker_id)
+
+        if stale:
+            await self._hdel(WORKERS_KEY, *stale)
+        return sorted(workers, key=lambda w: w.get("streams", 0))
+
+    async def should_accept_stream(self, local_streams: int) -> bool:
+        """
+        Decide whether this worker should take a new stream.
+
+        A worker refuses new streams once it reaches
+        ``STREAMING_MAX_STREAMS_PER_WORKER``, or when it carries at least
+        ``STREAMING_REBALANCE_MARGIN`` more streams than the least-loaded live
+        worker, so reconnecting clients land on a less busy worker.
+
+        Args:
+            local_streams: Number of streams currently served by this worker
+        """
+        max_streams = Config.STREAMING_MAX_STREAMS_PER_WORKER
+        if max_streams and local_streams >= max_streams:
+            return False
+
+        margin = Config.STREAMING_REBALANCE_MARGIN
+        if margin:
+            others = [
+                w.get("streams", 0)
+                for w in await self.get_workers()
+                if w["worker_id"] != self.worker_id
+            ]
+            if others and local_streams - min(others) >= margin:
+                return False
+        return True
+
+    # Control messages
+
+    def on_control(self, handler: ControlHandler) -> None:
+        """Register the coroutine that executes control messages for local streams."""
+        self._control_handler = handler
+
+    async def send_control(
+        self, client_id: str, action: str, payload: dict[str, Any] | None = None
+    ) -> str | None:
+        """
+        Route a control message to the worker that owns a stream.
+
+        Args:
+            client_id: Target stream
+            action: Control action (e.g. ``"disconnect"``)
+            payload: Optional action arguments
+
+        Returns:
+            Id of the owning worker, or None if the stream is unknown
+        """
+        entry = await self.get_stream(client_id)
+        if entry is None:
+            return None
+
+        message = json.dumps({"client_id": client_id, "action": action, "payload": payload or {}})
+        await self._publish(entry["worker_id"], message)
+        return entry["worker_id"]
+
+    async def _dispatch(self, message: str | bytes) -> None:
+        """Execute a control message received for this worker."""
+        if self._control_handler is None:
+            return
+        try:
+            data = json.loads(message)
+            await self._control_handler(data["client_id"], data["action"], data.get("payload", {}))
+        except Exception as e:
+            logger.error(f"Error handling stream control message: {e}")
+
+    # Lifecycle
+
+    async def start(self, load_provider: LoadProvider) -> None:
+        """
+        Start publishing heartbeats.
+
+        Args:
+            load_provider: Callable returning ``(worker_load, stream_stats)``
+        """
+        self._load_provider = load_provider
+        self._tasks.append(asyncio.create_task(self._heartbeat_loop()))
+
+    async def stop(self) -> None:
+        """Stop background tasks and remove this worker from the registry."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        try:
+            owned = [
+                client_id
+                for client_id, raw in (await self._hgetall(STREAMS_KEY)).items()
+                if json.loads(raw)["worker_id"] == self.worker_id
+            ]
+            if owned:
+                await self._hdel(STREAMS_KEY, *owned)
+            await self._hdel(WORKERS_KEY, self.worker_id)
+        except Exception as e:
+            logger.warning(f"Failed to deregister worker {self.worker_id}: {e}")
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            try:
+                load, streams = self._load_provider()
+                await self.heartbeat(load, streams)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Session registry heartbeat failed: {e}")
+            await asyncio.sleep(self.heartbeat_interval)
+
+
+class RedisSessionRegistry(SessionRegistry):
+    """Session registry shared between workers through Redis."""
+
+    def __init__(self, redis_client, **kwargs: Any) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            redis_client: ``redis.asyncio.Redis`` client
+            **kwargs: Passed to :class:`SessionRegistry`
+        """
+        super().__init__(**kwargs)
+        self.redis = redis_client
+
+    @property
+    def backend(self) -> str:
+        return "redis"
+
+    async def _hset(self, key: str, field: str, value: str) -> None:
+        await self.redis.hset(key, field, value)
+
+    async def _hdel(self, key: str, *fields: str) -> None:
+        if fields:
+            await self.redis.hdel(key, *fields)
+
+    async def _hget(self, key: str, field: str) -> str | None:
+        value = await self.redis.hget(key, field)
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def _hgetall(self, key: str) -> dict[str, str]:
+        return {
+            (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+            for k, v in (await self.redis.hgetall(key)).items()
+        }
+
+    async def _publish(self, worker_id: str, message: str) -> None:
+        await self.redis.publish(CONTROL_CHANNEL_PREFIX + worker_id, message)
+
+    async def start(self, load_provider: LoadProvider) -> None:
+        await super().start(load_provider)
+        self._tasks.append(asyncio.create_task(self._listen()))
+
+    async def _listen(self) -> None:
+        """Receive control messages addressed to this worker, resubscribing after errors."""
+        backoff = LISTEN_RETRY_SECONDS
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(CONTROL_CHANNEL_PREFIX + self.worker_id)
+                backoff = LISTEN_RETRY_SECONDS
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        await self._dispatch(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"Control channel subscription for worker {self.worker_id} failed: {e}; "
+                    f"resubscribing in {backoff:.0f}s"
+                )
+            finally:
+                try:
+                    await pubsub.unsubscribe()
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, LISTEN_MAX_RETRY_SECONDS)
+
+
+# Global registry instance
+_registry: SessionRegistry | None = None
+
+
+def get_session_registry() -> SessionRegistry:
+    """
+    Get the worker's session registry.
+
+    Returns a Redis-backed registry when Redis is enabled and reachable,
+    otherwise the in-process stand-in.
+    """
+    global _registry
+    if _registry is not None:
+        return _registry
+
+    if Config.REDIS_ENABLED:
+        try:
+            import redis.asyncio as aioredis
+
+            client = aioredis.Redis(
+                host=Config.REDIS_HOST,
+                port=Config.REDIS_PORT,
+                db=Config.REDIS_DB,
+                password=Config.REDIS_PASSWORD,
+                socket_connect_timeout=5,
+            )
+            _registry = RedisSessionRegistry(client)
+            logger.info(f"Live session registry using Redis (worker {_registry.worker_id})")
+            return _registry
+        except ImportError:
+            logger.warning("Redis package not installed; live session registry is process-local")
+
+    _registry = SessionRegistry()
+    return _registry
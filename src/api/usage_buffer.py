@@ -0,0 +1,189 @@
+"""Buffered writer for API usage logs.
+
+The analytics middleware used to open a session and commit one
+``api_usage_logs`` row per request. Rows now go into a bounded in-process
+buffer instead, and a background task writes them in batches with
+:func:`~src.database.bulk.bulk_insert` (binary COPY on PostgreSQL) whenever
+``API_USAGE_FLUSH_ROWS`` are waiting or ``API_USAGE_FLUSH_INTERVAL_MS`` has
+passed.
+
+Usage logging never holds up requests. When the database falls behind, the
+buffer sheds load instead of growing: above ``API_USAGE_SAMPLE_ABOVE`` of its
+capacity new rows are kept with a probability falling linearly to zero at
+full. With sampling disabled (``1.0``) a full buffer drops its oldest row for
+each new one instead. Discarded rows are counted per reason (``sampled``,
+``overflow``, ``error``) in :attr:`APIUsageBuffer.dropped` and the
+``soundhash_api_usage_rows_dropped_total`` metric.
+"""
+
+import asyncio
+import logging
+import random
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from config.settings import Config
+from src.database.bulk import bulk_insert
+from src.database.connection import db_manager
+from src.database.models import APIUsageLog
+
+if Config.METRICS_ENABLED:
+    from src.observability.metrics import metrics
+else:
+    metrics = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+
+class APIUsageBuffer:
+    """Bounded buffer of API usage rows, flushed to the database in batches."""
+
+    def __init__(
+        self,
+        capacity: int | None = None,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+        sample_above: float | None = None,
+        session_factory: Callable[[], Session] | None = None,
+    ) -> None:
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity: Rows held before the oldest are dropped
+                (default: Config.API_USAGE_BUFFER_SIZE)
+            batch_size: Rows per write, and the depth that triggers an early flush
+                (default: Config.API_USAGE_FLUSH_ROWS)
+            flush_interval: Seconds between flushes
+                (default: Config.API_USAGE_FLUSH_INTERVAL_MS / 1000)
+            sample_above: Fraction of capacity above which new rows are sampled
+                (default: Config.API_USAGE_SAMPLE_ABOVE)
+            session_factory: Creates the sessions rows are written with
+                (default: db_manager.get_session)
+        """
+        self.capacity = capacity or Config.API_USAGE_BUFFER_SIZE
+        self.batch_size = batch_size or Config.API_USAGE_FLUSH_ROWS
+        self.flush_interval = flush_interval or Config.API_USAGE_FLUSH_INTERVAL_MS / 1000
+        self.sample_above = Config.API_USAGE_SAMPLE_ABOVE if sample_above is None else sample_above
+        self._session_factory = session_factory or db_manager.get_session
+
+        self.dropped: dict[str, int] = {"sampled": 0, "overflow": 0, "error": 0}
+        self.written = 0
+
+        self._rows: deque[dict[str, Any]] = deque(maxlen=self.capacity)
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, row: dict[str, Any]) -> bool:
+        """
+        Queue an ``api_usage_logs`` row for writing.
+
+        Args:
+            row: Column values of the row
+
+        Returns:
+            False if the row was sampled out
+        """
+        fill = len(self._rows) / self.capacity
+        if fill > self.sample_above:
+            if random.random() >= (1 - fill) / (1 - self.sample_above):
+                self._drop("sampled", 1)
+                return False
+
+        if len(self._rows) == self.capacity:
+            # The deque evicts the oldest row
+            self._drop("overflow", 1)
+        self._rows.append(row)
+        self._set_depth()
+
+        if len(self._rows) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def flush(self) -> int:
+        """
+        Write every buffered row, one batch at a time.
+
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        while self._rows:
+            batch = [self._rows.popleft() for _ in range(min(self.batch_size, len(self._rows)))]
+            self._set_depth()
+            if await asyncio.to_thread(self._write, batch):
+                written += len(batch)
+        return written
+
+    def _write(self, batch: list[dict[str, Any]]) -> bool:
+        """Insert one batch in its own transaction (runs in a worker thread)."""
+        session = None
+        try:
+            session = self._session_factory()
+            bulk_insert(session, APIUsageLog, batch)
+            session.commit()
+        except Exception as e:
+            # Don't let analytics errors break the API; the batch is lost
+            logger.error(f"Failed to write {len(batch)} API usage rows: {e}")
+            if session:
+                session.rollback()
+            self._drop("error", len(batch))
+            return False
+        finally:
+            if session:
+                session.close()
+
+        self.written += len(batch)
+        if metrics:
+            metrics.api_usage_rows_written.inc(len(batch))
+        return True
+
+    async def _flush_loop(self) -> None:
+        """Flush when a batch is waiting or the interval has passed."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def start(self) -> None:
+        """Start flushing in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the background task and write whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def _drop(self, reason: str, count: int) -> None:
+        self.dropped[reason] += count
+        if metrics:
+            metrics.api_usage_rows_dropped.labels(reason=reason).inc(count)
+
+    def _set_depth(self) -> None:
+        if metrics:
+            metrics.api_usage_buffer_depth.set(len(self._rows))
+
+
+# Global buffer instance
+_buffer: APIUsageBuffer | None = None
+
+
+def get_usage_buffer() -> APIUsageBuffer:
+    """Get the worker's API usage buffer."""
+    global _buffer
+    if _buffer is None:
+        _buffer = APIUsageBuffer()
+    return _buffer
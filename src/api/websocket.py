@@ -84,3 +84,47 @@ class ConnectionManager:
 
 # Global connection manager instance
 manager = ConnectionManager()
+
+
+def collect_live_load() -> tuple[dict, dict[str, dict]]:
+    """
+    Snapshot this worker's load and per-stream statistics for the session registry.
+
+    Returns:
+        Tuple of (worker load, mapping of client id to stream statistics)
+    """
+    from src.core.streaming_processor import get_executor_stats, processors
+
+    streams = {}
+    for conn in manager.get_active_connections():
+        processor = processors.get(conn["client_id"])
+        streams[conn["client_id"]] = {
+            **conn,
+            "has_processor": processor is not None,
+            **(processor.get_stats() if processor else {}),
+        }
+
+    load = {"streams": len(streams), **get_executor_stats()}
+    return load, streams
+
+
+async def handle_stream_control(client_id: str, action: str, payload: dict):
+    """Execute a control message routed to this worker by the session registry."""
+    from src.api.session_registry import get_session_registry
+    from src.core.streaming_processor import cleanup_processor
+
+    if action != "disconnect":
+        logger.warning(f"Ignoring unknown stream control action {action!r} for {client_id}")
+        return
+
+    websocket = manager.active_connections.get(client_id)
+    if websocket is not None:
+        await manager.send_status(client_id, payload.get("message", "Connection terminated"))
+        try:
+            await websocket.close(code=1000)
+        except Exception as e:
+            logger.debug(f"Error closing WebSocket for {client_id}: {e}")
+
+    manager.disconnect(client_id)
+    cleanup_processor(client_id)
+    await get_session_registry().unregister_stream(client_id)
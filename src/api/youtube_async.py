@@ -0,0 +1,389 @@
+"""
+Async YouTube Data API v3 client
+Lists channel uploads over a pooled aiohttp session instead of the blocking
+googleapiclient: the next playlist page is fetched while the current one is
+processed, and video detail chunks are fetched concurrently. All requests
+go through a limiter that bounds concurrency and quota units per second.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from datetime import datetime
+from types import TracebackType
+from typing import Any
+
+import aiohttp
+
+from config.settings import Config
+from src.api.youtube_parsing import parse_video
+
+logger = logging.getLogger(__name__)
+
+API_BASE_URL = "https://www.googleapis.com/youtube/v3"
+
+# Maximum page size / IDs per request allowed by the Data API
+PAGE_SIZE = 50
+
+# Quota cost of the list calls used here (channels, playlistItems, videos)
+LIST_QUOTA_COST = 1
+
+
+class YouTubeAPIError(Exception):
+    """Raised when the Data API answers with an error status."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(f"YouTube API error {status}: {message}")
+        self.status = status
+
+
+class QuotaLimiter:
+    """
+    Bound concurrent Data API requests and the quota units they spend per second.
+
+    Usage:
+        async with limiter.acquire(units=1):
+            ...  # make the request
+    """
+
+    def __init__(self, max_concurrent: int, units_per_second: float) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            max_concurrent: Requests allowed in flight at once
+            units_per_second: Sustained quota units per second (bursts up to one second's worth)
+        """
+        self.units_per_second = units_per_second
+        self.units_used = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._lock = asyncio.Lock()
+        self._tokens = max(units_per_second, 1.0)
+        self._updated = time.monotonic()
+
+    def acquire(self, units: int = LIST_QUOTA_COST) -> "_LimiterSlot":
+        """Wait for a request slot and ``units`` of quota."""
+        return _LimiterSlot(self, units)
+
+    async def _take(self, units: int) -> None:
+        async with self._lock:
+            capacity = max(self.units_per_second, units)
+            while True:
+                now = time.monotonic()
+                refill = (now - self._updated) * self.units_per_second
+                self._tokens = min(capacity, self._tokens + refill)
+                self._updated = now
+                if self._tokens >= units:
+                    self._tokens -= units
+                    self.units_used += units
+                    return
+                await asyncio.sleep((units - self._tokens) / self.units_per_second)
+
+
+class _LimiterSlot:
+    def __init__(self, limiter: QuotaLimiter, units: int) -> None:
+        self.limiter = limiter
+        self.units = units
+
+    async def __aenter__(self) -> None:
+        await self.limiter._semaphore.acquire()
+        try:
+            await self.limiter._take(self.units)
+        except BaseException:
+            self.limiter._semaphore.release()
+            raise
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.limiter._semaphore.release()
+
+
+class AsyncYouTubeClient:
+    """Async YouTube Data API v3 client for channel and video listings"""
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        credentials: Any | None = None,
+        base_url: str = API_BASE_URL,
+        max_concurrent_requests: int | None = None,
+        quota_units_per_second: float | None = None,
+        timeout: float = 30.0,
+    ) -> None:
+        """
+        Initialize the client (the HTTP session is created on first use)
+
+        Args:
+            api_key: Data API key (used when no OAuth credentials are given)
+            credentials: google.oauth2 credentials, e.g. YouTubeAPIService.credentials
+            base_url: API root, overridable for tests against a local fake server
+            max_concurrent_requests: Pooled connections / requests in flight
+                (default: Config.YOUTUBE_API_MAX_CONCURRENT_REQUESTS)
+            quota_units_per_second: Request rate limit in quota units
+                (default: Config.YOUTUBE_API_QUOTA_UNITS_PER_SECOND)
+            timeout: Total timeout per request in seconds
+        """
+        self.api_key = api_key
+        self.credentials = credentials
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrent_requests = (
+            max_concurrent_requests or Config.YOUTUBE_API_MAX_CONCURRENT_REQUESTS
+        )
+        self.limiter = QuotaLimiter(
+            self.max_concurrent_requests,
+            quota_units_per_second or Config.YOUTUBE_API_QUOTA_UNITS_PER_SECOND,
+        )
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: aiohttp.ClientSession | None = None
+
+    @classmethod
+    def from_service(cls, youtube_service: Any | None = None) -> "AsyncYouTubeClient | None":
+        """
+        Create a client sharing the OAuth credentials of a YouTubeAPIService
+
+        Falls back to Config.YOUTUBE_API_KEY; returns None if neither is available.
+        """
+        credentials = getattr(youtube_service, "credentials", None)
+        if credentials is not None:
+            return cls(credentials=credentials)
+        if Config.YOUTUBE_API_KEY:
+            return cls(api_key=Config.YOUTUBE_API_KEY)
+        return None
+
+    async def __aenter__(self) -> "AsyncYouTubeClient":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the pooled HTTP session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrent_requests),
+                timeout=self.timeout,
+            )
+        return self._session
+
+    async def _auth(self, params: dict[str, Any], headers: dict[str, str]) -> None:
+        if self.credentials is not None:
+            if not self.credentials.valid:
+                from google.auth.transport.requests import Request
+
+                await asyncio.to_thread(self.credentials.refresh, Request())
+            headers["Authorization"] = f"Bearer {self.credentials.token}"
+        elif self.api_key:
+            params["key"] = self.api_key
+
+    async def _request(
+        self, resource: str, params: dict[str, Any], etag: str | None = None
+    ) -> dict[str, Any] | None:
+        """
+        Call a list endpoint
+
+        Returns:
+            The JSON response, or None if ``etag`` still matches (304 Not Modified)
+        """
+        params = {key: value for key, value in params.items() if value is not None}
+        headers: dict[str, str] = {}
+        await self._auth(params, headers)
+        if etag:
+            headers["If-None-Match"] = etag
+
+        async with self.limiter.acquire(LIST_QUOTA_COST):
+            async with self._get_session().get(
+                f"{self.base_url}/{resource}", params=params, headers=headers
+            ) as response:
+                if response.status == 304:
+                    return None
+                if response.status >= 400:
+                    raise YouTubeAPIError(response.status, await response.text())
+                return await response.json()
+
+    async def _get_uploads_playlist_id(self, channel_id: str) -> str | None:
+        response = await self._request("channels", {"part": "contentDetails", "id": channel_id})
+        if not response or not response.get("items"):
+            logger.warning(f"Channel not found: {channel_id}")
+            return None
+        return response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
+    async def _playlist_pages(
+        self, playlist_id: str, etag: str | None = None
+    ) -> AsyncIterator[dict[str, Any] | None]:
+        """Yield playlist pages, requesting each next page before the current one is processed"""
+        next_page: asyncio.Task | None = asyncio.create_task(
+            self._request(
+                "playlistItems",
+                {"part": "snippet", "playlistId": playlist_id, "maxResults": PAGE_SIZE},
+                etag,
+            )
+        )
+        try:
+            while next_page is not None:
+                page = await next_page
+                next_page = None
+                if page is not None and page.get("nextPageToken"):
+                    next_page = asyncio.create_task(
+                        self._request(
+                            "playlistItems",
+                            {
+                                "part": "snippet",
+                                "playlistId": playlist_id,
+                                "maxResults": PAGE_SIZE,
+                                "pageToken": page["nextPageToken"],
+                            },
+                        )
+                    )
+                yield page
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def _video_details_chunk(self, video_ids: list[str]) -> list[dict[str, Any]]:
+        response = await self._request(
+            "videos", {"part": "snippet,statistics,contentDetails", "id": ",".join(video_ids)}
+        )
+        return [parse_video(video) for video in (response or {}).get("items", [])]
+
+    async def _list_uploads(
+        self,
+        channel_id: str,
+        max_results: int | None,
+        last_video_id: str | None = None,
+        last_upload_date: datetime | None = None,
+        etag: str | None = None,
+    ) -> tuple[list[dict[str, Any]] | None, str | None]:
+        """List uploads newest first, stopping at the watermark; None videos means 304"""
+        uploads_playlist_id = await self._get_uploads_playlist_id(channel_id)
+        if not uploads_playlist_id:
+            return [], None
+
+        watermark = last_upload_date.strftime("%Y-%m-%d") if last_upload_date else None
+        detail_tasks: list[asyncio.Task] = []
+        listed = 0
+        new_etag = None
+
+        try:
+            async with aclosing(self._playlist_pages(uploads_playlist_id, etag)) as pages:
+                async for page in pages:
+                    if page is None:
+                        return None, etag
+                    if new_etag is None:
+                        new_etag = page.get("etag")
+
+                    video_ids = []
+                    reached_watermark = False
+                    for item in page.get("items", []):
+                        snippet = item["snippet"]
+                        video_id = snippet["resourceId"]["videoId"]
+                        # publishedAt is ISO 8601, so date prefixes compare chronologically
+                        if video_id == last_video_id or (
+                            watermark and snippet.get("publishedAt", "")[:10] < watermark
+                        ):
+                            reached_watermark = True
+                            break
+                        video_ids.append(video_id)
+
+                    if max_results is not None:
+                        video_ids = video_ids[: max_results - listed]
+                    listed += len(video_ids)
+
+                    # Fetch details concurrently with the next page
+                    if video_ids:
+                        detail_tasks.append(
+                            asyncio.create_task(self._video_details_chunk(video_ids))
+                        )
+                    if reached_watermark or (max_results is not None and listed >= max_results):
+                        break
+
+            chunks = await asyncio.gather(*detail_tasks)
+        except BaseException:
+            for task in detail_tasks:
+                task.cancel()
+            raise
+
+        return [video for chunk in chunks for video in chunk], new_etag
+
+    async def get_channel_videos(
+        self, channel_id: str, max_results: int | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Get list of videos from a channel
+
+        Args:
+            channel_id: YouTube channel ID
+            max_results: Maximum number of videos to return (None for unlimited)
+
+        Returns:
+            List of video information dictionaries (empty on errors)
+        """
+        try:
+            videos, _ = await self._list_uploads(channel_id, max_results)
+            logger.info(f"Retrieved {len(videos or [])} videos for channel {channel_id}")
+            return videos or []
+        except (aiohttp.ClientError, asyncio.TimeoutError, YouTubeAPIError) as e:
+            logger.error(f"Error getting videos for channel {channel_id}: {e}")
+            return []
+
+    async def get_new_channel_videos(
+        self,
+        channel_id: str,
+        last_video_id: str | None = None,
+        last_upload_date: datetime | None = None,
+        etag: str | None = None,
+        max_results: int | None = None,
+    ) -> tuple[list[dict[str, Any]] | None, str | None]:
+        """
+        Get the videos uploaded to a channel since the previous sync
+
+        Same contract as YouTubeAPIService.get_new_channel_videos.
+
+        Returns:
+            Tuple of (new videos newest first, or None if the listing failed;
+            current playlist ETag)
+        """
+        try:
+            videos, new_etag = await self._list_uploads(
+                channel_id, max_results, last_video_id, last_upload_date, etag
+            )
+            if videos is None:
+                logger.info(f"Uploads of channel {channel_id} unchanged")
+                return [], etag
+            logger.info(f"Retrieved {len(videos)} new videos for channel {channel_id}")
+            return videos, new_etag
+        except (aiohttp.ClientError, asyncio.TimeoutError, YouTubeAPIError) as e:
+            logger.error(f"Error getting new videos for channel {channel_id}: {e}")
+            return None, None
+
+    async def get_video_details(self, video_ids: list[str]) -> list[dict[str, Any]]:
+        """
+        Get detailed information for a list of video IDs, fetching chunks concurrently
+
+        Args:
+            video_ids: List of YouTube video IDs
+
+        Returns:
+            List of video information dictionaries (empty on errors)
+        """
+        try:
+            chunks = await asyncio.gather(
+                *(
+                    self._video_details_chunk(video_ids[i : i + PAGE_SIZE])
+                    for i in range(0, len(video_ids), PAGE_SIZE)
+                )
+            )
+            return [video for chunk in chunks for video in chunk]
+        except (aiohttp.ClientError, asyncio.TimeoutError, YouTubeAPIError) as e:
+            logger.error(f"Error getting video details: {e}")
+            return []
@@ -0,0 +1,76 @@
+"""Conversion of YouTube Data API v3 resources into video information dictionaries."""
+
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+
+def parse_video(video: dict) -> dict:
+    """
+    Convert a videos.list resource into a video information dictionary
+
+    Args:
+        video: Video resource with snippet, statistics and contentDetails parts
+
+    Returns:
+        Video information dictionary in the same format as yt-dlp metadata
+    """
+    # Parse duration from ISO 8601 format (PT4M13S) to seconds
+    duration_str = video["contentDetails"]["duration"]
+    duration_seconds = parse_duration(duration_str)
+
+    return {
+        "id": video["id"],
+        "title": video["snippet"]["title"],
+        "description": video["snippet"]["description"],
+        "duration": duration_seconds,
+        "upload_date": video["snippet"]["publishedAt"][:10].replace("-", ""),  # YYYYMMDD format
+        "view_count": int(video["statistics"].get("viewCount", 0)),
+        "like_count": int(video["statistics"].get("likeCount", 0)),
+        "channel": video["snippet"]["channelTitle"],
+        "channel_id": video["snippet"]["channelId"],
+        "thumbnail": video["snippet"]["thumbnails"].get("default", {}).get("url"),
+        "webpage_url": f"https://www.youtube.com/watch?v={video['id']}",
+    }
+
+
+def parse_duration(duration_str: str) -> int | None:
+    """
+    Parse ISO 8601 duration (PT4M13S) to seconds
+
+    Args:
+        duration_str: ISO 8601 duration string
+
+    Returns:
+        Duration in seconds or None if parsing fails
+    """
+    try:
+        # Remove PT prefix
+        duration_str = duration_str[2:] if duration_str.startswith("PT") else duration_str
+
+        # Parse hours, minutes, seconds
+        hours = 0
+        minutes = 0
+        seconds = 0
+
+        # Extract hours
+        h_match = re.search(r"(\d+)H", duration_str)
+        if h_match:
+            hours = int(h_match.group(1))
+
+        # Extract minutes
+        m_match = re.search(r"(\d+)M", duration_str)
+        if m_match:
+            minutes = int(m_match.group(1))
+
+        # Extract seconds
+        s_match = re.search(r"(\d+)S", duration_str)
+        if s_match:
+            seconds = int(s_match.group(1))
+
+        return hours * 3600 + minutes * 60 + seconds
+
+    except Exception as e:
+        logger.warning(f"Failed to parse duration '{duration_str}': {e}")
+        return None
@@ -5,6 +5,7 @@ Handles authentication and API calls for YouTube channel and video data.
 
 import logging
 import os
+from datetime import datetime
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -12,6 +13,8 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from src.api.youtube_parsing import parse_duration, parse_video
+
 
 class YouTubeAPIService:
     """YouTube Data API v3 service with OAuth authentication"""
@@ -29,6 +32,7 @@ class YouTubeAPIService:
         """
         self.logger = logging.getLogger(__name__)
         self.service = None
+        self.credentials = None
 
         # Default paths for credentials and tokens
         self.credentials_file = credentials_file or os.path.join(os.getcwd(), "credentials.json")
@@ -76,6 +80,8 @@ class YouTubeAPIService:
                 token.write(creds.to_json())
                 self.logger.info(f"Saved OAuth2 token to: {self.token_file}")
 
+        self.credentials = creds
+
         # Build the YouTube service
         try:
             self.service = build("youtube", "v3", credentials=creds)
@@ -140,17 +146,10 @@ class YouTubeAPIService:
                 self.logger.info(f"Fetching up to {max_results} videos from channel {channel_id}")
 
             # First, get the channel's uploads playlist ID
-            channel_request = self.service.channels().list(part="contentDetails", id=channel_id)
-            channel_response = channel_request.execute()
-
-            if not channel_response["items"]:
-                self.logger.warning(f"Channel not found: {channel_id}")
+            uploads_playlist_id = self._get_uploads_playlist_id(channel_id)
+            if not uploads_playlist_id:
                 return []
 
-            uploads_playlist_id = channel_response["items"][0]["contentDetails"][
-                "relatedPlaylists"
-            ]["uploads"]
-
             # Get videos from the uploads playlist
             next_page_token = None
             retrieved_count = 0
@@ -192,6 +191,105 @@ class YouTubeAPIService:
             self.logger.error(f"Error getting videos for channel {channel_id}: {e}")
             return []
 
+    def get_new_channel_videos(
+        self,
+        channel_id: str,
+        last_video_id: str | None = None,
+        last_upload_date: datetime | None = None,
+        etag: str | None = None,
+        max_results: int = None,
+    ) -> tuple[list[dict] | None, str | None]:
+        """
+        Get the videos uploaded to a channel since the previous sync
+
+        The uploads playlist lists the newest videos first, so paging stops at
+        the first video that was already seen (``last_video_id``) or that was
+        published before ``last_upload_date``. With ``etag`` the first page is
+        requested conditionally: an unchanged playlist costs no further quota.
+
+        Args:
+            channel_id: YouTube channel ID
+            last_video_id: Newest video seen by the previous sync
+            last_upload_date: Newest upload date seen by the previous sync
+            etag: ETag of the uploads playlist at the previous sync
+            max_results: Maximum number of videos to return (None for unlimited)
+
+        Returns:
+            Tuple of (new videos newest first, or None if the listing failed;
+            current playlist ETag)
+        """
+        try:
+            uploads_playlist_id = self._get_uploads_playlist_id(channel_id)
+            if not uploads_playlist_id:
+                return None, None
+
+            watermark = last_upload_date.strftime("%Y-%m-%d") if last_upload_date else None
+            videos = []
+            new_etag = None
+            next_page_token = None
+
+            while max_results is None or len(videos) < max_results:
+                request = self.service.playlistItems().list(
+                    part="snippet",
+                    playlistId=uploads_playlist_id,
+                    maxResults=50,
+                    pageToken=next_page_token,
+                )
+                if etag and next_page_token is None:
+                    request.headers["If-None-Match"] = etag
+                try:
+                    response = request.execute()
+                except HttpError as e:
+                    if e.resp.status == 304:
+                        self.logger.info(f"Uploads of channel {channel_id} unchanged")
+                        return [], etag
+                    raise
+
+                if next_page_token is None:
+                    new_etag = response.get("etag")
+
+                new_ids = []
+                reached_watermark = False
+                for item in response["items"]:
+                    snippet = item["snippet"]
+                    video_id = snippet["resourceId"]["videoId"]
+                    # publishedAt is ISO 8601, so date prefixes compare chronologically
+                    if video_id == last_video_id or (
+                        watermark and snippet.get("publishedAt", "")[:10] < watermark
+                    ):
+                        reached_watermark = True
+                        break
+                    new_ids.append(video_id)
+
+                if max_results is not None:
+                    new_ids = new_ids[: max_results - len(videos)]
+                videos.extend(self.get_video_details(new_ids))
+
+                next_page_token = response.get("nextPageToken")
+                if reached_watermark or not next_page_token:
+                    break
+
+            self.logger.info(f"Retrieved {len(videos)} new videos for channel {channel_id}")
+            return videos, new_etag
+
+        except HttpError as e:
+            self.logger.error(f"HTTP error getting new videos for channel {channel_id}: {e}")
+            return None, None
+        except Exception as e:
+            self.logger.error(f"Error getting new videos for channel {channel_id}: {e}")
+            return None, None
+
+    def _get_uploads_playlist_id(self, channel_id: str) -> str | None:
+        """Get the ID of a channel's uploads playlist (None if the channel does not exist)"""
+        channel_request = self.service.channels().list(part="contentDetails", id=channel_id)
+        channel_response = channel_request.execute()
+
+        if not channel_response["items"]:
+            self.logger.warning(f"Channel not found: {channel_id}")
+            return None
+
+        return channel_response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
     def get_video_details(self, video_ids: list[str]) -> list[dict]:
         """
         Get detailed information for a list of video IDs
@@ -218,26 +316,7 @@ class YouTubeAPIService:
                 response = request.execute()
 
                 for video in response["items"]:
-                    # Parse duration from ISO 8601 format (PT4M13S) to seconds
-                    duration_str = video["contentDetails"]["duration"]
-                    duration_seconds = self._parse_duration(duration_str)
-
-                    video_info = {
-                        "id": video["id"],
-                        "title": video["snippet"]["title"],
-                        "description": video["snippet"]["description"],
-                        "duration": duration_seconds,
-                        "upload_date": video["snippet"]["publishedAt"][:10].replace(
-                            "-", ""
-                        ),  # YYYYMMDD format
-                        "view_count": int(video["statistics"].get("viewCount", 0)),
-                        "like_count": int(video["statistics"].get("likeCount", 0)),
-                        "channel": video["snippet"]["channelTitle"],
-                        "channel_id": video["snippet"]["channelId"],
-                        "thumbnail": video["snippet"]["thumbnails"].get("default", {}).get("url"),
-                        "webpage_url": f"https://www.youtube.com/watch?v={video['id']}",
-                    }
-                    videos.append(video_info)
+                    videos.append(parse_video(video))
 
             return videos
 
@@ -249,46 +328,8 @@ class YouTubeAPIService:
             return []
 
     def _parse_duration(self, duration_str: str) -> int | None:
-        """
-        Parse ISO 8601 duration (PT4M13S) to seconds
-
-        Args:
-            duration_str: ISO 8601 duration string
-
-        Returns:
-            Duration in seconds or None if parsing fails
-        """
-        try:
-            import re
-
-            # Remove PT prefix
-            duration_str = duration_str[2:] if duration_str.startswith("PT") else duration_str
-
-            # Parse hours, minutes, seconds
-            hours = 0
-            minutes = 0
-            seconds = 0
-
-            # Extract hours
-            h_match = re.search(r"(\\d+)H", duration_str)
-            if h_match:
-                hours = int(h_match.group(1))
-
-            # Extract minutes
-            m_match = re.search(r"(\\d+)M", duration_str)
-            if m_match:
-                minutes = int(m_match.group(1))
-
-            # Extract seconds
-            s_match = re.search(r"(\\d+)S", duration_str)
-            if s_match:
-                seconds = int(s_match.group(1))
-
-            return hours * 3600 + minutes * 60 + seconds
-
-        except Exception as e:
-            self.logger.warning(f"Failed to parse duration '{duration_str}': {e}")
-            return None
+        """Parse ISO 8601 duration (PT4M13S) to seconds"""
+        return parse_duration(duration_str)
 
     def test_connection(self) -> bool:
         """
@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 
 from src.database.sso_models import MFADevice, SSOAuditLog
 from src.database.models import User
+from src.database.repositories.helpers import rows_exist
 
 logger = logging.getLogger(__name__)
 
@@ -383,14 +384,10 @@ class MFAService:
         Returns:
             True if user has at least one active MFA device
         """
-        count = (
-            self.db.query(MFADevice)
-            .filter(
-                MFADevice.user_id == user.id,
-                MFADevice.is_active == True,
-                MFADevice.is_verified == True,
-            )
-            .count()
+        return rows_exist(
+            self.db,
+            MFADevice,
+            MFADevice.user_id == user.id,
+            MFADevice.is_active == True,
+            MFADevice.is_verified == True,
         )
-
-        return count > 0
@@ -124,7 +124,8 @@ class TwitterBot:
                 return []
 
             matches = []
-            video_repo = get_video_repository()
+            # Only looks fingerprints up
+            video_repo = get_video_repository(read_only=True)
 
             # Check each segment against database
             for segment_file, start_time, end_time in segments:
@@ -0,0 +1,83 @@
+"""
+Process pool for CPU-bound segment fingerprinting.
+
+Fingerprint extraction (audio decoding, STFT and peak picking) holds the GIL
+for most of its runtime, so threads do not scale it. Segments are instead
+fingerprinted in worker processes. Each worker keeps one
+:class:`AudioFingerprinter` per parameter set and returns the serialized
+fingerprint, so only small payloads cross the process boundary.
+"""
+
+import logging
+import multiprocessing as mp
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from config.settings import Config
+from src.core.audio_fingerprinting import AudioFingerprinter
+
+logger = logging.getLogger(__name__)
+
+_pool: ProcessPoolExecutor | None = None
+
+# Per-process fingerprinter cache, populated inside pool workers
+_worker_fingerprinters: dict[tuple[int, int, int], AudioFingerprinter] = {}
+
+
+def get_fingerprint_pool() -> ProcessPoolExecutor:
+    """Get (or lazily create) the shared fingerprinting process pool."""
+    global _pool
+    if _pool is None:
+        # Spawn rather than fork: the parent runs threads (asyncio.to_thread,
+        # DB pools) that must not be duplicated into the workers mid-operation.
+        _pool = ProcessPoolExecutor(
+            max_workers=Config.FINGERPRINT_MAX_WORKERS,
+            mp_context=mp.get_context("spawn"),
+        )
+        logger.info(f"Started fingerprint process pool ({Config.FINGERPRINT_MAX_WORKERS} workers)")
+    return _pool
+
+
+def shutdown_fingerprint_pool() -> None:
+    """Shut down the fingerprinting process pool."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+
+
+def fingerprint_segment(
+    segment_file: str, sample_rate: int, n_fft: int, hop_length: int
+) -> dict[str, Any]:
+    """
+    Fingerprint one audio segment (executed in a pool worker).
+
+    Args:
+        segment_file: Path to the segment audio file
+        sample_rate: Fingerprint sample rate
+        n_fft: FFT window size
+        hop_length: STFT hop length
+
+    Returns:
+        Dictionary with the fingerprint hash, serialized fingerprint data,
+        confidence score, peak count, sample rate and extraction time
+    """
+    key = (sample_rate, n_fft, hop_length)
+    fingerprinter = _worker_fingerprinters.get(key)
+    if fingerprinter is None:
+        fingerprinter = AudioFingerprinter(
+            sample_rate=sample_rate, n_fft=n_fft, hop_length=hop_length
+        )
+        _worker_fingerprinters[key] = fingerprinter
+
+    started = time.time()
+    fingerprint = fingerprinter.extract_fingerprint(segment_file)
+    return {
+        "fingerprint_hash": fingerprint["fingerprint_hash"],
+        "fingerprint_data": fingerprinter.serialize_fingerprint(fingerprint),
+        "confidence_score": fingerprint["confidence_score"],
+        "peak_count": fingerprint["peak_count"],
+        "sample_rate": fingerprint["sample_rate"],
+        "duration": time.time() - started,
+    }
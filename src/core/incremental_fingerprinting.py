@@ -0,0 +1,183 @@
+"""
+Incremental sliding-window fingerprinting for live audio streams.
+
+Live streams are fingerprinted over a window (e.g. 3 s) that advances by a
+small hop (e.g. 0.5 s). Re-running the full STFT over the window on every hop
+recomputes most frames. This module keeps the per-frame spectral peaks for the
+current window and only computes STFT frames for newly arrived samples, so the
+per-hop cost is proportional to the hop rather than the window.
+
+Frames are computed without centering (``center=False``) so that each frame
+depends only on its own ``n_fft`` samples and can be reused as the window
+slides forward.
+"""
+
+import threading
+from collections import deque
+from typing import Any
+
+import librosa
+import numpy as np
+
+from src.core.audio_fingerprinting import AudioFingerprinter
+
+
+class IncrementalFingerprinter:
+    """
+    Maintain a fingerprint of the most recent ``window_samples`` of a stream.
+
+    Samples are appended as they arrive; :meth:`update` computes STFT frames and
+    peaks only for samples that have not been analysed yet, and drops frames
+    that fall out of the window. :meth:`get_fingerprint` builds the same result
+    dictionary as :meth:`AudioFingerprinter.extract_fingerprint_from_audio`
+    from the retained frames.
+
+    :meth:`append` may be called from the event loop while :meth:`update` runs
+    in a worker thread; pending samples are guarded by a lock.
+    """
+
+    def __init__(self, fingerprinter: AudioFingerprinter, window_samples: int) -> None:
+        """
+        Initialize incremental fingerprinter.
+
+        Args:
+            fingerprinter: Fingerprinter providing STFT parameters and peak extraction
+            window_samples: Size of the sliding analysis window in samples
+        """
+        if window_samples < fingerprinter.n_fft:
+            raise ValueError(
+                f"window_samples ({window_samples}) must be at least n_fft "
+                f"({fingerprinter.n_fft})"
+            )
+
+        self.fingerprinter = fingerprinter
+        self.sample_rate = fingerprinter.sample_rate
+        self.n_fft = fingerprinter.n_fft
+        self.hop_length = fingerprinter.hop_length
+        self.window_samples = window_samples
+        self.max_frames = 1 + (window_samples - self.n_fft) // self.hop_length
+        self.num_ranges = len(fingerprinter.freq_ranges)
+
+        # Each frame: (frame_index, peaks, range_magnitudes, confidence)
+        self.frames: deque[tuple[int, list[dict[str, Any]], np.ndarray, float]] = deque(
+            maxlen=self.max_frames
+        )
+
+        # Samples not yet covered by a computed frame, starting at the next frame start
+        self._pending: list[np.ndarray] = []
+        self._pending_len = 0
+        self._next_frame_index = 0
+        self._window_fill = 0
+        self._lock = threading.Lock()
+        self.frames_computed = 0
+
+    def append(self, samples: np.ndarray) -> None:
+        """Queue new mono float32 samples for analysis."""
+        if len(samples) == 0:
+            return
+        with self._lock:
+            self._pending.append(np.asarray(samples, dtype=np.float32))
+            self._pending_len += len(samples)
+            self._window_fill = min(self.window_samples, self._window_fill + len(samples))
+
+    def update(self) -> int:
+        """
+        Compute frames for newly available samples.
+
+        Returns:
+            Number of new frames computed
+        """
+        with self._lock:
+            if self._pending_len < self.n_fft:
+                return 0
+            chunks = self._pending
+            self._pending = []
+            self._pending_len = 0
+
+        pending = np.concatenate(chunks) if len(chunks) > 1 else chunks[0]
+        n_new = 1 + (len(pending) - self.n_fft) // self.hop_length
+
+        # Only new frames older than the window would be discarded immediately
+        skip = max(0, n_new - self.max_frames)
+        start = skip * self.hop_length
+        end = (n_new - 1) * self.hop_length + self.n_fft
+
+        magnitude = np.abs(
+            librosa.stft(
+                pending[start:end],
+                n_fft=self.n_fft,
+                hop_length=self.hop_length,
+                center=False,
+            )
+        )
+
+        first_index = self._next_frame_index + skip
+        for offset, frame in enumerate(magnitude.T):
+            peaks = self.fingerprinter._extract_frame_peaks(frame)
+            row = np.zeros(self.num_ranges, dtype=np.float64)
+            for peak in peaks:
+                row[peak["freq_range"]] += peak["magnitude"]
+            confidence = float(np.mean([p["magnitude"] for p in peaks])) if peaks else 0.0
+            self.frames.append((first_index + offset, peaks, row, confidence))
+
+        # Keep the samples the next frame needs
+        consumed = n_new * self.hop_length
+        remainder = pending[consumed:]
+        with self._lock:
+            if len(remainder):
+                self._pending.insert(0, remainder)
+                self._pending_len += len(remainder)
+        self._next_frame_index += n_new
+        self.frames_computed += n_new - skip
+
+        return n_new - skip
+
+    def get_fingerprint(self) -> dict[str, Any]:
+        """
+        Build the fingerprint for the current window from retained frames.
+
+        Returns:
+            Fingerprint dictionary with the same keys as
+            ``AudioFingerprinter.extract_fingerprint_from_audio``
+        """
+        sr = self.sample_rate
+        base_index = self.frames[0][0] if self.frames else 0
+
+        fingerprint_data: list[dict[str, Any]] = []
+        rows: list[np.ndarray] = []
+        confidence_scores: list[float] = []
+        for frame_index, peaks, row, confidence in self.frames:
+            if not peaks:
+                continue
+            fingerprint_data.append(
+                {"time": (frame_index - base_index) * self.hop_length / sr, "peaks": peaks}
+            )
+            rows.append(row)
+            confidence_scores.append(confidence)
+
+        if rows:
+            compact = np.vstack(rows).flatten()
+            max_val = np.max(compact)
+            if max_val > 0:
+                compact = compact / max_val
+        else:
+            compact = np.array([], dtype=np.float64)
+
+        return {
+            "fingerprint_data": fingerprint_data,
+            "compact_fingerprint": compact,
+            "fingerprint_hash": self.fingerprinter._hash_fingerprint(compact),
+            "confidence_score": float(np.mean(confidence_scores)) if confidence_scores else 0.0,
+            "peak_count": sum(len(frame["peaks"]) for frame in fingerprint_data),
+            "duration": float(self._window_fill / sr),
+            "sample_rate": sr,
+        }
+
+    def reset(self) -> None:
+        """Discard all buffered samples and frames."""
+        with self._lock:
+            self.frames.clear()
+            self._pending = []
+            self._pending_len = 0
+            self._next_frame_index = 0
+            self._window_fill = 0
@@ -0,0 +1,369 @@
+"""
+Shared in-memory candidate index for live-stream matching.
+
+Live streams query the fingerprint database every hop. Rather than issuing a
+database round trip per hop, each worker loads the stored compact fingerprints
+into an :class:`~src.core.lsh_index.LSHIndex` and answers queries from
+memory. Only the metadata of matched videos is fetched from the database, and
+that is kept in a small LRU cache.
+
+Loading happens on a background thread, never on a stream's hop: the API
+starts it at startup, and afterwards fingerprints written since the last load
+(by id watermark) are added every ``STREAMING_INDEX_REFRESH_SECONDS``.
+
+Stored compact fingerprints cover whole segments while stream windows are a few
+seconds long; :meth:`AudioFingerprinter.compare_fingerprints` compares the
+overlapping prefix, so only that prefix (``input_dim`` values) is indexed.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from src.core.audio_fingerprinting import AudioFingerprinter
+from src.core.fingerprinter_factory import get_lsh_index_config
+from src.core.lsh_index import LSHIndex
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingMatchIndex:
+    """
+    LSH-backed fingerprint index with an LRU cache for video metadata.
+
+    Thread-safe for concurrent queries from the streaming executor; loading and
+    cache updates are serialised with locks.
+    """
+
+    # Minimum seconds between load attempts after a failure
+    LOAD_RETRY_SECONDS = 30.0
+
+    def __init__(
+        self,
+        fingerprinter: AudioFingerprinter,
+        input_dim: int,
+        num_tables: int | None = None,
+        hash_size: int | None = None,
+        max_candidates: int | None = None,
+        metadata_cache_size: int = 1024,
+    ) -> None:
+        """
+        Initialize the match index.
+
+        Args:
+            fingerprinter: Fingerprinter whose parameters and scoring are used
+            input_dim: Length of the compact fingerprint prefix to index
+            num_tables: LSH hash tables (default from Config)
+            hash_size: LSH bits per table (default from Config)
+            max_candidates: Candidates scored per query (default from Config)
+            metadata_cache_size: Maximum number of videos kept in the metadata cache
+        """
+        lsh_config = get_lsh_index_config()
+        self.fingerprinter = fingerprinter
+        self.input_dim = input_dim
+        self.max_candidates = max_candidates or lsh_config["max_candidates"]
+        self.lsh = LSHIndex(
+            input_dim=input_dim,
+            num_tables=num_tables or lsh_config["num_tables"],
+            hash_size=hash_size or lsh_config["hash_size"],
+        )
+
+        # fingerprint id -> (video_id, start_time, end_time, confidence, prefix vector)
+        self.entries: dict[int, tuple[int, float, float, float | None, np.ndarray]] = {}
+
+        self.metadata_cache_size = metadata_cache_size
+        self._metadata_cache: OrderedDict[int, dict[str, Any]] = OrderedDict()
+        self._metadata_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._refresh_thread: threading.Thread | None = None
+        self._last_load_attempt: float | None = None
+        # Highest fingerprint id indexed; refreshes only read newer rows
+        self.watermark = 0
+        self.loaded = False
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def add(
+        self,
+        fingerprint_id: int,
+        video_id: int,
+        start_time: float,
+        end_time: float,
+        compact_fingerprint: np.ndarray,
+        confidence: float | None = None,
+    ) -> None:
+        """Index a single stored fingerprint (ids already indexed are skipped)."""
+        if compact_fingerprint is None or len(compact_fingerprint) == 0:
+            return
+        if fingerprint_id in self.entries:
+            return
+        prefix = np.asarray(compact_fingerprint[: self.input_dim], dtype=np.float64)
+        self.entries[fingerprint_id] = (video_id, start_time, end_time, confidence, prefix)
+        self.lsh.index_fingerprint(fingerprint_id, prefix)
+
+    def refresh(self, session: Session, batch_size: int = 1000) -> int:
+        """
+        Index fingerprints stored since the last refresh.
+
+        Rows are read in id order above :attr:`watermark`, which advances as
+        they are indexed, so a refresh that fails part-way resumes where it
+        stopped. The first refresh loads everything.
+
+        Args:
+            session: Database session
+            batch_size: Rows fetched per round trip
+
+        Returns:
+            Number of fingerprints indexed
+        """
+        from src.database.models import AudioFingerprint
+
+        query = (
+            session.query(
+                AudioFingerprint.id,
+                AudioFingerprint.video_id,
+                AudioFingerprint.start_time,
+                AudioFingerprint.end_time,
+                AudioFingerprint.confidence_score,
+                AudioFingerprint.fingerprint_data,
+            )
+            .filter(
+                AudioFingerprint.id > self.watermark,
+                AudioFingerprint.sample_rate == self.fingerprinter.sample_rate,
+                AudioFingerprint.n_fft == self.fingerprinter.n_fft,
+                AudioFingerprint.hop_length == self.fingerprinter.hop_length,
+                AudioFingerprint.fingerprint_data.isnot(None),
+            )
+            .order_by(AudioFingerprint.id)
+            .yield_per(batch_size)
+        )
+
+        count = 0
+        for fp_id, video_id, start_time, end_time, confidence, data in query:
+            self.watermark = fp_id
+            try:
+                stored = self.fingerprinter.deserialize_fingerprint(data)
+            except Exception as e:
+                logger.warning(f"Skipping undecodable fingerprint {fp_id}: {e}")
+                continue
+            compact = stored.get("compact_fingerprint")
+            if compact is None:
+                continue
+            self.add(fp_id, video_id, start_time, end_time, compact, confidence)
+            count += 1
+
+        if not self.loaded:
+            logger.info(f"Loaded {count} fingerprints into streaming match index")
+        elif count:
+            logger.debug(f"Added {count} new fingerprints to streaming match index")
+        self.loaded = True
+        return count
+
+    def ensure_loaded(self) -> bool:
+        """
+        Start a background refresh when one is due, without waiting for it.
+
+        The first call starts the full load; later calls pick up new
+        fingerprints at most every ``STREAMING_INDEX_REFRESH_SECONDS`` (and
+        retry a failed load after :attr:`LOAD_RETRY_SECONDS`).
+
+        Returns:
+            True if the index has been loaded and can be searched
+        """
+        from config.settings import Config
+
+        now = time.monotonic()
+        with self._load_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return self.loaded
+            if self._last_load_attempt is not None:
+                if self.loaded:
+                    interval = float(Config.STREAMING_INDEX_REFRESH_SECONDS)
+                else:
+                    interval = self.LOAD_RETRY_SECONDS
+                if now - self._last_load_attempt < interval:
+                    return self.loaded
+            self._last_load_attempt = now
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_from_database,
+                name="soundhash-match-index",
+                daemon=True,
+            )
+            self._refresh_thread.start()
+        return self.loaded
+
+    def _refresh_from_database(self) -> None:
+        """Run :meth:`refresh` with a read session (runs on the refresh thread)."""
+        from src.database.connection import db_manager
+
+        session = None
+        try:
+            session = db_manager.get_read_session()
+            self.refresh(session)
+        except Exception as e:
+            logger.error(f"Failed to refresh streaming match index: {e}")
+        finally:
+            if session is not None:
+                session.close()
+
+    def search(self, query_fp: dict[str, Any], limit: int = 10) -> list[dict[str, Any]]:
+        """
+        Find the best stored segments for a query fingerprint.
+
+        Args:
+            query_fp: Fingerprint dictionary with a ``compact_fingerprint`` key
+            limit: Maximum number of results
+
+        Returns:
+            Ranked results with fingerprint id, video id, segment times and scores
+        """
+        compact = query_fp.get("compact_fingerprint")
+        if compact is None or len(compact) == 0 or not self.entries:
+            return []
+
+        candidates = self.lsh.query_candidates(compact, max_candidates=self.max_candidates)
+        candidate_fps = []
+        for fp_id, _ in candidates:
+            entry = self.entries.get(fp_id)
+            if entry is None:
+                continue
+            video_id, start_time, end_time, _, prefix = entry
+            candidate_fps.append(
+                (fp_id, {"compact_fingerprint": prefix, "duration": end_time - start_time})
+            )
+
+        ranked = self.fingerprinter.rank_matches(query_fp, candidate_fps)
+
+        results = []
+        for match in ranked[:limit]:
+            video_id, start_time, end_time, confidence, _ = self.entries[match["identifier"]]
+            results.append(
+                {
+                    "fingerprint_id": match["identifier"],
+                    "video_id": video_id,
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "confidence": confidence,
+                    "score": match["score"],
+                }
+            )
+        return results
+
+    def get_video_metadata(self, video_ids: set[int]) -> dict[int, dict[str, Any]]:
+        """
+        Get display metadata for videos, fetching cache misses in one query.
+
+        Args:
+            video_ids: Database ids of the videos
+
+        Returns:
+            Mapping of video id to metadata dictionary
+        """
+        result: dict[int, dict[str, Any]] = {}
+        missing: list[int] = []
+
+        with self._metadata_lock:
+            for video_id in video_ids:
+                if video_id in self._metadata_cache:
+                    self._metadata_cache.move_to_end(video_id)
+                    result[video_id] = self._metadata_cache[video_id]
+                    self.cache_hits += 1
+                else:
+                    missing.append(video_id)
+                    self.cache_misses += 1
+
+        if missing:
+            from src.database.connection import db_manager
+            from src.database.models import Video
+
+            session = db_manager.get_read_session()
+            try:
+                rows = (
+                    session.query(
+                        Video.id, Video.video_id, Video.title, Video.url, Video.thumbnail_url
+                    )
+                    .filter(Video.id.in_(missing))
+                    .all()
+                )
+            finally:
+                session.close()
+
+            with self._metadata_lock:
+                for row in rows:
+                    metadata = {
+                        "video_id": row.video_id,
+                        "title": row.title,
+                        "url": row.url,
+                        "thumbnail_url": row.thumbnail_url,
+                    }
+                    self._metadata_cache[row.id] = metadata
+                    result[row.id] = metadata
+                while len(self._metadata_cache) > self.metadata_cache_size:
+                    self._metadata_cache.popitem(last=False)
+
+        return result
+
+    def clear(self) -> None:
+        """Drop all indexed fingerprints and cached metadata."""
+        with self._load_lock:
+            self.lsh.clear()
+            self.entries = {}
+            self.watermark = 0
+            self.loaded = False
+            self._last_load_attempt = None
+        with self._metadata_lock:
+            self._metadata_cache.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get index and cache statistics."""
+        return {
+            "loaded": self.loaded,
+            "num_indexed": len(self.entries),
+            "watermark": self.watermark,
+            "input_dim": self.input_dim,
+            "metadata_cached": len(self._metadata_cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+
+# One index per fingerprint configuration, shared by all streams in this worker
+_indexes: dict[tuple[int, int, int, int], StreamingMatchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_match_index(fingerprinter: AudioFingerprinter, input_dim: int) -> StreamingMatchIndex:
+    """
+    Get the worker-wide match index for a fingerprinter configuration.
+
+    Args:
+        fingerprinter: Fingerprinter used by the stream
+        input_dim: Compact fingerprint length of the stream window
+
+    Returns:
+        Shared StreamingMatchIndex instance
+    """
+    from config.settings import Config
+
+    key = (fingerprinter.sample_rate, fingerprinter.n_fft, fingerprinter.hop_length, input_dim)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = StreamingMatchIndex(
+                fingerprinter,
+                input_dim,
+                metadata_cache_size=Config.STREAMING_METADATA_CACHE_SIZE,
+            )
+            _indexes[key] = index
+        return index
+
+
+def get_match_index_stats() -> list[dict[str, Any]]:
+    """Get statistics for all match indexes in this worker."""
+    with _indexes_lock:
+        return [index.get_stats() for index in _indexes.values()]
@@ -0,0 +1,373 @@
+"""
+Binary audio framing protocol for the ``/ws/stream`` WebSocket.
+
+Each binary WebSocket message carries one audio frame prefixed by a fixed
+14-byte little-endian header::
+
+    offset  size  field
+    0       4     magic         b"SHAF"
+    4       1     version       1
+    5       1     codec         0 = float32 PCM, 1 = int16 PCM, 2 = Opus
+    6       4     sample_rate   Hz (uint32)
+    10      1     channels      interleaved channel count (PCM) / Opus channels
+    11      1     reserved      0
+    12      2     sequence      frame sequence number (uint16, wraps)
+
+Messages without the magic prefix are treated as legacy raw float32 mono audio
+at the processor's sample rate.
+
+Sequence numbers let the server detect lost frames (filled with silence to keep
+the stream's timeline intact) and drop duplicated or reordered frames.
+Audio is downmixed to mono and resampled to the fingerprinting rate with a
+streaming polyphase filter whose taps are designed once per rate pair and cached.
+"""
+
+import logging
+import struct
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
+from math import gcd
+from typing import Any
+
+import numpy as np
+from scipy.signal import firwin, upfirdn
+
+logger = logging.getLogger(__name__)
+
+# Optional Opus support - gracefully degrade if not available
+try:
+    import opuslib
+
+    OPUS_AVAILABLE = True
+except ImportError:
+    opuslib = None
+    OPUS_AVAILABLE = False
+
+
+FRAME_MAGIC = b"SHAF"
+PROTOCOL_VERSION = 1
+HEADER = struct.Struct("<4sBBIBBH")
+SEQUENCE_MODULUS = 1 << 16
+
+# Longest gap (in seconds) filled with silence; larger gaps are skipped
+MAX_GAP_FILL_SECONDS = 1.0
+
+# Opus only supports these decoder rates
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+class StreamProtocolError(ValueError):
+    """Raised when a WebSocket audio frame is malformed or unsupported."""
+
+
+class AudioCodec(IntEnum):
+    """Codecs accepted in framed audio messages."""
+
+    FLOAT32 = 0
+    INT16 = 1
+    OPUS = 2
+
+
+@dataclass(frozen=True)
+class FrameHeader:
+    """Parsed audio frame header."""
+
+    codec: AudioCodec
+    sample_rate: int
+    channels: int
+    sequence: int
+
+
+def encode_frame(
+    payload: bytes,
+    codec: AudioCodec,
+    sample_rate: int,
+    channels: int,
+    sequence: int,
+) -> bytes:
+    """
+    Build a framed audio message.
+
+    Args:
+        payload: Encoded audio bytes
+        codec: Payload codec
+        sample_rate: Payload sample rate in Hz
+        channels: Number of interleaved channels
+        sequence: Frame sequence number (wrapped to 16 bits)
+
+    Returns:
+        Header followed by the payload
+    """
+    header = HEADER.pack(
+        FRAME_MAGIC,
+        PROTOCOL_VERSION,
+        int(codec),
+        sample_rate,
+        channels,
+        0,
+        sequence % SEQUENCE_MODULUS,
+    )
+    return header + payload
+
+
+def parse_frame(data: bytes) -> tuple[FrameHeader | None, bytes]:
+    """
+    Split a WebSocket message into header and payload.
+
+    Args:
+        data: Raw binary message
+
+    Returns:
+        Tuple of (header, payload); header is None for legacy raw float32 messages
+
+    Raises:
+        StreamProtocolError: If the header is present but invalid
+    """
+    if not data.startswith(FRAME_MAGIC):
+        return None, data
+
+    if len(data) < HEADER.size:
+        raise StreamProtocolError(f"Truncated frame header ({len(data)} bytes)")
+
+    _, version, codec, sample_rate, channels, _, sequence = HEADER.unpack_from(data)
+
+    if version != PROTOCOL_VERSION:
+        raise StreamProtocolError(f"Unsupported protocol version {version}")
+    try:
+        codec = AudioCodec(codec)
+    except ValueError as e:
+        raise StreamProtocolError(f"Unsupported codec {codec}") from e
+    if sample_rate <= 0 or sample_rate > 192000:
+        raise StreamProtocolError(f"Invalid sample rate {sample_rate}")
+    if channels < 1 or channels > 8:
+        raise StreamProtocolError(f"Invalid channel count {channels}")
+
+    return FrameHeader(codec, sample_rate, channels, sequence), data[HEADER.size :]
+
+
+@lru_cache(maxsize=32)
+def polyphase_filter(up: int, down: int) -> np.ndarray:
+    """
+    Design (once) the anti-aliasing FIR filter for resampling by ``up/down``.
+
+    Uses the same Kaiser-windowed design as ``scipy.signal.resample_poly``.
+
+    Returns:
+        Read-only filter taps scaled by ``up``
+    """
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    taps = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)) * up
+    taps.setflags(write=False)
+    return taps
+
+
+class StreamingResampler:
+    """
+    Polyphase resampler that keeps filter state across chunks.
+
+    Resampling chunk by chunk with ``resample_poly`` introduces edge artifacts
+    at every chunk boundary; this class carries the filter history forward so
+    the output is continuous. Output is delayed by the filter's group delay.
+    """
+
+    def __init__(self, orig_sr: int, target_sr: int) -> None:
+        divisor = gcd(orig_sr, target_sr)
+        self.orig_sr = orig_sr
+        self.target_sr = target_sr
+        self.up = target_sr // divisor
+        self.down = orig_sr // divisor
+        self.passthrough = self.up == self.down
+
+        if not self.passthrough:
+            self.taps = polyphase_filter(self.up, self.down)
+            # Zero history before the stream starts; start index is a multiple of
+            # `down` so output indices stay aligned with the global output grid.
+            blocks = -(-len(self.taps) // (self.up * self.down))
+            pad = blocks * self.down
+            self._history = np.zeros(pad, dtype=np.float64)
+            self._start = -pad
+            self._next_output = 0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Resample the next chunk of the stream.
+
+        Args:
+            samples: Mono samples at ``orig_sr``
+
+        Returns:
+            Mono float32 samples at ``target_sr``
+        """
+        if self.passthrough or len(samples) == 0:
+            return np.asarray(samples, dtype=np.float32)
+
+        buf = np.concatenate([self._history, samples])
+        end = self._start + len(buf)
+
+        # Outputs whose contributing inputs have all arrived
+        last_output = (end * self.up - 1) // self.down
+        count = last_output - self._next_output + 1
+
+        filtered = upfirdn(self.taps, buf, self.up, self.down)
+        offset = self._next_output - (self._start * self.up) // self.down
+        out = filtered[offset : offset + count]
+        self._next_output += count
+
+        # Keep only the history the next output still needs
+        keep_from = (self._next_output * self.down - len(self.taps) + 1) // self.up
+        keep_from = max(self._start, (keep_from // self.down) * self.down)
+        self._history = buf[keep_from - self._start :]
+        self._start = keep_from
+
+        return out.astype(np.float32)
+
+
+class StreamDecoder:
+    """
+    Per-connection decoder for framed (or legacy raw) audio messages.
+
+    Tracks sequence numbers, decodes PCM/Opus payloads, downmixes to mono and
+    resamples to the target sample rate.
+    """
+
+    def __init__(self, target_sample_rate: int) -> None:
+        self.target_sample_rate = target_sample_rate
+        self.codec: AudioCodec | None = None
+        self.input_sample_rate: int | None = None
+        self.channels: int | None = None
+
+        self._resampler: StreamingResampler | None = None
+        self._opus_decoder: Any = None  # opuslib.Decoder for Opus streams
+        self._last_sequence: int | None = None
+        self._last_frame_samples = 0
+        self._pending_gap = 0
+
+        self.frames_received = 0
+        self.frames_lost = 0
+        self.frames_discarded = 0
+        self.bytes_received = 0
+
+    def decode(self, data: bytes) -> np.ndarray:
+        """
+        Decode one WebSocket message into mono float32 samples.
+
+        Args:
+            data: Raw binary message
+
+        Returns:
+            Samples at ``target_sample_rate`` (empty if the frame was discarded)
+
+        Raises:
+            StreamProtocolError: If the message cannot be decoded
+        """
+        self.bytes_received += len(data)
+        header, payload = parse_frame(data)
+
+        if header is None:
+            # Legacy protocol: raw float32 mono at the target rate
+            if len(payload) % 4:
+                raise StreamProtocolError("Raw float32 payload length must be a multiple of 4")
+            self.frames_received += 1
+            return np.frombuffer(payload, dtype=np.float32)
+
+        if not self._accept_sequence(header.sequence):
+            self.frames_discarded += 1
+            return np.array([], dtype=np.float32)
+
+        self._configure(header)
+        samples = self._decode_payload(header, payload)
+        self.frames_received += 1
+
+        # Fill lost frames with silence so the stream timeline stays intact
+        fill = 0
+        if self._pending_gap and self._last_frame_samples:
+            max_fill = int(MAX_GAP_FILL_SECONDS * header.sample_rate)
+            fill = min(self._pending_gap * self._last_frame_samples, max_fill)
+        self._pending_gap = 0
+        self._last_frame_samples = len(samples)
+        if fill:
+            samples = np.concatenate([np.zeros(fill, dtype=np.float32), samples])
+
+        assert self._resampler is not None  # Created by _configure()
+        return self._resampler.process(samples)
+
+    def _accept_sequence(self, sequence: int) -> bool:
+        """Record a sequence number; returns False for duplicate or stale frames."""
+        if self._last_sequence is None:
+            self._last_sequence = sequence
+            return True
+
+        delta = (sequence - self._last_sequence) % SEQUENCE_MODULUS
+        if delta == 0 or delta > SEQUENCE_MODULUS // 2:
+            return False
+
+        if delta > 1:
+            self.frames_lost += delta - 1
+            self._pending_gap = delta - 1
+            logger.debug(f"Detected {delta - 1} lost audio frames before sequence {sequence}")
+
+        self._last_sequence = sequence
+        return True
+
+    def _configure(self, header: FrameHeader) -> None:
+        """(Re)create decoder state when the stream format changes."""
+        if (
+            header.codec == self.codec
+            and header.sample_rate == self.input_sample_rate
+            and header.channels == self.channels
+        ):
+            return
+
+        if header.codec == AudioCodec.OPUS:
+            if not OPUS_AVAILABLE:
+                raise StreamProtocolError("Opus frames are not supported (opuslib not installed)")
+            if header.sample_rate not in OPUS_SAMPLE_RATES:
+                raise StreamProtocolError(f"Unsupported Opus sample rate {header.sample_rate}")
+            self._opus_decoder = opuslib.Decoder(header.sample_rate, header.channels)
+        else:
+            self._opus_decoder = None
+
+        self.codec = header.codec
+        self.input_sample_rate = header.sample_rate
+        self.channels = header.channels
+        self._resampler = StreamingResampler(header.sample_rate, self.target_sample_rate)
+        self._last_frame_samples = 0
+
+    def _decode_payload(self, header: FrameHeader, payload: bytes) -> np.ndarray:
+        """Decode a payload to mono float32 at the frame's sample rate."""
+        if header.codec == AudioCodec.FLOAT32:
+            if len(payload) % (4 * header.channels):
+                raise StreamProtocolError("float32 payload is not a whole number of samples")
+            audio = np.frombuffer(payload, dtype="<f4").astype(np.float32)
+        elif header.codec == AudioCodec.INT16:
+            if len(payload) % (2 * header.channels):
+                raise StreamProtocolError("int16 payload is not a whole number of samples")
+            audio = np.frombuffer(payload, dtype="<i2").astype(np.float32) / 32768.0
+        else:
+            # Largest Opus frame is 120 ms
+            max_frame = header.sample_rate * 120 // 1000
+            if self._opus_decoder is None:
+                raise StreamProtocolError("Opus decoder is not configured")
+            try:
+                pcm = self._opus_decoder.decode(payload, max_frame)
+            except Exception as e:
+                raise StreamProtocolError(f"Invalid Opus frame: {e}") from e
+            audio = np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+
+        if header.channels > 1:
+            audio = audio.reshape(-1, header.channels).mean(axis=1)
+        return audio
+
+    def get_stats(self) -> dict:
+        """Get decoder statistics."""
+        return {
+            "codec": self.codec.name.lower() if self.codec is not None else "raw_float32",
+            "input_sample_rate": self.input_sample_rate or self.target_sample_rate,
+            "input_channels": self.channels or 1,
+            "frames_received": self.frames_received,
+            "frames_lost": self.frames_lost,
+            "frames_discarded": self.frames_discarded,
+            "bytes_received": self.bytes_received,
+        }
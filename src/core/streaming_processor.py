@@ -1,22 +1,61 @@
 """Streaming audio processor for real-time fingerprint matching."""
 
+import asyncio
 import logging
 import time
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
+from config.settings import Config
 from src.core.audio_fingerprinting import AudioFingerprinter
+from src.core.incremental_fingerprinting import IncrementalFingerprinter
+from src.core.match_index import StreamingMatchIndex, get_match_index
+from src.core.stream_protocol import StreamDecoder
 
 logger = logging.getLogger(__name__)
 
+# Shared, bounded pool for CPU/DB work so streams never block the event loop
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_streaming_executor() -> ThreadPoolExecutor:
+    """Get (or lazily create) the executor used for streaming fingerprint work."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=Config.STREAMING_MAX_WORKERS,
+            thread_name_prefix="soundhash-stream",
+        )
+    return _executor
+
+
+def shutdown_streaming_executor() -> None:
+    """Shut down the streaming executor (called on application shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def warm_match_index() -> None:
+    """
+    Start loading the match index for the default stream configuration.
+
+    Called at application startup, so the full fingerprint load runs in the
+    background before the first stream instead of delaying its matches.
+    """
+    StreamingAudioProcessor().match_index.ensure_loaded()
+
 
 class StreamingAudioProcessor:
     """
     Process streaming audio in real-time for fingerprint matching.
 
     Maintains a sliding buffer of audio data and periodically extracts
-    fingerprints to find matches in the database.
+    fingerprints to find matches in the database. Spectral frames are computed
+    incrementally, so each hop only analyses the newly received audio.
     """
 
     def __init__(
@@ -38,51 +77,97 @@ class StreamingAudioProcessor:
         self.hop_size = int(sample_rate * hop_duration)
         self.audio_buffer: deque = deque(maxlen=self.buffer_size)
         self.fingerprinter = AudioFingerprinter(sample_rate=sample_rate)
+        self.incremental = IncrementalFingerprinter(self.fingerprinter, self.buffer_size)
+        self.decoder = StreamDecoder(target_sample_rate=sample_rate)
         self.total_matches = 0
         self.samples_processed = 0
+        self.samples_since_process = 0
         self.last_process_time = time.time()
 
+        # Backpressure bookkeeping
+        self.task: asyncio.Task | None = None
+        self.pending_since: float | None = None
+        self.hops_processed = 0
+        self.hops_dropped = 0
+        self.last_lag_seconds = 0.0
+        self.last_processing_ms = 0.0
+
     def add_audio(self, audio_chunk: bytes) -> None:
         """
         Add audio chunk to buffer.
 
         Args:
-            audio_chunk: Raw audio data as bytes (expected to be float32)
+            audio_chunk: Framed audio message (see ``src.core.stream_protocol``)
+                or legacy raw float32 mono audio at ``sample_rate``
         """
         try:
-            # Convert bytes to numpy array (assumes float32 format)
-            audio_array = np.frombuffer(audio_chunk, dtype=np.float32)
+            # Decode, downmix and resample to the fingerprinting rate
+            audio_array = self.decoder.decode(audio_chunk)
             self.audio_buffer.extend(audio_array)
+            self.incremental.append(audio_array)
             self.samples_processed += len(audio_array)
+            self.samples_since_process += len(audio_array)
+            if self.pending_since is None and self.should_process():
+                self.pending_since = time.time()
         except Exception as e:
             logger.error(f"Error adding audio to buffer: {e}")
             raise
 
     def should_process(self) -> bool:
-        """Check if buffer has enough data to process."""
-        return len(self.audio_buffer) >= self.hop_size
+        """Check if at least one hop of new audio has arrived since the last run."""
+        return self.samples_since_process >= self.hop_size
 
     def get_buffer_array(self) -> np.ndarray:
         """Convert buffer to numpy array."""
         return np.array(self.audio_buffer, dtype=np.float32)
 
+    @property
+    def queue_depth(self) -> int:
+        """Number of whole hops received but not yet analysed."""
+        return self.samples_since_process // self.hop_size if self.hop_size else 0
+
+    @property
+    def is_processing(self) -> bool:
+        """Whether a processing run is currently in flight."""
+        return self.task is not None and not self.task.done()
+
+    @property
+    def match_index(self) -> StreamingMatchIndex:
+        """The worker's shared match index for this stream's fingerprint configuration."""
+        return get_match_index(
+            self.fingerprinter,
+            self.incremental.max_frames * self.incremental.num_ranges,
+        )
+
+    def _compute_fingerprint(self) -> dict:
+        """Analyse newly buffered audio and build the window fingerprint (runs off-loop)."""
+        self.incremental.update()
+        return self.incremental.get_fingerprint()
+
     async def process_buffer(self) -> list[dict]:
         """
         Extract fingerprint from current buffer and find matches.
 
+        The STFT and match lookup run on the shared streaming executor. If
+        several hops have accumulated since the last run they are coalesced
+        into a single run over the latest window.
+
         Returns:
             List of matching videos with similarity scores
         """
         if not self.should_process():
             return []
 
-        try:
-            # Convert buffer to numpy array
-            audio = self.get_buffer_array()
+        started = time.time()
+        ready_since = self.pending_since or started
+        self.hops_dropped += max(0, self.queue_depth - 1)
+        self.samples_since_process = 0
+        self.pending_since = None
 
-            # Extract fingerprint
-            fingerprint_result = self.fingerprinter.extract_fingerprint_from_audio(
-                audio, self.sample_rate
+        try:
+            loop = asyncio.get_running_loop()
+            fingerprint_result = await loop.run_in_executor(
+                get_streaming_executor(), self._compute_fingerprint
             )
 
             # Find matches using the fingerprint
@@ -93,6 +178,9 @@ class StreamingAudioProcessor:
                 logger.info(f"Found {len(matches)} matches in buffer")
 
             self.last_process_time = time.time()
+            self.hops_processed += 1
+            self.last_processing_ms = (self.last_process_time - started) * 1000
+            self.last_lag_seconds = self.last_process_time - ready_since
             return matches
 
         except Exception as e:
@@ -101,7 +189,12 @@ class StreamingAudioProcessor:
 
     async def find_matches(self, fingerprint: dict) -> list[dict]:
         """
-        Find matches for the fingerprint in database.
+        Find matches for the fingerprint in the worker's shared match index.
+
+        Candidates come from an in-memory LSH index shared by the worker and
+        refreshed in the background, so there is no database round trip on the
+        hot path; only metadata for matched videos is looked up (through an
+        LRU cache). The lookup runs on the streaming executor.
 
         Args:
             fingerprint: Fingerprint data dictionary
@@ -109,74 +202,53 @@ class StreamingAudioProcessor:
         Returns:
             List of matching videos with metadata
         """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_streaming_executor(), self._find_matches_sync, fingerprint
+        )
+
+    def _find_matches_sync(self, fingerprint: dict) -> list[dict]:
+        """Blocking implementation of :meth:`find_matches`."""
         try:
-            from src.database.connection import db_manager
-            from src.database.models import AudioFingerprint, Video
-
-            session = db_manager.get_session()
-
-            try:
-                # Get fingerprint hash for initial filtering
-                fp_hash = fingerprint.get('fingerprint_hash')
-                compact_fp = fingerprint.get('compact_fingerprint')
-
-                if fp_hash is None or compact_fp is None:
-                    return []
-
-                # Query similar fingerprints (exact hash match for now)
-                # In production, this would use more sophisticated similarity search
-                similar_fps = (
-                    session.query(AudioFingerprint, Video)
-                    .join(Video, AudioFingerprint.video_id == Video.id)
-                    .filter(AudioFingerprint.fingerprint_hash == fp_hash)
-                    .limit(10)
-                    .all()
-                )
-
-                matches = []
-                for fp, video in similar_fps:
-                    # Deserialize the stored fingerprint to compare
-                    try:
-                        stored_fp_data = self.fingerprinter.deserialize_fingerprint(
-                            fp.fingerprint_data
-                        )
-                        stored_compact = stored_fp_data.get('compact_fingerprint')
-
-                        # Calculate actual similarity score
-                        if stored_compact is not None and compact_fp is not None:
-                            similarity_result = self.fingerprinter.compare_fingerprints(
-                                compact_fp,
-                                stored_compact,
-                                return_dict=True
-                            )
-                            similarity_score = similarity_result.get('combined_score', 0.0)
-                        else:
-                            # Fallback if fingerprints can't be compared
-                            similarity_score = 0.5
-                    except Exception as e:
-                        logger.warning(f"Error comparing fingerprints: {e}")
-                        similarity_score = 0.5
-
-                    matches.append({
-                        "video_id": video.video_id,
-                        "title": video.title,
-                        "url": video.url,
-                        "thumbnail_url": video.thumbnail_url,
-                        "start_time": fp.start_time,
-                        "end_time": fp.end_time,
-                        "similarity_score": similarity_score,
-                        "confidence": fp.confidence_score or 0.9,
-                    })
-
-                return matches
-
-            finally:
-                session.close()
+            compact_fp = fingerprint.get('compact_fingerprint')
+            if compact_fp is None or len(compact_fp) == 0:
+                return []
+
+            index = self.match_index
+            if not index.ensure_loaded():
+                return []
+
+            results = index.search(fingerprint, limit=10)
+            if not results:
+                return []
+
+            videos = index.get_video_metadata({r["video_id"] for r in results})
+
+            matches = []
+            for result in results:
+                video = videos.get(result["video_id"])
+                if video is None:
+                    continue
+                matches.append({
+                    **video,
+                    "start_time": result["start_time"],
+                    "end_time": result["end_time"],
+                    "similarity_score": result["score"],
+                    "confidence": result["confidence"] or 0.9,
+                })
+
+            return matches
 
         except Exception as e:
             logger.error(f"Error finding matches: {e}")
             return []
 
+    def current_lag_seconds(self) -> float:
+        """Age of the oldest unanalysed hop, or the last observed lag if caught up."""
+        if self.pending_since is not None:
+            return time.time() - self.pending_since
+        return self.last_lag_seconds
+
     def get_stats(self) -> dict:
         """Get processing statistics."""
         return {
@@ -184,6 +256,14 @@ class StreamingAudioProcessor:
             "buffer_capacity": self.buffer_size,
             "samples_processed": self.samples_processed,
             "total_matches": self.total_matches,
+            "frames_computed": self.incremental.frames_computed,
+            "queue_depth": self.queue_depth,
+            "processing": self.is_processing,
+            "hops_processed": self.hops_processed,
+            "hops_dropped": self.hops_dropped,
+            "lag_seconds": self.current_lag_seconds(),
+            "last_processing_ms": self.last_processing_ms,
+            **self.decoder.get_stats(),
             "duration_seconds": self.samples_processed / self.sample_rate if self.sample_rate else 0,
         }
 
@@ -213,8 +293,21 @@ async def process_audio_chunk(client_id: str, audio_chunk: bytes):
         # Add audio to buffer
         processor.add_audio(audio_chunk)
 
-        # Process buffer if ready
-        if processor.should_process():
+        # Start a processing run unless one is already in flight; audio that
+        # arrives meanwhile is coalesced into the next run.
+        if processor.should_process() and not processor.is_processing:
+            processor.task = asyncio.create_task(_drain_processor(client_id, processor))
+    except Exception as e:
+        logger.error(f"Error processing audio chunk for {client_id}: {e}")
+        await manager.send_error(client_id, f"Processing error: {str(e)}")
+
+
+async def _drain_processor(client_id: str, processor: StreamingAudioProcessor):
+    """Process a client's buffer until it has caught up with received audio."""
+    from src.api.websocket import manager
+
+    try:
+        while processor.should_process():
             matches = await processor.process_buffer()
 
             if matches:
@@ -224,13 +317,30 @@ async def process_audio_chunk(client_id: str, audio_chunk: bytes):
                     "timestamp": time.time(),
                     "stats": processor.get_stats()
                 })
+    except asyncio.CancelledError:
+        raise
     except Exception as e:
-        logger.error(f"Error processing audio chunk for {client_id}: {e}")
+        logger.error(f"Error processing audio for {client_id}: {e}")
         await manager.send_error(client_id, f"Processing error: {str(e)}")
 
 
+def get_executor_stats() -> dict:
+    """Get aggregate backpressure statistics across all streams."""
+    return {
+        "max_workers": Config.STREAMING_MAX_WORKERS,
+        "active_runs": sum(1 for p in processors.values() if p.is_processing),
+        "total_queue_depth": sum(p.queue_depth for p in processors.values()),
+        "total_hops_dropped": sum(p.hops_dropped for p in processors.values()),
+        "max_lag_seconds": max(
+            (p.current_lag_seconds() for p in processors.values()), default=0.0
+        ),
+    }
+
+
 def cleanup_processor(client_id: str):
     """Clean up processor when client disconnects."""
     if client_id in processors:
-        del processors[client_id]
+        processor = processors.pop(client_id)
+        if processor.task is not None and not processor.task.done():
+            processor.task.cancel()
         logger.info(f"Cleaned up processor for {client_id}")
@@ -2,11 +2,13 @@ import os
 import random
 import subprocess
 import time
+from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 from config.logging_config import create_section_logger
 from config.settings import Config
+from src.core.ytdlp_pool import DownloadError, get_ytdlp_pool, ytdlp_in_process_enabled
 
 if TYPE_CHECKING:
     from src.api.youtube_service import YouTubeAPIService
@@ -74,6 +76,9 @@ class VideoProcessor:
         # Empty string means "checked but not available", None means "not checked yet"
         self._cached_cookies_browser: str | None = None
 
+        # In-process yt-dlp instances are reused, so they keep one user agent
+        self._ytdlp_user_agent = self._get_random_user_agent()
+
         # Try to initialize YouTube API service if not provided
         if not self.youtube_service and YOUTUBE_API_AVAILABLE:
             try:
@@ -195,11 +200,92 @@ class VideoProcessor:
             "webpage_url": parts[10] if parts[10] != "NA" else None,
         }
 
+    def _video_info_from_ytdlp(self, info: dict[str, Any]) -> dict[str, Any]:
+        """
+        Map an in-process yt-dlp info dictionary to the fields of
+        :meth:`_parse_video_info_output`.
+        """
+        thumbnail = info.get("thumbnail")
+        if not thumbnail and info.get("thumbnails"):
+            thumbnail = info["thumbnails"][-1].get("url")
+        duration = info.get("duration")
+
+        return {
+            "id": info.get("id"),
+            "title": info.get("title"),
+            "description": info.get("description"),
+            "duration": int(duration) if duration is not None else None,
+            "upload_date": info.get("upload_date"),
+            "view_count": info.get("view_count"),
+            "like_count": info.get("like_count"),
+            "channel": info.get("channel"),
+            "channel_id": info.get("channel_id"),
+            "thumbnail": thumbnail,
+            "webpage_url": info.get("webpage_url"),
+        }
+
+    def _ytdlp_options(self, **options: Any) -> dict[str, Any]:
+        """
+        Build in-process YoutubeDL options mirroring the CLI flags (cache, proxy,
+        player client, cookies) plus ``options``.
+        """
+        ydl_opts: dict[str, Any] = {
+            "http_headers": {"User-Agent": self._ytdlp_user_agent},
+            "cachedir": Config.YT_DLP_CACHE_DIR if Config.ENABLE_YT_DLP_CACHE else False,
+            **options,
+        }
+
+        if Config.USE_PROXY and (Config.PROXY_URL or Config.PROXY_LIST):
+            proxy = self._get_proxy()
+            if proxy:
+                ydl_opts["proxy"] = proxy
+
+        if Config.YT_PLAYER_CLIENT:
+            ydl_opts["extractor_args"] = {"youtube": {"player_client": [Config.YT_PLAYER_CLIENT]}}
+
+        # Cookies: settings-driven > cookies file > auto-detect (detected once per processor)
+        if getattr(Config, "YT_COOKIES_FILE", None) and os.path.exists(str(Config.YT_COOKIES_FILE)):
+            ydl_opts["cookiefile"] = str(Config.YT_COOKIES_FILE)
+        elif getattr(Config, "YT_COOKIES_FROM_BROWSER", None):
+            ydl_opts["cookiesfrombrowser"] = (
+                str(Config.YT_COOKIES_FROM_BROWSER),
+                getattr(Config, "YT_BROWSER_PROFILE", None) or None,
+                None,
+                None,
+            )
+        else:
+            browser = self._detect_browser_cookies()
+            if browser:
+                ydl_opts["cookiesfrombrowser"] = (browser, None, None, None)
+
+        return ydl_opts
+
+    def _download_video_info_in_process(self, url: str, **options: Any) -> dict[str, Any] | None:
+        """
+        Extract video metadata with a pooled in-process YoutubeDL instance.
+        Format selection is skipped (``process=False``); only metadata is read.
+        """
+        try:
+            info = get_ytdlp_pool().extract_info(
+                url, self._ytdlp_options(noplaylist=True, **options), process=False
+            )
+            return self._video_info_from_ytdlp(info) if info else None
+        except DownloadError as e:
+            self.logger.error(f"yt-dlp extraction failed for {url}: {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"Error extracting video info from {url}: {str(e)}")
+            return None
+
     def download_video_info(self, url: str) -> dict[str, Any] | None:
         """
-        Extract video metadata without downloading using enhanced subprocess approach.
-        Returns video information dictionary.
+        Extract video metadata without downloading.
+        Uses the in-process yt-dlp pool when enabled, otherwise the enhanced
+        subprocess approach. Returns video information dictionary.
         """
+        if ytdlp_in_process_enabled():
+            return self._download_video_info_in_process(url, extractor_retries=2)
+
         try:
             # Enhanced command with anti-detection measures
             cmd = [
@@ -248,11 +334,17 @@ class VideoProcessor:
             self.logger.error(f"Error extracting video info from {url}: {str(e)}")
             return None
 
-    def download_video_audio(self, url: str, max_retries: int = 3) -> str | None:
+    def download_video_audio(
+        self, url: str, max_retries: int = 3, start_time: float = 0.0
+    ) -> str | None:
         """
         Download video and extract audio with enhanced anti-detection measures.
         Downloads audio in best available format, then converts to WAV separately.
         Returns path to the extracted audio file.
+
+        With ``start_time`` > 0 only the audio from that offset onwards is
+        downloaded (used to resume a partially fingerprinted video); the
+        returned file then starts at ``start_time`` of the video.
         """
         # Extract video ID from URL
         video_id = url.split("v=")[-1].split("&")[0] if "v=" in url else url.split("/")[-1]
@@ -272,93 +364,10 @@ class VideoProcessor:
 
                 downloaded_file = Path(self.temp_dir) / f"{video_id}.%(ext)s"
 
-                # Enhanced yt-dlp command with anti-detection measures
-                cmd = [
-                    "yt-dlp",
-                    "-f",
-                    "bestaudio",  # best audio format available
-                    "-o",
-                    str(downloaded_file),  # output template
-                    "--user-agent",
-                    self._get_random_user_agent(),  # Random user agent
-                    "--sleep-interval",
-                    "1",  # Sleep between downloads
-                    "--max-sleep-interval",
-                    "3",  # Maximum sleep interval
-                    "--extractor-retries",
-                    "3",  # Retry extraction on failure
-                    "--fragment-retries",
-                    "3",  # Retry fragments on failure
-                    "--retry-sleep",
-                    "exp=1:5",  # Exponential backoff for retries
-                ]
-
-                # Add cache directory if caching is enabled
-                if Config.ENABLE_YT_DLP_CACHE:
-                    cmd.extend(["--cache-dir", Config.YT_DLP_CACHE_DIR])
-
-                # Add proxy if configured
-                if Config.USE_PROXY and (Config.PROXY_URL or Config.PROXY_LIST):
-                    proxy = self._get_proxy()
-                    if proxy:
-                        cmd.extend(["--proxy", proxy])
-                        self.logger.debug(f"Using proxy: {proxy}")
-
-                # Configure extractor args and cookies (settings-driven > cookies file > auto-detect)
-                if Config.YT_PLAYER_CLIENT:
-                    cmd.extend(
-                        ["--extractor-args", f"youtube:player_client={Config.YT_PLAYER_CLIENT}"]
-                    )
-
-                cookies_configured = False
-
-                # Use explicit cookies file if provided
-                if getattr(Config, "YT_COOKIES_FILE", None) and os.path.exists(
-                    str(Config.YT_COOKIES_FILE)
-                ):
-                    cmd.extend(["--cookies", str(Config.YT_COOKIES_FILE)])
-                    cookies_configured = True
-                    self.logger.debug(f"Using cookies file: {Config.YT_COOKIES_FILE}")
-
-                # Use explicit cookies-from-browser if provided
-                elif getattr(Config, "YT_COOKIES_FROM_BROWSER", None):
-                    browser_arg = str(Config.YT_COOKIES_FROM_BROWSER)
-                    if getattr(Config, "YT_BROWSER_PROFILE", None):
-                        browser_arg = (
-                            f"{Config.YT_COOKIES_FROM_BROWSER}:{Config.YT_BROWSER_PROFILE}"
-                        )
-                    cmd.extend(["--cookies-from-browser", browser_arg])
-                    cookies_configured = True
-                    self.logger.debug(f"Using cookies from browser: {browser_arg}")
-
-                # Fallback auto-detection of available browsers
-                if not cookies_configured:
-                    try:
-                        for browser in ["chrome", "chromium", "brave", "edge", "firefox"]:
-                            test_cmd = [
-                                "yt-dlp",
-                                "--cookies-from-browser",
-                                browser,
-                                "--simulate",
-                                "--quiet",
-                                url,
-                            ]
-                            test_result = subprocess.run(test_cmd, capture_output=True, timeout=5)
-                            if test_result.returncode == 0:
-                                cmd.extend(["--cookies-from-browser", browser])
-                                self.logger.debug(f"Using {browser} cookies (auto)")
-                                cookies_configured = True
-                                break
-                    except Exception:
-                        self.logger.debug("Auto-detect cookies-from-browser failed")
-
-                # Append URL last
-                cmd.append(url)
-
-                self.logger.debug(
-                    f"Running yt-dlp command: {' '.join(cmd[:8])}..."
-                )  # Don't log full command with user agent
-                subprocess.run(cmd, check=True, capture_output=True, text=True, timeout=600)
+                if ytdlp_in_process_enabled():
+                    self._download_audio_in_process(url, downloaded_file, start_time)
+                else:
+                    self._download_audio_subprocess(url, downloaded_file, start_time)
 
                 # Find the actual downloaded file
                 actual_file = None
@@ -398,15 +407,17 @@ class VideoProcessor:
                         continue
                     return None
 
-            except subprocess.CalledProcessError as e:
+            except (subprocess.CalledProcessError, DownloadError) as e:
                 self.logger.error(f"yt-dlp command failed (attempt {attempt + 1}): {e}")
                 err_text = ""
-                if e.stderr:
-                    self.logger.error(f"yt-dlp stderr: {e.stderr}")
+                # In-process failures carry the yt-dlp error message instead of stderr
+                stderr = e.stderr if isinstance(e, subprocess.CalledProcessError) else str(e)
+                if stderr:
+                    self.logger.error(f"yt-dlp stderr: {stderr}")
                     err_text = (
-                        e.stderr
-                        if isinstance(e.stderr, str)
-                        else e.stderr.decode("utf-8", errors="ignore")
+                        stderr
+                        if isinstance(stderr, str)
+                        else stderr.decode("utf-8", errors="ignore")
                     )
                     if "Sign in to confirm you’re not a bot" in err_text or "not a bot" in err_text:
                         self.logger.error(
@@ -415,7 +426,7 @@ class VideoProcessor:
                             "2) Set YT_COOKIES_FROM_BROWSER (e.g., chrome|chromium|firefox) and optionally YT_BROWSER_PROFILE; "
                             "3) Configure a proxy via USE_PROXY/PROXY_URL; 4) Retry later."
                         )
-                if e.stdout:
+                if getattr(e, "stdout", None):
                     self.logger.error(f"yt-dlp stdout: {e.stdout}")
 
                 # Detect specific error types and provide targeted remediation
@@ -501,6 +512,125 @@ class VideoProcessor:
 
         return None
 
+    def _download_audio_in_process(
+        self, url: str, downloaded_file: Path, start_time: float = 0.0
+    ) -> None:
+        """
+        Download the best audio stream to ``downloaded_file`` with a pooled
+        in-process YoutubeDL instance. Raises DownloadError on failure.
+        """
+        call_params: dict[str, Any] = {"outtmpl": {"default": str(downloaded_file)}}
+
+        # Resume: fetch only the part of the video that still needs fingerprinting
+        if start_time > 0:
+            from yt_dlp.utils import download_range_func
+
+            call_params["download_ranges"] = download_range_func(None, [(start_time, float("inf"))])
+
+        options = self._ytdlp_options(
+            format="bestaudio", extractor_retries=3, fragment_retries=3, noplaylist=True
+        )
+        get_ytdlp_pool().extract_info(url, options, download=True, call_params=call_params)
+
+    def _download_audio_subprocess(
+        self, url: str, downloaded_file: Path, start_time: float = 0.0
+    ) -> None:
+        """
+        Download the best audio stream to ``downloaded_file`` with the yt-dlp CLI.
+        Raises CalledProcessError or TimeoutExpired on failure.
+        """
+        # Enhanced yt-dlp command with anti-detection measures
+        cmd = [
+            "yt-dlp",
+            "-f",
+            "bestaudio",  # best audio format available
+            "-o",
+            str(downloaded_file),  # output template
+            "--user-agent",
+            self._get_random_user_agent(),  # Random user agent
+            "--sleep-interval",
+            "1",  # Sleep between downloads
+            "--max-sleep-interval",
+            "3",  # Maximum sleep interval
+            "--extractor-retries",
+            "3",  # Retry extraction on failure
+            "--fragment-retries",
+            "3",  # Retry fragments on failure
+            "--retry-sleep",
+            "exp=1:5",  # Exponential backoff for retries
+        ]
+
+        # Resume: fetch only the part of the video that still needs fingerprinting
+        if start_time > 0:
+            cmd.extend(["--download-sections", f"*{start_time:g}-inf"])
+
+        # Add cache directory if caching is enabled
+        if Config.ENABLE_YT_DLP_CACHE:
+            cmd.extend(["--cache-dir", Config.YT_DLP_CACHE_DIR])
+
+        # Add proxy if configured
+        if Config.USE_PROXY and (Config.PROXY_URL or Config.PROXY_LIST):
+            proxy = self._get_proxy()
+            if proxy:
+                cmd.extend(["--proxy", proxy])
+                self.logger.debug(f"Using proxy: {proxy}")
+
+        # Configure extractor args and cookies (settings-driven > cookies file > auto-detect)
+        if Config.YT_PLAYER_CLIENT:
+            cmd.extend(
+                ["--extractor-args", f"youtube:player_client={Config.YT_PLAYER_CLIENT}"]
+            )
+
+        cookies_configured = False
+
+        # Use explicit cookies file if provided
+        if getattr(Config, "YT_COOKIES_FILE", None) and os.path.exists(
+            str(Config.YT_COOKIES_FILE)
+        ):
+            cmd.extend(["--cookies", str(Config.YT_COOKIES_FILE)])
+            cookies_configured = True
+            self.logger.debug(f"Using cookies file: {Config.YT_COOKIES_FILE}")
+
+        # Use explicit cookies-from-browser if provided
+        elif getattr(Config, "YT_COOKIES_FROM_BROWSER", None):
+            browser_arg = str(Config.YT_COOKIES_FROM_BROWSER)
+            if getattr(Config, "YT_BROWSER_PROFILE", None):
+                browser_arg = (
+                    f"{Config.YT_COOKIES_FROM_BROWSER}:{Config.YT_BROWSER_PROFILE}"
+                )
+            cmd.extend(["--cookies-from-browser", browser_arg])
+            cookies_configured = True
+            self.logger.debug(f"Using cookies from browser: {browser_arg}")
+
+        # Fallback auto-detection of available browsers
+        if not cookies_configured:
+            try:
+                for browser in ["chrome", "chromium", "brave", "edge", "firefox"]:
+                    test_cmd = [
+                        "yt-dlp",
+                        "--cookies-from-browser",
+                        browser,
+                        "--simulate",
+                        "--quiet",
+                        url,
+                    ]
+                    test_result = subprocess.run(test_cmd, capture_output=True, timeout=5)
+                    if test_result.returncode == 0:
+                        cmd.extend(["--cookies-from-browser", browser])
+                        self.logger.debug(f"Using {browser} cookies (auto)")
+                        cookies_configured = True
+                        break
+            except Exception:
+                self.logger.debug("Auto-detect cookies-from-browser failed")
+
+        # Append URL last
+        cmd.append(url)
+
+        self.logger.debug(
+            f"Running yt-dlp command: {' '.join(cmd[:8])}..."
+        )  # Don't log full command with user agent
+        subprocess.run(cmd, check=True, capture_output=True, text=True, timeout=600)
+
     def _get_random_user_agent(self) -> str:
         """Get a random user agent to avoid detection"""
         user_agents = [
@@ -550,12 +680,16 @@ class VideoProcessor:
             raise
 
     def segment_audio(
-        self, audio_file: str, segment_length: int | None = None
+        self, audio_file: str, segment_length: int | None = None, start_offset: float = 0.0
     ) -> list[tuple[str, float, float]]:
         """
         Split audio file into segments for processing.
         Returns list of (segment_file_path, start_time, end_time) tuples.
 
+        ``start_offset`` is the position of the audio file within the video
+        (non-zero for resumed downloads); it is added to the returned times so
+        they are always relative to the start of the video.
+
         Logs progress per segment including count and durations.
         """
         if not os.path.exists(audio_file):
@@ -596,7 +730,7 @@ class VideoProcessor:
                 )
 
                 if success:
-                    segments.append((segment_file, start_time, end_time))
+                    segments.append((segment_file, start_offset + start_time, start_offset + end_time))
                     self.logger.debug(
                         f"Created segment {segment_id + 1}: {start_time:.2f}s - {end_time:.2f}s "
                         f"(duration: {actual_duration:.2f}s)"
@@ -720,32 +854,64 @@ class VideoProcessor:
         # Fallback to yt-dlp subprocess
         return self._get_channel_videos_ytdlp(channel_id, max_results)
 
+    def get_new_channel_videos(
+        self,
+        channel_id: str,
+        last_video_id: str | None,
+        last_upload_date: datetime | None = None,
+        etag: str | None = None,
+        max_results: int | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Get the videos uploaded to a channel since the previous sync.
+        Listing stops at the previous sync's watermark instead of enumerating
+        the whole channel. Uses the Data API when available (conditional on the
+        uploads playlist ETag), falling back to yt-dlp.
+        Returns (new video information dictionaries, uploads playlist ETag).
+        """
+        if self.youtube_service:
+            try:
+                videos, new_etag = self.youtube_service.get_new_channel_videos(
+                    channel_id, last_video_id, last_upload_date, etag, max_results
+                )
+                if videos is not None:
+                    self.logger.info(
+                        f"Retrieved {len(videos)} new videos via YouTube Data API for channel {channel_id}"
+                    )
+                    return videos, new_etag
+            except Exception as e:
+                self.logger.warning(f"YouTube Data API failed for channel {channel_id}: {e}")
+
+        videos = self._get_channel_videos_ytdlp(
+            channel_id, max_results, stop_at_video_id=last_video_id
+        )
+        return videos, None
+
     def process_video_for_fingerprinting(
-        self, video_url: str, cleanup_segments: bool | None = None
+        self, video_url: str, cleanup_segments: bool | None = None, start_time: float = 0.0
     ) -> list[tuple[str, float, float]] | None:
         """
         Complete pipeline: download video, extract audio, and create segments.
-        Returns list of (segment_file, start_time, end_time) or None if failed.
+        Returns list of (segment_file, start_time, end_time), empty if the
+        downloaded audio yields no segments, or None if the download failed.
 
         Args:
             video_url: URL of the video to process
             cleanup_segments: Whether to clean up segment files after processing.
                              If None, uses Config.CLEANUP_SEGMENTS_AFTER_PROCESSING
+            start_time: Skip the video up to this offset (seconds) when resuming
         """
         audio_file = None
         segments = []
 
         try:
             # Download audio
-            audio_file = self.download_video_audio(video_url)
+            audio_file = self.download_video_audio(video_url, start_time=start_time)
             if not audio_file:
                 return None
 
             # Segment audio
-            segments = self.segment_audio(audio_file)
-
-            if not segments:
-                return None
+            segments = self.segment_audio(audio_file, start_offset=start_time)
 
             # This is where fingerprinting would happen - for now just return the segments
             # In a real implementation, you'd process each segment for fingerprinting here
@@ -820,7 +986,10 @@ class VideoProcessor:
             return None
 
     def _download_video_info_ytdlp(self, url: str) -> dict[str, Any] | None:
-        """Fallback method using yt-dlp subprocess for video info"""
+        """Fallback method using yt-dlp (in-process pool or subprocess) for video info"""
+        if ytdlp_in_process_enabled():
+            return self._download_video_info_in_process(url)
+
         try:
             # Use subprocess to get video info with cookies from browser to avoid bot detection
             cmd = [
@@ -854,9 +1023,13 @@ class VideoProcessor:
             return None
 
     def _get_channel_videos_ytdlp(
-        self, channel_id: str, max_results: int | None = None
+        self, channel_id: str, max_results: int | None = None, stop_at_video_id: str | None = None
     ) -> list[dict[str, Any]]:
-        """Fallback method using yt-dlp subprocess for channel videos"""
+        """
+        Fallback method using yt-dlp subprocess for channel videos.
+        With ``stop_at_video_id`` only the videos listed before it (newer
+        uploads) are returned and yt-dlp stops paging the channel there.
+        """
         try:
             channel_url = f"https://www.youtube.com/channel/{channel_id}/videos"
 
@@ -869,6 +1042,10 @@ class VideoProcessor:
             if max_results is not None and max_results != float("inf"):
                 cmd.extend(["--playlist-end", str(max_results)])
 
+            # Stop listing at the newest video seen by the previous sync
+            if stop_at_video_id:
+                cmd.extend(["--break-match-filters", f"id!={stop_at_video_id}"])
+
             # Use cached browser cookie detection
             browser = self._detect_browser_cookies()
             if browser:
@@ -878,6 +1055,8 @@ class VideoProcessor:
             result = subprocess.run(cmd, check=True, capture_output=True, text=True, timeout=60)
 
             video_ids = result.stdout.strip().split("\n") if result.stdout.strip() else []
+            if stop_at_video_id in video_ids:
+                video_ids = video_ids[: video_ids.index(stop_at_video_id)]
             self.logger.info(f"Found {len(video_ids)} video IDs for channel {channel_id}")
 
             # Get video info for each ID
@@ -0,0 +1,194 @@
+"""
+In-process yt-dlp extraction pool.
+
+Running the ``yt-dlp`` CLI once per call pays interpreter start-up and
+extractor loading every time (about a second), which dominates metadata-only
+lookups. The pool keeps warm :class:`yt_dlp.YoutubeDL` instances instead: one
+per worker thread and option set, reused across calls. All instances built
+from the same cookie source share one cookie jar (browser cookies are
+decrypted once) and yt-dlp's on-disk cache directory. A semaphore bounds how
+many extractions run at once and a per-host limiter spaces out the calls made
+to each site.
+"""
+
+import logging
+import threading
+import time
+from typing import Any
+from urllib.parse import urlparse
+
+from config.settings import Config
+
+try:
+    import yt_dlp
+    from yt_dlp.utils import DownloadError
+
+    YT_DLP_AVAILABLE = True
+except ImportError:
+    YT_DLP_AVAILABLE = False
+
+    class DownloadError(Exception):  # type: ignore[no-redef]
+        """Placeholder so callers can catch DownloadError without yt-dlp installed."""
+
+
+logger = logging.getLogger(__name__)
+
+# Options every pooled instance gets; yt-dlp output goes through our logger
+_BASE_OPTIONS: dict[str, Any] = {
+    "quiet": True,
+    "no_warnings": True,
+    "noprogress": True,
+    "logger": logging.getLogger("yt_dlp"),
+}
+
+_pool: "YtDlpPool | None" = None
+_pool_lock = threading.Lock()
+
+
+class HostRateLimiter:
+    """Space out calls to the same host to at most ``requests_per_second``."""
+
+    def __init__(self, requests_per_second: float) -> None:
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> float:
+        """Block until a call to ``url``'s host may start; returns the time waited."""
+        host = urlparse(url).hostname or ""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class YtDlpPool:
+    """Thread-local, reusable YoutubeDL instances with bounded concurrency."""
+
+    def __init__(self, max_concurrent: int, requests_per_second: float) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            max_concurrent: Maximum extractions/downloads running at once
+            requests_per_second: Maximum calls started per second for each host
+        """
+        self.max_concurrent = max_concurrent
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cookiejars: dict[tuple[Any, Any], Any] = {}
+        self._instances: list[Any] = []
+
+    @property
+    def instance_count(self) -> int:
+        """Number of YoutubeDL instances created so far (across all threads)."""
+        return len(self._instances)
+
+    def extract_info(
+        self,
+        url: str,
+        options: dict[str, Any],
+        download: bool = False,
+        process: bool = True,
+        call_params: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Run ``YoutubeDL.extract_info`` on this thread's instance for ``options``.
+
+        Args:
+            url: Video URL
+            options: YoutubeDL options; calls with equal options share an instance
+            download: Download the media as well as extracting its metadata
+            process: Resolve formats and references (``False`` skips format
+                selection, enough for metadata-only lookups)
+            call_params: Options that only apply to this call (e.g. ``outtmpl``)
+
+        Returns:
+            yt-dlp info dictionary
+
+        Raises:
+            DownloadError: If extraction or download fails
+        """
+        with self._slots:
+            self.rate_limiter.wait(url)
+            ydl = self._get_instance(options)
+            saved = {key: ydl.params.get(key) for key in call_params or {}}
+            ydl.params.update(call_params or {})
+            try:
+                return ydl.extract_info(url, download=download, process=process)
+            finally:
+                ydl.params.update(saved)
+
+    def close(self) -> None:
+        """Close every instance, saving cookies back to any cookie file."""
+        with self._lock:
+            instances, self._instances = self._instances, []
+            self._cookiejars.clear()
+        for ydl in instances:
+            try:
+                ydl.close()
+            except Exception as e:
+                logger.debug(f"Error closing yt-dlp instance: {e}")
+        self._local = threading.local()
+
+    def _get_instance(self, options: dict[str, Any]) -> Any:
+        """Get (or create) this thread's YoutubeDL instance for ``options``."""
+        instances = getattr(self._local, "instances", None)
+        if instances is None:
+            instances = self._local.instances = {}
+
+        key = repr(sorted(options.items()))
+        ydl = instances.get(key)
+        if ydl is None:
+            ydl = yt_dlp.YoutubeDL({**_BASE_OPTIONS, **options})
+            self._share_cookies(ydl, options)
+            instances[key] = ydl
+            with self._lock:
+                self._instances.append(ydl)
+        return ydl
+
+    def _share_cookies(self, ydl: Any, options: dict[str, Any]) -> None:
+        """Give ``ydl`` the jar already loaded for its cookie source, or load it once."""
+        source = (options.get("cookiefile"), repr(options.get("cookiesfrombrowser")))
+        with self._lock:
+            jar = self._cookiejars.get(source)
+            if jar is None:
+                # Loading may decrypt a browser profile; do it once under the lock
+                self._cookiejars[source] = ydl.cookiejar
+            else:
+                ydl.cookiejar = jar
+
+
+def ytdlp_in_process_enabled() -> bool:
+    """Whether yt-dlp calls should run in-process rather than as a CLI subprocess."""
+    return Config.YT_DLP_IN_PROCESS and YT_DLP_AVAILABLE
+
+
+def get_ytdlp_pool() -> YtDlpPool:
+    """Get (or lazily create) the shared yt-dlp pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = YtDlpPool(
+                max_concurrent=Config.YT_DLP_MAX_CONCURRENT,
+                requests_per_second=Config.YT_DLP_REQUESTS_PER_SECOND,
+            )
+            logger.info(
+                f"Started in-process yt-dlp pool ({Config.YT_DLP_MAX_CONCURRENT} concurrent)"
+            )
+        return _pool
+
+
+def shutdown_ytdlp_pool() -> None:
+    """Close the shared yt-dlp pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
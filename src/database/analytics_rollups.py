@@ -0,0 +1,387 @@
+"""
+Minute and hour rollups of the analytics log tables.
+
+:func:`roll_up_analytics` aggregates the rows of ``api_usage_logs`` and
+``analytics_events`` into per-minute totals, then folds completed hours of
+minute totals into per-hour totals. Each rollup only processes the range past
+its watermark in ``analytics_rollup_state``, so every raw row is read once.
+
+Queries for a time range combine the three sources: hour totals for whole
+rolled-up hours, minute totals for the rolled-up minutes around them, and the
+raw rows for the partial minutes at the edges and everything newer than the
+minute watermark (:func:`split_range`).
+"""
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    DateTime,
+    Select,
+    Subquery,
+    case,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    type_coerce,
+    union_all,
+)
+from sqlalchemy.orm import Session
+
+from .models import (
+    AnalyticsEvent,
+    AnalyticsEventRollup,
+    AnalyticsRollupState,
+    APIUsageLog,
+    APIUsageRollup,
+)
+
+logger = logging.getLogger(__name__)
+
+_STEPS = {"minute": timedelta(minutes=1), "hour": timedelta(hours=1)}
+
+
+@dataclass(frozen=True)
+class RollupSpec:
+    """How one raw table is rolled up."""
+
+    name: str
+    source: Any
+    time_column: str
+    rollup: Any
+    dimensions: tuple[str, ...]
+    # Labelled aggregates over the source rows, keyed by rollup column
+    measures: Callable[[], dict[str, ColumnElement]]
+
+
+API_USAGE = RollupSpec(
+    name="api_usage",
+    source=APIUsageLog,
+    time_column="timestamp",
+    rollup=APIUsageRollup,
+    dimensions=("tenant_id", "user_id", "endpoint", "status_code"),
+    measures=lambda: {
+        "request_count": func.count(),
+        "response_time_sum": func.coalesce(func.sum(APIUsageLog.response_time_ms), 0),
+        "response_time_count": func.count(APIUsageLog.response_time_ms),
+    },
+)
+
+ANALYTICS_EVENTS = RollupSpec(
+    name="analytics_events",
+    source=AnalyticsEvent,
+    time_column="created_at",
+    rollup=AnalyticsEventRollup,
+    dimensions=("tenant_id", "user_id", "event_category"),
+    measures=lambda: {"event_count": func.count()},
+)
+
+ROLLUPS = (API_USAGE, ANALYTICS_EVENTS)
+
+
+def truncate_datetime(value: datetime, unit: str) -> datetime:
+    """Truncate ``value`` to the start of its minute, hour, day, week (Monday) or month."""
+    value = value.replace(second=0, microsecond=0)
+    if unit == "minute":
+        return value
+    value = value.replace(minute=0)
+    if unit == "hour":
+        return value
+    value = value.replace(hour=0)
+    if unit == "week":
+        return value - timedelta(days=value.weekday())
+    if unit == "month":
+        return value.replace(day=1)
+    return value
+
+
+def _ceil(value: datetime, unit: str) -> datetime:
+    truncated = truncate_datetime(value, unit)
+    return truncated if truncated == value else truncated + _STEPS[unit]
+
+
+def _utc_naive(value: datetime) -> datetime:
+    """Timestamps are stored as naive UTC."""
+    return value.astimezone(UTC).replace(tzinfo=None) if value.tzinfo else value
+
+
+def bucket_expression(column: Any, unit: str, dialect_name: str) -> ColumnElement:
+    """SQL expression truncating a timestamp column to its minute or hour."""
+    if dialect_name == "sqlite":
+        # Same text format SQLAlchemy stores SQLite datetimes in
+        fmt = "%Y-%m-%d %H:%M:00.000000" if unit == "minute" else "%Y-%m-%d %H:00:00.000000"
+        return type_coerce(func.strftime(fmt, column), DateTime)
+    # Inline the unit so the expression in GROUP BY matches the select list
+    return func.date_trunc(literal_column(f"'{unit}'"), column)
+
+
+def split_range(
+    start: datetime,
+    end: datetime,
+    minute_mark: datetime | None,
+    hour_mark: datetime | None,
+) -> list[tuple[str, datetime, datetime]]:
+    """
+    Split ``[start, end]`` into pieces answered by each source.
+
+    Args:
+        start: Range start (inclusive)
+        end: Range end (inclusive)
+        minute_mark: Minute rollups cover everything before this (None if never run)
+        hour_mark: Hour rollups cover everything before this (None if never run)
+
+    Returns:
+        (source, piece start, piece end) tuples in order, where source is 'raw',
+        'minute' or 'hour'. Pieces are half-open except the last, which is raw
+        and includes ``end``.
+    """
+    start, end = _utc_naive(start), _utc_naive(end)
+    if minute_mark is None:
+        return [("raw", start, end)]
+
+    first_minute = _ceil(start, "minute")
+    rolled_end = min(truncate_datetime(end, "minute"), minute_mark)
+    if first_minute >= rolled_end:
+        return [("raw", start, end)]
+
+    pieces = []
+    if start < first_minute:
+        pieces.append(("raw", start, first_minute))
+
+    first_hour = _ceil(first_minute, "hour")
+    hours_end = min(truncate_datetime(rolled_end, "hour"), hour_mark) if hour_mark else None
+    if hours_end and first_hour < hours_end:
+        if first_minute < first_hour:
+            pieces.append(("minute", first_minute, first_hour))
+        pieces.append(("hour", first_hour, hours_end))
+        if hours_end < rolled_end:
+            pieces.append(("minute", hours_end, rolled_end))
+    else:
+        pieces.append(("minute", first_minute, rolled_end))
+
+    pieces.append(("raw", rolled_end, end))
+    return pieces
+
+
+def watermarks(rows: list[Any], spec: RollupSpec) -> tuple[datetime | None, datetime | None]:
+    """(minute, hour) watermarks of ``spec`` from analytics_rollup_state rows."""
+    marks = {row.name: row.rolled_up_to for row in rows}
+    return marks.get(f"{spec.name}:minute"), marks.get(f"{spec.name}:hour")
+
+
+def _piece_select(
+    spec: RollupSpec,
+    piece: tuple[str, datetime, datetime],
+    last: bool,
+    raw_columns: Callable[[Any], list[ColumnElement]],
+    rollup_columns: Callable[[Any], list[ColumnElement]],
+    scope: dict[str, int],
+    dialect_name: str,
+) -> Select:
+    source, lo, hi = piece
+    if source == "raw":
+        model = spec.source
+        timestamp = getattr(model, spec.time_column)
+        bucket = bucket_expression(timestamp, "minute", dialect_name)
+        query = select(bucket.label("bucket_start"), *raw_columns(model)).where(
+            timestamp >= lo, timestamp <= hi if last else timestamp < hi
+        )
+    else:
+        model = spec.rollup
+        query = select(model.bucket_start, *rollup_columns(model)).where(
+            model.granularity == source, model.bucket_start >= lo, model.bucket_start < hi
+        )
+    return query.where(*(getattr(model, name) == value for name, value in scope.items()))
+
+
+def _combined(
+    spec: RollupSpec,
+    pieces: list[tuple[str, datetime, datetime]],
+    raw_columns: Callable[[Any], list[ColumnElement]],
+    rollup_columns: Callable[[Any], list[ColumnElement]],
+    scope: dict[str, int],
+    dialect_name: str,
+) -> Subquery:
+    selects = [
+        _piece_select(
+            spec, piece, i == len(pieces) - 1, raw_columns, rollup_columns, scope, dialect_name
+        )
+        for i, piece in enumerate(pieces)
+    ]
+    return (union_all(*selects) if len(selects) > 1 else selects[0]).subquery()
+
+
+def api_usage_rows(
+    pieces: list[tuple[str, datetime, datetime]], scope: dict[str, int], dialect_name: str
+) -> Subquery:
+    """
+    API usage over ``pieces`` as one subquery of per-minute totals.
+
+    Columns: bucket_start, endpoint, status_code, request_count,
+    response_time_sum, response_time_count. Rows are not unique per key;
+    aggregate with SUM.
+
+    Args:
+        pieces: Output of :func:`split_range`
+        scope: Column values every row must match (user_id, tenant_id)
+        dialect_name: Database dialect name
+    """
+    return _combined(
+        API_USAGE,
+        pieces,
+        lambda log: [
+            log.endpoint,
+            log.status_code,
+            literal(1).label("request_count"),
+            func.coalesce(log.response_time_ms, 0).label("response_time_sum"),
+            case((log.response_time_ms.is_(None), 0), else_=1).label("response_time_count"),
+        ],
+        lambda rollup: [
+            rollup.endpoint,
+            rollup.status_code,
+            rollup.request_count,
+            rollup.response_time_sum,
+            rollup.response_time_count,
+        ],
+        scope,
+        dialect_name,
+    )
+
+
+def analytics_event_rows(
+    pieces: list[tuple[str, datetime, datetime]], scope: dict[str, int], dialect_name: str
+) -> Subquery:
+    """
+    Analytics events over ``pieces`` as one subquery of per-minute counts.
+
+    Columns: bucket_start, event_category, user_id, event_count. See
+    :func:`api_usage_rows`.
+    """
+    return _combined(
+        ANALYTICS_EVENTS,
+        pieces,
+        lambda event: [event.event_category, event.user_id, literal(1).label("event_count")],
+        lambda rollup: [rollup.event_category, rollup.user_id, rollup.event_count],
+        scope,
+        dialect_name,
+    )
+
+
+def _lock_state(
+    session: Session, name: str, initial: Callable[[], datetime]
+) -> AnalyticsRollupState:
+    state = session.get(AnalyticsRollupState, name, with_for_update=True)
+    if state is None:
+        state = AnalyticsRollupState(name=name, rolled_up_to=initial())
+        session.add(state)
+        session.flush()
+    return state
+
+
+def _roll_up(
+    session: Session,
+    spec: RollupSpec,
+    granularity: str,
+    source: Any,
+    timestamp: Any,
+    measures: dict[str, ColumnElement],
+    lo: datetime,
+    hi: datetime,
+    *criteria: Any,
+) -> None:
+    dialect_name = session.get_bind().dialect.name
+    bucket = bucket_expression(timestamp, granularity, dialect_name)
+    dimensions = [getattr(source, name) for name in spec.dimensions]
+    query = (
+        select(literal(granularity), bucket, *dimensions, *measures.values())
+        .where(timestamp >= lo, timestamp < hi, *criteria)
+        .group_by(bucket, *dimensions)
+    )
+    columns = ["granularity", "bucket_start", *spec.dimensions, *measures]
+    session.execute(insert(spec.rollup).from_select(columns, query))
+
+
+def roll_up_spec(session: Session, spec: RollupSpec, upto: datetime) -> tuple[datetime, datetime]:
+    """
+    Roll up ``spec`` through the minute ``upto`` (exclusive) and the hours it completes.
+
+    Runs in the session's transaction without committing; the watermark rows
+    are locked so concurrent runs serialize.
+
+    Returns:
+        The new (minute, hour) watermarks
+    """
+    upto = truncate_datetime(_utc_naive(upto), "minute")
+    timestamp = getattr(spec.source, spec.time_column)
+
+    def first_row_minute() -> datetime:
+        first = session.execute(select(func.min(timestamp))).scalar()
+        return truncate_datetime(first, "minute") if first else upto
+
+    minute_state = _lock_state(session, f"{spec.name}:minute", first_row_minute)
+    hour_state = _lock_state(
+        session,
+        f"{spec.name}:hour",
+        lambda: truncate_datetime(minute_state.rolled_up_to, "hour"),
+    )
+
+    if minute_state.rolled_up_to < upto:
+        _roll_up(
+            session,
+            spec,
+            "minute",
+            spec.source,
+            timestamp,
+            spec.measures(),
+            minute_state.rolled_up_to,
+            upto,
+        )
+        minute_state.rolled_up_to = upto
+
+    hours_upto = truncate_datetime(minute_state.rolled_up_to, "hour")
+    if hour_state.rolled_up_to < hours_upto:
+        rollup = spec.rollup
+        _roll_up(
+            session,
+            spec,
+            "hour",
+            rollup,
+            rollup.bucket_start,
+            {name: func.sum(getattr(rollup, name)) for name in spec.measures()},
+            hour_state.rolled_up_to,
+            hours_upto,
+            rollup.granularity == "minute",
+        )
+        hour_state.rolled_up_to = hours_upto
+
+    return minute_state.rolled_up_to, hour_state.rolled_up_to
+
+
+def roll_up_analytics(
+    session: Session, delay_seconds: float, now: datetime | None = None
+) -> dict[str, tuple[datetime, datetime]]:
+    """
+    Roll up all analytics tables and commit.
+
+    Args:
+        session: Database session
+        delay_seconds: Only roll up minutes that ended at least this long ago,
+            so rows written late (buffered or slow writers) are not missed
+        now: Current time (defaults to now, UTC)
+
+    Returns:
+        New (minute, hour) watermarks by rollup name
+    """
+    now = now or datetime.now(UTC)
+    upto = _utc_naive(now) - timedelta(seconds=delay_seconds)
+    marks = {spec.name: roll_up_spec(session, spec, upto) for spec in ROLLUPS}
+    session.commit()
+
+    logger.debug(f"Rolled up analytics: {marks}")
+    return marks
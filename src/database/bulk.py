@@ -0,0 +1,153 @@
+"""
+Bulk row writer for large, append-only batches.
+
+``Session.bulk_save_objects(..., return_defaults=True)`` builds an ORM object
+per row and, to hand primary keys back, inserts them one ``INSERT ...
+RETURNING`` at a time. :func:`bulk_insert` takes plain column dictionaries
+instead. On PostgreSQL through psycopg 3 it streams them with ``COPY ... FROM
+STDIN (FORMAT BINARY)``; on other dialects and drivers it issues a single
+executemany ``INSERT``. Primary keys are only fetched when asked for.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import Table, insert, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.schema import CallableColumnDefault, ScalarElementColumnDefault
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL type OIDs that need datetime values normalised before binary COPY
+TIMESTAMP_OID = 1114
+TIMESTAMPTZ_OID = 1184
+
+
+def bulk_insert(
+    session: Session, model: Any, rows: list[dict[str, Any]], return_ids: bool = False
+) -> list[int]:
+    """
+    Insert ``rows`` into ``model``'s table in the session's transaction.
+
+    Columns missing from a row, or given as ``None``, get the column's
+    Python-side default (as with ORM inserts); columns without one are NULL
+    or take their server default. The caller commits.
+
+    Args:
+        session: Session whose transaction the rows are written in
+        model: Mapped class (or Table) to insert into
+        rows: Column values per row
+        return_ids: Fetch the primary keys of the inserted rows
+
+    Returns:
+        Primary keys of the inserted rows in input order if ``return_ids``,
+        otherwise an empty list
+    """
+    if not rows:
+        return []
+
+    table: Table = getattr(model, "__table__", model)
+    rows = _complete_rows(table, rows)
+    bind = session.get_bind()
+    if bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg":
+        return _copy_rows(session, table, rows, return_ids)
+
+    if return_ids:
+        pk = _primary_key(table)
+        stmt = insert(table).returning(pk, sort_by_parameter_order=True)
+        return list(session.scalars(stmt, rows))
+    session.execute(insert(table), rows)
+    return []
+
+
+def _primary_key(table: Table) -> Any:
+    (pk,) = table.primary_key.columns
+    return pk
+
+
+def _complete_rows(table: Table, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Give every row the same columns, filling in Python-side defaults."""
+    names = {name for row in rows for name in row}
+    defaults: dict[str, Any] = {}
+    for column in table.columns:
+        if column.primary_key:
+            continue
+        default = column.default
+        if isinstance(default, ScalarElementColumnDefault):
+            defaults[column.name] = default.arg
+        elif isinstance(default, CallableColumnDefault):
+            # Evaluated once, so e.g. every row in the batch shares created_at; there
+            # is no execution context, which zero-argument defaults never see anyway
+            defaults[column.name] = default.arg(None)  # type: ignore[arg-type]
+    names.update(defaults)
+
+    return [
+        {name: row[name] if row.get(name) is not None else defaults.get(name) for name in names}
+        for row in rows
+    ]
+
+
+def _copy_rows(
+    session: Session, table: Table, rows: list[dict[str, Any]], return_ids: bool
+) -> list[int]:
+    """Stream ``rows`` into ``table`` with binary COPY on the session's connection."""
+    from psycopg import sql
+
+    connection = session.connection()
+    pk = _primary_key(table)
+    ids: list[int] = []
+    if return_ids:
+        # COPY cannot return generated keys, so reserve them up front
+        ids = list(
+            connection.scalars(
+                text(
+                    "SELECT nextval(pg_get_serial_sequence(:table, :column)) "
+                    "FROM generate_series(1, :count)"
+                ),
+                {"table": table.fullname, "column": pk.name, "count": len(rows)},
+            )
+        )
+        rows = [{**row, pk.name: id_} for row, id_ in zip(rows, ids, strict=True)]
+
+    # Binary COPY does no casting, so send values as the columns' actual types
+    oids: dict[str, int] = dict(
+        connection.execute(
+            text(
+                "SELECT attname, atttypid FROM pg_attribute "
+                "WHERE attrelid = CAST(:table AS regclass) AND attnum > 0 AND NOT attisdropped"
+            ),
+            {"table": table.fullname},
+        )
+        .tuples()
+        .all()
+    )
+    names = list(rows[0])
+    types = [oids[name] for name in names]
+    statement = sql.SQL("COPY {} ({}) FROM STDIN (FORMAT BINARY)").format(
+        sql.Identifier(*table.fullname.split(".")),
+        sql.SQL(", ").join(sql.Identifier(name) for name in names),
+    )
+
+    driver_connection = connection.connection.driver_connection
+    assert driver_connection is not None
+    with driver_connection.cursor() as cursor:
+        with cursor.copy(statement) as copy:
+            copy.set_types(types)
+            for row in rows:
+                copy.write_row(
+                    [_copy_value(row[name], oid) for name, oid in zip(names, types, strict=True)]
+                )
+
+    logger.debug(f"Copied {len(rows)} rows into {table.fullname}")
+    return ids
+
+
+def _copy_value(value: Any, oid: int) -> Any:
+    """Match datetime awareness to the column type, as the server would on INSERT."""
+    if isinstance(value, datetime):
+        if oid == TIMESTAMP_OID and value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        if oid == TIMESTAMPTZ_OID and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+    return value
@@ -1,16 +1,166 @@
+import asyncio
 import importlib.util
+import logging
+import time
+from typing import Any
 
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Engine, create_engine, make_url, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session as SQLASession
 from sqlalchemy.orm import sessionmaker
 
 from config.settings import Config
 
+logger = logging.getLogger(__name__)
+
+# Replication lag of a PostgreSQL standby in seconds (0 on a primary, or when
+# the standby has replayed everything it received)
+REPLICA_LAG_SQL = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+def _create_sync_engine(database_url: str) -> Engine:
+    """Create a pooled engine for ``database_url`` with the configured pool settings."""
+    # Auto-select driver if none specified and appropriate driver is available
+    if database_url.startswith("postgresql://"):
+        driver: str | None = None
+        if importlib.util.find_spec("psycopg2") is not None:
+            driver = "psycopg2"
+        elif importlib.util.find_spec("psycopg") is not None:
+            driver = "psycopg"
+        if driver:
+            database_url = database_url.replace("postgresql://", f"postgresql+{driver}://", 1)
+    from sqlalchemy.pool import QueuePool
+
+    # Build connect_args with statement timeout (a PostgreSQL server option)
+    connect_args = {}
+    if database_url.startswith("postgresql"):
+        connect_args = {"options": f"-c statement_timeout={Config.DATABASE_STATEMENT_TIMEOUT}"}
+
+    return create_engine(
+        database_url,
+        poolclass=QueuePool,
+        pool_size=Config.DATABASE_POOL_SIZE,
+        max_overflow=Config.DATABASE_MAX_OVERFLOW,
+        pool_timeout=Config.DATABASE_POOL_TIMEOUT,
+        pool_recycle=Config.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=True,  # Verify connections before using
+        echo=Config.DATABASE_ECHO,
+        connect_args=connect_args,
+    )
+
+
+def _create_async_engine(database_url: str) -> AsyncEngine:
+    """Create an async engine for ``database_url``, swapping in an async driver."""
+    scheme, _, rest = database_url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+
+    engine_args: dict[str, Any] = {"echo": Config.DATABASE_ECHO}
+    if dialect == "postgresql":
+        driver = "asyncpg" if importlib.util.find_spec("asyncpg") is not None else "psycopg"
+        database_url = f"postgresql+{driver}://{rest}"
+        timeout = Config.DATABASE_STATEMENT_TIMEOUT
+        connect_args: dict[str, Any]
+        if driver == "asyncpg":
+            connect_args = {"server_settings": {"statement_timeout": str(timeout)}}
+        else:
+            connect_args = {"options": f"-c statement_timeout={timeout}"}
+        engine_args.update(
+            pool_size=Config.DATABASE_POOL_SIZE,
+            max_overflow=Config.DATABASE_MAX_OVERFLOW,
+            pool_timeout=Config.DATABASE_POOL_TIMEOUT,
+            pool_recycle=Config.DATABASE_POOL_RECYCLE,
+            pool_pre_ping=True,
+            connect_args=connect_args,
+        )
+    elif dialect == "sqlite":
+        database_url = f"sqlite+aiosqlite://{rest}"
+
+    return create_async_engine(database_url, **engine_args)
+
+
+class ReadReplica:
+    """A read replica: its engines (created on first use) and last health check."""
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.engine: Engine | None = None
+        self.Session: sessionmaker[SQLASession] | None = None
+        self.async_engine: AsyncEngine | None = None
+        self.AsyncSession: async_sessionmaker[AsyncSession] | None = None
+
+        # Unusable until a health check has passed
+        self.healthy = False
+        self.lag_seconds: float | None = None
+        self.error: str | None = None
+
+    @property
+    def safe_url(self) -> str:
+        """URL with the password masked for logging."""
+        return make_url(self.url).render_as_string(hide_password=True)
+
+    def usable(self, max_lag_seconds: float) -> bool:
+        """Whether reads may be sent here."""
+        return (
+            self.healthy and self.lag_seconds is not None and self.lag_seconds <= max_lag_seconds
+        )
+
+    def get_session(self) -> SQLASession:
+        """Get a new session on the replica"""
+        if not self.Session:
+            self.engine = _create_sync_engine(self.url)
+            self.Session = sessionmaker(bind=self.engine)
+        return self.Session()
+
+    def get_async_session(self) -> AsyncSession:
+        """Get a new async session on the replica"""
+        if not self.AsyncSession:
+            self.async_engine = _create_async_engine(self.url)
+            self.AsyncSession = async_sessionmaker(self.async_engine, expire_on_commit=False)
+        return self.AsyncSession()
+
+    def check(self) -> None:
+        """Connect and measure replication lag, recording the outcome."""
+        try:
+            with self.get_session() as session:
+                if session.get_bind().dialect.name == "postgresql":
+                    lag = session.execute(REPLICA_LAG_SQL).scalar()
+                else:
+                    session.execute(text("SELECT 1"))
+                    lag = 0
+            self.healthy, self.lag_seconds, self.error = True, float(lag or 0), None
+        except Exception as e:
+            self.healthy, self.lag_seconds, self.error = False, None, str(e)
+
+    def status(self) -> dict[str, Any]:
+        """Outcome of the last health check."""
+        return {
+            "url": self.safe_url,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "error": self.error,
+        }
+
 
 class DatabaseManager:
     def __init__(self) -> None:
         self.engine: Engine | None = None
         self.Session: sessionmaker[SQLASession] | None = None
+        self.async_engine: AsyncEngine | None = None
+        self.AsyncSession: async_sessionmaker[AsyncSession] | None = None
+        self.replicas: list[ReadReplica] | None = None
+        self._replicas_checked_at: float | None = None
+        self._replica_turn = 0
+        self._replica_check_task: asyncio.Task | None = None
 
     def initialize(self) -> None:
         """Initialize database connection.
@@ -18,36 +168,7 @@ class DatabaseManager:
         Note: Tables are created via Alembic migrations, not here.
         Use `alembic upgrade head` to create or update the schema.
         """
-        database_url = Config.get_database_url()
-
-        # Auto-select driver if none specified and appropriate driver is available
-        if database_url.startswith("postgresql://"):
-            driver: str | None = None
-            if importlib.util.find_spec("psycopg2") is not None:
-                driver = "psycopg2"
-            elif importlib.util.find_spec("psycopg") is not None:
-                driver = "psycopg"
-            if driver:
-                database_url = database_url.replace("postgresql://", f"postgresql+{driver}://", 1)
-        from sqlalchemy.pool import QueuePool
-
-        # Build connect_args with statement timeout
-        connect_args = {
-            "options": f"-c statement_timeout={Config.DATABASE_STATEMENT_TIMEOUT}"
-        }
-
-        self.engine = create_engine(
-            database_url,
-            poolclass=QueuePool,
-            pool_size=Config.DATABASE_POOL_SIZE,
-            max_overflow=Config.DATABASE_MAX_OVERFLOW,
-            pool_timeout=Config.DATABASE_POOL_TIMEOUT,
-            pool_recycle=Config.DATABASE_POOL_RECYCLE,
-            pool_pre_ping=True,  # Verify connections before using
-            echo=Config.DATABASE_ECHO,
-            connect_args=connect_args,
-        )
-
+        self.engine = _create_sync_engine(Config.get_database_url())
         self.Session = sessionmaker(bind=self.engine)
 
         # Note: Schema is managed by Alembic migrations
@@ -60,10 +181,120 @@ class DatabaseManager:
         assert self.Session is not None
         return self.Session()
 
+    def initialize_async(self) -> None:
+        """Initialize the async engine used by FastAPI routes.
+
+        PostgreSQL uses asyncpg when installed, otherwise psycopg's async mode;
+        SQLite uses aiosqlite. The pool settings match the sync engine, so each
+        API process may hold up to twice DATABASE_POOL_SIZE + DATABASE_MAX_OVERFLOW
+        connections.
+        """
+        self.async_engine = _create_async_engine(Config.get_database_url())
+        # Routes serialize ORM objects after commit; don't expire them (that would need IO)
+        self.AsyncSession = async_sessionmaker(self.async_engine, expire_on_commit=False)
+
+    def get_async_session(self) -> AsyncSession:
+        """Get a new async database session"""
+        if not self.AsyncSession:
+            self.initialize_async()
+        assert self.AsyncSession is not None
+        return self.AsyncSession()
+
+    def get_replicas(self) -> list[ReadReplica]:
+        """Read replicas configured in DATABASE_READER_ENDPOINTS."""
+        if self.replicas is None:
+            self.replicas = [
+                ReadReplica(url.strip()) for url in Config.DATABASE_READER_ENDPOINTS if url.strip()
+            ]
+        return self.replicas
+
+    def check_replicas(self) -> list[dict[str, Any]]:
+        """Health-check every replica and measure its lag.
+
+        Returns:
+            Status of each replica
+        """
+        max_lag = Config.DATABASE_REPLICA_MAX_LAG_SECONDS
+        for replica in self.get_replicas():
+            was_usable = replica.usable(max_lag)
+            replica.check()
+            if was_usable and not replica.usable(max_lag):
+                logger.warning(
+                    f"Read replica {replica.safe_url} taken out of rotation "
+                    f"(lag: {replica.lag_seconds}, error: {replica.error})"
+                )
+            elif replica.usable(max_lag) and not was_usable:
+                logger.info(f"Read replica {replica.safe_url} in rotation")
+        self._replicas_checked_at = time.monotonic()
+        return [replica.status() for replica in self.get_replicas()]
+
+    def _pick_replica(self) -> ReadReplica | None:
+        """Next usable replica in round-robin order, or None to read from the primary."""
+        usable = [
+            replica
+            for replica in self.get_replicas()
+            if replica.usable(Config.DATABASE_REPLICA_MAX_LAG_SECONDS)
+        ]
+        if not usable:
+            return None
+        self._replica_turn += 1
+        return usable[self._replica_turn % len(usable)]
+
+    def get_read_session(self) -> SQLASession:
+        """Get a session for read-only work.
+
+        Served by a healthy read replica lagging at most
+        DATABASE_REPLICA_MAX_LAG_SECONDS behind the primary, or by the primary
+        when there is none. Writes made through it fail on a replica.
+        """
+        if self.get_replicas() and (
+            self._replicas_checked_at is None
+            or time.monotonic() - self._replicas_checked_at >= Config.DATABASE_REPLICA_CHECK_SECONDS
+        ):
+            self.check_replicas()
+        replica = self._pick_replica()
+        return replica.get_session() if replica else self.get_session()
+
+    def get_async_read_session(self) -> AsyncSession:
+        """Get an async session for read-only work (see :meth:`get_read_session`).
+
+        Never checks replicas itself, so the event loop isn't blocked; the API
+        keeps their status current with :meth:`start_replica_checks`.
+        """
+        replica = self._pick_replica()
+        return replica.get_async_session() if replica else self.get_async_session()
+
+    async def start_replica_checks(self) -> None:
+        """Check replicas now and then every DATABASE_REPLICA_CHECK_SECONDS in the background."""
+        if not self.get_replicas() or self._replica_check_task is not None:
+            return
+        await asyncio.to_thread(self.check_replicas)
+        self._replica_check_task = asyncio.create_task(self._replica_check_loop())
+
+    async def _replica_check_loop(self) -> None:
+        while True:
+            await asyncio.sleep(Config.DATABASE_REPLICA_CHECK_SECONDS)
+            await asyncio.to_thread(self.check_replicas)
+
     def close(self) -> None:
         """Close database connection"""
         if self.engine:
             self.engine.dispose()
+        for replica in self.replicas or []:
+            if replica.engine:
+                replica.engine.dispose()
+
+    async def close_async(self) -> None:
+        """Close the async engine's connections"""
+        if self._replica_check_task is not None:
+            self._replica_check_task.cancel()
+            await asyncio.gather(self._replica_check_task, return_exceptions=True)
+            self._replica_check_task = None
+        if self.async_engine:
+            await self.async_engine.dispose()
+        for replica in self.replicas or []:
+            if replica.async_engine:
+                await replica.async_engine.dispose()
 
 
 # Global database manager instance
@@ -0,0 +1,239 @@
+"""
+Incrementally maintained fingerprint statistics.
+
+The fingerprint statistics endpoint used to aggregate the whole
+``audio_fingerprints`` table on every call. The totals are now kept in three
+small tables instead:
+
+- ``fingerprint_statistics_snapshot`` holds the totals as of the last
+  reconcile, and ``ledger_id``: the last ledger row they include.
+- ``fingerprint_statistics`` is a ledger the batch writers append to in the
+  same transaction that writes the fingerprints: one row per video per
+  write, with the totals of the fingerprints inserted. Rows are only ever
+  inserted, so concurrent writers never wait on each other.
+- ``fingerprint_statistics_videos`` holds the videos counted so far. A write
+  inserts its videos with ``ON CONFLICT DO NOTHING``; a ledger row has
+  ``new_videos = 1`` if its video was inserted, so ``total_videos`` is a sum
+  like the other totals.
+
+Readers (:func:`stats_statement`) add the ledger rows after ``ledger_id`` to
+the snapshot: one primary key lookup plus a range scan over the rows appended
+since the last reconcile, however many fingerprints and videos are stored.
+:func:`reconcile_fingerprint_stats` recounts from the table, writes a new
+snapshot and drops the ledger rows it covers. It runs periodically
+(``scripts/reconcile_fingerprint_stats.py``), which bounds the ledger and
+corrects drift from deletes and from rewritten segments whose totals changed.
+"""
+
+import logging
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import (
+    RowMapping,
+    Select,
+    cast,
+    delete,
+    func,
+    insert,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .models import (
+    AudioFingerprint,
+    FingerprintStatistics,
+    FingerprintStatisticsSnapshot,
+    FingerprintStatisticsVideo,
+)
+
+logger = logging.getLogger(__name__)
+
+# Totals recorded per ledger row; total_videos is derived when reading
+DELTA_COLUMNS = (
+    "total_fingerprints",
+    "confidence_sum",
+    "confidence_count",
+    "peaks_sum",
+    "peaks_count",
+    "duration_sum",
+)
+
+TOTAL_COLUMNS = ("total_fingerprints", "total_videos", *DELTA_COLUMNS[1:])
+
+
+def _fingerprint_aggregates() -> list[Any]:
+    """Per-column aggregates of audio_fingerprints in DELTA_COLUMNS order."""
+    return [
+        func.count(AudioFingerprint.id).label("total_fingerprints"),
+        func.coalesce(func.sum(AudioFingerprint.confidence_score), 0.0).label("confidence_sum"),
+        func.count(AudioFingerprint.confidence_score).label("confidence_count"),
+        func.coalesce(func.sum(AudioFingerprint.peak_count), 0).label("peaks_sum"),
+        func.count(AudioFingerprint.peak_count).label("peaks_count"),
+        func.coalesce(func.sum(AudioFingerprint.segment_length), 0.0).label("duration_sum"),
+    ]
+
+
+def totals_statement(*criteria: Any) -> Select:
+    """Aggregate the statistics totals over the fingerprints matching ``criteria``."""
+    return select(
+        func.count(func.distinct(AudioFingerprint.video_id)).label("total_videos"),
+        *_fingerprint_aggregates(),
+    ).where(*criteria)
+
+
+# The snapshot table holds a single row
+SNAPSHOT_ID = 1
+
+
+def stats_statement() -> Select:
+    """Add the ledger rows newer than the snapshot to it; same totals as :func:`totals_statement`."""
+    snapshot = FingerprintStatisticsSnapshot
+    ledger = FingerprintStatistics
+    watermark = select(snapshot.ledger_id).where(snapshot.id == SNAPSHOT_ID).scalar_subquery()
+    rows = union_all(
+        select(
+            snapshot.total_videos.label("total_videos"),
+            *(getattr(snapshot, name).label(name) for name in DELTA_COLUMNS),
+        ).where(snapshot.id == SNAPSHOT_ID),
+        select(
+            ledger.new_videos.label("total_videos"),
+            *(getattr(ledger, name).label(name) for name in DELTA_COLUMNS),
+        ).where(ledger.id > func.coalesce(watermark, 0)),
+    ).subquery()
+    return select(
+        # SUM of a bigint is numeric on PostgreSQL; keep the column types
+        *(
+            cast(func.coalesce(func.sum(rows.c[name]), 0), getattr(snapshot, name).type).label(name)
+            for name in TOTAL_COLUMNS
+        )
+    )
+
+
+def row_totals(rows: Iterable[dict[str, Any]]) -> dict[int, dict[str, Any]]:
+    """Statistics totals per video of fingerprint rows about to be written."""
+    totals: dict[int, dict[str, Any]] = {}
+    for row in rows:
+        video = totals.setdefault(row["video_id"], dict.fromkeys(DELTA_COLUMNS, 0))
+        video["total_fingerprints"] += 1
+        if row.get("confidence_score") is not None:
+            video["confidence_sum"] += row["confidence_score"]
+            video["confidence_count"] += 1
+        if row.get("peak_count") is not None:
+            video["peaks_sum"] += row["peak_count"]
+            video["peaks_count"] += 1
+        if row.get("segment_length") is not None:
+            video["duration_sum"] += row["segment_length"]
+    return totals
+
+
+def _insert(session: Session) -> Any:
+    """The dialect's INSERT construct, for ON CONFLICT DO NOTHING."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"Fingerprint statistics are not supported on {dialect}")
+
+
+def record_fingerprint_writes(session: Session, rows: list[dict[str, Any]]) -> None:
+    """
+    Append the totals of fingerprints inserted in the session's transaction.
+
+    Call after the rows are written, before committing. Pass only newly
+    inserted rows: a rewritten segment is fingerprinted with the same
+    parameters, so it normally has the totals of the row it replaces, and
+    reconciliation corrects it when not.
+
+    Args:
+        session: Session that wrote the fingerprints
+        rows: Fingerprint rows inserted
+    """
+    if not rows:
+        return
+
+    totals = row_totals(rows)
+    # Before the ledger, in the order reconcile locks the tables
+    new_videos = set(
+        session.scalars(
+            _insert(session)(FingerprintStatisticsVideo)
+            .values([{"video_id": video_id} for video_id in totals])
+            .on_conflict_do_nothing(index_elements=["video_id"])
+            .returning(FingerprintStatisticsVideo.video_id)
+        )
+    )
+    now = datetime.now(timezone.utc)
+    session.execute(
+        insert(FingerprintStatistics),
+        [
+            {
+                "video_id": video_id,
+                "new_videos": int(video_id in new_videos),
+                **video_totals,
+                "created_at": now,
+            }
+            for video_id, video_totals in totals.items()
+        ],
+    )
+
+
+def reconcile_fingerprint_stats(session: Session, commit: bool = True) -> RowMapping:
+    """
+    Recount the statistics from audio_fingerprints into a new snapshot.
+
+    Args:
+        session: Database session
+        commit: Commit the update (False when part of a larger transaction)
+
+    Returns:
+        The recounted totals
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        # Wait for writers with uncommitted statistics, and hold new ones back,
+        # so the recount, the snapshot and the counted videos describe the same
+        # fingerprints. Writers take the tables in the same order.
+        session.execute(
+            text(
+                "LOCK TABLE fingerprint_statistics_videos, fingerprint_statistics "
+                "IN EXCLUSIVE MODE"
+            )
+        )
+
+    snapshot = FingerprintStatisticsSnapshot
+    ledger_id = session.scalar(
+        select(
+            func.coalesce(
+                func.max(FingerprintStatistics.id),
+                select(snapshot.ledger_id).where(snapshot.id == SNAPSHOT_ID).scalar_subquery(),
+                0,
+            )
+        )
+    )
+    totals = session.execute(totals_statement()).mappings().one()
+
+    session.execute(delete(snapshot))
+    session.execute(
+        insert(snapshot).values(
+            id=SNAPSHOT_ID,
+            ledger_id=ledger_id,
+            reconciled_at=datetime.now(timezone.utc),
+            **totals,
+        )
+    )
+    session.execute(delete(FingerprintStatistics).where(FingerprintStatistics.id <= ledger_id))
+    session.execute(delete(FingerprintStatisticsVideo))
+    session.execute(
+        insert(FingerprintStatisticsVideo).from_select(
+            ["video_id"], select(AudioFingerprint.video_id).distinct()
+        )
+    )
+
+    if commit:
+        session.commit()
+    logger.debug(f"Reconciled fingerprint statistics: {totals['total_fingerprints']} fingerprints")
+    return totals
@@ -30,7 +30,13 @@ from .tenant import Tenant
 from .video import Channel, Video
 
 # Audio fingerprinting
-from .fingerprint import AudioFingerprint, MatchResult
+from .fingerprint import (
+    AudioFingerprint,
+    FingerprintStatistics,
+    FingerprintStatisticsSnapshot,
+    FingerprintStatisticsVideo,
+    MatchResult,
+)
 
 # Job processing
 from .job import ProcessingJob
@@ -62,7 +68,10 @@ from .onboarding import OnboardingProgress, TutorialProgress, UserPreference
 # Analytics and reporting
 from .analytics import (
     AnalyticsEvent,
+    AnalyticsEventRollup,
+    AnalyticsRollupState,
     APIUsageLog,
+    APIUsageRollup,
     CohortAnalysis,
     DashboardConfig,
     ReportConfig,
@@ -117,6 +126,9 @@ __all__ = [
     "Video",
     # Fingerprint
     "AudioFingerprint",
+    "FingerprintStatistics",
+    "FingerprintStatisticsSnapshot",
+    "FingerprintStatisticsVideo",
     "MatchResult",
     # Job
     "ProcessingJob",
@@ -152,6 +164,9 @@ __all__ = [
     "ReportConfig",
     "ScheduledReport",
     "APIUsageLog",
+    "APIUsageRollup",
+    "AnalyticsEventRollup",
+    "AnalyticsRollupState",
     "UserJourney",
     "CohortAnalysis",
     "RevenueMetric",
@@ -3,7 +3,18 @@
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
-from sqlalchemy import JSON, Boolean, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -12,13 +23,21 @@ if TYPE_CHECKING:
     from .auth import User
     from .tenant import Tenant
 
+# Row IDs of the high-volume log tables; SQLite only autoincrements INTEGER keys
+_LOG_ID = BigInteger().with_variant(Integer, "sqlite")
+
 
 class AnalyticsEvent(Base):  # type: ignore[misc,valid-type]
-    """Track analytics events for business intelligence."""
+    """Track analytics events for business intelligence.
+
+    On PostgreSQL the table is range-partitioned by month of created_at
+    (see src/database/partitions.py), with primary key (id, created_at).
+    """
 
     __tablename__ = "analytics_events"
+    __table_args__ = (Index("idx_analytics_events_created_at", "created_at"),)
 
-    id: Mapped[int] = mapped_column(primary_key=True)
+    id: Mapped[int] = mapped_column(_LOG_ID, primary_key=True)
     tenant_id: Mapped[int | None] = mapped_column(ForeignKey("tenants.id"))
     user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"))
 
@@ -145,11 +164,16 @@ class ScheduledReport(Base):  # type: ignore[misc,valid-type]
 
 
 class APIUsageLog(Base):  # type: ignore[misc,valid-type]
-    """Detailed API usage logs for analytics."""
+    """Detailed API usage logs for analytics.
+
+    On PostgreSQL the table is range-partitioned by day of timestamp
+    (see src/database/partitions.py), with primary key (id, timestamp).
+    """
 
     __tablename__ = "api_usage_logs"
+    __table_args__ = (Index("idx_api_usage_logs_timestamp", "timestamp"),)
 
-    id: Mapped[int] = mapped_column(primary_key=True)
+    id: Mapped[int] = mapped_column(_LOG_ID, primary_key=True)
     tenant_id: Mapped[int | None] = mapped_column(ForeignKey("tenants.id"))
     user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"))
     api_key_id: Mapped[int | None] = mapped_column(ForeignKey("api_keys.id"))
@@ -177,6 +201,58 @@ class APIUsageLog(Base):  # type: ignore[misc,valid-type]
     timestamp: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
 
 
+class APIUsageRollup(Base):  # type: ignore[misc,valid-type]
+    """API usage totals per minute or hour, rolled up from api_usage_logs."""
+
+    __tablename__ = "api_usage_rollups"
+    __table_args__ = (
+        Index("idx_api_usage_rollups_bucket", "granularity", "bucket_start"),
+    )
+
+    id: Mapped[int] = mapped_column(_LOG_ID, primary_key=True)
+    granularity: Mapped[str] = mapped_column(String(10))  # 'minute' or 'hour'
+    bucket_start: Mapped[datetime] = mapped_column()
+
+    # Dimensions (no foreign keys: totals outlive deleted users and tenants)
+    tenant_id: Mapped[int | None] = mapped_column()
+    user_id: Mapped[int | None] = mapped_column()
+    endpoint: Mapped[str] = mapped_column(String(500))
+    status_code: Mapped[int] = mapped_column()
+
+    # Totals
+    request_count: Mapped[int] = mapped_column(BigInteger)
+    response_time_sum: Mapped[int] = mapped_column(BigInteger)
+    response_time_count: Mapped[int] = mapped_column(BigInteger)
+
+
+class AnalyticsEventRollup(Base):  # type: ignore[misc,valid-type]
+    """Analytics event counts per minute or hour, rolled up from analytics_events."""
+
+    __tablename__ = "analytics_event_rollups"
+    __table_args__ = (
+        Index("idx_analytics_event_rollups_bucket", "granularity", "bucket_start"),
+    )
+
+    id: Mapped[int] = mapped_column(_LOG_ID, primary_key=True)
+    granularity: Mapped[str] = mapped_column(String(10))  # 'minute' or 'hour'
+    bucket_start: Mapped[datetime] = mapped_column()
+
+    tenant_id: Mapped[int | None] = mapped_column()
+    user_id: Mapped[int | None] = mapped_column()
+    event_category: Mapped[str] = mapped_column(String(100))
+
+    event_count: Mapped[int] = mapped_column(BigInteger)
+
+
+class AnalyticsRollupState(Base):  # type: ignore[misc,valid-type]
+    """How far each rollup has been computed ('api_usage:minute', 'analytics_events:hour', ...)."""
+
+    __tablename__ = "analytics_rollup_state"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    rolled_up_to: Mapped[datetime] = mapped_column()  # Exclusive end of the rolled-up range
+
+
 class UserJourney(Base):  # type: ignore[misc,valid-type]
     """Track user journeys for funnel analysis."""
 
@@ -3,7 +3,17 @@
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -15,6 +25,30 @@ if TYPE_CHECKING:
 
 class AudioFingerprint(Base):  # type: ignore[misc,valid-type]
     __tablename__ = "audio_fingerprints"
+    __table_args__ = (
+        # One fingerprint per segment and parameter set; target of idempotent upserts
+        Index(
+            "uq_fingerprints_segment",
+            "video_id",
+            "start_time",
+            "n_fft",
+            "hop_length",
+            "sample_rate",
+            unique=True,
+        ),
+        # Existence and resume-point checks per video and parameter set
+        Index(
+            "idx_fingerprints_video_params",
+            "video_id",
+            "sample_rate",
+            "n_fft",
+            "hop_length",
+            "end_time",
+        ),
+        # Hash lookups when matching, optionally scoped to a tenant
+        Index("idx_fingerprints_hash", "fingerprint_hash"),
+        Index("idx_fingerprints_tenant_hash", "tenant_id", "fingerprint_hash"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     tenant_id: Mapped[int | None] = mapped_column(ForeignKey("tenants.id"))
@@ -50,6 +84,10 @@ class AudioFingerprint(Base):  # type: ignore[misc,valid-type]
 
 class MatchResult(Base):  # type: ignore[misc,valid-type]
     __tablename__ = "match_results"
+    __table_args__ = (
+        # Top matches per query fingerprint (get_top_matches)
+        Index("idx_match_results_query_fp", "query_fingerprint_id", "similarity_score"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     query_fingerprint_id: Mapped[int | None] = mapped_column(ForeignKey("audio_fingerprints.id"))
@@ -69,3 +107,50 @@ class MatchResult(Base):  # type: ignore[misc,valid-type]
     response_sent_at: Mapped[datetime | None] = mapped_column()
 
     created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
+
+
+class FingerprintStatistics(Base):  # type: ignore[misc,valid-type]
+    """Ledger of per-video totals over audio_fingerprints, appended by the batch writers."""
+
+    __tablename__ = "fingerprint_statistics"
+    # Ids must never be reused on SQLite: readers only add rows past the snapshot's ledger_id
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    video_id: Mapped[int] = mapped_column()  # No foreign key: deleted videos drop out on recount
+    new_videos: Mapped[int] = mapped_column(default=0)  # 1 for the first write of the video
+    total_fingerprints: Mapped[int] = mapped_column(BigInteger, default=0)
+
+    # Sums and non-null counts, so averages match AVG() over the table
+    confidence_sum: Mapped[float] = mapped_column(default=0.0)
+    confidence_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    peaks_sum: Mapped[int] = mapped_column(BigInteger, default=0)
+    peaks_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    duration_sum: Mapped[float] = mapped_column(default=0.0)  # Seconds
+
+    created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
+
+
+class FingerprintStatisticsSnapshot(Base):  # type: ignore[misc,valid-type]
+    """Totals over audio_fingerprints as of the last reconcile (a single row)."""
+
+    __tablename__ = "fingerprint_statistics_snapshot"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    ledger_id: Mapped[int] = mapped_column(BigInteger, default=0)  # Last ledger row included
+    total_fingerprints: Mapped[int] = mapped_column(BigInteger, default=0)
+    total_videos: Mapped[int] = mapped_column(BigInteger, default=0)
+    confidence_sum: Mapped[float] = mapped_column(default=0.0)
+    confidence_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    peaks_sum: Mapped[int] = mapped_column(BigInteger, default=0)
+    peaks_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    duration_sum: Mapped[float] = mapped_column(default=0.0)  # Seconds
+    reconciled_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
+
+
+class FingerprintStatisticsVideo(Base):  # type: ignore[misc,valid-type]
+    """Videos already counted in the statistics' total_videos."""
+
+    __tablename__ = "fingerprint_statistics_videos"
+
+    video_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
@@ -3,7 +3,7 @@
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, Text
+from sqlalchemy import ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -16,6 +16,43 @@ class ProcessingJob(Base):  # type: ignore[misc,valid-type]
     """Model for tracking background processing jobs."""
 
     __tablename__ = "processing_jobs"
+    __table_args__ = (
+        # Finds expired leases of crashed workers when claiming jobs
+        Index(
+            "idx_jobs_running_lease",
+            "job_type",
+            "lease_expires_at",
+            postgresql_where="status = 'running'",
+        ),
+        # Queue order within a lane and tenant when claiming pending jobs
+        Index(
+            "idx_jobs_pending_queue",
+            "job_type",
+            "lane",
+            "tenant_id",
+            "priority",
+            "created_at",
+            postgresql_where="status = 'pending'",
+        ),
+        # Pending jobs of a type in creation order (get_pending_jobs)
+        Index(
+            "idx_jobs_pending_type_created",
+            "job_type",
+            "created_at",
+            postgresql_where="status = 'pending'",
+        ),
+        # Job counts per status (count_jobs_by_status)
+        Index("idx_processing_jobs_status", "status"),
+        # Active jobs in creation order
+        Index(
+            "idx_jobs_status_created",
+            "status",
+            "created_at",
+            postgresql_where="status IN ('pending', 'running')",
+        ),
+        # Recent service per tenant for fair-share scheduling
+        Index("idx_jobs_type_started", "job_type", "started_at", "tenant_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     job_type: Mapped[str | None] = mapped_column(String(50))  # 'channel_ingest', 'video_process', 'fingerprint_extract'
@@ -25,6 +62,11 @@ class ProcessingJob(Base):  # type: ignore[misc,valid-type]
     target_id: Mapped[str | None] = mapped_column(String(255))  # Channel ID or Video ID
     parameters: Mapped[str | None] = mapped_column(Text)  # JSON parameters
 
+    # Scheduling
+    tenant_id: Mapped[int | None] = mapped_column(ForeignKey("tenants.id"))
+    priority: Mapped[int] = mapped_column(default=0)  # Higher runs first within a lane and tenant
+    lane: Mapped[str] = mapped_column(String(20), default="bulk")  # 'interactive' (fast lane) or 'bulk'
+
     # Progress tracking
     progress: Mapped[float] = mapped_column(default=0.0)  # 0.0 to 1.0
     current_step: Mapped[str | None] = mapped_column(String(200))
@@ -34,6 +76,11 @@ class ProcessingJob(Base):  # type: ignore[misc,valid-type]
     started_at: Mapped[datetime | None] = mapped_column()
     completed_at: Mapped[datetime | None] = mapped_column()
 
+    # Lease held by the worker processing the job; expired leases are reclaimed
+    worker_id: Mapped[str | None] = mapped_column(String(255))
+    lease_expires_at: Mapped[datetime | None] = mapped_column()
+    heartbeat_at: Mapped[datetime | None] = mapped_column()
+
     # Error handling
     error_message: Mapped[str | None] = mapped_column(Text)
     retry_count: Mapped[int] = mapped_column(default=0)
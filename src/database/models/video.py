@@ -3,7 +3,7 @@
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -28,6 +28,12 @@ class Channel(Base):  # type: ignore[misc,valid-type]
     last_processed: Mapped[datetime | None] = mapped_column()
     is_active: Mapped[bool] = mapped_column(default=True)
 
+    # Incremental sync watermarks: routine syncs only list uploads newer than these
+    sync_last_video_id: Mapped[str | None] = mapped_column(String(255))
+    sync_last_upload_date: Mapped[datetime | None] = mapped_column()
+    sync_etag: Mapped[str | None] = mapped_column(String(255))  # Uploads playlist ETag
+    last_deep_sync: Mapped[datetime | None] = mapped_column()  # Last full enumeration
+
     # Relationships
     tenant: Mapped["Tenant"] = relationship("Tenant", back_populates="channels")  # type: ignore[assignment]
     videos: Mapped[list["Video"]] = relationship("Video", back_populates="channel")  # type: ignore[assignment]
@@ -35,6 +41,11 @@ class Channel(Base):  # type: ignore[misc,valid-type]
 
 class Video(Base):  # type: ignore[misc,valid-type]
     __tablename__ = "videos"
+    __table_args__ = (
+        # Unprocessed videos (get_unprocessed_videos); the partial index is PostgreSQL-only
+        Index("idx_videos_processed", "processed"),
+        Index("idx_videos_unprocessed", "created_at", postgresql_where="processed = false"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     tenant_id: Mapped[int | None] = mapped_column(ForeignKey("tenants.id"))
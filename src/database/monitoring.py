@@ -1,17 +1,44 @@
 """Database query performance monitoring.
 
 This module provides query performance tracking and logging for slow queries.
+
+Besides the process-wide counters, queries can be accounted per unit of work
+(e.g. an API request): inside :func:`track_queries` every statement executed
+in the same context (including threads and tasks started from it) is added to
+a :class:`QueryStats`, keyed by its normalized text. Statements repeated many
+times in one request usually mean an N+1 query pattern.
 """
 
 import logging
+import re
+import threading
 import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from typing import Any
 
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
 
+from config.settings import Config
+
+if Config.METRICS_ENABLED:
+    from src.observability.metrics import metrics
+else:
+    metrics = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+# Normalized statements are cut to this length for logs and metric labels
+STATEMENT_LABEL_LENGTH = 200
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\(\?(?:, \?)*\)(?:, \(\?(?:, \?)*\))*")
+
 # Track query metrics
 query_metrics = {
     "total_queries": 0,
@@ -20,12 +47,71 @@ query_metrics = {
 }
 
 
+@dataclass
+class QueryStats:
+    """Queries executed within one :func:`track_queries` block."""
+
+    count: int = 0
+    duration: float = 0.0
+    statements: dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, statement: str, duration: float) -> None:
+        """Add one execution of a normalized statement."""
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+            self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Statements executed more than ``threshold`` times, by execution count."""
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count > threshold
+        }
+
+
+# Stats of the tracked block the current context runs in, if any
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Account the queries executed inside the block.
+
+    Yields:
+        QueryStats filled in as statements complete
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Reduce a statement to its shape, so executions with different values match.
+
+    Literals and bind parameters (in any paramstyle) become ``?``, expanded
+    ``IN`` lists and multi-row ``VALUES`` collapse to a single ``(?)``, and
+    whitespace is collapsed.
+    """
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _LITERAL.sub("?", normalized)
+    return _PLACEHOLDER_LIST.sub("(?)", normalized)
+
+
 @event.listens_for(Engine, "before_cursor_execute")
 def before_cursor_execute(
     conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
 ) -> None:
     """Record query start time before execution."""
-    conn.info.setdefault("query_start_time", []).append(time.time())
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
 
 
 @event.listens_for(Engine, "after_cursor_execute")
@@ -33,12 +119,20 @@ def after_cursor_execute(
     conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
 ) -> None:
     """Log slow queries and record metrics after execution."""
-    total = time.time() - conn.info["query_start_time"].pop(-1)
+    total = time.perf_counter() - conn.info["query_start_time"].pop(-1)
 
     # Update metrics
     query_metrics["total_queries"] += 1
     query_metrics["total_duration"] += total
 
+    stats = _current_stats.get()
+    if stats is not None or metrics:
+        normalized = normalize_statement(statement)[:STATEMENT_LABEL_LENGTH]
+        if stats is not None:
+            stats.record(normalized, total)
+        if metrics:
+            metrics.db_query_duration.labels(statement=normalized).observe(total)
+
     # Log slow queries (> 100ms)
     if total > 0.1:
         query_metrics["slow_queries"] += 1
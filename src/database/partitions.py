@@ -0,0 +1,218 @@
+"""
+Time-range partitions of the analytics log tables (PostgreSQL).
+
+``api_usage_logs`` is partitioned by day and ``analytics_events`` by month.
+Partitions are named ``<table>_p<YYYYMMDD>`` / ``<table>_p<YYYYMM>`` after the
+start of their range; rows outside every range land in ``<table>_default``.
+
+:func:`ensure_partitions` creates the partitions for the coming days ahead of
+time, moving any rows for their ranges out of the default partition first.
+Retention drops whole expired partitions (:func:`expired_partitions`,
+:func:`drop_partitions`) instead of deleting rows; only the default partition
+has its expired rows deleted (:func:`delete_expired_default_rows`).
+On other databases, or before the migration has partitioned a table, the
+tables are plain and :func:`is_partitioned` returns False.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import cast
+
+from sqlalchemy import CursorResult, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PartitionedTable:
+    """A table range-partitioned on a timestamp column."""
+
+    name: str
+    column: str
+    interval: str  # 'day' or 'month'
+
+    def partition_start(self, day: date) -> date:
+        """Start of the partition range containing ``day``."""
+        return day.replace(day=1) if self.interval == "month" else day
+
+    def next_start(self, start: date) -> date:
+        """Start of the partition range following the one starting at ``start``."""
+        if self.interval == "month":
+            return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return start + timedelta(days=1)
+
+    def partition_name(self, start: date) -> str:
+        """Name of the partition starting at ``start``."""
+        suffix = f"{start:%Y%m}" if self.interval == "month" else f"{start:%Y%m%d}"
+        return f"{self.name}_p{suffix}"
+
+    def parse_partition_name(self, name: str) -> date | None:
+        """Start of the range of a partition named by :meth:`partition_name` (None otherwise)."""
+        prefix = f"{self.name}_p"
+        if not name.startswith(prefix):
+            return None
+        fmt = "%Y%m" if self.interval == "month" else "%Y%m%d"
+        try:
+            return datetime.strptime(name[len(prefix) :], fmt).date()
+        except ValueError:
+            return None
+
+    @property
+    def default_name(self) -> str:
+        """Name of the default partition holding rows outside every range."""
+        return f"{self.name}_default"
+
+    def range_condition(self, start: date) -> str:
+        """SQL condition matching the rows of the partition starting at ``start``."""
+        return (
+            f"{self.column} >= '{start.isoformat()}' "
+            f"AND {self.column} < '{self.next_start(start).isoformat()}'"
+        )
+
+    def create_partition_ddl(self, start: date) -> str:
+        """DDL creating the partition starting at ``start`` if it does not exist."""
+        return (
+            f"CREATE TABLE IF NOT EXISTS {self.partition_name(start)} "
+            f"PARTITION OF {self.name} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{self.next_start(start).isoformat()}')"
+        )
+
+
+API_USAGE_LOGS = PartitionedTable("api_usage_logs", "timestamp", "day")
+ANALYTICS_EVENTS = PartitionedTable("analytics_events", "created_at", "month")
+PARTITIONED_TABLES = (API_USAGE_LOGS, ANALYTICS_EVENTS)
+
+
+def is_partitioned(session: Session, table: PartitionedTable) -> bool:
+    """Whether ``table`` is a partitioned table in the session's database."""
+    if session.get_bind().dialect.name != "postgresql":
+        return False
+    relkind = session.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table.name},
+    ).scalar()
+    return relkind == "p"
+
+
+def list_partitions(session: Session, table: PartitionedTable) -> list[str]:
+    """Names of the partitions attached to ``table``."""
+    rows = session.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:table) "
+            "ORDER BY child.relname"
+        ),
+        {"table": table.name},
+    )
+    return [row[0] for row in rows]
+
+
+def create_partition(session: Session, table: PartitionedTable, start: date) -> None:
+    """
+    Create the partition of ``table`` starting at ``start`` (not committed).
+
+    PostgreSQL refuses to create a partition while the default partition holds
+    rows in its range, so those rows are moved into the new partition: the
+    default partition is detached, the partition created, the rows re-inserted
+    through the parent and the default partition attached again.
+    """
+    has_default_rows = session.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {table.default_name} "
+            f"WHERE {table.range_condition(start)})"
+        )
+    ).scalar()
+    if not has_default_rows:
+        session.execute(text(table.create_partition_ddl(start)))
+        return
+
+    session.execute(text(f"ALTER TABLE {table.name} DETACH PARTITION {table.default_name}"))
+    session.execute(text(table.create_partition_ddl(start)))
+    session.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {table.default_name} "
+            f"WHERE {table.range_condition(start)} RETURNING *) "
+            f"INSERT INTO {table.name} SELECT * FROM moved"
+        )
+    )
+    session.execute(text(f"ALTER TABLE {table.name} ATTACH PARTITION {table.default_name} DEFAULT"))
+    logger.info(f"Moved rows for {table.partition_name(start)} out of {table.default_name}")
+
+
+def ensure_partitions(session: Session, ahead_days: int, today: date | None = None) -> list[str]:
+    """
+    Create missing partitions from today through ``ahead_days`` days ahead.
+
+    Each table's partitions are committed together; a table whose partitions
+    fail is logged and rolled back without affecting the others.
+
+    Args:
+        session: Database session
+        ahead_days: How many days ahead partitions must exist
+        today: Current date (defaults to today, UTC)
+
+    Returns:
+        Names of the partitions created
+    """
+    today = today or datetime.now(timezone.utc).date()
+    created = []
+    for table in PARTITIONED_TABLES:
+        try:
+            if not is_partitioned(session, table):
+                continue
+            existing = set(list_partitions(session, table))
+            table_created = []
+            start = table.partition_start(today)
+            while start <= today + timedelta(days=ahead_days):
+                name = table.partition_name(start)
+                if name not in existing:
+                    create_partition(session, table, start)
+                    table_created.append(name)
+                start = table.next_start(start)
+            session.commit()
+            created.extend(table_created)
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error(f"Failed to create {table.name} partitions: {e}")
+
+    if created:
+        logger.info(f"Created analytics partitions: {', '.join(created)}")
+    return created
+
+
+def expired_partitions(session: Session, table: PartitionedTable, cutoff: date) -> list[str]:
+    """Partitions of ``table`` whose whole range ends on or before ``cutoff``."""
+    expired = []
+    for name in list_partitions(session, table):
+        start = table.parse_partition_name(name)
+        if start is not None and table.next_start(start) <= cutoff:
+            expired.append(name)
+    return expired
+
+
+def drop_partitions(session: Session, names: list[str]) -> None:
+    """Drop partitions (and their rows) by name, committing once all are gone."""
+    for name in names:
+        session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+    session.commit()
+
+
+def count_expired_default_rows(session: Session, table: PartitionedTable, cutoff: datetime) -> int:
+    """Count the rows of the default partition older than ``cutoff``."""
+    return session.execute(
+        text(f"SELECT COUNT(*) FROM {table.default_name} WHERE {table.column} < :cutoff"),
+        {"cutoff": cutoff},
+    ).scalar_one()
+
+
+def delete_expired_default_rows(session: Session, table: PartitionedTable, cutoff: datetime) -> int:
+    """Delete the rows of the default partition older than ``cutoff`` (not committed)."""
+    result = session.execute(
+        text(f"DELETE FROM {table.default_name} WHERE {table.column} < :cutoff"),
+        {"cutoff": cutoff},
+    )
+    return cast(CursorResult, result).rowcount
@@ -0,0 +1,233 @@
+"""Live job progress snapshots with Redis support.
+
+Workers publish a small progress snapshot for every job update, while the
+database only receives throttled writes (see
+:class:`src.ingestion.job_progress.JobProgressReporter`). API handlers read the
+latest snapshot from here instead of querying ``processing_jobs``.
+
+With Redis enabled snapshots are stored under ``soundhash:jobs:progress:*``
+keys with a TTL and pushed on the ``soundhash:jobs:progress`` pub/sub channel,
+so they are visible to every API worker. Without Redis an in-process store
+with the same interface is used, which only helps when the API and the job
+processor share a process.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_KEY_PREFIX = "soundhash:jobs:progress:"
+PROGRESS_CHANNEL = "soundhash:jobs:progress"
+
+ProgressListener = Callable[[dict[str, Any]], None]
+
+# Global channel instance
+_channel_instance: "ProgressChannel | None" = None
+
+
+def progress_key(job_type: str, target_id: str) -> str:
+    """Build the snapshot key of a job target."""
+    return f"{PROGRESS_KEY_PREFIX}{job_type}:{target_id}"
+
+
+def _isoformat(value: Any) -> str | None:
+    return value.isoformat() if isinstance(value, datetime) else None
+
+
+class ProgressChannel:
+    """
+    In-process progress store and channel.
+
+    Used as-is when Redis is disabled; :class:`RedisProgressChannel` overrides
+    the storage and messaging primitives to share snapshots between processes.
+    """
+
+    def __init__(self, ttl_seconds: int | None = None, max_entries: int = 1000) -> None:
+        """
+        Initialize the channel.
+
+        Args:
+            ttl_seconds: Seconds a snapshot stays readable after its last update
+                (default: Config.JOB_PROGRESS_TTL_SECONDS)
+            max_entries: Maximum snapshots kept in memory
+        """
+        self.ttl_seconds = ttl_seconds or Config.JOB_PROGRESS_TTL_SECONDS
+        self.max_entries = max_entries
+        self._snapshots: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._listeners: list[ProgressListener] = []
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self) -> str:
+        """Name of the storage backend."""
+        return "local"
+
+    # Storage primitives (overridden by the Redis backend)
+
+    def _store(self, key: str, value: str) -> None:
+        with self._lock:
+            self._snapshots[key] = (time.time() + self.ttl_seconds, value)
+            self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self.max_entries:
+                self._snapshots.popitem(last=False)
+
+    def _load(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._snapshots.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._snapshots[key]
+                return None
+            return value
+
+    def _broadcast(self, message: str) -> None:
+        pass
+
+    # Public interface
+
+    def publish(
+        self,
+        job: Any,
+        status: str,
+        progress: float | None,
+        current_step: str | None = None,
+        error_message: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Publish the current state of a job.
+
+        Args:
+            job: ProcessingJob (or any object with id, job_type, target_id)
+            status: Job status
+            progress: Progress between 0.0 and 1.0
+            current_step: Description of the current step
+            error_message: Error message for failed jobs
+
+        Returns:
+            The published snapshot
+        """
+        finished = status in ("completed", "failed")
+        snapshot = {
+            "job_id": job.id,
+            "job_type": job.job_type,
+            "target_id": job.target_id,
+            "status": status,
+            "progress": progress,
+            "current_step": current_step,
+            "error_message": error_message,
+            "started_at": _isoformat(getattr(job, "started_at", None)),
+            "completed_at": datetime.now(timezone.utc).isoformat() if finished else None,
+            "updated_at": time.time(),
+        }
+        try:
+            message = json.dumps(snapshot)
+            self._store(progress_key(job.job_type, job.target_id), message)
+            self._broadcast(message)
+        except Exception as e:
+            logger.debug(f"Failed to publish progress for job {job.id}: {e}")
+
+        for listener in list(self._listeners):
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.warning(f"Progress listener failed: {e}")
+        return snapshot
+
+    def get(self, job_type: str, target_id: str) -> dict[str, Any] | None:
+        """Get the latest snapshot of a job target, if one is still live."""
+        try:
+            value = self._load(progress_key(job_type, target_id))
+        except Exception as e:
+            logger.debug(f"Failed to read progress for {job_type}:{target_id}: {e}")
+            return None
+        return json.loads(value) if value else None
+
+    def subscribe(self, listener: ProgressListener) -> Callable[[], None]:
+        """
+        Call ``listener`` with every snapshot published by this process.
+
+        Returns:
+            Function that removes the listener
+        """
+        self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return unsubscribe
+
+
+class RedisProgressChannel(ProgressChannel):
+    """Progress channel shared between processes through Redis."""
+
+    def __init__(self, redis_client, **kwargs: Any) -> None:
+        """
+        Initialize the channel.
+
+        Args:
+            redis_client: ``redis.Redis`` client
+            **kwargs: Passed to :class:`ProgressChannel`
+        """
+        super().__init__(**kwargs)
+        self.redis = redis_client
+
+    @property
+    def backend(self) -> str:
+        return "redis"
+
+    def _store(self, key: str, value: str) -> None:
+        self.redis.set(key, value, ex=self.ttl_seconds)
+
+    def _load(self, key: str) -> str | None:
+        value = self.redis.get(key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    def _broadcast(self, message: str) -> None:
+        self.redis.publish(PROGRESS_CHANNEL, message)
+
+
+def get_progress_channel() -> ProgressChannel:
+    """
+    Get the global progress channel.
+
+    Returns a Redis-backed channel when Redis is enabled and reachable,
+    otherwise the in-process store.
+    """
+    global _channel_instance
+    if _channel_instance is not None:
+        return _channel_instance
+
+    if Config.REDIS_ENABLED:
+        try:
+            import redis
+
+            client = redis.Redis(
+                host=Config.REDIS_HOST,
+                port=Config.REDIS_PORT,
+                db=Config.REDIS_DB,
+                password=Config.REDIS_PASSWORD,
+                socket_connect_timeout=5,
+                socket_timeout=5,
+            )
+            client.ping()
+            _channel_instance = RedisProgressChannel(client)
+            return _channel_instance
+        except ImportError:
+            logger.warning("Redis package not installed; job progress is process-local")
+        except Exception as e:
+            logger.warning(f"Failed to connect to Redis: {e}. Job progress is process-local.")
+
+    _channel_instance = ProgressChannel()
+    return _channel_instance
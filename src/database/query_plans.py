@@ -0,0 +1,104 @@
+"""
+Query plan checks for repository queries.
+
+:func:`capture_statements` records the SQL a block of code sends over a
+connection, :func:`explain` asks the database how it would run each
+statement, and :func:`sequential_scans` lists the tables a plan reads in
+full. ``scripts/test_query_performance.py --explain`` combines them to fail
+when a repository query scans a large table instead of using an index.
+
+PostgreSQL plans come from ``EXPLAIN (FORMAT JSON)``, where full scans are
+``Seq Scan`` nodes. SQLite plans come from ``EXPLAIN QUERY PLAN``, where they
+show as ``SCAN <table>`` without an index.
+"""
+
+import re
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Connection, event
+
+# Statements worth explaining (inserts only touch the rows they write)
+EXPLAINED_PREFIXES = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+_SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+
+
+@dataclass
+class CapturedStatement:
+    """A statement as sent to the driver, with its parameters."""
+
+    statement: str
+    parameters: Any
+
+
+@contextmanager
+def capture_statements(connection: Connection) -> Iterator[list[CapturedStatement]]:
+    """
+    Record the queries executed on ``connection`` inside the block.
+
+    Yields:
+        List filled with each SELECT/UPDATE/DELETE statement as it executes
+    """
+    captured: list[CapturedStatement] = []
+
+    def record(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        if not executemany and statement.lstrip().upper().startswith(EXPLAINED_PREFIXES):
+            captured.append(CapturedStatement(statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", record)
+    try:
+        yield captured
+    finally:
+        event.remove(connection, "before_cursor_execute", record)
+
+
+def explain(connection: Connection, captured: CapturedStatement) -> Any:
+    """
+    Plan of a captured statement, without running it.
+
+    Returns:
+        The JSON plan on PostgreSQL, the ``EXPLAIN QUERY PLAN`` rows elsewhere
+    """
+    if connection.dialect.name == "postgresql":
+        return connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {captured.statement}", captured.parameters
+        ).scalar()
+    return connection.exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {captured.statement}", captured.parameters
+    ).all()
+
+
+def _postgres_scans(node: dict[str, Any]) -> Iterator[str]:
+    if node.get("Node Type") == "Seq Scan":
+        yield node["Relation Name"]
+    for child in node.get("Plans", []):
+        yield from _postgres_scans(child)
+
+
+def sequential_scans(plan: Any, dialect: str, tables: Iterable[str] | None = None) -> list[str]:
+    """
+    Tables a plan from :func:`explain` reads in full.
+
+    Args:
+        plan: Plan returned by :func:`explain`
+        dialect: Dialect name of the connection that produced it
+        tables: Only report these tables (e.g. the large ones)
+
+    Returns:
+        Scanned table names, in plan order
+    """
+    if dialect == "postgresql":
+        scans = [name for entry in plan for name in _postgres_scans(entry["Plan"])]
+    else:
+        scans = [
+            match.group(1) for row in plan if (match := _SQLITE_SCAN.match(row[-1])) is not None
+        ]
+    if tables is not None:
+        wanted = set(tables)
+        scans = [name for name in scans if name in wanted]
+    return scans
@@ -4,7 +4,7 @@ This package provides backwards-compatible imports for all repository classes an
 """
 
 # Helper functions and decorators (without context managers that need repository classes)
-from .helpers import db_retry, get_session
+from .helpers import db_retry, get_session, rows_exist
 
 # Repository classes
 from .job_repository import JobRepository
@@ -75,13 +75,17 @@ def get_webhook_repo_session() -> Generator[WebhookRepository, None, None]:
         session.close()
 
 
-def get_video_repository() -> VideoRepository:
+def get_video_repository(read_only: bool = False) -> VideoRepository:
     """Get a VideoRepository instance with a fresh session.
     
+    Args:
+        read_only: Use a read session (served by a read replica when one is
+            healthy); the repository must then only be used for lookups
+    
     Returns:
         VideoRepository instance
     """
-    session = db_manager.get_session()
+    session = db_manager.get_read_session() if read_only else db_manager.get_session()
     return VideoRepository(session)
 
 
@@ -114,6 +118,7 @@ __all__ = [
     # Helpers
     "db_retry",
     "get_session",
+    "rows_exist",
     "get_video_repo_session",
     "get_job_repo_session",
     "get_webhook_repo_session",
@@ -6,6 +6,7 @@ from datetime import datetime, timezone
 from functools import wraps
 from typing import Any, TypeVar
 
+from sqlalchemy import exists, select
 from sqlalchemy.exc import DBAPIError, IntegrityError, OperationalError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
@@ -66,6 +67,24 @@ def db_retry(
     return decorator
 
 
+def rows_exist(session: Session, model: Any, *criteria: Any) -> bool:
+    """
+    Check whether any row of ``model`` matches ``criteria``.
+
+    Runs ``SELECT EXISTS (...)``, which stops at the first matching row (or
+    index entry), unlike ``query.count() > 0`` which counts every match.
+
+    Args:
+        session: Session to query with
+        model: Mapped class (or table) to look in
+        *criteria: WHERE clauses, combined with AND
+
+    Returns:
+        True if at least one row matches
+    """
+    return bool(session.scalar(select(exists().select_from(model).where(*criteria))))
+
+
 @contextmanager
 def get_session() -> Generator[Session, None, None]:
     """
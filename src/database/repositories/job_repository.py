@@ -1,18 +1,27 @@
 """Job repository for processing job operations."""
 
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from sqlalchemy import and_, func, select
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy import and_, func, insert, select, update
+from sqlalchemy.exc import DBAPIError, IntegrityError, OperationalError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from ..models import ProcessingJob
-from .helpers import db_retry
+from config.settings import Config
+
+from ..models import ProcessingJob, Tenant
+from .helpers import db_retry, rows_exist
 
 logger = logging.getLogger(__name__)
 
+# Queue lanes: interactive jobs (API uploads) are claimed before bulk ingestion
+INTERACTIVE_LANE = "interactive"
+BULK_LANE = "bulk"
+
+# Sentinel for "no tenant filter" (None means jobs without a tenant)
+_ANY_TENANT = object()
+
 
 class JobRepository:
     def __init__(self, session: Session) -> None:
@@ -20,15 +29,35 @@ class JobRepository:
 
     @db_retry()
     def create_job(
-        self, job_type: str, target_id: str, parameters: str | None = None
+        self,
+        job_type: str,
+        target_id: str,
+        parameters: str | None = None,
+        priority: int = 0,
+        lane: str = BULK_LANE,
+        tenant_id: int | None = None,
     ) -> ProcessingJob:
         """Create a new processing job with retry on transient errors.
 
         Note: Always check job_exists() before calling this to ensure idempotency.
+
+        Args:
+            job_type: Type of job to create
+            target_id: Target identifier for the job
+            parameters: Optional job parameters as JSON string
+            priority: Higher priorities are claimed first within a lane and tenant
+            lane: ``"interactive"`` for the fast lane, ``"bulk"`` otherwise
+            tenant_id: Tenant the job is scheduled for (fair share between tenants)
         """
         try:
             job = ProcessingJob(
-                job_type=job_type, target_id=target_id, parameters=parameters, status="pending"
+                job_type=job_type,
+                target_id=target_id,
+                parameters=parameters,
+                status="pending",
+                priority=priority,
+                lane=lane,
+                tenant_id=tenant_id,
             )
             self.session.add(job)
             self.session.commit()
@@ -38,6 +67,34 @@ class JobRepository:
             logger.error(f"Failed to create job {job_type} for {target_id}: {e}")
             raise
 
+    @db_retry()
+    def create_jobs_batch(self, jobs_data: list[dict[str, Any]]) -> int:
+        """Create several pending jobs with a single multi-row insert.
+
+        Note: Like create_job(), this does not check for existing jobs; use
+        jobs_exist_batch() first.
+
+        Args:
+            jobs_data: Column values per job; each needs job_type and target_id and
+                may set parameters, priority, lane and tenant_id
+
+        Returns:
+            Number of jobs created
+        """
+        if not jobs_data:
+            return 0
+
+        rows = [{"status": "pending", **job_data} for job_data in jobs_data]
+        try:
+            self.session.execute(insert(ProcessingJob), rows)
+            self.session.commit()
+            logger.debug(f"Batch created {len(rows)} jobs")
+            return len(rows)
+        except (IntegrityError, OperationalError, DBAPIError) as e:
+            self.session.rollback()
+            logger.error(f"Failed to batch create jobs: {e}")
+            raise
+
     @db_retry()
     def get_pending_jobs(self, job_type: str | None = None, limit: int = 10) -> list[ProcessingJob]:
         """Get pending jobs with retry on transient errors"""
@@ -51,6 +108,276 @@ class JobRepository:
             logger.error(f"Failed to get pending jobs: {e}")
             raise
 
+    @db_retry()
+    def claim_jobs(
+        self,
+        job_type: str,
+        limit: int,
+        worker_id: str,
+        lease_seconds: int | None = None,
+    ) -> list[ProcessingJob]:
+        """Atomically claim jobs for a worker with retry on transient errors.
+
+        Jobs are selected with ``SELECT ... FOR UPDATE SKIP LOCKED``, so
+        concurrent workers never receive the same job. Slots are filled in
+        this order:
+
+        1. Running jobs whose lease has expired (their worker crashed or
+           stalled). Reclaimed jobs count as a retry; jobs that have run out
+           of retries are marked ``failed`` instead of being handed out again.
+        2. The interactive fast lane (e.g. API uploads), highest priority first.
+        3. Bulk jobs shared fairly between tenants (see :meth:`_fair_share`),
+           highest priority first within each tenant.
+
+        Claimed jobs are marked ``running`` with a lease that the worker must
+        renew through :meth:`heartbeat_jobs`.
+
+        Args:
+            job_type: Type of job to claim
+            limit: Maximum number of jobs to claim
+            worker_id: Identifier of the claiming worker
+            lease_seconds: Lease duration (default: Config.JOB_LEASE_SECONDS)
+
+        Returns:
+            Claimed jobs in scheduling order
+        """
+        lease_seconds = lease_seconds or Config.JOB_LEASE_SECONDS
+        try:
+            now = datetime.now(timezone.utc)
+            expired = (
+                self.session.query(ProcessingJob)
+                .filter(
+                    ProcessingJob.job_type == job_type,
+                    ProcessingJob.status == "running",
+                    ProcessingJob.lease_expires_at < now,
+                )
+                .order_by(ProcessingJob.lease_expires_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+
+            candidates = []
+            for job in expired:
+                # Lease expired: the previous worker is presumed dead
+                job.retry_count = (job.retry_count or 0) + 1
+                if job.retry_count > job.max_retries:
+                    job.status = "failed"
+                    job.error_message = f"Lease expired on worker {job.worker_id} after {job.retry_count - 1} retries"
+                    job.completed_at = now
+                    job.worker_id = None
+                    job.lease_expires_at = None
+                    continue
+                logger.warning(
+                    f"Reclaiming job {job.id} from worker {job.worker_id} (lease expired)"
+                )
+                candidates.append(job)
+
+            if len(candidates) < limit:
+                candidates += self._lock_pending(
+                    job_type, limit - len(candidates), lane=INTERACTIVE_LANE
+                )
+
+            if len(candidates) < limit:
+                for tenant_id, slots in self._fair_share(job_type, limit - len(candidates), now):
+                    candidates += self._lock_pending(
+                        job_type, slots, lane=BULK_LANE, tenant_id=tenant_id
+                    )
+
+            if len(candidates) < limit:
+                # Slots of tenants whose jobs were locked by other workers
+                candidates += self._lock_pending(
+                    job_type, limit - len(candidates), exclude=[job.id for job in candidates]
+                )
+
+            for job in candidates:
+                job.status = "running"
+                job.worker_id = worker_id
+                job.lease_expires_at = now + timedelta(seconds=lease_seconds)
+                job.heartbeat_at = now
+                if not job.started_at:
+                    job.started_at = now
+
+            self.session.commit()
+            if candidates:
+                logger.debug(f"Worker {worker_id} claimed {len(candidates)} {job_type} jobs")
+            return candidates
+        except (OperationalError, DBAPIError) as e:
+            self.session.rollback()
+            logger.error(f"Failed to claim jobs: {e}")
+            raise
+
+    def _lock_pending(
+        self,
+        job_type: str,
+        limit: int,
+        lane: str | None = None,
+        tenant_id: int | None | object = _ANY_TENANT,
+        exclude: list[int] | None = None,
+    ) -> list[ProcessingJob]:
+        """Lock up to ``limit`` pending jobs, highest priority and oldest first."""
+        query = self.session.query(ProcessingJob).filter(
+            ProcessingJob.job_type == job_type, ProcessingJob.status == "pending"
+        )
+        if lane is not None:
+            query = query.filter(ProcessingJob.lane == lane)
+        if tenant_id is None:
+            query = query.filter(ProcessingJob.tenant_id.is_(None))
+        elif tenant_id is not _ANY_TENANT:
+            query = query.filter(ProcessingJob.tenant_id == tenant_id)
+        if exclude:
+            query = query.filter(ProcessingJob.id.notin_(exclude))
+
+        return (
+            query.order_by(ProcessingJob.priority.desc(), ProcessingJob.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+    def _fair_share(self, job_type: str, slots: int, now: datetime) -> list[tuple[int | None, int]]:
+        """Split claim slots between tenants with pending bulk jobs.
+
+        Weighted round-robin: each slot goes to the tenant with the smallest
+        weighted share of jobs started in the last
+        ``JOB_FAIR_SHARE_WINDOW_SECONDS`` (counting slots already handed out
+        in this round), so a tenant with a huge backlog cannot starve tenants
+        with a few jobs. Tenant weights come from the ``job_queue_weight``
+        tenant setting (default 1). Jobs without a tenant share one slot
+        group.
+
+        Returns:
+            List of (tenant_id, slots) pairs
+        """
+        pending = dict(
+            self.session.query(ProcessingJob.tenant_id, func.count(ProcessingJob.id))
+            .filter(
+                ProcessingJob.job_type == job_type,
+                ProcessingJob.status == "pending",
+                ProcessingJob.lane == BULK_LANE,
+            )
+            .group_by(ProcessingJob.tenant_id)
+            .all()
+        )
+        if not pending:
+            return []
+
+        window_start = now - timedelta(seconds=Config.JOB_FAIR_SHARE_WINDOW_SECONDS)
+        served = dict(
+            self.session.query(ProcessingJob.tenant_id, func.count(ProcessingJob.id))
+            .filter(
+                ProcessingJob.job_type == job_type,
+                ProcessingJob.started_at >= window_start,
+            )
+            .group_by(ProcessingJob.tenant_id)
+            .all()
+        )
+
+        weights: dict[int | None, float] = {tenant_id: 1.0 for tenant_id in pending}
+        tenant_ids = [tenant_id for tenant_id in pending if tenant_id is not None]
+        if tenant_ids:
+            for tenant_id, settings in self.session.query(Tenant.id, Tenant.settings).filter(
+                Tenant.id.in_(tenant_ids)
+            ):
+                weight = (settings or {}).get("job_queue_weight", 1)
+                weights[tenant_id] = max(float(weight), 0.01)
+
+        allocation: dict[int | None, int] = {}
+        for _ in range(slots):
+            open_tenants = [t for t in pending if allocation.get(t, 0) < pending[t]]
+            if not open_tenants:
+                break
+            tenant_id = min(
+                open_tenants,
+                key=lambda t: (
+                    (served.get(t, 0) + allocation.get(t, 0)) / weights[t],
+                    -1 if t is None else t,
+                ),
+            )
+            allocation[tenant_id] = allocation.get(tenant_id, 0) + 1
+
+        return list(allocation.items())
+
+    @db_retry()
+    def heartbeat_jobs(
+        self, job_ids: list[int], worker_id: str, lease_seconds: int | None = None
+    ) -> set[int]:
+        """Renew the leases of jobs a worker is still processing.
+
+        Args:
+            job_ids: Jobs held by the worker
+            worker_id: Identifier of the worker
+            lease_seconds: New lease duration (default: Config.JOB_LEASE_SECONDS)
+
+        Returns:
+            Ids of the jobs whose lease was renewed; jobs missing from the result
+            were reclaimed by another worker or finished elsewhere and should be
+            abandoned
+        """
+        if not job_ids:
+            return set()
+
+        lease_seconds = lease_seconds or Config.JOB_LEASE_SECONDS
+        try:
+            now = datetime.now(timezone.utc)
+            owned = select(ProcessingJob.id).where(
+                ProcessingJob.id.in_(job_ids),
+                ProcessingJob.worker_id == worker_id,
+                ProcessingJob.status == "running",
+            )
+            renewed = set(self.session.scalars(owned).all())
+            if renewed:
+                self.session.execute(
+                    update(ProcessingJob)
+                    .where(ProcessingJob.id.in_(renewed), ProcessingJob.worker_id == worker_id)
+                    .values(
+                        lease_expires_at=now + timedelta(seconds=lease_seconds),
+                        heartbeat_at=now,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            self.session.commit()
+
+            lost = set(job_ids) - renewed
+            if lost:
+                logger.warning(f"Worker {worker_id} lost the lease on jobs {sorted(lost)}")
+            return renewed
+        except (OperationalError, DBAPIError) as e:
+            self.session.rollback()
+            logger.error(f"Failed to renew job leases: {e}")
+            raise
+
+    @db_retry()
+    def release_jobs(self, job_ids: list[int], worker_id: str) -> int:
+        """Return unfinished jobs held by a worker to the queue (e.g. on shutdown).
+
+        Args:
+            job_ids: Jobs held by the worker
+            worker_id: Identifier of the worker
+
+        Returns:
+            Number of jobs released
+        """
+        if not job_ids:
+            return 0
+        try:
+            result = self.session.execute(
+                update(ProcessingJob)
+                .where(
+                    ProcessingJob.id.in_(job_ids),
+                    ProcessingJob.worker_id == worker_id,
+                    ProcessingJob.status == "running",
+                )
+                .values(status="pending", worker_id=None, lease_expires_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            self.session.commit()
+            return int(result.rowcount or 0)
+        except (OperationalError, DBAPIError) as e:
+            self.session.rollback()
+            logger.error(f"Failed to release jobs: {e}")
+            raise
+
     @db_retry()
     def get_jobs_by_target(
         self, job_type: str, target_id: str, statuses: list[str] | None = None
@@ -75,13 +402,10 @@ class JobRepository:
         This method is critical for idempotent job creation. Always call this before create_job().
         """
         try:
-            query = self.session.query(ProcessingJob).filter(
-                ProcessingJob.job_type == job_type,
-                ProcessingJob.target_id == target_id,
-            )
+            criteria = [ProcessingJob.job_type == job_type, ProcessingJob.target_id == target_id]
             if statuses:
-                query = query.filter(ProcessingJob.status.in_(statuses))
-            exists = self.session.query(query.exists()).scalar()
+                criteria.append(ProcessingJob.status.in_(statuses))
+            exists = rows_exist(self.session, ProcessingJob, *criteria)
             logger.debug(f"Job exists check: type={job_type}, target={target_id}, exists={exists}")
             return bool(exists)
         except (OperationalError, DBAPIError) as e:
@@ -150,6 +474,7 @@ class JobRepository:
                     job.started_at = datetime.now(timezone.utc)
                 elif status in ["completed", "failed"]:
                     job.completed_at = datetime.now(timezone.utc)
+                    job.lease_expires_at = None
 
                 self.session.commit()
                 logger.debug(f"Updated job {job_id}: status={status}, progress={progress}")
@@ -159,6 +484,36 @@ class JobRepository:
             logger.error(f"Failed to update job {job_id} status: {e}")
             raise
 
+    @db_retry()
+    def update_jobs_progress(self, updates: dict[int, tuple[float, str | None]]) -> None:
+        """Write the progress of several running jobs in one transaction.
+
+        Jobs that are no longer running are left untouched, so a late progress
+        write cannot overwrite a final status.
+
+        Args:
+            updates: Mapping of job id to (progress, current step)
+        """
+        if not updates:
+            return
+
+        try:
+            for job_id, (progress, current_step) in updates.items():
+                values: dict[str, Any] = {"progress": progress}
+                if current_step:
+                    values["current_step"] = current_step
+                self.session.execute(
+                    update(ProcessingJob)
+                    .where(ProcessingJob.id == job_id, ProcessingJob.status == "running")
+                    .values(**values)
+                )
+            self.session.commit()
+            logger.debug(f"Updated progress of {len(updates)} jobs")
+        except (OperationalError, DBAPIError) as e:
+            self.session.rollback()
+            logger.error(f"Failed to update job progress: {e}")
+            raise
+
     @db_retry()
     def create_job_if_not_exists(
         self,
@@ -166,6 +521,7 @@ class JobRepository:
         target_id: str,
         parameters: str | None = None,
         statuses: list[str] | None = None,
+        **scheduling: Any,
     ) -> ProcessingJob | None:
         """Create a job only if it doesn't already exist (idempotent operation).
 
@@ -174,6 +530,7 @@ class JobRepository:
             target_id: Target identifier for the job
             parameters: Optional job parameters as JSON string
             statuses: Optional list of statuses to check; if job exists in any of these statuses, won't create
+            **scheduling: priority, lane and tenant_id, passed to create_job()
 
         Returns:
             Created job if new, None if job already exists
@@ -185,7 +542,7 @@ class JobRepository:
                 return None
 
             # Create the job
-            job = self.create_job(job_type, target_id, parameters)
+            job = self.create_job(job_type, target_id, parameters, **scheduling)
             logger.info(f"Created new job: type={job_type}, target={target_id}, id={job.id}")
             return job
         except IntegrityError as e:
@@ -4,15 +4,37 @@ import logging
 from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy import and_, func, or_, select
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, exists, func, or_, select, tuple_, update
+from sqlalchemy.exc import DBAPIError, IntegrityError, OperationalError, SQLAlchemyError
+from sqlalchemy.orm import Session, aliased
 
+from ..bulk import bulk_insert
+from ..fingerprint_stats import record_fingerprint_writes
 from ..models import AudioFingerprint, Channel, MatchResult, Video
-from .helpers import db_retry
+from .helpers import db_retry, rows_exist
 
 logger = logging.getLogger(__name__)
 
+# Identifies one segment's fingerprint; upserts conflict on these columns
+FINGERPRINT_SEGMENT_KEY = ("video_id", "start_time", "n_fft", "hop_length", "sample_rate")
+
+
+def _fingerprint_row(fp_data: dict[str, Any]) -> dict[str, Any]:
+    """Column values for one fingerprint from create_fingerprints_batch() input."""
+    return {
+        "video_id": fp_data["video_id"],
+        "start_time": fp_data["start_time"],
+        "end_time": fp_data["end_time"],
+        "fingerprint_hash": fp_data["fingerprint_hash"],
+        "fingerprint_data": fp_data["fingerprint_data"],
+        "confidence_score": fp_data.get("confidence_score"),
+        "peak_count": fp_data.get("peak_count"),
+        "sample_rate": fp_data.get("sample_rate"),
+        "segment_length": fp_data.get("segment_length"),
+        "n_fft": fp_data.get("n_fft", 2048),
+        "hop_length": fp_data.get("hop_length", 512),
+    }
+
 
 class VideoRepository:
     def __init__(self, session: Session) -> None:
@@ -81,6 +103,91 @@ class VideoRepository:
             logger.error(f"Failed to get video {video_id}: {e}")
             raise
 
+    @db_retry()
+    def get_videos_by_ids(self, video_ids: list[str]) -> dict[str, Video]:
+        """
+        Get the videos among ``video_ids`` that exist, in a single query.
+
+        Args:
+            video_ids: YouTube video IDs
+
+        Returns:
+            Mapping of YouTube video ID to Video for the videos that exist
+        """
+        if not video_ids:
+            return {}
+
+        try:
+            videos = self.session.query(Video).filter(Video.video_id.in_(video_ids)).all()
+            return {video.video_id: video for video in videos}
+        except (OperationalError, DBAPIError) as e:
+            logger.error(f"Failed to get videos by IDs: {e}")
+            raise
+
+    @db_retry()
+    def insert_videos_batch(self, videos_data: list[dict[str, Any]]) -> dict[str, int]:
+        """
+        Insert videos in a single statement, skipping ones that already exist.
+
+        Uses ``INSERT ... ON CONFLICT (video_id) DO NOTHING``, so concurrent
+        ingestion of the same channel never fails on (or duplicates) a video.
+
+        Args:
+            videos_data: Column values per video; each needs video_id and channel_id
+
+        Returns:
+            Mapping of YouTube video ID to database ID for the videos that were
+            inserted by this call (videos that already existed are left out)
+        """
+        if not videos_data:
+            return {}
+
+        try:
+            dialect = self.session.get_bind().dialect.name
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            elif dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                raise NotImplementedError(f"Video batch insert is not supported on {dialect}")
+
+            stmt = (
+                insert(Video)
+                .on_conflict_do_nothing(index_elements=["video_id"])
+                .returning(Video.video_id, Video.id)
+            )
+            inserted = {video_id: id_ for video_id, id_ in self.session.execute(stmt, videos_data)}
+            self.session.commit()
+            logger.debug(f"Batch inserted {len(inserted)} of {len(videos_data)} videos")
+            return inserted
+        except (IntegrityError, OperationalError, DBAPIError) as e:
+            self.session.rollback()
+            logger.error(f"Failed to batch insert videos: {e}")
+            raise
+
+    @db_retry()
+    def update_videos_batch(self, updates: list[dict[str, Any]]) -> None:
+        """
+        Update several videos in one transaction.
+
+        Args:
+            updates: Column values per video, each including the video's database ``id``
+        """
+        if not updates:
+            return
+
+        now = datetime.now(timezone.utc)
+        try:
+            self.session.execute(
+                update(Video), [{"updated_at": now, **values} for values in updates]
+            )
+            self.session.commit()
+            logger.debug(f"Batch updated {len(updates)} videos")
+        except (OperationalError, DBAPIError) as e:
+            self.session.rollback()
+            logger.error(f"Failed to batch update videos: {e}")
+            raise
+
     @db_retry()
     def get_unprocessed_videos(self, limit: int = 100) -> list[Video]:
         """Get videos that haven't been processed yet with retry on transient errors"""
@@ -140,18 +247,23 @@ class VideoRepository:
 
     @db_retry()
     def create_fingerprints_batch(
-        self, fingerprints_data: list[dict[str, Any]]
-    ) -> list[AudioFingerprint]:
+        self, fingerprints_data: list[dict[str, Any]], return_ids: bool = False
+    ) -> int | list[int]:
         """
         Create multiple audio fingerprints in a single transaction.
 
+        Rows are written with bulk_insert() (binary COPY on PostgreSQL), so no
+        ORM objects are built and IDs are only fetched when requested.
+
         Args:
             fingerprints_data: List of dictionaries containing fingerprint data.
                 Each dict should have keys: video_id, start_time, end_time,
                 fingerprint_hash, fingerprint_data, and optional kwargs.
+            return_ids: Return the new fingerprints' IDs instead of a count
 
         Returns:
-            List of created AudioFingerprint objects
+            Number of fingerprints created, or their IDs (in input order) if
+            return_ids is set
 
         Example:
             fingerprints_data = [
@@ -167,35 +279,148 @@ class VideoRepository:
                 ...
             ]
         """
+        if not fingerprints_data:
+            return [] if return_ids else 0
+
+        rows = [_fingerprint_row(fp_data) for fp_data in fingerprints_data]
+        try:
+            ids = bulk_insert(self.session, AudioFingerprint, rows, return_ids=return_ids)
+            record_fingerprint_writes(self.session, rows)
+            self.session.commit()
+            logger.debug(f"Batch created {len(rows)} fingerprints")
+            return ids if return_ids else len(rows)
+        except (IntegrityError, OperationalError, DBAPIError) as e:
+            self.session.rollback()
+            logger.error(f"Failed to batch create fingerprints: {e}")
+            raise
+
+    @db_retry()
+    def upsert_fingerprints(self, fingerprints_data: list[dict[str, Any]]) -> int:
+        """
+        Insert or replace fingerprints in a single transaction (idempotent).
+
+        Rows are keyed by (video_id, start_time, n_fft, hop_length,
+        sample_rate), so re-writing segments after a crash or retry replaces
+        them instead of creating duplicates.
+
+        Args:
+            fingerprints_data: Same row format as create_fingerprints_batch()
+
+        Returns:
+            Number of rows written
+        """
+        if not fingerprints_data:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        rows = [{**_fingerprint_row(fp_data), "created_at": now} for fp_data in fingerprints_data]
+
         try:
-            if not fingerprints_data:
-                return []
-
-            fingerprints = []
-            for fp_data in fingerprints_data:
-                fingerprint = AudioFingerprint(
-                    video_id=fp_data["video_id"],
-                    start_time=fp_data["start_time"],  # type: ignore[arg-type]
-                    end_time=fp_data["end_time"],  # type: ignore[arg-type]
-                    fingerprint_hash=fp_data["fingerprint_hash"],
-                    fingerprint_data=fp_data["fingerprint_data"],
-                    confidence_score=fp_data.get("confidence_score"),
-                    peak_count=fp_data.get("peak_count"),
-                    sample_rate=fp_data.get("sample_rate"),
-                    segment_length=fp_data.get("segment_length"),
-                    n_fft=fp_data.get("n_fft", 2048),
-                    hop_length=fp_data.get("hop_length", 512),
+            dialect = self.session.get_bind().dialect.name
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            elif dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                raise NotImplementedError(f"Fingerprint upsert is not supported on {dialect}")
+
+            # Insert new segments first; only their totals go to the statistics
+            segment_columns = [getattr(AudioFingerprint, c) for c in FINGERPRINT_SEGMENT_KEY]
+            inserted = {
+                tuple(key)
+                for key in self.session.execute(
+                    insert(AudioFingerprint)
+                    .values(rows)
+                    .on_conflict_do_nothing(index_elements=list(FINGERPRINT_SEGMENT_KEY))
+                    .returning(*segment_columns)
                 )
-                fingerprints.append(fingerprint)
+            }
+            new_rows: list[dict[str, Any]] = []
+            existing_rows: list[dict[str, Any]] = []
+            for row in rows:
+                key = tuple(row[c] for c in FINGERPRINT_SEGMENT_KEY)
+                (new_rows if key in inserted else existing_rows).append(row)
 
-            self.session.bulk_save_objects(fingerprints, return_defaults=True)
+            if existing_rows:
+                stmt = insert(AudioFingerprint).values(existing_rows)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=list(FINGERPRINT_SEGMENT_KEY),
+                    set_={
+                        column: stmt.excluded[column]
+                        for column in (
+                            "end_time",
+                            "fingerprint_hash",
+                            "fingerprint_data",
+                            "confidence_score",
+                            "peak_count",
+                            "segment_length",
+                            "created_at",
+                        )
+                    },
+                )
+                self.session.execute(stmt)
+            record_fingerprint_writes(self.session, new_rows)
             self.session.commit()
-            logger.debug(f"Batch created {len(fingerprints)} fingerprints")
-            return fingerprints
+            logger.debug(f"Upserted {len(rows)} fingerprints")
+            return len(rows)
         except (IntegrityError, OperationalError, DBAPIError) as e:
-            logger.error(f"Failed to batch create fingerprints: {e}")
+            self.session.rollback()
+            logger.error(f"Failed to upsert fingerprints: {e}")
             raise
 
+    @db_retry()
+    def get_fingerprint_resume_point(
+        self, video_id: int, sample_rate: int, n_fft: int, hop_length: int
+    ) -> float | None:
+        """
+        Get where fingerprinting of a partially processed video can resume.
+
+        The video is done up to the end of the contiguous run of stored
+        segments from its start: each segment starts where the previous one
+        ended, so the first stored segment whose end no other segment starts
+        at marks the first gap. Segments that failed leave such a gap even
+        when later segments were stored, and are redone on resume.
+
+        Returns:
+            End time (seconds) of the contiguous stored prefix (0.0 if the
+            first segment is missing), or None if the video has no
+            fingerprints with these parameters
+        """
+        params = (
+            AudioFingerprint.video_id == video_id,
+            AudioFingerprint.sample_rate == sample_rate,
+            AudioFingerprint.n_fft == n_fft,
+            AudioFingerprint.hop_length == hop_length,
+        )
+        following = aliased(AudioFingerprint)
+        first_gap = (
+            select(func.min(AudioFingerprint.end_time))
+            .where(
+                *params,
+                ~exists().where(
+                    following.video_id == video_id,
+                    following.start_time == AudioFingerprint.end_time,
+                    following.n_fft == n_fft,
+                    following.hop_length == hop_length,
+                    following.sample_rate == sample_rate,
+                ),
+            )
+            .scalar_subquery()
+        )
+        try:
+            first_start, resume_point = self.session.execute(
+                select(func.min(AudioFingerprint.start_time), first_gap).where(*params)
+            ).one()
+        except (OperationalError, DBAPIError) as e:
+            logger.error(f"Failed to get fingerprint resume point for video {video_id}: {e}")
+            raise
+
+        if first_start is None:
+            return None
+        if first_start > 0:
+            return 0.0
+        return resume_point
+
     @db_retry()
     def check_fingerprints_exist(
         self,
@@ -219,21 +444,61 @@ class VideoRepository:
             True if fingerprints exist with matching parameters, False otherwise
         """
         try:
-            count = (
-                self.session.query(AudioFingerprint)
-                .filter(
-                    AudioFingerprint.video_id == video_id,
-                    AudioFingerprint.sample_rate == sample_rate,
-                    AudioFingerprint.n_fft == n_fft,
-                    AudioFingerprint.hop_length == hop_length,
-                )
-                .count()
+            return rows_exist(
+                self.session,
+                AudioFingerprint,
+                AudioFingerprint.video_id == video_id,
+                AudioFingerprint.sample_rate == sample_rate,
+                AudioFingerprint.n_fft == n_fft,
+                AudioFingerprint.hop_length == hop_length,
             )
-            return count > 0
         except (OperationalError, DBAPIError) as e:
             logger.error(f"Failed to check fingerprint existence for video {video_id}: {e}")
             raise
 
+    @db_retry()
+    def fingerprints_exist_for_videos(
+        self,
+        video_ids: list[int],
+        sample_rate: int,
+        n_fft: int,
+        hop_length: int,
+    ) -> set[int]:
+        """
+        Batch version of check_fingerprints_exist(), in a single query.
+
+        Each video is checked with a correlated EXISTS on the fingerprint
+        parameter index, so the lookup stops at the video's first matching
+        fingerprint instead of reading all of them.
+
+        Args:
+            video_ids: IDs of the videos to check
+            sample_rate: Sample rate used for audio processing
+            n_fft: FFT window size
+            hop_length: Hop length for STFT
+
+        Returns:
+            IDs of the videos that have fingerprints with matching parameters
+        """
+        if not video_ids:
+            return set()
+
+        try:
+            fingerprinted = exists().where(
+                AudioFingerprint.video_id == Video.id,
+                AudioFingerprint.sample_rate == sample_rate,
+                AudioFingerprint.n_fft == n_fft,
+                AudioFingerprint.hop_length == hop_length,
+            )
+            return set(
+                self.session.scalars(
+                    select(Video.id).where(Video.id.in_(video_ids), fingerprinted)
+                )
+            )
+        except (OperationalError, DBAPIError) as e:
+            logger.error(f"Failed to batch check fingerprint existence: {e}")
+            raise
+
     @db_retry()
     def find_matching_fingerprints(self, fingerprint_hash: str) -> list[AudioFingerprint]:
         """Find fingerprints with matching hash with retry on transient errors"""
@@ -276,7 +541,9 @@ class VideoRepository:
             raise
 
     @db_retry()
-    def create_match_results_batch(self, matches_data: list[dict[str, Any]]) -> list[MatchResult]:
+    def create_match_results_batch(
+        self, matches_data: list[dict[str, Any]], return_ids: bool = False
+    ) -> int | list[int]:
         """
         Create multiple match results in a single transaction.
 
@@ -285,9 +552,11 @@ class VideoRepository:
                 Each dict should have keys: query_fingerprint_id, matched_fingerprint_id,
                 similarity_score, and optional kwargs (query_source, query_url, query_user,
                 match_confidence).
+            return_ids: Return the new match results' IDs instead of a count
 
         Returns:
-            List of created MatchResult objects
+            Number of match results created, or their IDs (in input order) if
+            return_ids is set
 
         Example:
             matches_data = [
@@ -301,28 +570,28 @@ class VideoRepository:
                 ...
             ]
         """
-        try:
-            if not matches_data:
-                return []
-
-            matches = []
-            for match_data in matches_data:
-                match = MatchResult(
-                    query_fingerprint_id=match_data["query_fingerprint_id"],
-                    matched_fingerprint_id=match_data["matched_fingerprint_id"],
-                    similarity_score=match_data["similarity_score"],  # type: ignore[arg-type]
-                    match_confidence=match_data.get("match_confidence"),
-                    query_source=match_data.get("query_source"),
-                    query_url=match_data.get("query_url"),
-                    query_user=match_data.get("query_user"),
-                )
-                matches.append(match)
+        if not matches_data:
+            return [] if return_ids else 0
 
-            self.session.bulk_save_objects(matches, return_defaults=True)
+        rows = [
+            {
+                "query_fingerprint_id": match_data["query_fingerprint_id"],
+                "matched_fingerprint_id": match_data["matched_fingerprint_id"],
+                "similarity_score": match_data["similarity_score"],
+                "match_confidence": match_data.get("match_confidence"),
+                "query_source": match_data.get("query_source"),
+                "query_url": match_data.get("query_url"),
+                "query_user": match_data.get("query_user"),
+            }
+            for match_data in matches_data
+        ]
+        try:
+            ids = bulk_insert(self.session, MatchResult, rows, return_ids=return_ids)
             self.session.commit()
-            logger.debug(f"Batch created {len(matches)} match results")
-            return matches
+            logger.debug(f"Batch created {len(rows)} match results")
+            return ids if return_ids else len(rows)
         except (IntegrityError, OperationalError, DBAPIError) as e:
+            self.session.rollback()
             logger.error(f"Failed to batch create match results: {e}")
             raise
 
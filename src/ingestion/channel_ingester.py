@@ -2,13 +2,21 @@ import asyncio
 import json
 import logging
 import time
-from datetime import datetime, timezone
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Any
 
 from config.logging_config import create_section_logger, get_progress_logger
 from config.settings import Config
+from src.api.youtube_async import AsyncYouTubeClient
 from src.core.audio_fingerprinting import AudioFingerprinter
+from src.core.fingerprint_pool import (
+    fingerprint_segment,
+    get_fingerprint_pool,
+    shutdown_fingerprint_pool,
+)
 from src.core.video_processor import VideoProcessor as CoreVideoProcessor
+from src.core.ytdlp_pool import shutdown_ytdlp_pool
 from src.database.connection import db_manager
 from src.database.repositories import (
     JobRepository,
@@ -16,6 +24,9 @@ from src.database.repositories import (
     get_job_repository,
     get_video_repository,
 )
+from src.ingestion.fingerprint_writer import ChunkedFingerprintWriter
+from src.ingestion.job_lease import JobLeaseKeeper, default_worker_id
+from src.ingestion.job_progress import JobProgressReporter
 
 if TYPE_CHECKING:
     from src.api.youtube_service import YouTubeAPIService
@@ -65,6 +76,8 @@ class ChannelIngester:
         self.fingerprinter = AudioFingerprinter()
         self.target_channels = Config.TARGET_CHANNELS
         self._db_initialized = False
+        # Async Data API client shared by the channels of one ingest_all_channels run
+        self.youtube_client: AsyncYouTubeClient | None = None
 
         # Initialize database (can be skipped for dry-run)
         if initialize_db:
@@ -108,10 +121,17 @@ class ChannelIngester:
                     results["failed"] += 1
                 progress.update(increment=1)
 
-        # Process all channels concurrently with bounded concurrency
-        await asyncio.gather(
-            *[process_channel_with_semaphore(ch) for ch in channels], return_exceptions=True
-        )
+        # Process all channels concurrently with bounded concurrency, sharing one
+        # pooled API client (and its quota limiter) between them
+        self.youtube_client = AsyncYouTubeClient.from_service(self.youtube_service)
+        try:
+            await asyncio.gather(
+                *[process_channel_with_semaphore(ch) for ch in channels], return_exceptions=True
+            )
+        finally:
+            if self.youtube_client is not None:
+                await self.youtube_client.close()
+                self.youtube_client = None
 
         progress.complete()
 
@@ -158,14 +178,43 @@ class ChannelIngester:
         self.logger.info(f"📺 Starting ingestion for channel: {channel_id}")
 
         try:
-            # Warn about unlimited processing
-            if max_videos is None:
-                self.logger.log_warning_box(
-                    f"Processing ALL videos for channel {channel_id}. This may take a very long time!"
+            video_repo = job_repo = channel = None
+            incremental = False
+            if not dry_run and self._db_initialized:
+                video_repo = get_video_repository()
+                job_repo = get_job_repository()
+
+                # Get or create channel record
+                channel = video_repo.get_channel_by_id(channel_id)
+                if not channel:
+                    self.logger.info(f"Creating new channel record for {channel_id}")
+                    channel = video_repo.create_channel(
+                        channel_id=channel_id,
+                        channel_name=f"Channel {channel_id}",  # Will be updated with real name
+                    )
+                incremental = not self._needs_deep_sync(channel)
+
+            etag = None
+            if incremental:
+                # Routine sync: only list uploads newer than the last sync's watermark
+                videos_info, etag = await self._list_new_channel_videos(
+                    channel_id, channel, max_videos
                 )
+                if not videos_info:
+                    self.logger.info(f"✅ Channel {channel_id} is up to date")
+                    channel.sync_etag = etag or channel.sync_etag
+                    channel.last_processed = datetime.now(timezone.utc)
+                    video_repo.session.commit()
+                    return
+            else:
+                # Warn about unlimited processing
+                if max_videos is None:
+                    self.logger.log_warning_box(
+                        f"Processing ALL videos for channel {channel_id}. This may take a very long time!"
+                    )
 
-            # Get videos from channel via yt-dlp
-            videos_info = self.video_processor.get_channel_videos(channel_id, max_videos)
+                # Get videos from channel via the Data API or yt-dlp
+                videos_info = await self._list_channel_videos(channel_id, max_videos)
 
             if not videos_info:
                 self.logger.log_warning_box(f"No videos found for channel {channel_id}")
@@ -186,19 +235,6 @@ class ChannelIngester:
                     self.logger.info(f"   ... and {len(videos_info) - 5} more videos")
                 return
 
-            # Proceed with DB operations
-            video_repo = get_video_repository()
-            job_repo = get_job_repository()
-
-            # Get or create channel record
-            channel = video_repo.get_channel_by_id(channel_id)
-            if not channel:
-                self.logger.info(f"Creating new channel record for {channel_id}")
-                channel = video_repo.create_channel(
-                    channel_id=channel_id,
-                    channel_name=f"Channel {channel_id}",  # Will be updated with real name
-                )
-
             # Update channel info with first video's channel data
             if (
                 videos_info
@@ -208,110 +244,77 @@ class ChannelIngester:
                 first_video = videos_info[0]
                 if first_video.get("channel"):
                     channel.channel_name = first_video["channel"]
-                    video_repo.session.commit()
 
             new_videos = 0
             updated_videos = 0
             duplicate_videos = 0
             failed_videos = 0
 
-            # Batch-check existing jobs to avoid N+1 queries
-            all_video_ids = [video_info["id"] for video_info in videos_info]
+            # Diff the listing against the database with one query per table
+            # instead of a lookup (and commit) per video
+            videos_by_id = {video_info["id"]: video_info for video_info in videos_info}
+            all_video_ids = list(videos_by_id)
             existing_job_ids = job_repo.jobs_exist_batch(
                 "video_process", all_video_ids, statuses=["pending", "running"]
             )
+            existing_videos = video_repo.get_videos_by_ids(all_video_ids)
 
-            # Create progress tracker for videos in this channel
-            video_progress = get_progress_logger(
-                self.logger, len(videos_info), f"Videos for {channel_id}"
-            )
-
-            for idx, video_info in enumerate(videos_info):
+            new_rows: list[dict[str, Any]] = []
+            updates: list[dict[str, Any]] = []
+            for video_id, video_info in videos_by_id.items():
                 try:
-                    video_id = video_info["id"]
-                    # Check if video already exists
-                    existing_video = video_repo.get_video_by_id(video_id)
-
-                    if existing_video:
-                        # Use batch-checked result instead of individual query
-                        job_already_exists = video_id in existing_job_ids
-
-                        is_duplicate = False
-                        if job_already_exists:
-                            is_duplicate = True
-                            duplicate_reason = "already exists with pending/running job"
-                        elif self._should_update_video(existing_video, video_info):
-                            self._update_video_record(existing_video, video_info, video_repo)
-                            updated_videos += 1
-                        else:
-                            is_duplicate = True
-                            duplicate_reason = "exists and does not need updating"
-
-                        if is_duplicate:
-                            duplicate_videos += 1
-                            self.logger.debug(f"Video {video_id} {duplicate_reason}")
+                    existing_video = existing_videos.get(video_id)
+                    if existing_video is None:
+                        new_rows.append(self._video_row(video_info, channel))
+                    elif video_id in existing_job_ids:
+                        duplicate_videos += 1
+                        self.logger.debug(f"Video {video_id} already exists with pending/running job")
+                    elif self._should_update_video(existing_video, video_info):
+                        updates.append(self._video_update(existing_video, video_info))
                     else:
-                        # Create new video record
-                        video_repo.create_video(
-                            video_id=video_id,
-                            channel_id=int(channel.id),  # type: ignore[arg-type]
-                            title=video_info.get("title"),
-                            description=video_info.get("description"),
-                            duration=(
-                                float(video_info["duration"])
-                                if video_info.get("duration")
-                                else None
-                            ),
-                            view_count=video_info.get("view_count"),
-                            like_count=video_info.get("like_count"),
-                            upload_date=self._parse_upload_date(video_info.get("upload_date")),
-                            url=video_info.get("webpage_url"),
-                            thumbnail_url=video_info.get("thumbnail"),
-                        )
-
-                        # Track video ingestion
-                        if metrics:
-                            metrics.videos_ingested.inc()
-
-                        # Create processing job for this video using batch-checked result
-                        if video_id not in existing_job_ids:
-                            job_repo.create_job(
-                                job_type="video_process",
-                                target_id=video_id,
-                                parameters=json.dumps(
-                                    {"url": video_info.get("webpage_url"), "channel_id": channel_id}
-                                ),
-                            )
-                        else:
-                            self.logger.debug(
-                                f"Job already exists for video {video_id}, skipping job creation"
-                            )
-
-                        new_videos += 1
-
-                    # Update progress periodically (every 10 videos)
-                    if (idx + 1) % 10 == 0:
-                        video_progress.update(increment=10)
-
+                        duplicate_videos += 1
+                        self.logger.debug(f"Video {video_id} exists and does not need updating")
                 except Exception as e:
-                    self.logger.error(
-                        f"Error processing video {video_info.get('id', 'unknown')}: {str(e)}"
-                    )
+                    self.logger.error(f"Error processing video {video_id}: {str(e)}")
                     failed_videos += 1
-                    continue
 
-            # Complete remaining progress
-            remaining = len(videos_info) % 10
-            if remaining > 0:
-                video_progress.update(increment=remaining)
-            video_progress.complete()
+            video_repo.update_videos_batch(updates)
+            updated_videos = len(updates)
 
-            # Update channel last processed time
+            # Videos inserted concurrently by another ingester are skipped
+            inserted = video_repo.insert_videos_batch(new_rows)
+            new_videos = len(inserted)
+            duplicate_videos += len(new_rows) - new_videos
+            if metrics:
+                metrics.videos_ingested.inc(new_videos)
+
+            # Queue processing jobs for the videos this sync inserted
+            job_repo.create_jobs_batch([
+                {
+                    "job_type": "video_process",
+                    "target_id": video_id,
+                    "parameters": json.dumps(
+                        {"url": videos_by_id[video_id].get("webpage_url"), "channel_id": channel_id}
+                    ),
+                    "tenant_id": channel.tenant_id,
+                }
+                for video_id in inserted
+                if video_id not in existing_job_ids
+            ])
+
+            # Advance the sync watermarks and update channel last processed time
+            self._advance_sync_state(
+                channel,
+                videos_info,
+                etag,
+                deep=not incremental,
+                truncated=max_videos is not None and len(videos_info) >= max_videos,
+            )
             channel.last_processed = datetime.now(timezone.utc)
             video_repo.session.commit()
 
             self.logger.info(
-                f"✅ Channel {channel_id} complete: "
+                f"✅ Channel {channel_id} {'incremental' if incremental else 'full'} sync complete: "
                 f"{new_videos} new, {updated_videos} updated, {duplicate_videos} duplicates, {failed_videos} failed"
             )
 
@@ -319,6 +322,91 @@ class ChannelIngester:
             self.logger.error(f"Error ingesting channel {channel_id}: {str(e)}")
             raise
 
+    async def _list_channel_videos(
+        self, channel_id: str, max_videos: int | None
+    ) -> list[dict[str, Any]]:
+        """List all videos of a channel, preferring the async Data API client"""
+        if self.youtube_client is not None:
+            videos = await self.youtube_client.get_channel_videos(channel_id, max_videos)
+            if videos:
+                return videos
+
+        # Blocking Data API / yt-dlp listing - run in thread
+        return await asyncio.to_thread(
+            self.video_processor.get_channel_videos, channel_id, max_videos
+        )
+
+    async def _list_new_channel_videos(
+        self, channel_id: str, channel: Any, max_videos: int | None
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """List a channel's uploads since its sync watermark, preferring the async Data API client"""
+        watermark = (
+            channel_id,
+            channel.sync_last_video_id,
+            channel.sync_last_upload_date,
+            channel.sync_etag,
+            max_videos,
+        )
+        if self.youtube_client is not None:
+            videos, etag = await self.youtube_client.get_new_channel_videos(*watermark)
+            if videos is not None:
+                return videos, etag
+
+        # Blocking Data API / yt-dlp listing - run in thread
+        return await asyncio.to_thread(self.video_processor.get_new_channel_videos, *watermark)
+
+    def _needs_deep_sync(self, channel: Any) -> bool:
+        """Check if a channel needs a full re-enumeration instead of an incremental sync"""
+        if not channel.sync_last_video_id or channel.last_deep_sync is None:
+            return True
+        if Config.CHANNEL_DEEP_SYNC_INTERVAL_HOURS <= 0:
+            return True
+
+        last_deep_sync = channel.last_deep_sync
+        if last_deep_sync.tzinfo is None:
+            last_deep_sync = last_deep_sync.replace(tzinfo=timezone.utc)
+        interval = timedelta(hours=Config.CHANNEL_DEEP_SYNC_INTERVAL_HOURS)
+        return datetime.now(timezone.utc) - last_deep_sync >= interval
+
+    def _advance_sync_state(
+        self,
+        channel: Any,
+        videos_info: list[dict[str, Any]],
+        etag: str | None,
+        deep: bool,
+        truncated: bool = False,
+    ) -> None:
+        """Record the newest upload of a listing as the channel's sync watermark"""
+        if truncated and not deep:
+            # A capped incremental listing holds only the newest uploads; advancing the
+            # watermark past them would skip the older ones it cut off, so keep the old
+            # watermark and re-enumerate the channel on the next sync instead
+            self.logger.info(
+                f"Incremental listing for channel {channel.channel_id} hit max_videos; "
+                "forcing a deep sync next time"
+            )
+            channel.last_deep_sync = None
+            return
+
+        # Listings are ordered newest first
+        channel.sync_last_video_id = videos_info[0]["id"]
+
+        upload_dates = [
+            date
+            for date in (self._parse_upload_date(vi.get("upload_date")) for vi in videos_info)
+            if date is not None
+        ]
+        if upload_dates and (
+            channel.sync_last_upload_date is None
+            or max(upload_dates) > channel.sync_last_upload_date
+        ):
+            channel.sync_last_upload_date = max(upload_dates)
+
+        if etag:
+            channel.sync_etag = etag
+        if deep:
+            channel.last_deep_sync = datetime.now(timezone.utc)
+
     def _should_update_video(self, existing_video: Any, video_info: dict[str, Any]) -> bool:
         """Check if video record should be updated with new info"""
         # Update if view count or like count has changed significantly
@@ -338,16 +426,29 @@ class ChannelIngester:
 
         return False
 
-    def _update_video_record(
-        self, video: Any, video_info: dict[str, Any], repo: VideoRepository
-    ) -> None:
-        """Update existing video record with new information"""
-        video.view_count = video_info.get("view_count")
-        video.like_count = video_info.get("like_count")
-        if video_info.get("duration") and not video.duration:
-            video.duration = video_info.get("duration")
-        video.updated_at = datetime.now(timezone.utc)
-        repo.session.commit()
+    def _video_row(self, video_info: dict[str, Any], channel: Any) -> dict[str, Any]:
+        """Build the column values of a new video record from its yt-dlp info"""
+        return {
+            "video_id": video_info["id"],
+            "channel_id": int(channel.id),
+            "title": video_info.get("title"),
+            "description": video_info.get("description"),
+            "duration": float(video_info["duration"]) if video_info.get("duration") else None,
+            "view_count": video_info.get("view_count"),
+            "like_count": video_info.get("like_count"),
+            "upload_date": self._parse_upload_date(video_info.get("upload_date")),
+            "url": video_info.get("webpage_url"),
+            "thumbnail_url": video_info.get("thumbnail"),
+        }
+
+    def _video_update(self, video: Any, video_info: dict[str, Any]) -> dict[str, Any]:
+        """Build the column updates of an existing video record from its yt-dlp info"""
+        return {
+            "id": video.id,
+            "view_count": video_info.get("view_count"),
+            "like_count": video_info.get("like_count"),
+            "duration": video.duration or video_info.get("duration"),
+        }
 
     def _parse_upload_date(self, upload_date_str: str | None) -> datetime | None:
         """Parse upload date string from yt-dlp"""
@@ -371,61 +472,164 @@ class VideoJobProcessor:
         self.video_processor = CoreVideoProcessor()
         self.fingerprinter = AudioFingerprinter()
         self.logger = logging.getLogger(__name__)
+        # Identifies this worker's job leases; several workers can process the queue
+        self.worker_id = default_worker_id()
 
     async def process_pending_videos(self, batch_size: int = 5) -> None:
-        """Process videos that are queued for processing"""
+        """
+        Process videos that are queued for processing.
+
+        By default jobs run through the staged :class:`VideoPipeline`, so
+        downloads, segmentation, fingerprinting and database writes of
+        different videos overlap. With ``VIDEO_PIPELINE_ENABLED=false`` jobs
+        are processed one at a time.
+
+        Jobs are claimed atomically with a lease that is renewed while they
+        are processed, so several workers can drain the queue without
+        duplicating work, and jobs of a crashed worker are picked up again.
+        """
         job_repo = get_job_repository()
         video_repo = get_video_repository()
 
-        while True:
-            # Get pending jobs
-            jobs = job_repo.get_pending_jobs("video_process", limit=batch_size)
+        try:
+            async with JobLeaseKeeper(job_repo, self.worker_id) as leases:
+                if Config.VIDEO_PIPELINE_ENABLED:
+                    from src.ingestion.video_pipeline import VideoPipeline
+
+                    await VideoPipeline(self, job_repo, video_repo, leases=leases).run(batch_size)
+                    return
+
+                while True:
+                    # Claim pending jobs (and jobs whose worker stopped heartbeating)
+                    jobs = job_repo.claim_jobs("video_process", batch_size, self.worker_id)
+
+                    if not jobs:
+                        self.logger.info("No pending video processing jobs")
+                        break
+
+                    self.logger.info(f"Processing {len(jobs)} video jobs")
+                    for job in jobs:
+                        leases.track(job.id)
+                    fingerprinted = self.find_fingerprinted_videos(jobs, video_repo)
+
+                    for job in jobs:
+                        if leases.is_lost(job.id):
+                            self.logger.warning(f"Skipping job {job.id}: lease taken by another worker")
+                            continue
+                        try:
+                            await self.process_video_job(
+                                job, video_repo, job_repo, fingerprinted
+                            )
+                        except Exception as e:
+                            self.logger.error(f"Error processing job {job.id}: {str(e)}")
+                            self.handle_job_failure(job, e, video_repo, job_repo)
+                        finally:
+                            leases.untrack(job.id)
+        finally:
+            job_repo.session.close()
+            video_repo.session.close()
+
+    def handle_job_failure(
+        self,
+        job: Any,
+        error: Exception,
+        video_repo: VideoRepository,
+        job_repo: JobRepository,
+        progress: JobProgressReporter | None = None,
+    ) -> None:
+        """Mark a failed job (and its video) as failed and record the failure."""
+        if metrics:
+            metrics.processing_errors.labels(error_type=type(error).__name__).inc()
+        try:
+            video_repo.session.rollback()
+            video = video_repo.get_video_by_id(job.target_id)
+            if video and video.id:
+                video_repo.mark_video_processed(video.id, success=False, error_message=str(error))
+        except Exception as e:
+            self.logger.error(f"Failed to mark video {job.target_id} as failed: {e}")
+
+        if job.id:
+            progress = progress or JobProgressReporter(job_repo)
+            progress.finish(job, "failed", error_message=str(error))
+            # Record job failure for alerting
+            if alert_manager:
+                alert_manager.record_job_failure(
+                    job_type="video_process",
+                    job_id=job.id,
+                    error_message=str(error)[:500]
+                )
 
-            if not jobs:
-                self.logger.info("No pending video processing jobs")
-                break
+    def find_fingerprinted_videos(
+        self, jobs: list[Any], video_repo: VideoRepository
+    ) -> set[str] | None:
+        """
+        Find the videos of a batch of claimed jobs that already have fingerprints.
 
-            self.logger.info(f"Processing {len(jobs)} video jobs")
+        Two queries for the whole batch instead of one existence check per job
+        in :meth:`prepare_job`.
 
-            for job in jobs:
-                try:
-                    await self.process_video_job(job, video_repo, job_repo)
-                except Exception as e:
-                    self.logger.error(f"Error processing job {job.id}: {str(e)}")
-                    if metrics:
-                        metrics.processing_errors.labels(error_type=type(e).__name__).inc()
-                    if job.id:
-                        job_repo.update_job_status(job.id, "failed", error_message=str(e))
-                        # Record job failure for alerting
-                        if alert_manager:
-                            alert_manager.record_job_failure(
-                                job_type="video_process",
-                                job_id=job.id,
-                                error_message=str(e)[:500]
-                            )
+        Returns:
+            YouTube IDs of the videos with fingerprints for the current
+            parameters, or None if the lookup failed (jobs are then checked
+            one at a time)
+        """
+        try:
+            videos = video_repo.get_videos_by_ids([job.target_id for job in jobs])
+            fingerprinted = video_repo.fingerprints_exist_for_videos(
+                [video.id for video in videos.values()],
+                sample_rate=self.fingerprinter.sample_rate,
+                n_fft=self.fingerprinter.n_fft,
+                hop_length=self.fingerprinter.hop_length,
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to check fingerprints for {len(jobs)} jobs: {e}")
+            video_repo.session.rollback()
+            return None
+        return {video_id for video_id, video in videos.items() if video.id in fingerprinted}
 
-    async def process_video_job(
-        self, job: Any, video_repo: VideoRepository, job_repo: JobRepository
-    ) -> None:
-        """Process a single video processing job"""
-        start_time = time.time()
-        job_repo.update_job_status(job.id, "running", 0.0, "Starting video processing")
+    def prepare_job(
+        self,
+        job: Any,
+        video_repo: VideoRepository,
+        job_repo: JobRepository,
+        progress: JobProgressReporter | None = None,
+        fingerprinted: set[str] | None = None,
+    ) -> tuple[Any, str, float] | None:
+        """
+        Validate a video job and check whether fingerprinting can be skipped.
 
-        try:
-            # Parse job parameters
-            params = json.loads(job.parameters or "{}")
-            video_url = params.get("url")
-            video_id = job.target_id
+        Videos that were fingerprinted partially (an earlier attempt crashed
+        or failed after writing some chunks) resume at the first segment
+        missing from the database instead of starting over.
+
+        Args:
+            fingerprinted: Videos of the job's batch known to have fingerprints
+                (from :meth:`find_fingerprinted_videos`); checked per job if None
 
-            if not video_url:
-                raise ValueError("No video URL in job parameters")
+        Returns:
+            Tuple of (video record, video URL, resume offset in seconds), or
+            None if the video already has fingerprints with the current
+            parameters (the job is then completed)
+
+        Raises:
+            ValueError: If the job has no URL or the video record is missing
+        """
+        params = json.loads(job.parameters or "{}")
+        video_url = params.get("url")
+        video_id = job.target_id
 
-            # Get video record
-            video = video_repo.get_video_by_id(video_id)
-            if not video:
-                raise ValueError(f"Video record not found: {video_id}")
+        if not video_url:
+            raise ValueError("No video URL in job parameters")
 
-            # Check if fingerprints already exist with current parameters
+        # Get video record
+        video = video_repo.get_video_by_id(video_id)
+        if not video:
+            raise ValueError(f"Video record not found: {video_id}")
+
+        # Check if fingerprints already exist with current parameters
+        if fingerprinted is not None:
+            fingerprints_exist = video_id in fingerprinted
+        else:
             fingerprints_exist = video_repo.check_fingerprints_exist(
                 video_id=int(video.id),  # type: ignore[arg-type]
                 sample_rate=self.fingerprinter.sample_rate,
@@ -433,32 +637,174 @@ class VideoJobProcessor:
                 hop_length=self.fingerprinter.hop_length,
             )
 
-            if fingerprints_exist:
+        if fingerprints_exist and not video.processed:
+            resume_from = video_repo.get_fingerprint_resume_point(
+                video_id=int(video.id),  # type: ignore[arg-type]
+                sample_rate=self.fingerprinter.sample_rate,
+                n_fft=self.fingerprinter.n_fft,
+                hop_length=self.fingerprinter.hop_length,
+            ) or 0.0
+            # Allow for the audio being slightly shorter than the reported duration
+            if not video.duration or resume_from < video.duration - 1.0:
                 self.logger.info(
-                    f"Fingerprints already exist for video {video_id} with matching parameters "
-                    f"(sample_rate={self.fingerprinter.sample_rate}, n_fft={self.fingerprinter.n_fft}, "
-                    f"hop_length={self.fingerprinter.hop_length}). Skipping re-fingerprinting."
+                    f"Resuming video {video_id} from {resume_from:.0f}s (earlier segments already stored)"
                 )
-                # Mark video as processed and complete the job
-                if video.id:
-                    video_repo.mark_video_processed(video.id, success=True)
-                if job.id:
-                    job_repo.update_job_status(
-                        job.id, "completed", 1.0, "Reused existing fingerprints (cache hit)"
-                    )
+                return video, video_url, resume_from
+
+            self.complete_stored_video(job, video, video_repo, job_repo, progress)
+            return None
+
+        if fingerprints_exist:
+            self.logger.info(
+                f"Fingerprints already exist for video {video_id} with matching parameters "
+                f"(sample_rate={self.fingerprinter.sample_rate}, n_fft={self.fingerprinter.n_fft}, "
+                f"hop_length={self.fingerprinter.hop_length}). Skipping re-fingerprinting."
+            )
+            # Mark video as processed and complete the job
+            if video.id:
+                video_repo.mark_video_processed(video.id, success=True)
+            if job.id:
+                progress = progress or JobProgressReporter(job_repo)
+                progress.finish(job, "completed", 1.0, "Reused existing fingerprints (cache hit)")
+            return None
+
+        return video, video_url, 0.0
+
+    def complete_stored_video(
+        self,
+        job: Any,
+        video: Any,
+        video_repo: VideoRepository,
+        job_repo: JobRepository,
+        progress: JobProgressReporter | None = None,
+    ) -> None:
+        """
+        Complete a resumed job whose segments were all stored by an earlier attempt.
+
+        Used when the stored segments reach the video's duration, and when the
+        duration is unknown and the audio after the resume point is empty.
+        """
+        self.logger.info(f"All segments of video {job.target_id} were stored by an earlier attempt")
+        if video.id:
+            video_repo.mark_video_processed(video.id, success=True)
+        if job.id:
+            progress = progress or JobProgressReporter(job_repo)
+            progress.finish(job, "completed", 1.0, "Resumed: all segments already stored")
+
+    async def fingerprint_segments(
+        self,
+        video: Any,
+        segments: list[tuple[str, float, float]],
+        writer: ChunkedFingerprintWriter,
+        on_segment: Callable[[int, int], None] | None = None,
+    ) -> None:
+        """
+        Fingerprint a video's segments in the process pool and hand the rows to a writer.
+
+        librosa holds the GIL, so threads would not scale. Results arrive in
+        completion order; the writer puts them back in segment order and
+        persists them in chunks, so a crash part-way through keeps the work
+        done so far. Failed segments are logged and counted by the writer.
+
+        Args:
+            video: Video record the segments belong to
+            segments: (segment file, start time, end time) tuples
+            writer: Writer collecting the fingerprint rows
+            on_segment: Called with (segments done, total segments) as each finishes
+        """
+        loop = asyncio.get_running_loop()
+        pool = get_fingerprint_pool()
+        total = len(segments)
+
+        async def fingerprint(index: int, segment_file: str) -> tuple[int, Any]:
+            try:
+                result = await loop.run_in_executor(
+                    pool,
+                    fingerprint_segment,
+                    segment_file,
+                    self.fingerprinter.sample_rate,
+                    self.fingerprinter.n_fft,
+                    self.fingerprinter.hop_length,
+                )
+                return index, result
+            except Exception as e:
+                return index, e
+
+        for completed, next_result in enumerate(
+            asyncio.as_completed(
+                [fingerprint(i, segment_file) for i, (segment_file, _, _) in enumerate(segments)]
+            ),
+            start=1,
+        ):
+            index, result = await next_result
+            _, seg_start, seg_end = segments[index]
+
+            if isinstance(result, Exception):
+                self.logger.error(f"Error processing segment {seg_start}-{seg_end}: {result}")
+                writer.add(index, None)
+            else:
+                # Track fingerprint extraction time
+                if metrics:
+                    metrics.fingerprint_duration.observe(result["duration"])
+                    metrics.fingerprints_extracted.inc()
+
+                writer.add(
+                    index,
+                    {
+                        "video_id": int(video.id),
+                        "start_time": seg_start,
+                        "end_time": seg_end,
+                        "fingerprint_hash": result["fingerprint_hash"],
+                        "fingerprint_data": result["fingerprint_data"],
+                        "confidence_score": result["confidence_score"],
+                        "peak_count": result["peak_count"],
+                        "segment_length": seg_end - seg_start,
+                        "sample_rate": result["sample_rate"],
+                        "n_fft": self.fingerprinter.n_fft,
+                        "hop_length": self.fingerprinter.hop_length,
+                    },
+                )
+
+            if on_segment is not None:
+                on_segment(completed, total)
+
+    async def process_video_job(
+        self,
+        job: Any,
+        video_repo: VideoRepository,
+        job_repo: JobRepository,
+        fingerprinted: set[str] | None = None,
+    ) -> None:
+        """Process a single video processing job"""
+        start_time = time.time()
+        progress = JobProgressReporter(job_repo)
+        progress.update(job, 0.0, "Starting video processing")
+
+        try:
+            prepared = self.prepare_job(job, video_repo, job_repo, progress, fingerprinted)
+            if prepared is None:
                 return
+            video, video_url, resume_from = prepared
+            video_id = job.target_id
 
             # Mark video as processing started
             video.processing_started = datetime.now(timezone.utc)
             video_repo.session.commit()
 
-            job_repo.update_job_status(job.id, "running", 0.2, "Downloading and segmenting audio")
+            progress.update(job, 0.2, "Downloading and segmenting audio")
 
             # Process video and get segments (blocking I/O - run in thread)
             segments = await asyncio.to_thread(
-                self.video_processor.process_video_for_fingerprinting, video_url
+                self.video_processor.process_video_for_fingerprinting,
+                video_url,
+                start_time=resume_from,
             )
 
+            if segments == [] and resume_from > 0 and not video.duration:
+                # Nothing after the resume point: the earlier attempt had already
+                # stored the last segment of a video of unknown duration
+                self.complete_stored_video(job, video, video_repo, job_repo, progress)
+                return
             if not segments:
                 raise ValueError("Failed to process video or no segments created")
 
@@ -466,71 +812,26 @@ class VideoJobProcessor:
             if metrics:
                 metrics.audio_segments_created.inc(len(segments))
 
-            job_repo.update_job_status(
-                job.id, "running", 0.5, f"Extracting fingerprints from {len(segments)} segments"
-            )
+            progress.update(job, 0.5, f"Extracting fingerprints from {len(segments)} segments")
 
-            # Process each segment and collect fingerprint data for batch insert
-            fingerprints_data: list[dict[str, Any]] = []
-            failed_segments = 0
+            writer = ChunkedFingerprintWriter(video_repo)
 
-            for i, (segment_file, start_time, end_time) in enumerate(segments):
-                try:
-                    # Extract fingerprint (blocking I/O - run in thread)
-                    fingerprint_start = time.time()
-                    fingerprint_data = await asyncio.to_thread(
-                        self.fingerprinter.extract_fingerprint, segment_file
-                    )
+            def segment_done(completed: int, total: int) -> None:
+                # Published live, written to the database throttled
+                progress.update(
+                    job, 0.5 + 0.4 * completed / total, f"Processed segment {completed}/{total}"
+                )
 
-                    # Track fingerprint extraction time
-                    if metrics:
-                        metrics.fingerprint_duration.observe(time.time() - fingerprint_start)
-                        metrics.fingerprints_extracted.inc()
-
-                    # Prepare fingerprint data for batch insert
-                    serialized_data = self.fingerprinter.serialize_fingerprint(fingerprint_data)
-
-                    fingerprints_data.append({
-                        "video_id": int(video.id),  # type: ignore[arg-type]
-                        "start_time": start_time,
-                        "end_time": end_time,
-                        "fingerprint_hash": fingerprint_data["fingerprint_hash"],
-                        "fingerprint_data": serialized_data,
-                        "confidence_score": fingerprint_data["confidence_score"],
-                        "peak_count": fingerprint_data["peak_count"],
-                        "segment_length": end_time - start_time,
-                        "sample_rate": fingerprint_data["sample_rate"],
-                        "n_fft": self.fingerprinter.n_fft,
-                        "hop_length": self.fingerprinter.hop_length,
-                    })
-
-                    # Update progress
-                    progress_value = 0.5 + (0.4 * (i + 1) / len(segments))
-                    job_repo.update_job_status(
-                        job.id,
-                        "running",
-                        progress_value,
-                        f"Processed segment {i+1}/{len(segments)}",
-                    )
+            await self.fingerprint_segments(video, segments, writer, segment_done)
 
-                except Exception as e:
-                    self.logger.error(f"Error processing segment {start_time}-{end_time}: {str(e)}")
-                    failed_segments += 1
-                    continue
-
-            # Batch insert all fingerprints in a single transaction
-            if fingerprints_data:
-                try:
-                    video_repo.create_fingerprints_batch(fingerprints_data)
-                    fingerprints_created = len(fingerprints_data)
-                    self.logger.info(
-                        f"Batch inserted {fingerprints_created} fingerprints for video {video_id}"
-                    )
-                except Exception as e:
-                    self.logger.error(f"Failed to batch insert fingerprints: {e}")
-                    raise
-            else:
-                fingerprints_created = 0
+            try:
+                writer.flush()
+            except Exception as e:
+                self.logger.error(f"Failed to write fingerprints: {e}")
+                raise
+            fingerprints_created = writer.written
+            failed_segments = writer.failed
+            self.logger.info(f"Wrote {fingerprints_created} fingerprints for video {video_id}")
 
             # Clean up segments based on configuration (blocking I/O - run in thread)
             if Config.CLEANUP_SEGMENTS_AFTER_PROCESSING:
@@ -541,9 +842,7 @@ class VideoJobProcessor:
                 video_repo.mark_video_processed(video.id, success=True)
 
             if job.id:
-                job_repo.update_job_status(
-                    job.id, "completed", 1.0, f"Created {fingerprints_created} fingerprints"
-                )
+                progress.finish(job, "completed", 1.0, f"Created {fingerprints_created} fingerprints")
 
             # Track processing duration and success
             if metrics:
@@ -551,6 +850,7 @@ class VideoJobProcessor:
                 metrics.videos_processed.inc()
             self.logger.info(
                 f"Successfully processed video {video_id}: {fingerprints_created} fingerprints"
+                + (f" ({failed_segments} segments failed)" if failed_segments else "")
             )
 
         except Exception as e:
@@ -573,7 +873,11 @@ async def main() -> None:
     await ingester.ingest_all_channels()
 
     # Then process videos
-    await processor.process_pending_videos()
+    try:
+        await processor.process_pending_videos()
+    finally:
+        shutdown_fingerprint_pool()
+        shutdown_ytdlp_pool()
 
 
 if __name__ == "__main__":
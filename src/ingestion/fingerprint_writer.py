@@ -0,0 +1,72 @@
+"""Chunked, in-order fingerprint writes for a single video."""
+
+import logging
+from typing import Any
+
+from config.settings import Config
+from src.database.repositories import VideoRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkedFingerprintWriter:
+    """
+    Persist a video's segment fingerprints every ``chunk_size`` segments.
+
+    Segments may finish fingerprinting in any order; the writer releases them
+    strictly in segment order, so a crash leaves the fingerprints of a prefix
+    of the video's segments, minus those that failed. A retried job resumes
+    at the first missing segment (see
+    ``VideoRepository.get_fingerprint_resume_point``), so failed segments are
+    redone too. Writes are upserts, so re-writing a segment after a crash is
+    harmless.
+
+    Usage:
+        writer = ChunkedFingerprintWriter(video_repo)
+        for index, row in completed_segments:   # any order
+            writer.add(index, row)              # row is None for failed segments
+        writer.flush()
+    """
+
+    def __init__(self, video_repo: VideoRepository, chunk_size: int | None = None) -> None:
+        """
+        Initialize the writer.
+
+        Args:
+            video_repo: Repository used for the upserts
+            chunk_size: Fingerprints per transaction
+                (default: Config.FINGERPRINT_WRITE_CHUNK_SIZE)
+        """
+        self.video_repo = video_repo
+        self.chunk_size = chunk_size or Config.FINGERPRINT_WRITE_CHUNK_SIZE
+        self.pending: list[dict[str, Any]] = []
+        self.written = 0
+        self.failed = 0
+        self._completed: dict[int, dict[str, Any] | None] = {}
+        self._next_index = 0
+
+    def add(self, index: int, row: dict[str, Any] | None) -> None:
+        """
+        Record the result of segment ``index`` (None if it failed).
+
+        A chunk is written as soon as ``chunk_size`` rows are ready in order.
+        """
+        self._completed[index] = row
+        while self._next_index in self._completed:
+            ready = self._completed.pop(self._next_index)
+            self._next_index += 1
+            if ready is None:
+                self.failed += 1
+            else:
+                self.pending.append(ready)
+
+        if len(self.pending) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all rows released so far."""
+        if not self.pending:
+            return
+        self.written += self.video_repo.upsert_fingerprints(self.pending)
+        logger.debug(f"Wrote chunk of {len(self.pending)} fingerprints ({self.written} total)")
+        self.pending = []
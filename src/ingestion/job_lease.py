@@ -0,0 +1,101 @@
+"""Lease renewal for claimed processing jobs."""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+
+from config.settings import Config
+from src.database.repositories import JobRepository
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_id() -> str:
+    """Build a job worker id that is unique across hosts and restarts."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class JobLeaseKeeper:
+    """
+    Keep the leases of a worker's claimed jobs alive.
+
+    Jobs are tracked from the moment they are claimed until they complete or
+    fail. While active, the keeper renews all tracked leases every
+    ``JOB_HEARTBEAT_SECONDS``. Jobs whose lease could not be renewed (because
+    another worker reclaimed them) are reported as lost so the caller can
+    abandon them instead of writing duplicate results.
+
+    The keeper shares the caller's repository session, so it must run on the
+    same event loop thread as the rest of the caller's database access.
+
+    Usage:
+        async with JobLeaseKeeper(job_repo, worker_id) as leases:
+            for job in job_repo.claim_jobs("video_process", 5, worker_id):
+                leases.track(job.id)
+                ...
+                leases.untrack(job.id)
+    """
+
+    def __init__(
+        self,
+        job_repo: JobRepository,
+        worker_id: str,
+        interval: float | None = None,
+    ) -> None:
+        self.job_repo = job_repo
+        self.worker_id = worker_id
+        self.interval = interval or Config.JOB_HEARTBEAT_SECONDS
+        self.active: set[int] = set()
+        self.lost: set[int] = set()
+        self._task: asyncio.Task | None = None
+
+    def track(self, job_id: int) -> None:
+        """Start renewing the lease of a claimed job."""
+        self.active.add(job_id)
+
+    def untrack(self, job_id: int) -> None:
+        """Stop renewing the lease of a finished job."""
+        self.active.discard(job_id)
+
+    def is_lost(self, job_id: int) -> bool:
+        """Whether the job's lease was taken over by another worker."""
+        return job_id in self.lost
+
+    def renew(self) -> None:
+        """Renew all tracked leases now."""
+        if not self.active:
+            return
+        renewed = self.job_repo.heartbeat_jobs(sorted(self.active), self.worker_id)
+        newly_lost = self.active - renewed
+        self.lost |= newly_lost
+        self.active -= newly_lost
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.renew()
+            except Exception as e:
+                logger.warning(f"Failed to renew job leases for worker {self.worker_id}: {e}")
+
+    async def __aenter__(self) -> "JobLeaseKeeper":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        # Hand unfinished jobs back to the queue instead of waiting for the lease to expire
+        if self.active:
+            try:
+                released = self.job_repo.release_jobs(sorted(self.active), self.worker_id)
+                if released:
+                    logger.info(f"Released {released} unfinished jobs from worker {self.worker_id}")
+            except Exception as e:
+                logger.warning(f"Failed to release jobs for worker {self.worker_id}: {e}")
+            self.active.clear()
@@ -0,0 +1,93 @@
+"""Throttled progress reporting for processing jobs."""
+
+import logging
+import time
+from typing import Any
+
+from config.settings import Config
+from src.database.progress import ProgressChannel, get_progress_channel
+from src.database.repositories import JobRepository
+
+logger = logging.getLogger(__name__)
+
+
+class JobProgressReporter:
+    """
+    Report job progress without a database commit per update.
+
+    Every update is published to the progress channel right away, so API
+    clients see live progress. Database writes are coalesced: pending updates
+    of all jobs handled by the reporter are written together in one
+    transaction once ``min_interval`` seconds have passed since the last
+    write, or earlier when a job advanced by at least ``min_delta``. Final
+    states (completed/failed) are always written immediately.
+
+    The reporter shares the caller's repository session, so it must be used
+    from the same thread as the rest of the caller's database access.
+
+    Usage:
+        progress = JobProgressReporter(job_repo)
+        for i, segment in enumerate(segments):
+            ...
+            progress.update(job, (i + 1) / len(segments), f"Segment {i + 1}")
+        progress.finish(job, "completed", 1.0, "Done")
+    """
+
+    def __init__(
+        self,
+        job_repo: JobRepository,
+        channel: ProgressChannel | None = None,
+        min_interval: float | None = None,
+        min_delta: float | None = None,
+    ) -> None:
+        self.job_repo = job_repo
+        self.channel = channel or get_progress_channel()
+        self.min_interval = (
+            Config.JOB_PROGRESS_MIN_INTERVAL if min_interval is None else min_interval
+        )
+        self.min_delta = Config.JOB_PROGRESS_MIN_DELTA if min_delta is None else min_delta
+        self._pending: dict[int, tuple[float, str | None]] = {}
+        self._written: dict[int, float] = {}
+        self._last_flush = time.monotonic()
+        self.writes = 0
+
+    def update(self, job: Any, progress: float, current_step: str | None = None) -> None:
+        """Record the progress of a running job."""
+        self.channel.publish(job, "running", progress, current_step)
+        self._pending[job.id] = (progress, current_step)
+
+        if (
+            time.monotonic() - self._last_flush >= self.min_interval
+            or progress - self._written.get(job.id, 0.0) >= self.min_delta
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all pending progress updates in one transaction."""
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        self._last_flush = time.monotonic()
+        try:
+            self.job_repo.update_jobs_progress(pending)
+            self.writes += 1
+            for job_id, (progress, _) in pending.items():
+                self._written[job_id] = progress
+        except Exception as e:
+            # Progress is informational; never fail a job because of it
+            logger.warning(f"Failed to write progress of jobs {sorted(pending)}: {e}")
+
+    def finish(
+        self,
+        job: Any,
+        status: str,
+        progress: float | None = None,
+        current_step: str | None = None,
+        error_message: str | None = None,
+    ) -> None:
+        """Write and publish the final status of a job."""
+        self._pending.pop(job.id, None)
+        self._written.pop(job.id, None)
+        self.job_repo.update_job_status(job.id, status, progress, current_step, error_message)
+        self.channel.publish(job, status, progress, current_step, error_message)
@@ -0,0 +1,441 @@
+"""
+Staged pipeline for processing queued videos.
+
+Processing a video is a chain of very different kinds of work: a
+network-bound yt-dlp download, disk/ffmpeg-bound segmentation, CPU-bound
+fingerprinting and a database insert. Running them one video at a time
+leaves most resources idle, so the pipeline runs each kind of work as its
+own stage connected by bounded asyncio queues::
+
+    feeder -> download (N tasks) -> decode -> fingerprint (process pool) -> writer
+
+While one video is being fingerprinted the next ones are already
+downloading and segmenting. Bounded queues provide backpressure: the feeder
+stops claiming jobs when the downstream stages are full. Database access
+stays on the event loop thread (feeder and writer); blocking stages run in
+threads or in the fingerprint process pool.
+
+Long videos are not held back until the writer stage: the fingerprint
+stage persists them in chunks as segments finish (see
+``ChunkedFingerprintWriter``) and only hands the remainder to the writer,
+so a crash loses at most one chunk and the retried job resumes after it.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+from config.settings import Config
+from src.database.repositories import JobRepository, VideoRepository
+from src.ingestion.fingerprint_writer import ChunkedFingerprintWriter
+from src.ingestion.job_lease import JobLeaseKeeper
+from src.ingestion.job_progress import JobProgressReporter
+
+if TYPE_CHECKING:
+    from src.ingestion.channel_ingester import VideoJobProcessor
+
+# Import metrics if enabled
+if Config.METRICS_ENABLED:
+    from src.observability.metrics import metrics
+else:
+    metrics = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("download", "decode", "fingerprint", "write")
+
+
+@dataclass
+class PipelineItem:
+    """A video job travelling through the pipeline."""
+
+    job: Any
+    video: Any
+    url: str
+    resume_from: float = 0.0
+    started: float = field(default_factory=time.time)
+    audio_file: str | None = None
+    segments: list[tuple[str, float, float]] = field(default_factory=list)
+    fingerprints: list[dict[str, Any]] = field(default_factory=list)
+    fingerprints_written: int = 0
+    failed_segments: int = 0
+
+
+class VideoPipeline:
+    """Run pending video jobs through overlapping download/decode/fingerprint/write stages."""
+
+    def __init__(
+        self,
+        processor: "VideoJobProcessor",
+        job_repo: JobRepository,
+        video_repo: VideoRepository,
+        download_workers: int | None = None,
+        fingerprint_workers: int = 2,
+        queue_size: int | None = None,
+        write_batch_size: int | None = None,
+        leases: JobLeaseKeeper | None = None,
+    ) -> None:
+        """
+        Initialize the pipeline.
+
+        Args:
+            processor: Job processor providing the video processor, fingerprinter
+                and job bookkeeping helpers
+            job_repo: Job repository (used on the event loop thread only)
+            video_repo: Video repository (used on the event loop thread only)
+            download_workers: Concurrent downloads (default: MAX_CONCURRENT_DOWNLOADS)
+            fingerprint_workers: Videos fingerprinted concurrently; each video's
+                segments are spread over the whole process pool
+            queue_size: Capacity of each inter-stage queue (default: PIPELINE_QUEUE_SIZE)
+            write_batch_size: Maximum videos written per transaction
+                (default: PIPELINE_WRITE_BATCH_SIZE)
+            leases: Lease keeper renewing the claimed jobs (created if not provided)
+        """
+        self.processor = processor
+        self.job_repo = job_repo
+        self.video_repo = video_repo
+        self.download_workers = download_workers or Config.MAX_CONCURRENT_DOWNLOADS
+        self.fingerprint_workers = fingerprint_workers
+        self.queue_size = queue_size or Config.PIPELINE_QUEUE_SIZE
+        self.write_batch_size = write_batch_size or Config.PIPELINE_WRITE_BATCH_SIZE
+        self._owns_leases = leases is None
+        self.leases = leases or JobLeaseKeeper(job_repo, processor.worker_id)
+        # Shared by all jobs so their progress writes are batched together
+        self.progress = JobProgressReporter(job_repo)
+        self.queues: dict[str, asyncio.Queue] = {}
+        self.completed = 0
+        self.failed = 0
+
+    async def run(self, batch_size: int = 5) -> int:
+        """
+        Process pending video jobs until none are left.
+
+        Args:
+            batch_size: Jobs fetched from the database per query
+
+        Returns:
+            Number of videos completed
+        """
+        if self._owns_leases:
+            async with self.leases:
+                return await self._run(batch_size)
+        return await self._run(batch_size)
+
+    async def _run(self, batch_size: int) -> int:
+        self.queues = {stage: asyncio.Queue(maxsize=self.queue_size) for stage in STAGES}
+
+        tasks = [
+            asyncio.create_task(self._feed(batch_size)),
+            asyncio.create_task(
+                self._run_stage("download", self._download, self.download_workers, "decode", 1)
+            ),
+            asyncio.create_task(
+                self._run_stage("decode", self._decode, 1, "fingerprint", self.fingerprint_workers)
+            ),
+            asyncio.create_task(
+                self._run_stage(
+                    "fingerprint", self._fingerprint, self.fingerprint_workers, "write", 1
+                )
+            ),
+            asyncio.create_task(self._write_stage()),
+        ]
+
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            self.progress.flush()
+
+        logger.info(f"Video pipeline finished: {self.completed} completed, {self.failed} failed")
+        return self.completed
+
+    # Stage plumbing
+
+    async def _put(self, stage: str, item: PipelineItem | None) -> None:
+        await self.queues[stage].put(item)
+        if metrics:
+            metrics.pipeline_queue_depth.labels(stage=stage).set(self.queues[stage].qsize())
+
+    async def _get(self, stage: str) -> PipelineItem | None:
+        item = await self.queues[stage].get()
+        if metrics:
+            metrics.pipeline_queue_depth.labels(stage=stage).set(self.queues[stage].qsize())
+        return item
+
+    async def _run_stage(
+        self,
+        stage: str,
+        handler: Callable[[PipelineItem], Awaitable[None]],
+        workers: int,
+        next_stage: str,
+        next_workers: int,
+    ) -> None:
+        """Run ``workers`` consumers for a stage, then signal the next stage to stop."""
+
+        async def worker() -> None:
+            while True:
+                item = await self._get(stage)
+                if item is None:
+                    return
+                if await self._handle(stage, handler, item):
+                    await self._put(next_stage, item)
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        for _ in range(next_workers):
+            await self._put(next_stage, None)
+
+    async def _handle(
+        self,
+        stage: str,
+        handler: Callable[[PipelineItem], Awaitable[None]],
+        item: PipelineItem,
+    ) -> bool:
+        """Run one item through a stage; returns False if the job failed or was lost."""
+        if self._lost(item):
+            return False
+
+        started = time.time()
+        if metrics:
+            metrics.pipeline_in_flight.labels(stage=stage).inc()
+        try:
+            await handler(item)
+            outcome = "success"
+        except Exception as e:
+            logger.error(f"Pipeline {stage} failed for job {item.job.id}: {e}")
+            self._fail(item, e)
+            outcome = "failed"
+        finally:
+            if metrics:
+                metrics.pipeline_in_flight.labels(stage=stage).dec()
+                metrics.pipeline_stage_duration.labels(stage=stage).observe(time.time() - started)
+
+        if metrics:
+            metrics.pipeline_items_processed.labels(stage=stage, outcome=outcome).inc()
+        return outcome == "success"
+
+    def _lost(self, item: PipelineItem) -> bool:
+        """Drop a job whose lease was reclaimed by another worker."""
+        if not self.leases.is_lost(item.job.id):
+            return False
+        logger.warning(f"Abandoning job {item.job.id}: lease taken by another worker")
+        self._cleanup(item)
+        return True
+
+    def _fail(self, item: PipelineItem, error: Exception) -> None:
+        """Record a failed job and remove its temporary files."""
+        self.failed += 1
+        self.leases.untrack(item.job.id)
+        self.processor.handle_job_failure(
+            item.job, error, self.video_repo, self.job_repo, self.progress
+        )
+        self._cleanup(item)
+
+    def _cleanup(self, item: PipelineItem) -> None:
+        """Remove a job's temporary files."""
+        if item.audio_file and not Config.KEEP_ORIGINAL_AUDIO and os.path.exists(item.audio_file):
+            try:
+                os.remove(item.audio_file)
+            except OSError as e:
+                logger.warning(f"Failed to remove audio file {item.audio_file}: {e}")
+        if item.segments:
+            self.processor.video_processor.cleanup_segments(item.segments)
+
+    # Stages
+
+    async def _feed(self, batch_size: int) -> None:
+        """Claim pending jobs and hand them to the download stage."""
+        while True:
+            # Claim pending jobs (and jobs whose worker stopped heartbeating)
+            jobs = self.job_repo.claim_jobs("video_process", batch_size, self.processor.worker_id)
+            if not jobs:
+                logger.info("No pending video processing jobs")
+                break
+
+            logger.info(f"Queueing {len(jobs)} video jobs")
+            for job in jobs:
+                self.leases.track(job.id)
+            fingerprinted = self.processor.find_fingerprinted_videos(jobs, self.video_repo)
+            for job in jobs:
+                item = self._prepare(job, fingerprinted)
+                if item is not None:
+                    # Blocks while the pipeline is full (backpressure)
+                    await self._put("download", item)
+
+        # Only on a clean finish: an error or cancellation cancels every stage, and
+        # nothing would drain the queue if it is full
+        for _ in range(self.download_workers):
+            await self._put("download", None)
+
+    def _prepare(self, job: Any, fingerprinted: set[str] | None = None) -> PipelineItem | None:
+        """Validate a job and mark it running; returns None if nothing needs doing."""
+        try:
+            self.progress.update(job, 0.0, "Queued for download")
+            prepared = self.processor.prepare_job(
+                job, self.video_repo, self.job_repo, self.progress, fingerprinted
+            )
+            if prepared is None:
+                self.leases.untrack(job.id)
+                return None
+            video, url, resume_from = prepared
+            video.processing_started = datetime.now(timezone.utc)
+            self.video_repo.session.commit()
+            return PipelineItem(job=job, video=video, url=url, resume_from=resume_from)
+        except Exception as e:
+            logger.error(f"Error preparing job {job.id}: {e}")
+            self.failed += 1
+            self.leases.untrack(job.id)
+            self.processor.handle_job_failure(job, e, self.video_repo, self.job_repo, self.progress)
+            return None
+
+    async def _download(self, item: PipelineItem) -> None:
+        download_start = time.time()
+        item.audio_file = await asyncio.to_thread(
+            self.processor.video_processor.download_video_audio,
+            item.url,
+            start_time=item.resume_from,
+        )
+        if not item.audio_file:
+            raise ValueError(f"Failed to download audio for {item.url}")
+        if metrics:
+            metrics.download_duration.observe(time.time() - download_start)
+
+    async def _decode(self, item: PipelineItem) -> None:
+        audio_file = item.audio_file
+        if audio_file is None:
+            raise ValueError(f"No downloaded audio for {item.url}")
+
+        self.progress.update(item.job, 0.3, "Segmenting audio")
+        item.segments = await asyncio.to_thread(
+            self.processor.video_processor.segment_audio,
+            audio_file,
+            start_offset=item.resume_from,
+        )
+        # Nothing after the resume point of a video of unknown duration means the
+        # earlier attempt stored the last segment; completed by _complete
+        if not item.segments and not (item.resume_from > 0 and not item.video.duration):
+            raise ValueError("No segments created")
+
+        if not Config.KEEP_ORIGINAL_AUDIO and os.path.exists(audio_file):
+            await asyncio.to_thread(os.remove, audio_file)
+        if metrics:
+            metrics.audio_segments_created.inc(len(item.segments))
+
+    async def _fingerprint(self, item: PipelineItem) -> None:
+        total = len(item.segments)
+        self.progress.update(item.job, 0.5, f"Extracting fingerprints from {total} segments")
+        writer = ChunkedFingerprintWriter(self.video_repo)
+
+        def segment_done(done: int, total: int) -> None:
+            self.progress.update(
+                item.job, 0.5 + 0.4 * done / total, f"Processed segment {done}/{total}"
+            )
+
+        await self.processor.fingerprint_segments(item.video, item.segments, writer, segment_done)
+
+        # Full chunks are already stored; the remainder is batched by the writer stage
+        item.fingerprints = writer.pending
+        item.fingerprints_written = writer.written
+        item.failed_segments = writer.failed
+
+    async def _write_stage(self) -> None:
+        """Write fingerprints for all videos that are ready in one transaction."""
+        stage = "write"
+        done = False
+        while not done:
+            item = await self._get(stage)
+            if item is None:
+                break
+
+            batch = [item]
+            while len(batch) < self.write_batch_size:
+                try:
+                    queued = self.queues[stage].get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if queued is None:
+                    done = True
+                    break
+                batch.append(queued)
+
+            batch = [item for item in batch if not self._lost(item)]
+            if batch:
+                await self._write_batch(batch)
+
+    async def _write_batch(self, batch: list[PipelineItem]) -> None:
+        started = time.time()
+        if metrics:
+            metrics.pipeline_in_flight.labels(stage="write").inc(len(batch))
+
+        written: list[PipelineItem] = []
+        try:
+            rows = [row for item in batch for row in item.fingerprints]
+            try:
+                self.video_repo.upsert_fingerprints(rows)
+                written = batch
+            except Exception as e:
+                # Retry video by video so one bad video does not fail the batch
+                logger.warning(f"Batched fingerprint write failed, retrying per video: {e}")
+                self.video_repo.session.rollback()
+                for item in batch:
+                    try:
+                        self.video_repo.upsert_fingerprints(item.fingerprints)
+                        written.append(item)
+                    except Exception as item_error:
+                        self.video_repo.session.rollback()
+                        self._fail(item, item_error)
+                        if metrics:
+                            metrics.pipeline_items_processed.labels(
+                                stage="write", outcome="failed"
+                            ).inc()
+
+            for item in written:
+                try:
+                    await self._complete(item)
+                except Exception as e:
+                    logger.error(f"Failed to complete job {item.job.id}: {e}")
+                    self.video_repo.session.rollback()
+                    self._fail(item, e)
+                    if metrics:
+                        metrics.pipeline_items_processed.labels(
+                            stage="write", outcome="failed"
+                        ).inc()
+        finally:
+            if metrics:
+                metrics.pipeline_in_flight.labels(stage="write").dec(len(batch))
+                metrics.pipeline_stage_duration.labels(stage="write").observe(time.time() - started)
+
+    async def _complete(self, item: PipelineItem) -> None:
+        """Finish a job whose fingerprints have been stored."""
+        if Config.CLEANUP_SEGMENTS_AFTER_PROCESSING:
+            await asyncio.to_thread(self.processor.video_processor.cleanup_segments, item.segments)
+
+        count = item.fingerprints_written + len(item.fingerprints)
+        self.leases.untrack(item.job.id)
+        if not item.segments:
+            self.processor.complete_stored_video(
+                item.job, item.video, self.video_repo, self.job_repo, self.progress
+            )
+        else:
+            if item.video.id:
+                self.video_repo.mark_video_processed(item.video.id, success=True)
+            if item.job.id:
+                self.progress.finish(item.job, "completed", 1.0, f"Created {count} fingerprints")
+
+        self.completed += 1
+        if metrics:
+            metrics.pipeline_items_processed.labels(stage="write", outcome="success").inc()
+            metrics.processing_duration.observe(time.time() - item.started)
+            metrics.videos_processed.inc()
+        logger.info(
+            f"Successfully processed video {item.job.target_id}: {count} fingerprints"
+            + (f" ({item.failed_segments} segments failed)" if item.failed_segments else "")
+        )
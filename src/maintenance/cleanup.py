@@ -6,17 +6,38 @@ Handles cleanup of:
 - Old log files
 - Obsolete processing jobs
 - Orphaned fingerprints (optional)
+- Expired analytics logs (optional)
 """
 
 import os
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
+from typing import Any
 
 from config.logging_config import create_section_logger
 from config.settings import Config
 from src.database.connection import db_manager
-from src.database.models import AudioFingerprint, ProcessingJob, Video
+from src.database.fingerprint_stats import reconcile_fingerprint_stats
+from src.database.models import (
+    AnalyticsEvent,
+    AnalyticsEventRollup,
+    APIUsageLog,
+    APIUsageRollup,
+    AudioFingerprint,
+    ProcessingJob,
+    Video,
+)
+from src.database.partitions import (
+    ANALYTICS_EVENTS,
+    API_USAGE_LOGS,
+    PartitionedTable,
+    count_expired_default_rows,
+    delete_expired_default_rows,
+    drop_partitions,
+    expired_partitions,
+    is_partitioned,
+)
 
 
 @dataclass
@@ -61,6 +82,8 @@ class CleanupPolicy:
     log_files_days: int
     completed_jobs_days: int
     failed_jobs_days: int
+    api_usage_logs_days: int = 30
+    analytics_events_days: int = 365
 
     @classmethod
     def from_config(cls) -> "CleanupPolicy":
@@ -70,6 +93,8 @@ class CleanupPolicy:
             log_files_days=Config.RETENTION_LOG_FILES_DAYS,
             completed_jobs_days=Config.RETENTION_COMPLETED_JOBS_DAYS,
             failed_jobs_days=Config.RETENTION_FAILED_JOBS_DAYS,
+            api_usage_logs_days=Config.RETENTION_API_USAGE_LOGS_DAYS,
+            analytics_events_days=Config.RETENTION_ANALYTICS_EVENTS_DAYS,
         )
 
 
@@ -344,6 +369,7 @@ class CleanupService:
                             .filter(Video.processing_error.isnot(None), ~Video.processed)
                             .delete(synchronize_session=False)
                         )
+                        reconcile_fingerprint_stats(session, commit=False)
                         session.commit()
                         self.logger.info(f"Deleted {deleted} orphaned fingerprints")
 
@@ -362,13 +388,93 @@ class CleanupService:
 
         return stats
 
+    def cleanup_analytics(self) -> CleanupStats:
+        """
+        Remove raw analytics logs older than their retention period.
+
+        Partitioned tables (PostgreSQL) lose whole expired partitions and the
+        expired rows of their default partition; plain tables have their
+        expired rows deleted. Minute rollups are deleted with
+        the raw rows they summarize; hour rollups are kept.
+
+        Returns:
+            CleanupStats with details of the cleanup operation.
+        """
+        stats = CleanupStats(dry_run=self.dry_run)
+        now = datetime.now(UTC)
+        retention: list[tuple[PartitionedTable, Any, Any, int]] = [
+            (API_USAGE_LOGS, APIUsageLog, APIUsageRollup, self.policy.api_usage_logs_days),
+            (
+                ANALYTICS_EVENTS,
+                AnalyticsEvent,
+                AnalyticsEventRollup,
+                self.policy.analytics_events_days,
+            ),
+        ]
+
+        try:
+            session = db_manager.get_session()
+            try:
+                for table, model, rollup, days in retention:
+                    cutoff = now - timedelta(days=days)
+
+                    if is_partitioned(session, table):
+                        expired = expired_partitions(session, table, cutoff.date())
+                        if self.dry_run:
+                            count = count_expired_default_rows(session, table, cutoff)
+                            self.logger.info(
+                                f"[DRY RUN] Would drop {len(expired)} {table.name} partitions "
+                                f"and delete {count} rows from {table.default_name}"
+                            )
+                        else:
+                            if expired:
+                                drop_partitions(session, expired)
+                                self.logger.info(
+                                    f"Dropped {table.name} partitions: {', '.join(expired)}"
+                                )
+                            # Rows outside every partition range have no partition to drop
+                            count = delete_expired_default_rows(session, table, cutoff)
+                            if count > 0:
+                                self.logger.info(f"Deleted {count} {table.default_name} rows")
+                        stats.db_records_deleted += count
+                    else:
+                        expired_rows = session.query(model).filter(
+                            getattr(model, table.column) < cutoff
+                        )
+                        count = expired_rows.count()
+                        if self.dry_run:
+                            self.logger.info(f"[DRY RUN] Would delete {count} {table.name} rows")
+                        elif count > 0:
+                            expired_rows.delete(synchronize_session=False)
+                            self.logger.info(f"Deleted {count} {table.name} rows")
+                        stats.db_records_deleted += count
+
+                    if not self.dry_run:
+                        session.query(rollup).filter(
+                            rollup.granularity == "minute", rollup.bucket_start < cutoff
+                        ).delete(synchronize_session=False)
+                        session.commit()
+
+            except Exception as e:
+                session.rollback()
+                self.logger.error(f"Error cleaning analytics logs: {e}")
+                stats.errors += 1
+            finally:
+                session.close()
+
+        except Exception as e:
+            self.logger.error(f"Database connection error: {e}")
+            stats.errors += 1
+
+        return stats
+
     def cleanup_all(self, targets: list[str] | None = None) -> dict[str, CleanupStats]:
         """
         Run all cleanup operations.
 
         Args:
             targets: List of specific targets to clean. Options:
-                     'temp', 'logs', 'jobs', 'fingerprints'
+                     'temp', 'logs', 'jobs', 'fingerprints', 'analytics'
                      If None, runs all cleanup operations.
 
         Returns:
@@ -398,6 +504,10 @@ class CleanupService:
             self.logger.info("🧹 Cleaning orphaned fingerprints...")
             results["fingerprints"] = self.cleanup_orphaned_fingerprints()
 
+        if "analytics" in all_targets:
+            self.logger.info("🧹 Cleaning expired analytics logs...")
+            results["analytics"] = self.cleanup_analytics()
+
         # Print summary
         total_files = sum(s.files_deleted for s in results.values())
         total_bytes = sum(s.bytes_reclaimed for s in results.values())
@@ -73,6 +73,29 @@ class Metrics:
             buckets=(0.1, 0.5, 1, 2, 5, 10),
         )
 
+        # Video processing pipeline metrics (per stage)
+        self.pipeline_queue_depth = Gauge(
+            "soundhash_pipeline_queue_depth",
+            "Number of videos waiting in front of a pipeline stage",
+            ["stage"],
+        )
+        self.pipeline_in_flight = Gauge(
+            "soundhash_pipeline_in_flight",
+            "Number of videos currently being handled by a pipeline stage",
+            ["stage"],
+        )
+        self.pipeline_items_processed = Counter(
+            "soundhash_pipeline_items_processed_total",
+            "Total number of videos that completed a pipeline stage",
+            ["stage", "outcome"],
+        )
+        self.pipeline_stage_duration = Histogram(
+            "soundhash_pipeline_stage_duration_seconds",
+            "Time a video spends in a pipeline stage",
+            ["stage"],
+            buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600),
+        )
+
         # Matching metrics
         self.matches_found = Counter(
             "soundhash_matches_found_total",
@@ -88,6 +111,39 @@ class Metrics:
             buckets=(0.01, 0.1, 0.5, 1, 5, 10),
         )
 
+        # API usage logging
+        self.api_usage_buffer_depth = Gauge(
+            "soundhash_api_usage_buffer_depth",
+            "API usage rows waiting to be written",
+        )
+        self.api_usage_rows_written = Counter(
+            "soundhash_api_usage_rows_written_total",
+            "Total number of API usage rows written",
+        )
+        self.api_usage_rows_dropped = Counter(
+            "soundhash_api_usage_rows_dropped_total",
+            "Total number of API usage rows discarded instead of written",
+            ["reason"],
+        )
+
+        # Database query metrics
+        self.db_query_duration = Histogram(
+            "soundhash_db_query_duration_seconds",
+            "Time taken to execute a database statement",
+            ["statement"],
+            buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+        )
+        self.db_queries_per_request = Histogram(
+            "soundhash_db_queries_per_request",
+            "Number of database statements executed while serving an API request",
+            buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250),
+        )
+        self.db_n_plus_one = Counter(
+            "soundhash_db_n_plus_one_total",
+            "Total number of API requests that repeated a statement past the N+1 threshold",
+            ["statement"],
+        )
+
         # System health gauges
         self.pending_jobs = Gauge(
             "soundhash_pending_jobs",
@@ -3,9 +3,11 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
-from src.api.dependencies import get_db
+from src.api.dependencies import get_async_db, get_async_read_db, get_db, get_read_db
 from src.api.main import app
 from src.database.models import APIKey, Base, User
 
@@ -46,7 +48,21 @@ def client(test_db: Session):
         finally:
             pass
     
+    # Async routes read the same test database through its async driver.
+    # NullPool: TestClient may run requests on different event loops.
+    url = test_db.get_bind().url
+    async_driver = "sqlite+aiosqlite" if url.get_backend_name() == "sqlite" else "postgresql+psycopg"
+    async_engine = create_async_engine(url.set(drivername=async_driver), poolclass=NullPool)
+    AsyncTestingSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSession() as session:
+            yield session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
     
     with TestClient(app) as test_client:
         yield test_client
@@ -0,0 +1,314 @@
+"""Tests for the routes served from the async database session."""
+
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.api.auth import create_access_token, get_password_hash
+from src.api.dependencies import get_async_db, get_async_read_db
+from src.api.routes import analytics, fingerprints, matches, videos
+from src.database.analytics_rollups import roll_up_analytics
+from src.database.fingerprint_stats import reconcile_fingerprint_stats
+from src.database.models import (
+    APIUsageLog,
+    AudioFingerprint,
+    Base,
+    Channel,
+    FingerprintStatistics,
+    MatchResult,
+    ProcessingJob,
+    User,
+    Video,
+)
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture
+def seeded_db_url(tmp_path):
+    """Create a SQLite database file with a user, videos, fingerprints and a match."""
+    url = f"sqlite:///{tmp_path / 'api.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    session.add(
+        User(
+            username="reader",
+            email="reader@example.com",
+            hashed_password=get_password_hash("Password123!"),
+            is_active=True,
+        )
+    )
+    channel = Channel(channel_id="UC_ASYNC", channel_name="Async Channel")
+    session.add(channel)
+    session.flush()
+    for i in range(5):
+        session.add(
+            Video(
+                video_id=f"vid{i}",
+                channel_id=channel.id,
+                title=f"Video {i}",
+                processed=i < 3,
+            )
+        )
+    session.flush()
+    first_video = session.query(Video).filter_by(video_id="vid0").one()
+    for i in range(4):
+        session.add(
+            AudioFingerprint(
+                video_id=first_video.id,
+                start_time=i * 90.0,
+                end_time=(i + 1) * 90.0,
+                fingerprint_hash=f"hash{i}",
+                sample_rate=22050,
+                segment_length=90.0,
+                confidence_score=0.5 + i * 0.1,
+                peak_count=100 * (i + 1),
+            )
+        )
+    session.add(MatchResult(similarity_score=0.9, query_source="manual"))
+    session.add(ProcessingJob(job_type="video_process", target_id="vid1", status="running"))
+    session.commit()
+    # Fingerprints added directly, not through the batch writers
+    reconcile_fingerprint_stats(session)
+    session.close()
+    engine.dispose()
+    return url
+
+
+@pytest_asyncio.fixture
+async def client(seeded_db_url, monkeypatch):
+    """An HTTP client for the async routers, bound to the seeded database."""
+    monkeypatch.setattr(fingerprints, "_stats_cache", None)
+    async_engine = create_async_engine(seeded_db_url.replace("sqlite://", "sqlite+aiosqlite://"))
+    AsyncTestingSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSession() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(videos.router, prefix="/videos")
+    app.include_router(fingerprints.router, prefix="/fingerprints")
+    app.include_router(matches.router, prefix="/matches")
+    app.include_router(analytics.router, prefix="/analytics")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
+
+    token = create_access_token({"sub": "reader"})
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as http_client:
+        yield http_client
+
+    await async_engine.dispose()
+
+
+class TestAsyncRoutes:
+    """Test suite for routes using get_async_db."""
+
+    @pytest.mark.asyncio
+    async def test_requires_authentication(self, client):
+        """Test an unknown user is rejected by the async auth dependency."""
+        token = create_access_token({"sub": "nobody"})
+        response = await client.get("/videos/", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_list_videos_filters_and_paginates(self, client):
+        """Test filters apply to both the page and the total count."""
+        response = await client.get(
+            "/videos/", params={"processed": True, "per_page": 2, "order_dir": "asc"}
+        )
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["total"] == 3
+        assert body["total_pages"] == 2
+        assert [v["video_id"] for v in body["data"]] == ["vid0", "vid1"]
+
+    @pytest.mark.asyncio
+    async def test_get_video(self, client):
+        """Test a video is found by its YouTube ID and a missing one is a 404."""
+        found = await client.get("/videos/vid2")
+        missing = await client.get("/videos/nope")
+
+        assert found.json()["title"] == "Video 2"
+        assert missing.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_video_status_from_latest_job(self, client):
+        """Test the status falls back to the latest processing job."""
+        running = await client.get("/videos/vid1/status")
+        not_started = await client.get("/videos/vid3/status")
+
+        assert running.json()["status"] == "running"
+        assert not_started.json()["status"] == "not_started"
+
+    @pytest.mark.asyncio
+    async def test_delete_video(self, client):
+        """Test deleting a video commits through the async session."""
+        response = await client.delete("/videos/vid4")
+
+        assert response.status_code == 200
+        assert (await client.get("/videos/vid4")).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_stats(self, client):
+        """Test all fingerprint aggregates come back from one query."""
+        body = (await client.get("/fingerprints/stats")).json()
+
+        assert body["total_fingerprints"] == 4
+        assert body["total_videos"] == 1
+        assert body["avg_confidence"] == pytest.approx(0.65)
+        assert body["avg_peaks"] == pytest.approx(250.0)
+        assert body["total_duration_hours"] == pytest.approx(0.1)
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_stats_served_from_ledger(self, client, seeded_db_url):
+        """Test the stats come from the maintained ledger and are cached between reads."""
+        engine = create_engine(seeded_db_url)
+        with sessionmaker(bind=engine)() as session:
+            session.add(FingerprintStatistics(video_id=999, new_videos=1, total_fingerprints=1000))
+            session.commit()
+
+            first = (await client.get("/fingerprints/stats")).json()
+            session.add(FingerprintStatistics(video_id=999, total_fingerprints=1000))
+            session.commit()
+            second = (await client.get("/fingerprints/stats")).json()
+        engine.dispose()
+
+        assert first["total_fingerprints"] == 1004
+        assert first["total_videos"] == 2
+        assert second["total_fingerprints"] == 1004
+
+    @pytest.mark.asyncio
+    async def test_list_and_get_fingerprints(self, client):
+        """Test fingerprint listing and lookup by ID."""
+        listing = (await client.get("/fingerprints/", params={"per_page": 3})).json()
+        fingerprint_id = listing["data"][0]["id"]
+
+        assert listing["total"] == 4
+        assert len(listing["data"]) == 3
+        assert (await client.get(f"/fingerprints/{fingerprint_id}")).status_code == 200
+        assert (await client.get("/fingerprints/9999")).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_fingerprints_cursor_pagination(self, client):
+        """Test next_cursor fetches the following page without recounting."""
+        first = (await client.get("/fingerprints/", params={"per_page": 3})).json()
+        second = (
+            await client.get(
+                "/fingerprints/", params={"per_page": 3, "cursor": first["next_cursor"]}
+            )
+        ).json()
+        invalid = await client.get("/fingerprints/", params={"cursor": "bogus"})
+
+        hashes = [fp["fingerprint_hash"] for fp in first["data"] + second["data"]]
+        assert sorted(hashes) == ["hash0", "hash1", "hash2", "hash3"]
+        assert second["next_cursor"] is None
+        assert (second["total"], second["page"]) == (None, None)
+        assert invalid.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_matches(self, client):
+        """Test match listing, lookup and the placeholder search."""
+        listing = (await client.get("/matches/")).json()
+        match_id = listing["data"][0]["id"]
+        details = (await client.get(f"/matches/{match_id}")).json()
+        found = (
+            await client.post(
+                "/matches/find",
+                json={"video_url": "https://youtube.com/watch?v=x", "max_results": 2},
+            )
+        ).json()
+
+        assert listing["total"] == 1
+        assert details["similarity_score"] == 0.9
+        assert [m["video_id"] for m in found["matches"]] == ["vid0", "vid1"]
+
+    @pytest.mark.asyncio
+    async def test_track_event_and_funnel(self, client):
+        """Test a tracked event shows up in the overview, and empty funnels report zero."""
+        tracked = await client.post(
+            "/analytics/events",
+            params={"event_type": "click", "event_category": "ui", "event_name": "play"},
+        )
+
+        assert tracked.status_code == 200
+
+        overview = (await client.get("/analytics/overview")).json()
+        assert overview["metrics"]["total_events"] == 1
+        assert overview["metrics"]["active_users"] == 1
+        assert overview["events_by_category"] == {"ui": 1}
+        assert overview["metrics"]["error_rate"] == 0
+
+        funnel = (await client.get("/analytics/funnel", params={"journey_type": "signup"})).json()
+        assert funnel["metrics"]["total_started"] == 0
+        assert funnel["metrics"]["conversion_rate"] == 0
+
+    @pytest.mark.asyncio
+    async def test_api_usage_from_rollups_and_raw_rows(self, client, seeded_db_url):
+        """Test usage stats combine rolled-up hours with the raw rows after the watermark."""
+        start = datetime(2026, 10, 18, 8, 0)
+        engine = create_engine(seeded_db_url)
+        with sessionmaker(bind=engine)() as session:
+            reader = session.query(User).filter_by(username="reader").one()
+            for minutes in range(0, 150, 10):
+                session.add(
+                    APIUsageLog(
+                        user_id=reader.id,
+                        endpoint="/videos" if minutes < 100 else "/matches",
+                        method="GET",
+                        status_code=200 if minutes % 30 else 404,
+                        response_time_ms=minutes,
+                        timestamp=start + timedelta(minutes=minutes, seconds=5),
+                    )
+                )
+            session.add(
+                APIUsageLog(
+                    user_id=None,
+                    endpoint="/videos",
+                    method="GET",
+                    status_code=200,
+                    timestamp=start,
+                )
+            )
+            session.commit()
+            roll_up_analytics(session, 0, now=start + timedelta(hours=1, minutes=45))
+        engine.dispose()
+
+        params = {
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(hours=3)).isoformat(),
+        }
+        usage = await client.get("/analytics/api-usage", params={**params, "group_by": "hour"})
+        overview = (await client.get("/analytics/overview", params=params)).json()
+        body = usage.json()
+
+        assert usage.status_code == 200
+        assert [(p["period"], p["count"]) for p in body["usage_over_time"]] == [
+            ("2026-10-18T08:00:00", 6),
+            ("2026-10-18T09:00:00", 6),
+            ("2026-10-18T10:00:00", 3),
+        ]
+        assert body["usage_over_time"][1]["avg_response_time_ms"] == 85.0
+        assert body["top_endpoints"][0] == {
+            "endpoint": "/videos",
+            "count": 10,
+            "avg_response_time_ms": 45.0,
+        }
+        assert body["status_distribution"] == {"200": 10, "404": 5}
+        assert overview["metrics"]["api_calls"] == 15
+        assert overview["metrics"]["error_rate"] == pytest.approx(33.33)
+
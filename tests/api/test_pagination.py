@@ -0,0 +1,142 @@
+"""Tests for keyset pagination helpers."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from src.api.models.common import PaginationParams
+from src.api.pagination import (
+    count_statement,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+    split_page,
+)
+from src.database.models import Base, Channel, Video
+
+
+@pytest.fixture
+def session():
+    """An in-memory database with 7 videos, three of them created at the same time."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    channel = Channel(channel_id="UC_PAGES")
+    db.add(channel)
+    db.flush()
+    start = datetime(2026, 10, 1)
+    for i in range(7):
+        db.add(
+            Video(
+                video_id=f"vid{i}",
+                channel_id=channel.id,
+                created_at=start + timedelta(hours=min(i, 3)),
+            )
+        )
+    db.commit()
+    yield db
+    db.close()
+
+
+def _walk(session, per_page, descending=True):
+    """Follow next_cursor from the first page to the last; return the pages' video IDs."""
+    pages = []
+    pagination = PaginationParams(per_page=per_page)
+    while True:
+        query = paginate(select(Video), pagination, Video.created_at, Video.id, descending)
+        rows, next_cursor = split_page(
+            session.scalars(query).all(), pagination, Video.created_at, Video.id
+        )
+        pages.append([video.video_id for video in rows])
+        if next_cursor is None:
+            return pages
+        pagination = PaginationParams(per_page=per_page, cursor=next_cursor)
+
+
+class TestKeysetPagination:
+    """Test suite for cursor pagination."""
+
+    def test_cursor_walk_visits_every_row_once(self, session):
+        """Test pages split inside a run of equal created_at values are not skipped or repeated."""
+        pages = _walk(session, per_page=2)
+
+        assert pages == [["vid6", "vid5"], ["vid4", "vid3"], ["vid2", "vid1"], ["vid0"]]
+
+    def test_ascending_walk(self, session):
+        """Test cursors follow ascending order too."""
+        pages = _walk(session, per_page=3, descending=False)
+
+        assert [vid for page in pages for vid in page] == [f"vid{i}" for i in range(7)]
+
+    def test_page_numbers_still_work(self, session):
+        """Test page-numbered requests use an offset and still hand out a cursor."""
+        pagination = PaginationParams(page=2, per_page=3)
+        query = paginate(select(Video), pagination, Video.created_at, Video.id)
+        rows, next_cursor = split_page(
+            session.scalars(query).all(), pagination, Video.created_at, Video.id
+        )
+
+        assert [v.video_id for v in rows] == ["vid3", "vid2", "vid1"]
+        assert decode_cursor(next_cursor, (Video.created_at, Video.id)) == [
+            datetime(2026, 10, 1, 1),
+            2,
+        ]
+
+    def test_nullable_sort_column_has_no_cursor(self, session):
+        """Test sorts on nullable columns fall back to page numbers."""
+        pagination = PaginationParams(per_page=2)
+        query = paginate(select(Video), pagination, Video.title, Video.id)
+        _, next_cursor = split_page(session.scalars(query).all(), pagination, Video.title, Video.id)
+
+        assert next_cursor is None
+        with pytest.raises(HTTPException) as exc_info:
+            paginate(
+                select(Video),
+                PaginationParams(cursor=encode_cursor("a", 1)),
+                Video.title,
+                Video.id,
+            )
+        assert exc_info.value.status_code == 400
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(1, 2, 3), "!!!"])
+    def test_invalid_cursor(self, cursor):
+        """Test malformed cursors are rejected with a 400."""
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor(cursor, (Video.created_at, Video.id))
+
+        assert exc_info.value.status_code == 400
+
+
+class TestCountStatement:
+    """Test suite for total counting modes."""
+
+    def test_cursor_requests_skip_count(self):
+        """Test the total is only counted on cursor requests when asked for."""
+        query = select(Video)
+
+        assert count_statement(query, PaginationParams(cursor="x"), "postgresql") is None
+        assert count_statement(query, PaginationParams(), "sqlite") is not None
+
+    def test_approximate_uses_reltuples_for_unfiltered_lists(self):
+        """Test the estimate reads pg_class only when no filter applies."""
+        approximate = PaginationParams(count="approximate")
+        unfiltered = count_statement(select(Video), approximate, "postgresql")
+        filtered = count_statement(
+            select(Video).where(Video.processed.is_(True)), approximate, "postgresql"
+        )
+
+        sql = str(unfiltered.compile(dialect=postgresql.dialect()))
+        assert "pg_class.reltuples" in sql
+        assert "CAST(%(param_1)s AS REGCLASS)" in sql
+        assert "pg_class" not in str(filtered.compile(dialect=postgresql.dialect()))
+        assert "pg_class" not in str(count_statement(select(Video), approximate, "sqlite"))
+
+    def test_exact_count(self, session):
+        """Test the exact count matches the filtered rows."""
+        query = select(Video).where(Video.video_id.in_(["vid1", "vid2", "missing"]))
+
+        assert session.scalar(count_statement(query, PaginationParams(), "sqlite")) == 2
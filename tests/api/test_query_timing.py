@@ -0,0 +1,83 @@
+"""Tests for the per-request query timing middleware."""
+
+import logging
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from config.settings import Config
+from src.api.middleware.query_timing_middleware import QueryTimingMiddleware
+
+
+@pytest.fixture
+def app():
+    """An app whose routes run a given number of lookups, one query each."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    app = FastAPI()
+    app.add_middleware(QueryTimingMiddleware)
+
+    @app.get("/lookups/{n}")
+    def lookups(n: int):
+        with engine.connect() as connection:
+            for i in range(n):
+                connection.execute(text("SELECT :i"), {"i": i})
+        return {"n": n}
+
+    @app.get("/none")
+    async def none():
+        return {}
+
+    yield app
+    engine.dispose()
+
+
+async def _get(app, path):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path)
+
+
+class TestQueryTimingMiddleware:
+    """Test suite for QueryTimingMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_server_timing_header(self, app):
+        """Test queries run in the route's worker thread are counted."""
+        response = await _get(app, "/lookups/3")
+
+        assert response.status_code == 200
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+        assert response.headers["Server-Timing"].endswith('desc="3 queries"')
+
+        response = await _get(app, "/none")
+        assert response.headers["Server-Timing"] == 'db;dur=0.0;desc="0 queries"'
+
+    @pytest.mark.asyncio
+    async def test_header_can_be_disabled(self, app, monkeypatch):
+        """Test no header is sent when DATABASE_SERVER_TIMING is off."""
+        monkeypatch.setattr(Config, "DATABASE_SERVER_TIMING", False)
+
+        response = await _get(app, "/lookups/1")
+
+        assert "Server-Timing" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_repeated_statement_warns(self, app, monkeypatch, caplog):
+        """Test a statement repeated past the threshold is logged as a likely N+1."""
+        monkeypatch.setattr(Config, "DATABASE_N_PLUS_ONE_THRESHOLD", 5)
+        logger = "src.api.middleware.query_timing_middleware"
+
+        with caplog.at_level(logging.WARNING, logger=logger):
+            await _get(app, "/lookups/5")
+        assert not caplog.records
+
+        with caplog.at_level(logging.WARNING, logger=logger):
+            await _get(app, "/lookups/6")
+        assert len(caplog.records) == 1
+        assert "GET /lookups/6" in caplog.records[0].message
+        assert "ran 6 times: SELECT ?" in caplog.records[0].message
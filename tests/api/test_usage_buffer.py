@@ -0,0 +1,124 @@
+"""Tests for the buffered API usage log writer."""
+
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from src.api.usage_buffer import APIUsageBuffer
+from src.database.models import APIUsageLog, Base
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Sessions on a file database, so writer threads see the same data."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'usage.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _row(n=0, **values):
+    return {
+        "endpoint": f"/api/v1/videos/{n}",
+        "method": "GET",
+        "status_code": 200,
+        "response_time_ms": 12,
+        "query_params": {"page": n},
+        "timestamp": datetime.now(UTC),
+        **values,
+    }
+
+
+def _count(session_factory):
+    with session_factory() as session:
+        return session.scalar(select(func.count(APIUsageLog.id)))
+
+
+class TestAPIUsageBuffer:
+    """Test suite for APIUsageBuffer."""
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_in_batches(self, session_factory):
+        """Test buffered rows are written batch by batch."""
+        buffer = APIUsageBuffer(capacity=100, batch_size=4, session_factory=session_factory)
+        for n in range(10):
+            buffer.add(_row(n))
+
+        assert await buffer.flush() == 10
+        assert len(buffer) == 0
+        assert _count(session_factory) == 10
+        with session_factory() as session:
+            log = session.scalars(select(APIUsageLog).where(APIUsageLog.endpoint.endswith("/7")))
+            assert log.one().query_params == {"page": 7}
+
+    @pytest.mark.asyncio
+    async def test_background_flush_on_batch_size_and_interval(self, session_factory):
+        """Test a full batch is written right away and stragglers on the interval."""
+        buffer = APIUsageBuffer(
+            capacity=100, batch_size=5, flush_interval=0.5, session_factory=session_factory
+        )
+        await buffer.start()
+        try:
+            for n in range(5):
+                buffer.add(_row(n))
+            await asyncio.sleep(0.1)
+            assert _count(session_factory) == 5
+
+            buffer.add(_row(5))
+            await asyncio.sleep(0.1)
+            assert _count(session_factory) == 5
+            await asyncio.sleep(0.6)
+            assert _count(session_factory) == 6
+        finally:
+            await buffer.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_writes_remaining_rows(self, session_factory):
+        """Test stopping flushes rows still in the buffer."""
+        buffer = APIUsageBuffer(
+            capacity=100, batch_size=50, flush_interval=60, session_factory=session_factory
+        )
+        await buffer.start()
+        buffer.add(_row())
+        await buffer.stop()
+
+        assert _count(session_factory) == 1
+
+    def test_full_buffer_drops_oldest_without_sampling(self, session_factory):
+        """Test a full buffer evicts its oldest rows and counts them."""
+        buffer = APIUsageBuffer(
+            capacity=3, batch_size=10, sample_above=1.0, session_factory=session_factory
+        )
+        for n in range(5):
+            assert buffer.add(_row(n))
+
+        assert buffer.dropped["overflow"] == 2
+        assert [row["query_params"]["page"] for row in buffer._rows] == [2, 3, 4]
+
+    def test_rows_are_sampled_under_pressure(self, session_factory, monkeypatch):
+        """Test rows are kept with falling probability once the buffer passes the threshold."""
+        monkeypatch.setattr("src.api.usage_buffer.random.random", lambda: 0.5)
+        buffer = APIUsageBuffer(
+            capacity=100, batch_size=1000, sample_above=0.5, session_factory=session_factory
+        )
+        kept = sum(buffer.add(_row(n)) for n in range(200))
+
+        # Keep probability is 1 at half full and falls below 0.5 past three quarters
+        assert kept == len(buffer) == 75
+        assert buffer.dropped["sampled"] == 200 - kept
+        assert buffer.dropped["overflow"] == 0
+
+    @pytest.mark.asyncio
+    async def test_write_failure_counts_batch_as_dropped(self, session_factory):
+        """Test a failed batch write is counted and does not raise."""
+        buffer = APIUsageBuffer(capacity=100, batch_size=2, session_factory=session_factory)
+        buffer.add(_row(0))
+        buffer.add(_row(1, method=None))  # violates NOT NULL
+        buffer.add(_row(2))
+
+        assert await buffer.flush() == 1
+        assert buffer.dropped["error"] == 2
+        assert _count(session_factory) == 1
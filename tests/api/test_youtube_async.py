@@ -0,0 +1,234 @@
+"""Tests for the async YouTube Data API client against a local fake API server."""
+
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.api.youtube_async import AsyncYouTubeClient, QuotaLimiter
+
+PAGE_DELAY = 0.1
+
+
+class FakeYouTubeAPI:
+    """Serve channels, playlistItems and videos list calls for one channel."""
+
+    def __init__(self, video_count, delay=0.0, etag="etag-1"):
+        # Newest upload first, one per day going back from 2026-10-28
+        self.video_ids = [f"vid{i:04d}" for i in range(video_count)]
+        self.delay = delay
+        self.etag = etag
+        self.requests = {"channels": 0, "playlistItems": 0, "videos": 0}
+        self.active_details = 0
+        self.max_active_details = 0
+
+    def _published(self, index):
+        return f"2026-{10 - index // 28:02d}-{28 - index % 28:02d}T12:00:00Z"
+
+    async def channels(self, request):
+        self.requests["channels"] += 1
+        return web.json_response(
+            {"items": [{"contentDetails": {"relatedPlaylists": {"uploads": "UU1"}}}]}
+        )
+
+    async def playlist_items(self, request):
+        self.requests["playlistItems"] += 1
+        if request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304)
+        await asyncio.sleep(self.delay)
+        start = int(request.query.get("pageToken", 0))
+        size = int(request.query["maxResults"])
+        items = [
+            {"snippet": {"resourceId": {"videoId": video_id}, "publishedAt": self._published(i)}}
+            for i, video_id in enumerate(self.video_ids[start : start + size], start)
+        ]
+        body = {"etag": self.etag, "items": items}
+        if start + size < len(self.video_ids):
+            body["nextPageToken"] = str(start + size)
+        return web.json_response(body)
+
+    async def videos(self, request):
+        self.requests["videos"] += 1
+        self.active_details += 1
+        self.max_active_details = max(self.max_active_details, self.active_details)
+        try:
+            await asyncio.sleep(self.delay)
+            return web.json_response({
+                "items": [
+                    {
+                        "id": video_id,
+                        "snippet": {
+                            "title": f"Title {video_id}",
+                            "description": "",
+                            "publishedAt": "2026-10-01T12:00:00Z",
+                            "channelTitle": "Channel",
+                            "channelId": "UC1",
+                            "thumbnails": {},
+                        },
+                        "statistics": {"viewCount": "10"},
+                        "contentDetails": {"duration": "PT1M5S"},
+                    }
+                    for video_id in request.query["id"].split(",")
+                ]
+            })
+        finally:
+            self.active_details -= 1
+
+    def app(self):
+        app = web.Application()
+        app.router.add_get("/channels", self.channels)
+        app.router.add_get("/playlistItems", self.playlist_items)
+        app.router.add_get("/videos", self.videos)
+        return app
+
+
+@pytest_asyncio.fixture
+async def fake_api():
+    """Start fake API servers and return a client for each."""
+    servers = []
+
+    async def start(video_count, **kwargs):
+        api = FakeYouTubeAPI(video_count, **kwargs)
+        server = TestServer(api.app())
+        await server.start_server()
+        servers.append(server)
+        client = AsyncYouTubeClient(
+            api_key="test-key",
+            base_url=str(server.make_url("")),
+            max_concurrent_requests=8,
+            quota_units_per_second=1000,
+        )
+        return api, client
+
+    yield start
+    for server in servers:
+        await server.close()
+
+
+class TestAsyncYouTubeClient:
+    """Test suite for AsyncYouTubeClient."""
+
+    @pytest.mark.asyncio
+    async def test_lists_all_videos_in_upload_order(self, fake_api):
+        """Test every page is listed and details keep the playlist order."""
+        api, client = await fake_api(120)
+        async with client:
+            videos = await client.get_channel_videos("UC1")
+
+        assert [v["id"] for v in videos] == api.video_ids
+        assert videos[0]["duration"] == 65
+        assert api.requests["playlistItems"] == 3
+
+    @pytest.mark.asyncio
+    async def test_pages_and_details_overlap(self, fake_api):
+        """Test listing latency grows by one request per page, not two."""
+        api, client = await fake_api(200, delay=PAGE_DELAY)
+        async with client:
+            started = time.monotonic()
+            videos = await client.get_channel_videos("UC1")
+            elapsed = time.monotonic() - started
+
+        assert len(videos) == 200
+        # Sequential paging plus details would take 4 * 2 * PAGE_DELAY
+        assert elapsed < 6 * PAGE_DELAY
+
+    @pytest.mark.asyncio
+    async def test_detail_chunks_fetched_concurrently(self, fake_api):
+        """Test 50-ID detail chunks are requested in parallel."""
+        api, client = await fake_api(0, delay=PAGE_DELAY)
+        video_ids = [f"vid{i:04d}" for i in range(200)]
+        async with client:
+            videos = await client.get_video_details(video_ids)
+
+        assert [v["id"] for v in videos] == video_ids
+        assert api.requests["videos"] == 4
+        assert api.max_active_details == 4
+
+    @pytest.mark.asyncio
+    async def test_max_results(self, fake_api):
+        """Test paging stops once enough videos are listed."""
+        api, client = await fake_api(200)
+        async with client:
+            videos = await client.get_channel_videos("UC1", max_results=60)
+
+        assert [v["id"] for v in videos] == api.video_ids[:60]
+
+    @pytest.mark.asyncio
+    async def test_incremental_listing_stops_at_watermark(self, fake_api):
+        """Test only uploads newer than the last seen video are fetched."""
+        api, client = await fake_api(200)
+        async with client:
+            videos, etag = await client.get_new_channel_videos("UC1", last_video_id="vid0003")
+            by_date, _ = await client.get_new_channel_videos(
+                "UC1", last_video_id="gone", last_upload_date=datetime(2026, 10, 26)
+            )
+
+        assert [v["id"] for v in videos] == ["vid0000", "vid0001", "vid0002"]
+        assert etag == "etag-1"
+        assert [v["id"] for v in by_date] == ["vid0000", "vid0001", "vid0002"]
+
+    @pytest.mark.asyncio
+    async def test_unchanged_playlist(self, fake_api):
+        """Test a matching ETag returns no videos without fetching details."""
+        api, client = await fake_api(100)
+        async with client:
+            videos, etag = await client.get_new_channel_videos("UC1", "vid0000", etag="etag-1")
+
+        assert videos == []
+        assert etag == "etag-1"
+        assert api.requests["videos"] == 0
+
+    @pytest.mark.asyncio
+    async def test_api_error_returns_empty_listing(self):
+        """Test an error status is logged and reported as no videos."""
+        async def quota_exceeded(request):
+            return web.Response(status=403, text="quota exceeded")
+
+        app = web.Application()
+        app.router.add_get("/channels", quota_exceeded)
+        async with TestServer(app) as server:
+            async with AsyncYouTubeClient(api_key="k", base_url=str(server.make_url(""))) as client:
+                assert await client.get_channel_videos("UC1") == []
+                assert await client.get_new_channel_videos("UC1") == (None, None)
+
+
+class TestQuotaLimiter:
+    """Test suite for QuotaLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_limits_units_per_second(self):
+        """Test requests beyond the burst wait for quota to refill."""
+        limiter = QuotaLimiter(max_concurrent=100, units_per_second=20)
+
+        async def request():
+            async with limiter.acquire():
+                pass
+
+        started = time.monotonic()
+        await asyncio.gather(*(request() for _ in range(30)))
+
+        assert time.monotonic() - started >= 0.45
+        assert limiter.units_used == 30
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrency(self):
+        """Test no more than max_concurrent requests run at once."""
+        limiter = QuotaLimiter(max_concurrent=2, units_per_second=1000)
+        active = 0
+        peak = 0
+
+        async def request():
+            nonlocal active, peak
+            async with limiter.acquire():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(request() for _ in range(6)))
+
+        assert peak == 2
@@ -0,0 +1,90 @@
+"""Tests for incremental channel listing in YouTubeAPIService."""
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from src.api.youtube_service import YouTubeAPIService
+
+
+def _service(pages):
+    """Build a service whose uploads playlist returns the given pages of (video_id, published)."""
+    service = YouTubeAPIService.__new__(YouTubeAPIService)
+    service.logger = MagicMock()
+    service.service = MagicMock()
+    service.service.channels().list().execute.return_value = {
+        "items": [{"contentDetails": {"relatedPlaylists": {"uploads": "UU123"}}}]
+    }
+
+    responses = []
+    for i, page in enumerate(pages):
+        response = {
+            "etag": "etag-new",
+            "items": [
+                {"snippet": {"resourceId": {"videoId": video_id}, "publishedAt": published}}
+                for video_id, published in page
+            ],
+        }
+        if i < len(pages) - 1:
+            response["nextPageToken"] = f"page{i + 1}"
+        responses.append(response)
+
+    requests = []
+
+    def list_items(**kwargs):
+        request = MagicMock()
+        request.headers = {}
+        request.execute.return_value = responses[len(requests)]
+        requests.append(request)
+        return request
+
+    service.service.playlistItems().list.side_effect = list_items
+    service.get_video_details = lambda ids: [{"id": video_id} for video_id in ids]
+    return service, requests
+
+
+class TestGetNewChannelVideos:
+    """Test suite for YouTubeAPIService.get_new_channel_videos."""
+
+    def test_stops_paging_at_last_seen_video(self):
+        """Test listing stops at the previous sync's newest video without reading further pages."""
+        service, requests = _service([
+            [("new2", "2026-10-17T10:00:00Z"), ("new1", "2026-10-16T10:00:00Z")],
+            [("seen", "2026-10-01T10:00:00Z"), ("older", "2026-09-01T10:00:00Z")],
+            [("oldest", "2026-08-01T10:00:00Z")],
+        ])
+
+        videos, etag = service.get_new_channel_videos("UC123", last_video_id="seen")
+
+        assert [v["id"] for v in videos] == ["new2", "new1"]
+        assert etag == "etag-new"
+        assert len(requests) == 2
+
+    def test_stops_at_upload_date_watermark(self):
+        """Test videos published before the watermark end the listing."""
+        service, _ = _service([
+            [("new", "2026-10-17T10:00:00Z"), ("old", "2026-09-30T10:00:00Z")],
+        ])
+
+        videos, _ = service.get_new_channel_videos(
+            "UC123", last_video_id="deleted", last_upload_date=datetime(2026, 10, 1)
+        )
+
+        assert [v["id"] for v in videos] == ["new"]
+
+    def test_unchanged_playlist_returns_no_videos(self):
+        """Test a 304 for the stored ETag means no new uploads."""
+        service, _ = _service([])
+        request = MagicMock()
+        request.headers = {}
+        request.execute.side_effect = HttpError(httplib2.Response({"status": 304}), b"")
+        service.service.playlistItems().list.side_effect = None
+        service.service.playlistItems().list.return_value = request
+
+        videos, etag = service.get_new_channel_videos("UC123", "seen", etag="etag-old")
+
+        assert videos == []
+        assert etag == "etag-old"
+        assert request.headers["If-None-Match"] == "etag-old"
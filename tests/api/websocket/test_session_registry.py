@@ -0,0 +1,221 @@
+"""Tests for the cross-worker live session registry."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.api.session_registry import (
+    CONTROL_CHANNEL_PREFIX,
+    RedisSessionRegistry,
+    SessionRegistry,
+)
+
+
+class FakeRedis:
+    """Minimal shared hash store that delivers pub/sub messages to registries."""
+
+    def __init__(self):
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.subscribers: dict[str, SessionRegistry] = {}
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def publish(self, channel, message):
+        await self.subscribers[channel]._dispatch(message)
+
+
+class FakePubSub:
+    """Pub/sub connection that yields the given messages, raising any exceptions among them."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.subscribed = []
+
+    async def subscribe(self, channel):
+        self.subscribed.append(channel)
+
+    async def listen(self):
+        for message in self.messages:
+            if isinstance(message, Exception):
+                raise message
+            yield message
+        await asyncio.Event().wait()
+
+    async def unsubscribe(self):
+        pass
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def registry():
+    """Create an in-process registry."""
+    return SessionRegistry(worker_id="worker-a", heartbeat_interval=5)
+
+
+@pytest.fixture
+def shared_workers():
+    """Create two Redis-backed registries sharing one store."""
+    redis = FakeRedis()
+    workers = [
+        RedisSessionRegistry(redis, worker_id=name, heartbeat_interval=5)
+        for name in ("worker-a", "worker-b")
+    ]
+    for worker in workers:
+        redis.subscribers[CONTROL_CHANNEL_PREFIX + worker.worker_id] = worker
+    return workers
+
+
+class TestSessionRegistry:
+    """Test suite for SessionRegistry."""
+
+    @pytest.mark.asyncio
+    async def test_register_and_unregister(self, registry):
+        """Test stream ownership is recorded and removed."""
+        await registry.register_stream("client-1", connected_at=100.0)
+
+        entry = await registry.get_stream("client-1")
+        assert entry["worker_id"] == "worker-a"
+        assert entry["connected_at"] == 100.0
+
+        await registry.unregister_stream("client-1")
+        assert await registry.get_stream("client-1") is None
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_publishes_stats_and_drops_ghosts(self, registry):
+        """Test heartbeats refresh stream stats and remove closed streams."""
+        await registry.register_stream("open")
+        await registry.register_stream("closed")
+        time.sleep(0.01)
+
+        await registry.heartbeat({"streams": 1}, {"open": {"queue_depth": 2}})
+
+        streams = await registry.get_streams()
+        assert [s["client_id"] for s in streams] == ["open"]
+        assert streams[0]["queue_depth"] == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_workers_pruned(self, registry):
+        """Test workers that stopped heartbeating are dropped."""
+        await registry.heartbeat({"streams": 0}, {})
+        registry._workers["worker-gone"] = (
+            '{"worker_id": "worker-gone", "streams": 3, "heartbeat_at": 0}'
+        )
+
+        workers = await registry.get_workers()
+
+        assert [w["worker_id"] for w in workers] == ["worker-a"]
+        assert "worker-gone" not in registry._workers
+
+    @pytest.mark.asyncio
+    async def test_local_control_dispatch(self, registry):
+        """Test control messages for local streams reach the handler."""
+        handler = AsyncMock()
+        registry.on_control(handler)
+        await registry.register_stream("client-1")
+
+        owner = await registry.send_control("client-1", "disconnect", {"message": "bye"})
+
+        assert owner == "worker-a"
+        handler.assert_awaited_once_with("client-1", "disconnect", {"message": "bye"})
+
+    @pytest.mark.asyncio
+    async def test_control_unknown_stream(self, registry):
+        """Test control messages for unknown streams are not routed."""
+        assert await registry.send_control("missing", "disconnect") is None
+
+    @pytest.mark.asyncio
+    async def test_capacity_limit(self, registry):
+        """Test new streams are refused at the per-worker limit."""
+        with patch("src.api.session_registry.Config.STREAMING_MAX_STREAMS_PER_WORKER", 2):
+            assert await registry.should_accept_stream(1)
+            assert not await registry.should_accept_stream(2)
+
+
+class TestRedisSessionRegistry:
+    """Test cross-worker behaviour of the Redis-backed registry."""
+
+    @pytest.mark.asyncio
+    async def test_streams_visible_from_all_workers(self, shared_workers):
+        """Test every worker lists streams owned by its peers."""
+        worker_a, worker_b = shared_workers
+        await worker_a.heartbeat({"streams": 1}, {})
+        await worker_b.heartbeat({"streams": 0}, {})
+        await worker_a.register_stream("client-a")
+
+        streams = await worker_b.get_streams()
+
+        assert [(s["client_id"], s["worker_id"]) for s in streams] == [("client-a", "worker-a")]
+
+    @pytest.mark.asyncio
+    async def test_control_routed_to_owner(self, shared_workers):
+        """Test a disconnect issued on one worker runs on the owning worker."""
+        worker_a, worker_b = shared_workers
+        handler_a, handler_b = AsyncMock(), AsyncMock()
+        worker_a.on_control(handler_a)
+        worker_b.on_control(handler_b)
+        await worker_a.register_stream("client-a")
+
+        owner = await worker_b.send_control("client-a", "disconnect")
+
+        assert owner == "worker-a"
+        handler_a.assert_awaited_once_with("client-a", "disconnect", {})
+        handler_b.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_streams_of_dead_worker_removed(self, shared_workers):
+        """Test streams of a worker without recent heartbeats are dropped."""
+        worker_a, worker_b = shared_workers
+        await worker_a.register_stream("client-a")
+        await worker_b.heartbeat({"streams": 0}, {})
+
+        assert await worker_b.get_streams() == []
+        assert await worker_a.get_stream("client-a") is None
+
+    @pytest.mark.asyncio
+    async def test_rebalance_margin(self, shared_workers):
+        """Test a worker far busier than its peers refuses new streams."""
+        worker_a, worker_b = shared_workers
+        await worker_a.heartbeat({"streams": 5}, {})
+        await worker_b.heartbeat({"streams": 1}, {})
+
+        with patch("src.api.session_registry.Config.STREAMING_REBALANCE_MARGIN", 3):
+            assert not await worker_a.should_accept_stream(5)
+            assert await worker_b.should_accept_stream(1)
+
+    @pytest.mark.asyncio
+    async def test_listener_resubscribes_after_connection_error(self, shared_workers):
+        """Test a dropped control subscription is re-established."""
+        worker_a, _ = shared_workers
+        handler = AsyncMock()
+        worker_a.on_control(handler)
+        message = '{"client_id": "client-a", "action": "disconnect"}'
+        connections = [
+            FakePubSub([ConnectionError("connection lost")]),
+            FakePubSub([{"type": "subscribe"}, {"type": "message", "data": message}]),
+        ]
+        worker_a.redis.pubsub = lambda: connections.pop(0)
+
+        with patch("src.api.session_registry.LISTEN_RETRY_SECONDS", 0):
+            task = asyncio.create_task(worker_a._listen())
+            for _ in range(10):
+                await asyncio.sleep(0)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        assert connections == []
+        handler.assert_awaited_once_with("client-a", "disconnect", {})
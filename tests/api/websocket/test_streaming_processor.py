@@ -1,5 +1,7 @@
 """Tests for streaming audio processor."""
 
+import asyncio
+
 import pytest
 import numpy as np
 from unittest.mock import AsyncMock, patch
@@ -134,6 +136,33 @@ class TestStreamingAudioProcessor:
         # Should return empty list
         assert matches == []
 
+    @pytest.mark.asyncio
+    @patch('src.core.streaming_processor.get_match_index')
+    async def test_find_matches_uses_index(self, mock_get_index, processor):
+        """Test find_matches resolves candidates from the shared index."""
+        index = mock_get_index.return_value
+        index.ensure_loaded.return_value = True
+        index.search.return_value = [
+            {"video_id": 7, "start_time": 0.0, "end_time": 90.0, "confidence": 0.8, "score": 0.91}
+        ]
+        index.get_video_metadata.return_value = {
+            7: {"video_id": "abc", "title": "T", "url": "u", "thumbnail_url": None}
+        }
+
+        matches = await processor.find_matches({"compact_fingerprint": np.ones(12)})
+
+        assert matches == [{
+            "video_id": "abc",
+            "title": "T",
+            "url": "u",
+            "thumbnail_url": None,
+            "start_time": 0.0,
+            "end_time": 90.0,
+            "similarity_score": 0.91,
+            "confidence": 0.8,
+        }]
+        index.get_video_metadata.assert_called_once_with({7})
+
     def test_get_stats(self, processor):
         """Test getting processor statistics."""
         # Add some data
@@ -223,3 +252,87 @@ async def test_process_audio_chunk_existing_client(mock_manager):
     
     # Cleanup
     cleanup_processor(client_id)
+
+
+class TestBackpressure:
+    """Test off-loop processing and hop coalescing."""
+
+    @pytest.mark.asyncio
+    @patch('src.core.streaming_processor.StreamingAudioProcessor.find_matches')
+    async def test_stale_hops_are_coalesced(self, mock_find_matches, processor):
+        """Test that hops accumulated while behind are processed as one run."""
+        mock_find_matches.return_value = []
+
+        audio_array = np.random.rand(processor.hop_size * 3).astype(np.float32)
+        processor.add_audio(audio_array.tobytes())
+        assert processor.queue_depth == 3
+
+        await processor.process_buffer()
+
+        mock_find_matches.assert_called_once()
+        assert processor.hops_processed == 1
+        assert processor.hops_dropped == 2
+        assert processor.queue_depth == 0
+        assert not processor.should_process()
+
+    @pytest.mark.asyncio
+    @patch('src.core.streaming_processor.StreamingAudioProcessor.find_matches')
+    async def test_single_run_in_flight(self, mock_find_matches):
+        """Test that chunks received during a run do not start another run."""
+        from src.core.streaming_processor import process_audio_chunk
+
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_find_matches(fingerprint):
+            started.set()
+            await release.wait()
+            return []
+
+        mock_find_matches.side_effect = slow_find_matches
+
+        client_id = "slow-client"
+        processors[client_id] = StreamingAudioProcessor()
+        processor = processors[client_id]
+        hop = np.random.rand(processor.hop_size).astype(np.float32).tobytes()
+
+        with patch('src.api.websocket.manager'):
+            await process_audio_chunk(client_id, hop)
+            await asyncio.wait_for(started.wait(), timeout=10)
+            first_task = processor.task
+
+            # More audio arrives while the first run is still in flight
+            await process_audio_chunk(client_id, hop)
+            await process_audio_chunk(client_id, hop)
+            assert processor.task is first_task
+            assert processor.queue_depth == 2
+
+            release.set()
+            await asyncio.wait_for(first_task, timeout=10)
+
+        # The backlog was drained by a single coalesced follow-up run
+        assert mock_find_matches.call_count == 2
+        assert processor.hops_dropped == 1
+        cleanup_processor(client_id)
+
+    def test_stats_include_backpressure(self, processor):
+        """Test that stats expose queue depth and lag."""
+        audio_array = np.random.rand(processor.hop_size).astype(np.float32)
+        processor.add_audio(audio_array.tobytes())
+
+        stats = processor.get_stats()
+
+        assert stats["queue_depth"] == 1
+        assert stats["processing"] is False
+        assert stats["hops_dropped"] == 0
+        assert stats["lag_seconds"] >= 0
+
+    def test_executor_stats(self):
+        """Test aggregate executor statistics."""
+        from src.core.streaming_processor import get_executor_stats
+
+        stats = get_executor_stats()
+
+        assert stats["max_workers"] > 0
+        assert "total_queue_depth" in stats
+        assert "max_lag_seconds" in stats
@@ -36,6 +36,7 @@ class TestYtDlpCaching:
                 # Cache dir should not be created when caching is disabled
                 assert not os.path.exists(cache_dir), "Cache directory should not be created when disabled"
 
+    @patch.object(Config, "YT_DLP_IN_PROCESS", False)
     @patch("subprocess.run")
     def test_cache_dir_passed_to_ytdlp_when_enabled(self, mock_run, temp_dir):
         """Test that --cache-dir is passed to yt-dlp when caching is enabled."""
@@ -66,6 +67,7 @@ class TestYtDlpCaching:
                 assert "--cache-dir" in cmd, "Should include --cache-dir flag"
                 assert cache_dir in cmd, f"Should include cache directory: {cache_dir}"
 
+    @patch.object(Config, "YT_DLP_IN_PROCESS", False)
     @patch("subprocess.run")
     def test_cache_dir_not_passed_when_disabled(self, mock_run, temp_dir):
         """Test that --cache-dir is not passed to yt-dlp when caching is disabled."""
@@ -103,10 +105,7 @@ class TestFingerprintCaching:
         """Test that check_fingerprints_exist returns False for videos without fingerprints."""
         # Create a mock session
         mock_session = MagicMock()
-        mock_query = MagicMock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.count.return_value = 0  # No existing fingerprints
+        mock_session.scalar.return_value = False  # EXISTS finds no fingerprints
         
         repo = VideoRepository(mock_session)
         
@@ -124,10 +123,7 @@ class TestFingerprintCaching:
         """Test that check_fingerprints_exist returns True when fingerprints exist with matching params."""
         # Create a mock session
         mock_session = MagicMock()
-        mock_query = MagicMock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.count.return_value = 5  # 5 existing fingerprints
+        mock_session.scalar.return_value = True  # EXISTS finds fingerprints
         
         repo = VideoRepository(mock_session)
         
@@ -145,10 +141,7 @@ class TestFingerprintCaching:
         """Test that check_fingerprints_exist returns False when params don't match."""
         # Create a mock session
         mock_session = MagicMock()
-        mock_query = MagicMock()
-        mock_session.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.count.return_value = 0  # Different params, no match
+        mock_session.scalar.return_value = False  # Different params, no match
         
         repo = VideoRepository(mock_session)
         
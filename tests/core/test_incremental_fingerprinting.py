@@ -0,0 +1,120 @@
+"""Tests for incremental sliding-window fingerprinting."""
+
+import librosa
+import numpy as np
+import pytest
+
+from src.core.audio_fingerprinting import AudioFingerprinter
+from src.core.incremental_fingerprinting import IncrementalFingerprinter
+
+
+@pytest.fixture
+def fingerprinter():
+    """Create a standard fingerprinter."""
+    return AudioFingerprinter(sample_rate=22050, n_fft=2048, hop_length=512)
+
+
+def _reference_fingerprint(fingerprinter, window):
+    """Fingerprint a window from scratch using non-centered frames."""
+    magnitude = np.abs(
+        librosa.stft(
+            window,
+            n_fft=fingerprinter.n_fft,
+            hop_length=fingerprinter.hop_length,
+            center=False,
+        )
+    )
+    rows = []
+    for frame in magnitude.T:
+        peaks = fingerprinter._extract_frame_peaks(frame)
+        if peaks:
+            row = np.zeros(len(fingerprinter.freq_ranges))
+            for peak in peaks:
+                row[peak["freq_range"]] += peak["magnitude"]
+            rows.append(row)
+    compact = np.vstack(rows).flatten()
+    return compact / np.max(compact)
+
+
+class TestIncrementalFingerprinter:
+    """Test suite for IncrementalFingerprinter."""
+
+    def test_window_too_small(self, fingerprinter):
+        """Test that a window smaller than n_fft is rejected."""
+        with pytest.raises(ValueError, match="window_samples"):
+            IncrementalFingerprinter(fingerprinter, window_samples=1024)
+
+    def test_no_frames_before_n_fft(self, fingerprinter):
+        """Test that no frames are computed until n_fft samples arrive."""
+        inc = IncrementalFingerprinter(fingerprinter, window_samples=22050)
+        inc.append(np.zeros(1000, dtype=np.float32))
+
+        assert inc.update() == 0
+        assert inc.get_fingerprint()["compact_fingerprint"].size == 0
+
+    def test_matches_full_window_recompute(self, fingerprinter):
+        """Test that sliding hops produce the same compact fingerprint as a full recompute."""
+        rng = np.random.RandomState(0)
+        window_samples = 3 * 22050
+        hop = 22050 // 2
+        audio = rng.randn(6 * 22050).astype(np.float32)
+
+        inc = IncrementalFingerprinter(fingerprinter, window_samples=window_samples)
+        for start in range(0, len(audio), hop):
+            inc.append(audio[start:start + hop])
+            inc.update()
+
+        # Window covers the last max_frames frames of the stream
+        first_frame = inc.frames[0][0]
+        offset = first_frame * fingerprinter.hop_length
+        end = offset + (inc.max_frames - 1) * fingerprinter.hop_length + fingerprinter.n_fft
+        expected = _reference_fingerprint(fingerprinter, audio[offset:end])
+
+        result = inc.get_fingerprint()
+        np.testing.assert_allclose(result["compact_fingerprint"], expected, rtol=1e-5)
+        assert len(inc.frames) == inc.max_frames
+
+    def test_per_hop_cost_proportional_to_hop(self, fingerprinter):
+        """Test that each hop only computes frames for the new samples."""
+        hop = 22050 // 2
+        inc = IncrementalFingerprinter(fingerprinter, window_samples=3 * 22050)
+        inc.append(np.random.randn(3 * 22050).astype(np.float32))
+        inc.update()
+
+        inc.append(np.random.randn(hop).astype(np.float32))
+        new_frames = inc.update()
+
+        # ~hop / hop_length frames, far fewer than the window's frame count
+        assert new_frames <= hop // fingerprinter.hop_length + 1
+        assert new_frames < inc.max_frames
+
+    def test_result_keys(self, fingerprinter):
+        """Test that the result matches the batch fingerprinter's shape."""
+        t = np.linspace(0, 2.0, 2 * 22050, endpoint=False)
+        inc = IncrementalFingerprinter(fingerprinter, window_samples=3 * 22050)
+        inc.append(np.sin(2 * np.pi * 440 * t).astype(np.float32))
+        inc.update()
+
+        result = inc.get_fingerprint()
+        for key in (
+            "fingerprint_data",
+            "compact_fingerprint",
+            "fingerprint_hash",
+            "confidence_score",
+            "peak_count",
+            "duration",
+            "sample_rate",
+        ):
+            assert key in result
+        assert result["duration"] == pytest.approx(2.0)
+        assert result["fingerprint_data"][0]["time"] == 0.0
+
+    def test_reset(self, fingerprinter):
+        """Test resetting discards frames and pending samples."""
+        inc = IncrementalFingerprinter(fingerprinter, window_samples=22050)
+        inc.append(np.random.randn(22050).astype(np.float32))
+        inc.update()
+        inc.reset()
+
+        assert len(inc.frames) == 0
+        assert inc.update() == 0
@@ -0,0 +1,210 @@
+"""Tests for the shared streaming match index."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from config.settings import Config
+from src.core.audio_fingerprinting import AudioFingerprinter
+from src.core.match_index import StreamingMatchIndex
+from src.database.models import AudioFingerprint, Base, Channel, Video
+
+
+@pytest.fixture
+def db_engine():
+    """In-memory database shared with the index's background refresh thread."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def fingerprinter():
+    """Create a standard fingerprinter."""
+    return AudioFingerprinter(sample_rate=22050)
+
+
+@pytest.fixture
+def stored_vectors():
+    """Create distinct stored compact fingerprints."""
+    rng = np.random.RandomState(7)
+    return [rng.rand(600) for _ in range(5)]
+
+
+@pytest.fixture
+def populated_db(db_session, fingerprinter, stored_vectors):
+    """Store fingerprints for two videos in the test database."""
+    channel = Channel(channel_id="UC_INDEX", channel_name="Index Channel")
+    db_session.add(channel)
+    db_session.flush()
+
+    videos = [
+        Video(video_id=f"vid{i}", channel_id=channel.id, title=f"Video {i}", url=f"https://y/{i}")
+        for i in range(2)
+    ]
+    db_session.add_all(videos)
+    db_session.flush()
+
+    for i, vector in enumerate(stored_vectors):
+        data = fingerprinter.serialize_fingerprint(
+            {
+                "compact_fingerprint": vector,
+                "confidence_score": 0.8,
+                "peak_count": 10,
+                "duration": 90.0,
+                "sample_rate": 22050,
+            }
+        )
+        db_session.add(
+            AudioFingerprint(
+                video_id=videos[i % 2].id,
+                start_time=i * 90.0,
+                end_time=(i + 1) * 90.0,
+                fingerprint_hash=f"hash{i}",
+                fingerprint_data=data,
+                sample_rate=22050,
+                n_fft=2048,
+                hop_length=512,
+                confidence_score=0.8,
+            )
+        )
+
+    # Different extraction parameters must not be indexed
+    db_session.add(
+        AudioFingerprint(
+            video_id=videos[0].id,
+            start_time=0.0,
+            end_time=90.0,
+            fingerprint_hash="other",
+            fingerprint_data=data,
+            sample_rate=22050,
+            n_fft=4096,
+            hop_length=1024,
+        )
+    )
+    db_session.commit()
+    return db_session
+
+
+class TestStreamingMatchIndex:
+    """Test suite for StreamingMatchIndex."""
+
+    def test_load_filters_by_parameters(self, fingerprinter, populated_db):
+        """Test loading only indexes fingerprints with matching parameters."""
+        index = StreamingMatchIndex(fingerprinter, input_dim=300)
+
+        count = index.refresh(populated_db)
+
+        assert count == 5
+        assert index.loaded
+        assert all(len(entry[4]) == 300 for entry in index.entries.values())
+
+    def test_search_finds_stored_segment(self, fingerprinter, populated_db, stored_vectors):
+        """Test that a query equal to a stored prefix ranks that segment first."""
+        index = StreamingMatchIndex(fingerprinter, input_dim=300, hash_size=4)
+        index.refresh(populated_db)
+
+        results = index.search({"compact_fingerprint": stored_vectors[3][:300]})
+
+        assert results
+        assert results[0]["start_time"] == 270.0
+        assert results[0]["score"] == pytest.approx(1.0)
+
+    def test_search_empty_query(self, fingerprinter):
+        """Test that empty queries return no results."""
+        index = StreamingMatchIndex(fingerprinter, input_dim=300)
+        index.add(1, 1, 0.0, 90.0, np.ones(300))
+
+        assert index.search({"compact_fingerprint": np.array([])}) == []
+
+    def test_video_metadata_lru(self, fingerprinter, populated_db):
+        """Test that video metadata is cached and evicted in LRU order."""
+        index = StreamingMatchIndex(fingerprinter, input_dim=300, metadata_cache_size=1)
+        video_ids = [v.id for v in populated_db.query(Video).order_by(Video.id)]
+
+        with patch(
+            "src.database.connection.db_manager.get_read_session", return_value=populated_db
+        ):
+            first = index.get_video_metadata({video_ids[0]})
+            index.get_video_metadata({video_ids[0]})
+            index.get_video_metadata({video_ids[1]})
+
+        assert first[video_ids[0]]["title"] == "Video 0"
+        assert index.cache_hits == 1
+        assert index.cache_misses == 2
+        assert list(index._metadata_cache) == [video_ids[1]]
+
+    def test_refresh_adds_only_new_fingerprints(self, fingerprinter, populated_db):
+        """Test a refresh picks up fingerprints stored after the last one."""
+        index = StreamingMatchIndex(fingerprinter, input_dim=300)
+        index.refresh(populated_db)
+        stored = populated_db.query(AudioFingerprint).filter_by(n_fft=2048).first()
+
+        populated_db.add(
+            AudioFingerprint(
+                video_id=stored.video_id,
+                start_time=450.0,
+                end_time=540.0,
+                fingerprint_hash="late",
+                fingerprint_data=stored.fingerprint_data,
+                sample_rate=22050,
+                n_fft=2048,
+                hop_length=512,
+            )
+        )
+        populated_db.commit()
+
+        assert index.refresh(populated_db) == 1
+        assert index.refresh(populated_db) == 0
+        assert len(index.entries) == 6
+
+    def test_retried_refresh_does_not_index_twice(self, fingerprinter, populated_db):
+        """Test fingerprints indexed before a failure are not added to the buckets again."""
+        index = StreamingMatchIndex(fingerprinter, input_dim=300)
+        index.refresh(populated_db)
+        buckets = sum(len(bucket) for table in index.lsh.tables for bucket in table.values())
+
+        index.watermark = 0
+        index.refresh(populated_db)
+
+        assert len(index.entries) == 5
+        assert sum(len(b) for table in index.lsh.tables for b in table.values()) == buckets
+
+    def test_ensure_loaded_loads_in_background(self, fingerprinter, populated_db):
+        """Test the load runs on a background thread and is refreshed on the interval."""
+        index = StreamingMatchIndex(fingerprinter, input_dim=300)
+
+        with patch(
+            "src.database.connection.db_manager.get_read_session", return_value=populated_db
+        ) as mock_session:
+            index.ensure_loaded()
+            index._refresh_thread.join()
+            assert index.ensure_loaded() is True
+            assert len(index.entries) == 5
+
+            with patch.object(Config, "STREAMING_INDEX_REFRESH_SECONDS", 0):
+                index.ensure_loaded()
+                index._refresh_thread.join()
+
+        assert mock_session.call_count == 2
+
+    def test_ensure_loaded_backs_off_after_failure(self, fingerprinter):
+        """Test that a failed load is not retried on every hop."""
+        index = StreamingMatchIndex(fingerprinter, input_dim=300)
+
+        with patch(
+            "src.database.connection.db_manager.get_read_session",
+            side_effect=RuntimeError("db down"),
+        ) as mock_session:
+            assert index.ensure_loaded() is False
+            index._refresh_thread.join()
+            assert index.ensure_loaded() is False
+
+        assert mock_session.call_count == 1
+        assert not index.loaded
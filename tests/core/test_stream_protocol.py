@@ -0,0 +1,180 @@
+"""Tests for the WebSocket audio framing protocol."""
+
+import numpy as np
+import pytest
+from scipy.signal import resample_poly
+
+from src.core.stream_protocol import (
+    HEADER,
+    AudioCodec,
+    StreamDecoder,
+    StreamingResampler,
+    StreamProtocolError,
+    encode_frame,
+    parse_frame,
+    polyphase_filter,
+)
+
+
+def _int16_frame(samples: np.ndarray, sample_rate: int, sequence: int, channels: int = 1) -> bytes:
+    """Encode float samples as an int16 PCM frame."""
+    pcm = (np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes()
+    return encode_frame(pcm, AudioCodec.INT16, sample_rate, channels, sequence)
+
+
+class TestFraming:
+    """Test frame encoding and parsing."""
+
+    def test_round_trip(self):
+        """Test that an encoded header parses back."""
+        data = encode_frame(b"\x00\x01", AudioCodec.INT16, 16000, 2, 70000)
+
+        header, payload = parse_frame(data)
+
+        assert header is not None
+        assert header.codec == AudioCodec.INT16
+        assert header.sample_rate == 16000
+        assert header.channels == 2
+        assert header.sequence == 70000 % (1 << 16)
+        assert payload == b"\x00\x01"
+
+    def test_legacy_raw_float32(self):
+        """Test that unframed messages are passed through as legacy audio."""
+        raw = np.ones(4, dtype=np.float32).tobytes()
+
+        header, payload = parse_frame(raw)
+
+        assert header is None
+        assert payload == raw
+
+    def test_truncated_header(self):
+        """Test that a truncated header is rejected."""
+        data = encode_frame(b"", AudioCodec.INT16, 16000, 1, 0)[: HEADER.size - 1]
+
+        with pytest.raises(StreamProtocolError, match="Truncated"):
+            parse_frame(data)
+
+    def test_unknown_codec(self):
+        """Test that unknown codecs are rejected."""
+        data = bytearray(encode_frame(b"", AudioCodec.INT16, 16000, 1, 0))
+        data[5] = 9
+
+        with pytest.raises(StreamProtocolError, match="codec"):
+            parse_frame(bytes(data))
+
+
+class TestStreamingResampler:
+    """Test the stateful polyphase resampler."""
+
+    def test_filter_is_cached(self):
+        """Test that filter taps are designed once per rate pair."""
+        assert polyphase_filter(441, 320) is polyphase_filter(441, 320)
+
+    def test_passthrough(self):
+        """Test that equal rates are not resampled."""
+        resampler = StreamingResampler(22050, 22050)
+        samples = np.random.rand(100).astype(np.float32)
+
+        np.testing.assert_array_equal(resampler.process(samples), samples)
+
+    def test_chunked_matches_single_call(self):
+        """Test that chunked resampling is continuous across chunk boundaries."""
+        x = np.random.RandomState(1).randn(16000)
+
+        chunked = StreamingResampler(16000, 22050)
+        out = np.concatenate([chunked.process(x[i : i + 777]) for i in range(0, len(x), 777)])
+        whole = StreamingResampler(16000, 22050).process(x)
+
+        np.testing.assert_allclose(out, whole, atol=1e-6)
+        assert len(out) == 22050
+
+    def test_matches_resample_poly(self):
+        """Test output matches scipy's resample_poly up to the filter delay."""
+        x = np.sin(2 * np.pi * 440 * np.arange(32000) / 16000)
+        resampler = StreamingResampler(16000, 22050)
+        out = resampler.process(x)
+
+        reference = resample_poly(x, 441, 320)
+        delay = round((len(resampler.taps) - 1) / 2 / resampler.down)
+        np.testing.assert_allclose(out[delay : delay + 20000], reference[:20000], atol=0.05)
+
+
+class TestStreamDecoder:
+    """Test per-connection decoding."""
+
+    def test_legacy_float32(self):
+        """Test legacy raw float32 messages at the target rate."""
+        decoder = StreamDecoder(target_sample_rate=22050)
+        samples = np.random.rand(512).astype(np.float32)
+
+        np.testing.assert_array_equal(decoder.decode(samples.tobytes()), samples)
+        assert decoder.get_stats()["codec"] == "raw_float32"
+
+    def test_int16_at_target_rate(self):
+        """Test int16 PCM is scaled to [-1, 1]."""
+        decoder = StreamDecoder(target_sample_rate=16000)
+        samples = np.linspace(-0.5, 0.5, 400)
+
+        out = decoder.decode(_int16_frame(samples, 16000, 0))
+
+        np.testing.assert_allclose(out, samples, atol=1e-4)
+
+    def test_stereo_downmix(self):
+        """Test interleaved stereo is averaged to mono."""
+        decoder = StreamDecoder(target_sample_rate=16000)
+        stereo = np.column_stack([np.full(100, 0.5), np.full(100, -0.1)]).flatten()
+
+        out = decoder.decode(_int16_frame(stereo, 16000, 0, channels=2))
+
+        assert len(out) == 100
+        np.testing.assert_allclose(out, 0.2, atol=1e-4)
+
+    def test_resamples_16k_to_target(self):
+        """Test 16 kHz int16 input is resampled to the fingerprint rate."""
+        decoder = StreamDecoder(target_sample_rate=22050)
+        chunk = np.zeros(1600)
+
+        total = sum(len(decoder.decode(_int16_frame(chunk, 16000, seq))) for seq in range(10))
+
+        assert total == 22050
+
+    def test_sequence_gap_filled_with_silence(self):
+        """Test lost frames are counted and filled to keep the timeline."""
+        decoder = StreamDecoder(target_sample_rate=16000)
+        chunk = np.full(160, 0.25)
+
+        decoder.decode(_int16_frame(chunk, 16000, 0))
+        out = decoder.decode(_int16_frame(chunk, 16000, 3))
+
+        assert decoder.frames_lost == 2
+        assert len(out) == 3 * 160
+        assert np.all(out[:320] == 0)
+
+    def test_duplicate_and_stale_frames_discarded(self):
+        """Test duplicated or reordered frames are dropped."""
+        decoder = StreamDecoder(target_sample_rate=16000)
+        chunk = np.zeros(160)
+
+        decoder.decode(_int16_frame(chunk, 16000, 5))
+        assert len(decoder.decode(_int16_frame(chunk, 16000, 5))) == 0
+        assert len(decoder.decode(_int16_frame(chunk, 16000, 4))) == 0
+        assert decoder.frames_discarded == 2
+
+    def test_sequence_wraparound(self):
+        """Test sequence numbers wrap without reporting a gap."""
+        decoder = StreamDecoder(target_sample_rate=16000)
+        chunk = np.zeros(160)
+
+        decoder.decode(_int16_frame(chunk, 16000, (1 << 16) - 1))
+        decoder.decode(_int16_frame(chunk, 16000, 0))
+
+        assert decoder.frames_lost == 0
+        assert decoder.frames_discarded == 0
+
+    def test_misaligned_payload(self):
+        """Test payloads that are not whole samples are rejected."""
+        decoder = StreamDecoder(target_sample_rate=16000)
+        data = encode_frame(b"\x00\x01\x02", AudioCodec.INT16, 16000, 1, 0)
+
+        with pytest.raises(StreamProtocolError):
+            decoder.decode(data)
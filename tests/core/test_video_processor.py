@@ -6,6 +6,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from config.settings import Config
 from src.core.video_processor import VideoProcessor
 
 
@@ -119,6 +120,27 @@ class TestVideoProcessor:
         # Clean up created segments
         processor.cleanup_segments(segments)
 
+    @patch("subprocess.run")
+    def test_segment_audio_start_offset(self, mock_run, temp_dir, multi_second_sine_wave):
+        """Test segment times of a resumed download are relative to the whole video."""
+        processor = VideoProcessor(temp_dir=temp_dir, segment_length=1)
+
+        def mock_subprocess(cmd, *args, **kwargs):
+            if cmd[0] == "ffprobe":
+                result = MagicMock()
+                result.stdout = "3.0\n"
+                return result
+            Path(cmd[cmd.index("-y") + 1]).touch()
+            return MagicMock()
+
+        mock_run.side_effect = mock_subprocess
+
+        segments = processor.segment_audio(multi_second_sine_wave, start_offset=270.0)
+
+        assert segments[0][1] == 270.0
+        assert segments[0][2] == 271.0
+        processor.cleanup_segments(segments)
+
     def test_segment_audio_nonexistent_file(self, temp_dir):
         """Test segmentation with nonexistent audio file."""
         processor = VideoProcessor(temp_dir=temp_dir)
@@ -404,6 +426,7 @@ class TestVideoProcessor:
         with pytest.raises(subprocess.CalledProcessError):
             processor._convert_to_wav("input.mp3", "output.wav")
 
+    @patch.object(Config, "YT_DLP_IN_PROCESS", False)
     @patch("subprocess.run")
     def test_download_video_info_success(self, mock_run, temp_dir):
         """Test downloading video info successfully."""
@@ -420,6 +443,7 @@ class TestVideoProcessor:
         assert info["id"] == "dQw4w9WgXcQ"
         assert info["title"] == "Test Video"
 
+    @patch.object(Config, "YT_DLP_IN_PROCESS", False)
     @patch("subprocess.run")
     def test_download_video_info_timeout(self, mock_run, temp_dir):
         """Test timeout when downloading video info."""
@@ -433,6 +457,7 @@ class TestVideoProcessor:
 
         assert info is None
 
+    @patch.object(Config, "YT_DLP_IN_PROCESS", False)
     @patch("subprocess.run")
     def test_download_video_info_error(self, mock_run, temp_dir):
         """Test error when downloading video info."""
@@ -446,6 +471,7 @@ class TestVideoProcessor:
 
         assert info is None
 
+    @patch.object(Config, "YT_DLP_IN_PROCESS", False)
     @patch("subprocess.run")
     def test_get_channel_videos_ytdlp_success(self, mock_run, temp_dir):
         """Test getting channel videos via yt-dlp."""
@@ -468,6 +494,19 @@ class TestVideoProcessor:
 
         assert isinstance(videos, list)
 
+    @patch("subprocess.run")
+    def test_get_channel_videos_ytdlp_stops_at_last_seen_video(self, mock_run, temp_dir):
+        """Test incremental listing stops at the previous sync's newest video."""
+        processor = VideoProcessor(temp_dir=temp_dir)
+        mock_run.return_value = MagicMock(stdout="video3\nvideo2\nvideo1")
+        processor.download_video_info = MagicMock(side_effect=lambda url: {"id": url[-6:]})
+
+        videos = processor._get_channel_videos_ytdlp("UC123456789", stop_at_video_id="video2")
+
+        assert [v["id"] for v in videos] == ["video3"]
+        cmd = mock_run.call_args.args[0]
+        assert cmd[cmd.index("--break-match-filters") + 1] == "id!=video2"
+
     @patch("subprocess.run")
     def test_get_channel_videos_ytdlp_error(self, mock_run, temp_dir):
         """Test error when getting channel videos."""
@@ -481,6 +520,7 @@ class TestVideoProcessor:
 
         assert videos == []
 
+    @patch.object(Config, "YT_DLP_IN_PROCESS", False)
     @patch("subprocess.run")
     @patch("time.sleep")
     def test_download_video_audio_http_403_error(self, mock_sleep, mock_run, temp_dir):
@@ -501,6 +541,7 @@ class TestVideoProcessor:
         # Should retry 3 times (with cookie detection, this means more calls)
         assert mock_run.call_count >= 3
 
+    @patch.object(Config, "YT_DLP_IN_PROCESS", False)
     @patch("subprocess.run")
     @patch("time.sleep")
     def test_download_video_audio_http_429_error(self, mock_sleep, mock_run, temp_dir):
@@ -523,6 +564,7 @@ class TestVideoProcessor:
         # Should have extra sleep calls for rate limiting (beyond the base retry backoff)
         assert mock_sleep.call_count >= 3
 
+    @patch.object(Config, "YT_DLP_IN_PROCESS", False)
     @patch("subprocess.run")
     def test_download_video_audio_http_410_error(self, mock_run, temp_dir):
         """Test handling of HTTP 410 Gone error (no retry)."""
@@ -549,6 +591,7 @@ class TestVideoProcessor:
         # Should NOT retry for 410 errors (but cookie detection adds extra calls)
         # We just verify it returns None quickly
 
+    @patch.object(Config, "YT_DLP_IN_PROCESS", False)
     @patch("subprocess.run")
     def test_download_video_audio_bot_detection(self, mock_run, temp_dir):
         """Test handling of YouTube bot detection."""
@@ -567,3 +610,77 @@ class TestVideoProcessor:
         assert result is None
         # Should retry
         assert mock_run.call_count >= 3
+
+    @patch.object(Config, "YT_DLP_IN_PROCESS", True)
+    @patch("src.core.video_processor.get_ytdlp_pool")
+    @patch("subprocess.run")
+    def test_download_video_info_in_process(self, mock_run, mock_get_pool, temp_dir):
+        """Test metadata comes from the warm yt-dlp pool without spawning the CLI."""
+        processor = VideoProcessor(temp_dir=temp_dir)
+        processor._cached_cookies_browser = ""
+        mock_get_pool.return_value.extract_info.return_value = {
+            "id": "dQw4w9WgXcQ",
+            "title": "Test Video",
+            "duration": 180.0,
+            "upload_date": "20231201",
+            "channel_id": "UC123",
+            "thumbnails": [{"url": "small.jpg"}, {"url": "large.jpg"}],
+            "webpage_url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        }
+
+        info = processor.download_video_info("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+
+        assert info["id"] == "dQw4w9WgXcQ"
+        assert info["duration"] == 180
+        assert info["thumbnail"] == "large.jpg"
+        assert info["view_count"] is None
+        # Metadata only: no format selection, no subprocess
+        assert mock_get_pool.return_value.extract_info.call_args.kwargs["process"] is False
+        mock_run.assert_not_called()
+
+    @patch.object(Config, "YT_DLP_IN_PROCESS", True)
+    @patch("src.core.video_processor.get_ytdlp_pool")
+    def test_download_video_audio_in_process_resume(self, mock_get_pool, temp_dir):
+        """Test an in-process download writes to the video's file and honours start_time."""
+        processor = VideoProcessor(temp_dir=temp_dir)
+        processor._cached_cookies_browser = ""
+
+        def fake_download(url, options, download=False, process=True, call_params=None):
+            Path(temp_dir, "test123.m4a").write_bytes(b"audio")
+            return {"id": "test123"}
+
+        mock_get_pool.return_value.extract_info.side_effect = fake_download
+        processor._convert_to_wav = lambda src, dst: Path(dst).write_bytes(b"wav")
+
+        result = processor.download_video_audio(
+            "https://www.youtube.com/watch?v=test123", start_time=270.0
+        )
+
+        assert result == str(Path(temp_dir) / "test123.wav")
+        call = mock_get_pool.return_value.extract_info.call_args
+        assert call.kwargs["download"] is True
+        assert call.kwargs["call_params"]["outtmpl"] == {
+            "default": str(Path(temp_dir) / "test123.%(ext)s")
+        }
+        assert "download_ranges" in call.kwargs["call_params"]
+        assert call.args[1]["format"] == "bestaudio"
+
+    @patch.object(Config, "YT_DLP_IN_PROCESS", True)
+    @patch("src.core.video_processor.get_ytdlp_pool")
+    @patch("time.sleep")
+    def test_download_video_audio_in_process_http_403_error(
+        self, mock_sleep, mock_get_pool, temp_dir
+    ):
+        """Test in-process yt-dlp errors go through the same retry handling."""
+        from yt_dlp.utils import DownloadError
+
+        processor = VideoProcessor(temp_dir=temp_dir)
+        processor._cached_cookies_browser = ""
+        mock_get_pool.return_value.extract_info.side_effect = DownloadError(
+            "ERROR: unable to download video data: HTTP Error 403: Forbidden"
+        )
+
+        result = processor.download_video_audio("https://www.youtube.com/watch?v=test123")
+
+        assert result is None
+        assert mock_get_pool.return_value.extract_info.call_count == 3
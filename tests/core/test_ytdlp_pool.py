@@ -0,0 +1,155 @@
+"""Tests for the in-process yt-dlp pool."""
+
+import functools
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.core.ytdlp_pool import HostRateLimiter, YtDlpPool
+
+
+class FakeYoutubeDL:
+    """Stand-in for yt_dlp.YoutubeDL that records calls instead of fetching."""
+
+    def __init__(self, params):
+        self.params = dict(params)
+        self.calls = []
+        self.closed = False
+
+    @functools.cached_property
+    def cookiejar(self):
+        return object()
+
+    def extract_info(self, url, download=False, process=True):
+        self.calls.append((url, download, process))
+        return {"id": url[-6:], "outtmpl": self.params.get("outtmpl")}
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool():
+    """A pool whose instances are FakeYoutubeDL objects."""
+    with patch("src.core.ytdlp_pool.yt_dlp.YoutubeDL", FakeYoutubeDL):
+        ytdlp_pool = YtDlpPool(max_concurrent=2, requests_per_second=0)
+        yield ytdlp_pool
+        ytdlp_pool.close()
+
+
+class TestYtDlpPool:
+    """Test suite for YtDlpPool."""
+
+    def test_instance_reused_per_thread_and_options(self, pool):
+        """Test repeated calls on one thread share a warm instance per option set."""
+        for i in range(3):
+            pool.extract_info(f"https://www.youtube.com/watch?v=video{i}", {"format": "a"})
+        pool.extract_info("https://www.youtube.com/watch?v=video9", {"format": "b"})
+
+        assert pool.instance_count == 2
+
+    def test_instance_per_thread(self, pool):
+        """Test each worker thread gets its own instance."""
+        threads = [
+            threading.Thread(
+                target=pool.extract_info, args=("https://www.youtube.com/watch?v=video1", {})
+            )
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert pool.instance_count == 3
+
+    def test_cookie_jar_shared_across_instances(self, pool):
+        """Test instances with the same cookie source share one loaded jar."""
+        options = {"cookiefile": "cookies.txt"}
+        pool.extract_info("https://www.youtube.com/watch?v=video1", options)
+        first = pool._local.instances[repr(sorted(options.items()))]
+
+        worker = threading.Thread(
+            target=pool.extract_info, args=("https://www.youtube.com/watch?v=video2", options)
+        )
+        worker.start()
+        worker.join()
+
+        second = next(ydl for ydl in pool._instances if ydl is not first)
+        assert second.cookiejar is first.cookiejar
+
+    def test_call_params_apply_to_one_call(self, pool):
+        """Test per-call options are restored after the call."""
+        first = pool.extract_info(
+            "https://www.youtube.com/watch?v=video1",
+            {},
+            call_params={"outtmpl": {"default": "/tmp/video1.%(ext)s"}},
+        )
+        second = pool.extract_info("https://www.youtube.com/watch?v=video2", {})
+
+        assert first["outtmpl"] == {"default": "/tmp/video1.%(ext)s"}
+        assert second["outtmpl"] is None
+        assert pool.instance_count == 1
+
+    def test_concurrency_bounded(self, pool):
+        """Test no more than max_concurrent calls run at once."""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def extract(self, url, download=False, process=True):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return {}
+
+        with patch.object(FakeYoutubeDL, "extract_info", extract):
+            threads = [
+                threading.Thread(
+                    target=pool.extract_info, args=(f"https://www.youtube.com/watch?v=v{i}", {})
+                )
+                for i in range(6)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert peak == 2
+
+    def test_close_closes_instances(self, pool):
+        """Test closing the pool closes (and saves cookies of) every instance."""
+        pool.extract_info("https://www.youtube.com/watch?v=video1", {})
+        ydl = pool._instances[0]
+
+        pool.close()
+
+        assert ydl.closed
+        assert pool.instance_count == 0
+
+
+class TestHostRateLimiter:
+    """Test suite for HostRateLimiter."""
+
+    def test_spaces_calls_to_same_host(self):
+        """Test calls to one host are spaced by the configured interval."""
+        limiter = HostRateLimiter(requests_per_second=20)
+
+        started = time.monotonic()
+        for _ in range(4):
+            limiter.wait("https://www.youtube.com/watch?v=video1")
+
+        assert time.monotonic() - started >= 0.14
+
+    def test_hosts_limited_independently(self):
+        """Test a busy host does not delay calls to another host."""
+        limiter = HostRateLimiter(requests_per_second=1)
+        limiter.wait("https://www.youtube.com/watch?v=video1")
+
+        assert limiter.wait("https://vimeo.com/12345") == 0
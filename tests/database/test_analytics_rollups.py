@@ -0,0 +1,186 @@
+"""Tests for analytics rollups and the range queries combining them with raw rows."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from src.database.analytics_rollups import (
+    ANALYTICS_EVENTS,
+    API_USAGE,
+    analytics_event_rows,
+    api_usage_rows,
+    roll_up_analytics,
+    split_range,
+    truncate_datetime,
+    watermarks,
+)
+from src.database.models import (
+    AnalyticsEvent,
+    AnalyticsRollupState,
+    APIUsageLog,
+    APIUsageRollup,
+)
+
+START = datetime(2026, 10, 18, 9, 0)
+
+
+def _log(minutes, user_id=1, status_code=200, response_time_ms=100, endpoint="/videos"):
+    return APIUsageLog(
+        user_id=user_id,
+        endpoint=endpoint,
+        method="GET",
+        status_code=status_code,
+        response_time_ms=response_time_ms,
+        timestamp=START + timedelta(minutes=minutes),
+    )
+
+
+@pytest.fixture
+def usage_logs(test_db_session):
+    """API usage spread over three hours, plus analytics events."""
+    for minutes in range(0, 180, 7):
+        test_db_session.add(_log(minutes + 0.5, user_id=1 + minutes % 2))
+        test_db_session.add(_log(minutes + 0.25, status_code=500, response_time_ms=None))
+        test_db_session.add(
+            AnalyticsEvent(
+                user_id=1 + minutes % 3,
+                event_type="click",
+                event_category="ui" if minutes % 2 else "api",
+                event_name="play",
+                created_at=START + timedelta(minutes=minutes),
+            )
+        )
+    test_db_session.commit()
+    return test_db_session
+
+
+def _usage_totals(session, start, end, scope=None):
+    states = session.scalars(select(AnalyticsRollupState)).all()
+    usage = api_usage_rows(
+        split_range(start, end, *watermarks(states, API_USAGE)), scope or {}, "sqlite"
+    )
+    return session.execute(
+        select(
+            func.sum(usage.c.request_count),
+            func.sum(usage.c.response_time_sum),
+            func.sum(usage.c.response_time_count),
+        )
+    ).one()
+
+
+def _raw_totals(session, start, end, *criteria):
+    return session.execute(
+        select(
+            func.count(),
+            func.sum(APIUsageLog.response_time_ms),
+            func.count(APIUsageLog.response_time_ms),
+        ).where(APIUsageLog.timestamp >= start, APIUsageLog.timestamp <= end, *criteria)
+    ).one()
+
+
+class TestSplitRange:
+    """Test suite for splitting a time range between rollups and raw rows."""
+
+    def test_without_rollups_everything_is_raw(self):
+        """Test ranges are read raw until the rollup job has run."""
+        end = START + timedelta(days=1)
+
+        assert split_range(START, end, None, None) == [("raw", START, end)]
+
+    def test_pieces_use_hours_then_minutes_then_raw(self):
+        """Test whole hours come from hour rollups and unaligned edges from minutes and raw."""
+        start = START + timedelta(minutes=20, seconds=30)
+        end = START + timedelta(hours=5, minutes=10)
+        minute_mark = START + timedelta(hours=4, minutes=30)
+        hour_mark = START + timedelta(hours=4)
+
+        assert split_range(start, end, minute_mark, hour_mark) == [
+            ("raw", start, START + timedelta(minutes=21)),
+            ("minute", START + timedelta(minutes=21), START + timedelta(hours=1)),
+            ("hour", START + timedelta(hours=1), hour_mark),
+            ("minute", hour_mark, minute_mark),
+            ("raw", minute_mark, end),
+        ]
+
+    def test_range_within_one_minute_is_raw(self):
+        """Test a range too short for any rollup bucket is read raw."""
+        start = START + timedelta(seconds=10)
+        end = START + timedelta(seconds=50)
+
+        assert split_range(start, end, START + timedelta(hours=1), START) == [("raw", start, end)]
+
+    def test_truncate_datetime_week_and_month(self):
+        """Test periods start on Mondays and on the first of the month."""
+        value = datetime(2026, 10, 18, 9, 45, 30)  # Sunday
+
+        assert truncate_datetime(value, "week") == datetime(2026, 10, 12)
+        assert truncate_datetime(value, "month") == datetime(2026, 10, 1)
+
+
+class TestRollUp:
+    """Test suite for rolling up analytics logs."""
+
+    def test_rollups_answer_ranges_like_raw_rows(self, usage_logs):
+        """Test totals over rollups plus raw rows equal totals over the raw rows alone."""
+        roll_up_analytics(usage_logs, 0, now=START + timedelta(hours=2, minutes=40))
+
+        ranges = [
+            (START, START + timedelta(hours=3)),
+            (START + timedelta(minutes=13, seconds=20), START + timedelta(hours=2, minutes=55)),
+            (START + timedelta(hours=1), START + timedelta(hours=2)),
+        ]
+        for start, end in ranges:
+            assert tuple(_usage_totals(usage_logs, start, end)) == tuple(
+                _raw_totals(usage_logs, start, end)
+            )
+
+        end = START + timedelta(hours=3)
+        assert tuple(_usage_totals(usage_logs, START, end, {"user_id": 2})) == tuple(
+            _raw_totals(usage_logs, START, end, APIUsageLog.user_id == 2)
+        )
+
+    def test_runs_are_incremental(self, usage_logs):
+        """Test each run only rolls up minutes and hours completed since the last one."""
+        first = roll_up_analytics(usage_logs, 0, now=START + timedelta(minutes=90, seconds=5))
+        second = roll_up_analytics(usage_logs, 60, now=START + timedelta(hours=3, minutes=1))
+
+        assert first["api_usage"] == (START + timedelta(minutes=90), START + timedelta(hours=1))
+        assert second["api_usage"] == (START + timedelta(hours=3), START + timedelta(hours=3))
+
+        minute_requests = usage_logs.scalar(
+            select(func.sum(APIUsageRollup.request_count)).where(
+                APIUsageRollup.granularity == "minute"
+            )
+        )
+        hour_buckets = usage_logs.scalars(
+            select(APIUsageRollup.bucket_start)
+            .where(APIUsageRollup.granularity == "hour")
+            .distinct()
+            .order_by(APIUsageRollup.bucket_start)
+        ).all()
+        assert minute_requests == usage_logs.scalar(select(func.count(APIUsageLog.id)))
+        assert hour_buckets == [START + timedelta(hours=h) for h in range(3)]
+
+    def test_delay_leaves_recent_minutes_raw(self, usage_logs):
+        """Test minutes newer than the delay are not rolled up yet."""
+        marks = roll_up_analytics(usage_logs, 600, now=START + timedelta(hours=1))
+
+        assert marks["analytics_events"][0] == START + timedelta(minutes=50)
+
+    def test_event_rows_count_distinct_users(self, usage_logs):
+        """Test active users are counted once across rollup and raw pieces."""
+        roll_up_analytics(usage_logs, 0, now=START + timedelta(hours=1, minutes=30))
+        states = usage_logs.scalars(select(AnalyticsRollupState)).all()
+
+        events = analytics_event_rows(
+            split_range(START, START + timedelta(hours=3), *watermarks(states, ANALYTICS_EVENTS)),
+            {},
+            "sqlite",
+        )
+        total, users = usage_logs.execute(
+            select(func.sum(events.c.event_count), func.count(func.distinct(events.c.user_id)))
+        ).one()
+
+        assert total == usage_logs.scalar(select(func.count(AnalyticsEvent.id)))
+        assert users == 3
@@ -55,10 +55,10 @@ class TestBatchInsertFingerprints:
         ]
         
         # Batch insert
-        fingerprints = repo.create_fingerprints_batch(fingerprints_data)
+        created = repo.create_fingerprints_batch(fingerprints_data)
         
         # Verify results
-        assert len(fingerprints) == 3
+        assert created == 3
         
         # Verify in database
         db_fingerprints = (
@@ -76,12 +76,30 @@ class TestBatchInsertFingerprints:
         assert db_fingerprints[2].fingerprint_hash == "hash_003"
 
     def test_batch_insert_empty_list(self, test_db_session):
-        """Test batch insert with empty list returns empty list."""
+        """Test batch insert with empty list creates nothing."""
         repo = VideoRepository(test_db_session)
         
-        fingerprints = repo.create_fingerprints_batch([])
-        
-        assert fingerprints == []
+        assert repo.create_fingerprints_batch([]) == 0
+        assert repo.create_fingerprints_batch([], return_ids=True) == []
+
+    def test_batch_insert_returns_ids_in_order(self, test_db_session, sample_video):
+        """Test requested IDs line up with the input rows and defaults are applied."""
+        repo = VideoRepository(test_db_session)
+        rows = [_segment_row(sample_video.id, i) for i in range(5)]
+        for row in rows:
+            del row["n_fft"], row["hop_length"]
+        rows[2]["sample_rate"] = None
+
+        ids = repo.create_fingerprints_batch(rows, return_ids=True)
+
+        stored = {fp.id: fp for fp in test_db_session.query(AudioFingerprint).all()}
+        assert [stored[id_].fingerprint_hash for id_ in ids] == [
+            f"hash_{i:03d}" for i in range(5)
+        ]
+        assert {(fp.n_fft, fp.hop_length, fp.sample_rate) for fp in stored.values()} == {
+            (2048, 512, 22050)
+        }
+        assert all(fp.created_at is not None for fp in stored.values())
 
     def test_batch_insert_fingerprints_performance(self, test_db_session, sample_video):
         """Test that batch insert is significantly faster than individual inserts."""
@@ -120,6 +138,131 @@ class TestBatchInsertFingerprints:
         assert count == 20
 
 
+def _segment_row(video_id, index, fingerprint_hash=None):
+    return {
+        "video_id": video_id,
+        "start_time": float(index * 90),
+        "end_time": float((index + 1) * 90),
+        "fingerprint_hash": fingerprint_hash or f"hash_{index:03d}",
+        "fingerprint_data": b"data",
+        "confidence_score": 0.9,
+        "peak_count": 40,
+        "sample_rate": 22050,
+        "segment_length": 90.0,
+        "n_fft": 2048,
+        "hop_length": 512,
+    }
+
+
+class TestUpsertFingerprints:
+    """Test suite for idempotent fingerprint chunk writes."""
+
+    def test_rewriting_a_chunk_does_not_duplicate(self, test_db_session, sample_video):
+        """Test a chunk written twice (e.g. by a retried job) is stored once, with the latest data."""
+        repo = VideoRepository(test_db_session)
+
+        assert repo.upsert_fingerprints([_segment_row(sample_video.id, i) for i in range(3)]) == 3
+        repo.upsert_fingerprints([_segment_row(sample_video.id, 1, "rehashed")])
+
+        stored = (
+            test_db_session.query(AudioFingerprint)
+            .filter(AudioFingerprint.video_id == sample_video.id)
+            .order_by(AudioFingerprint.start_time)
+            .all()
+        )
+        assert [fp.fingerprint_hash for fp in stored] == ["hash_000", "rehashed", "hash_002"]
+
+    def test_upsert_empty_list(self, test_db_session):
+        """Test upserting nothing writes nothing."""
+        assert VideoRepository(test_db_session).upsert_fingerprints([]) == 0
+
+    def test_resume_point_is_end_of_last_stored_segment(self, test_db_session, sample_video):
+        """Test the resume point only considers fingerprints with matching parameters."""
+        repo = VideoRepository(test_db_session)
+        params = {"sample_rate": 22050, "n_fft": 2048, "hop_length": 512}
+
+        assert repo.get_fingerprint_resume_point(sample_video.id, **params) is None
+
+        repo.upsert_fingerprints([_segment_row(sample_video.id, i) for i in range(2)])
+
+        assert repo.get_fingerprint_resume_point(sample_video.id, **params) == 180.0
+        assert repo.get_fingerprint_resume_point(sample_video.id, 22050, 4096, 512) is None
+
+    def test_resume_point_stops_at_first_missing_segment(self, test_db_session, sample_video):
+        """Test a failed segment followed by stored ones is where fingerprinting resumes."""
+        repo = VideoRepository(test_db_session)
+        params = {"sample_rate": 22050, "n_fft": 2048, "hop_length": 512}
+
+        # Segment 2 failed; 3 and 4 were stored before the crash
+        repo.upsert_fingerprints([_segment_row(sample_video.id, i) for i in (0, 1, 3, 4)])
+        assert repo.get_fingerprint_resume_point(sample_video.id, **params) == 180.0
+
+        # The resumed attempt stores the rest from the gap
+        repo.upsert_fingerprints([_segment_row(sample_video.id, i) for i in (2, 3, 4)])
+        assert repo.get_fingerprint_resume_point(sample_video.id, **params) == 450.0
+
+    def test_resume_point_without_first_segment(self, test_db_session, sample_video):
+        """Test a video whose first segment failed resumes from the start."""
+        repo = VideoRepository(test_db_session)
+
+        repo.upsert_fingerprints([_segment_row(sample_video.id, i) for i in (1, 2)])
+
+        assert repo.get_fingerprint_resume_point(sample_video.id, 22050, 2048, 512) == 0.0
+
+
+class TestFingerprintExistence:
+    """Test suite for EXISTS-based fingerprint checks."""
+
+    def test_check_fingerprints_exist_matches_parameters(self, test_db_session, sample_video):
+        """Test only fingerprints extracted with the same parameters count."""
+        repo = VideoRepository(test_db_session)
+
+        assert repo.check_fingerprints_exist(sample_video.id, 22050, 2048, 512) is False
+
+        repo.upsert_fingerprints([_segment_row(sample_video.id, i) for i in range(3)])
+
+        assert repo.check_fingerprints_exist(sample_video.id, 22050, 2048, 512) is True
+        assert repo.check_fingerprints_exist(sample_video.id, 22050, 4096, 512) is False
+
+    def test_fingerprints_exist_for_videos(self, test_db_session, sample_video):
+        """Test the batch check returns the fingerprinted videos in one query."""
+        repo = VideoRepository(test_db_session)
+        other = repo.create_video("TEST_VIDEO_002", sample_video.channel_id, "Unprocessed")
+        repo.upsert_fingerprints([_segment_row(sample_video.id, i) for i in range(3)])
+
+        video_ids = [sample_video.id, other.id, 999]
+        assert repo.fingerprints_exist_for_videos(video_ids, 22050, 2048, 512) == {sample_video.id}
+        assert repo.fingerprints_exist_for_videos(video_ids, 44100, 2048, 512) == set()
+        assert repo.fingerprints_exist_for_videos([], 22050, 2048, 512) == set()
+
+
+class TestBatchInsertVideos:
+    """Test suite for channel-sync batch video writes."""
+
+    def test_insert_skips_existing_videos(self, test_db_session, sample_video):
+        """Test videos that already exist are skipped instead of failing the batch."""
+        repo = VideoRepository(test_db_session)
+        rows = [
+            {"video_id": video_id, "channel_id": sample_video.channel_id, "title": video_id}
+            for video_id in (sample_video.video_id, "NEW_VIDEO_1", "NEW_VIDEO_2")
+        ]
+
+        inserted = repo.insert_videos_batch(rows)
+
+        assert set(inserted) == {"NEW_VIDEO_1", "NEW_VIDEO_2"}
+        assert set(repo.get_videos_by_ids(list(inserted) + ["MISSING"])) == set(inserted)
+        assert repo.get_video_by_id(sample_video.video_id).title == "Test Video for Batch Operations"
+
+    def test_update_videos_batch(self, test_db_session, sample_video):
+        """Test several videos are updated by primary key in one call."""
+        repo = VideoRepository(test_db_session)
+
+        repo.update_videos_batch([{"id": sample_video.id, "view_count": 5000}])
+
+        test_db_session.expire_all()
+        assert repo.get_video_by_id(sample_video.video_id).view_count == 5000
+
+
 class TestBatchInsertMatchResults:
     """Test suite for batch match result insertion."""
 
@@ -152,10 +295,11 @@ class TestBatchInsertMatchResults:
         ]
         
         # Batch insert
-        matches = repo.create_match_results_batch(matches_data)
+        ids = repo.create_match_results_batch(matches_data, return_ids=True)
         
         # Verify results
-        assert len(matches) == 3
+        assert len(ids) == 3
+        assert test_db_session.get(MatchResult, ids[1]).query_source == "reddit"
         
         # Verify in database
         db_matches = (
@@ -171,12 +315,10 @@ class TestBatchInsertMatchResults:
         assert db_matches[2].similarity_score == 0.88
 
     def test_batch_insert_match_results_empty_list(self, test_db_session):
-        """Test batch insert with empty list returns empty list."""
+        """Test batch insert with empty list creates nothing."""
         repo = VideoRepository(test_db_session)
         
-        matches = repo.create_match_results_batch([])
-        
-        assert matches == []
+        assert repo.create_match_results_batch([]) == 0
 
     def test_batch_insert_match_results_performance(
         self, test_db_session, sample_fingerprints
@@ -0,0 +1,147 @@
+"""Tests for the bulk row writer."""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.database.bulk import TIMESTAMP_OID, bulk_insert
+from src.database.models import AudioFingerprint, MatchResult
+
+pytest.importorskip("psycopg")
+
+INT4, FLOAT8, VARCHAR, BYTEA = 23, 701, 1043, 17
+
+FINGERPRINT_OIDS = {
+    "id": INT4,
+    "tenant_id": INT4,
+    "video_id": INT4,
+    "start_time": FLOAT8,
+    "end_time": FLOAT8,
+    "fingerprint_hash": VARCHAR,
+    "fingerprint_data": BYTEA,
+    "sample_rate": INT4,
+    "segment_length": FLOAT8,
+    "n_fft": INT4,
+    "hop_length": INT4,
+    "confidence_score": FLOAT8,
+    "peak_count": INT4,
+    "created_at": TIMESTAMP_OID,
+}
+
+
+class FakeCopy:
+    """Records what a psycopg Copy object is sent."""
+
+    def __init__(self):
+        self.types = None
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set_types(self, types):
+        self.types = types
+
+    def write_row(self, row):
+        self.rows.append(row)
+
+
+@pytest.fixture
+def pg_session():
+    """A session on a psycopg PostgreSQL connection whose COPY calls are recorded."""
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "postgresql"
+    session.get_bind.return_value.dialect.driver = "psycopg"
+
+    connection = session.connection.return_value
+    connection.scalars.return_value = [101, 102]
+    oid_rows = connection.execute.return_value.tuples.return_value
+    oid_rows.all.return_value = list(FINGERPRINT_OIDS.items())
+
+    copy = FakeCopy()
+    cursor = connection.connection.driver_connection.cursor.return_value.__enter__.return_value
+    cursor.copy.return_value = copy
+    return session, cursor, copy
+
+
+def _fingerprint(index):
+    return {
+        "video_id": 7,
+        "start_time": index * 90.0,
+        "end_time": (index + 1) * 90.0,
+        "fingerprint_hash": f"hash{index}",
+        "fingerprint_data": b"data",
+    }
+
+
+class TestBulkInsert:
+    """Test suite for bulk_insert."""
+
+    def test_postgres_streams_binary_copy(self, pg_session):
+        """Test rows are copied with the columns' server types and defaults filled in."""
+        session, cursor, copy = pg_session
+
+        ids = bulk_insert(session, AudioFingerprint, [_fingerprint(0), _fingerprint(1)])
+
+        statement = cursor.copy.call_args.args[0].as_string(None)
+        assert statement.startswith('COPY "audio_fingerprints" (')
+        assert statement.endswith(") FROM STDIN (FORMAT BINARY)")
+        assert '"id"' not in statement
+        assert ids == []
+        session.connection.return_value.scalars.assert_not_called()
+
+        columns = [FINGERPRINT_OIDS[name] for name in _copied_columns(statement)]
+        assert copy.types == columns
+        first = dict(zip(_copied_columns(statement), copy.rows[0]))
+        assert first["fingerprint_hash"] == "hash0"
+        assert (first["n_fft"], first["hop_length"], first["sample_rate"]) == (2048, 512, 22050)
+        # timestamp without time zone gets a naive UTC value
+        assert first["created_at"].tzinfo is None
+        assert first["created_at"] <= datetime.now(timezone.utc).replace(tzinfo=None)
+
+    def test_postgres_reserves_ids_when_requested(self, pg_session):
+        """Test requested IDs come from the sequence and are copied with the rows."""
+        session, cursor, copy = pg_session
+
+        ids = bulk_insert(
+            session, AudioFingerprint, [_fingerprint(0), _fingerprint(1)], return_ids=True
+        )
+
+        statement = cursor.copy.call_args.args[0].as_string(None)
+        columns = _copied_columns(statement)
+        assert ids == [101, 102]
+        assert [dict(zip(columns, row))["id"] for row in copy.rows] == [101, 102]
+
+    def test_other_dialects_use_executemany(self, test_db_session, sample_fingerprints):
+        """Test the INSERT fallback writes every row and returns IDs in input order."""
+        rows = [
+            {
+                "query_fingerprint_id": sample_fingerprints[0].id,
+                "matched_fingerprint_id": fp.id,
+                "similarity_score": score,
+            }
+            for fp, score in zip(sample_fingerprints, (0.7, 0.9, 0.8))
+        ]
+
+        ids = bulk_insert(test_db_session, MatchResult, rows, return_ids=True)
+        test_db_session.commit()
+
+        scores = [test_db_session.get(MatchResult, id_).similarity_score for id_ in ids]
+        assert scores == [0.7, 0.9, 0.8]
+        assert not any(test_db_session.get(MatchResult, id_).responded for id_ in ids)
+
+    def test_empty_batch(self, pg_session):
+        """Test an empty batch touches nothing."""
+        session, cursor, _ = pg_session
+
+        assert bulk_insert(session, AudioFingerprint, [], return_ids=True) == []
+        cursor.copy.assert_not_called()
+
+
+def _copied_columns(statement):
+    column_list = statement[statement.index("(") + 1 : statement.index(")")]
+    return [name.strip().strip('"') for name in column_list.split(",")]
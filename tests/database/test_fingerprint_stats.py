@@ -0,0 +1,135 @@
+"""Tests for incrementally maintained fingerprint statistics."""
+
+import pytest
+
+from src.database.fingerprint_stats import (
+    TOTAL_COLUMNS,
+    reconcile_fingerprint_stats,
+    stats_statement,
+    totals_statement,
+)
+from src.database.models import (
+    AudioFingerprint,
+    FingerprintStatistics,
+    FingerprintStatisticsSnapshot,
+    Video,
+)
+from src.database.repositories import VideoRepository
+
+
+def _row(video_id, index, confidence=0.5, peaks=100):
+    return {
+        "video_id": video_id,
+        "start_time": index * 90.0,
+        "end_time": (index + 1) * 90.0,
+        "fingerprint_hash": f"hash_{video_id}_{index}",
+        "fingerprint_data": b"data",
+        "confidence_score": confidence,
+        "peak_count": peaks,
+        "sample_rate": 22050,
+        "segment_length": 90.0,
+    }
+
+
+def _stored(session):
+    stats = session.execute(stats_statement()).mappings().one()
+    return {name: stats[name] for name in TOTAL_COLUMNS}
+
+
+def _recounted(session):
+    return dict(session.execute(totals_statement()).mappings().one())
+
+
+@pytest.fixture
+def second_video(test_db_session, sample_video):
+    video = Video(video_id="SECOND_VIDEO", channel_id=sample_video.channel_id)
+    test_db_session.add(video)
+    test_db_session.commit()
+    return video
+
+
+class TestFingerprintStats:
+    """Test suite for fingerprint statistics maintenance."""
+
+    def test_batch_writes_keep_totals_current(self, test_db_session, sample_video, second_video):
+        """Test inserted batches update the totals to what a full recount gives."""
+        repo = VideoRepository(test_db_session)
+
+        repo.create_fingerprints_batch([_row(sample_video.id, i) for i in range(3)])
+        repo.create_fingerprints_batch(
+            [_row(sample_video.id, 3, confidence=None), _row(second_video.id, 0, peaks=None)]
+        )
+
+        stored = _stored(test_db_session)
+        assert stored == pytest.approx(_recounted(test_db_session))
+        assert stored["total_fingerprints"] == 5
+        assert stored["total_videos"] == 2
+        assert stored["confidence_count"] == 4
+
+    def test_upserts_count_only_new_segments(self, test_db_session, sample_video):
+        """Test rewriting a chunk adds only the segments it inserted."""
+        repo = VideoRepository(test_db_session)
+
+        repo.upsert_fingerprints([_row(sample_video.id, i) for i in range(3)])
+        repo.upsert_fingerprints([_row(sample_video.id, 1), _row(sample_video.id, 3)])
+
+        stored = _stored(test_db_session)
+        assert stored == pytest.approx(_recounted(test_db_session))
+        assert stored["total_fingerprints"] == 4
+        assert stored["total_videos"] == 1
+        assert test_db_session.query(FingerprintStatistics).count() == 2
+
+    def test_reconcile_corrects_drift(self, test_db_session, sample_video):
+        """Test a recount picks up deleted and changed fingerprints and compacts the ledger."""
+        repo = VideoRepository(test_db_session)
+        repo.create_fingerprints_batch([_row(sample_video.id, i) for i in range(3)])
+        repo.upsert_fingerprints([_row(sample_video.id, 3)])
+        repo.upsert_fingerprints([_row(sample_video.id, 3, peaks=300)])
+        test_db_session.query(AudioFingerprint).filter(AudioFingerprint.start_time == 0).delete()
+        test_db_session.commit()
+
+        assert _stored(test_db_session)["total_fingerprints"] == 4
+
+        totals = reconcile_fingerprint_stats(test_db_session)
+
+        assert totals["total_fingerprints"] == 3
+        assert totals["peaks_sum"] == 500
+        assert _stored(test_db_session) == pytest.approx(_recounted(test_db_session))
+        assert test_db_session.query(FingerprintStatistics).count() == 0
+
+    def test_reads_add_only_writes_after_snapshot(
+        self, test_db_session, sample_video, second_video
+    ):
+        """Test readers combine the snapshot with the ledger rows written since."""
+        repo = VideoRepository(test_db_session)
+        repo.upsert_fingerprints([_row(sample_video.id, i) for i in range(3)])
+        reconcile_fingerprint_stats(test_db_session)
+
+        repo.upsert_fingerprints([_row(sample_video.id, 3)])
+        repo.upsert_fingerprints([_row(second_video.id, 0)])
+
+        ledger = test_db_session.query(FingerprintStatistics).order_by(FingerprintStatistics.id)
+        snapshot = test_db_session.get(FingerprintStatisticsSnapshot, 1)
+        assert [row.id > snapshot.ledger_id for row in ledger] == [True, True]
+        # Only the second video's first write adds a video
+        assert [row.new_videos for row in ledger] == [0, 1]
+        stored = _stored(test_db_session)
+        assert stored == pytest.approx(_recounted(test_db_session))
+        assert stored["total_fingerprints"] == 5
+        assert stored["total_videos"] == 2
+
+    def test_reconcile_without_new_writes_keeps_watermark(self, test_db_session, sample_video):
+        """Test rows written after a reconcile of an empty ledger are still counted."""
+        repo = VideoRepository(test_db_session)
+        repo.upsert_fingerprints([_row(sample_video.id, 0)])
+        reconcile_fingerprint_stats(test_db_session)
+        reconcile_fingerprint_stats(test_db_session)
+
+        repo.upsert_fingerprints([_row(sample_video.id, 1)])
+
+        assert _stored(test_db_session)["total_fingerprints"] == 2
+        assert _stored(test_db_session)["total_videos"] == 1
+
+    def test_empty_ledger_reads_as_zero(self, test_db_session):
+        """Test a database without fingerprints reports zeroed totals."""
+        assert _stored(test_db_session) == dict.fromkeys(TOTAL_COLUMNS, 0)
@@ -49,10 +49,10 @@ def test_batch_fingerprint_integration():
         ]
 
         # Batch insert
-        fingerprints = repo.create_fingerprints_batch(fingerprints_data)
+        created = repo.create_fingerprints_batch(fingerprints_data)
 
         # Verify
-        assert len(fingerprints) == 5
+        assert created == 5
 
         # Query back from database
         db_fingerprints = (
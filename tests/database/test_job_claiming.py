@@ -0,0 +1,215 @@
+"""Tests for lease-based job claiming in JobRepository."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.database.models import ProcessingJob, Tenant
+from src.database.repositories import JobRepository
+
+
+@pytest.fixture
+def job_repo(test_db_session):
+    """Create a job repository with three pending video jobs."""
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(3):
+        test_db_session.add(
+            ProcessingJob(
+                job_type="video_process",
+                target_id=f"video{i}",
+                status="pending",
+                created_at=base + timedelta(minutes=i),
+            )
+        )
+    test_db_session.add(
+        ProcessingJob(job_type="channel_ingest", target_id="UC1", status="pending", created_at=base)
+    )
+    test_db_session.commit()
+    return JobRepository(test_db_session)
+
+
+def _expire_lease(session, job_id):
+    job = session.get(ProcessingJob, job_id)
+    job.lease_expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    session.commit()
+
+
+class TestClaimJobs:
+    """Test suite for claim_jobs, heartbeat_jobs and release_jobs."""
+
+    def test_claim_marks_jobs_running(self, job_repo):
+        """Test claimed jobs are leased to the worker, oldest first."""
+        jobs = job_repo.claim_jobs("video_process", 2, "worker-a", lease_seconds=60)
+
+        assert [j.target_id for j in jobs] == ["video0", "video1"]
+        for job in jobs:
+            assert job.status == "running"
+            assert job.worker_id == "worker-a"
+            assert job.lease_expires_at is not None
+            assert job.started_at is not None
+
+    def test_claimed_jobs_not_claimed_again(self, job_repo):
+        """Test a second worker only receives unclaimed jobs."""
+        first = job_repo.claim_jobs("video_process", 2, "worker-a")
+        second = job_repo.claim_jobs("video_process", 5, "worker-b")
+
+        assert {j.id for j in first}.isdisjoint({j.id for j in second})
+        assert [j.target_id for j in second] == ["video2"]
+        assert job_repo.claim_jobs("video_process", 5, "worker-c") == []
+
+    def test_expired_lease_is_reclaimed(self, job_repo):
+        """Test jobs of a worker that stopped heartbeating are handed out again."""
+        job = job_repo.claim_jobs("video_process", 1, "worker-a")[0]
+        _expire_lease(job_repo.session, job.id)
+
+        reclaimed = job_repo.claim_jobs("video_process", 1, "worker-b")
+
+        assert [j.id for j in reclaimed] == [job.id]
+        assert reclaimed[0].worker_id == "worker-b"
+        assert reclaimed[0].retry_count == 1
+
+    def test_reclaim_exhausts_retries(self, job_repo):
+        """Test a job that keeps losing its worker is eventually failed."""
+        job = job_repo.claim_jobs("video_process", 1, "worker-a")[0]
+        job.max_retries = 0
+        job_repo.session.commit()
+        _expire_lease(job_repo.session, job.id)
+
+        reclaimed = job_repo.claim_jobs("video_process", 1, "worker-b")
+
+        assert job.id not in {j.id for j in reclaimed}
+        assert job_repo.session.get(ProcessingJob, job.id).status == "failed"
+
+    def test_heartbeat_renews_only_owned_jobs(self, job_repo):
+        """Test leases are renewed for owned jobs and reported lost otherwise."""
+        job = job_repo.claim_jobs("video_process", 1, "worker-a", lease_seconds=1)[0]
+        _expire_lease(job_repo.session, job.id)
+        job_repo.claim_jobs("video_process", 1, "worker-b")
+
+        assert job_repo.heartbeat_jobs([job.id], "worker-a") == set()
+        assert job_repo.heartbeat_jobs([job.id], "worker-b") == {job.id}
+
+    def test_release_returns_jobs_to_queue(self, job_repo):
+        """Test released jobs become pending again."""
+        jobs = job_repo.claim_jobs("video_process", 3, "worker-a")
+
+        released = job_repo.release_jobs([j.id for j in jobs], "worker-a")
+
+        assert released == 3
+        assert len(job_repo.claim_jobs("video_process", 3, "worker-b")) == 3
+
+    def test_completion_clears_lease(self, job_repo):
+        """Test finished jobs no longer hold a lease."""
+        job = job_repo.claim_jobs("video_process", 1, "worker-a")[0]
+
+        job_repo.update_job_status(job.id, "completed", 1.0)
+
+        assert job_repo.session.get(ProcessingJob, job.id).lease_expires_at is None
+
+    def test_batched_progress_skips_finished_jobs(self, job_repo):
+        """Test batched progress writes never overwrite a final status."""
+        running, finished = job_repo.claim_jobs("video_process", 2, "worker-a")
+        job_repo.update_job_status(finished.id, "completed", 1.0, "Done")
+
+        job_repo.update_jobs_progress({running.id: (0.5, "Halfway"), finished.id: (0.4, "Late")})
+
+        job_repo.session.expire_all()
+        assert job_repo.session.get(ProcessingJob, running.id).progress == 0.5
+        assert job_repo.session.get(ProcessingJob, running.id).current_step == "Halfway"
+        assert job_repo.session.get(ProcessingJob, finished.id).progress == 1.0
+
+
+@pytest.fixture
+def tenants(test_db_session):
+    """Create two tenants; the second has twice the queue weight."""
+    small = Tenant(name="Small", slug="small", admin_email="small@example.com")
+    big = Tenant(
+        name="Big", slug="big", admin_email="big@example.com", settings={"job_queue_weight": 2}
+    )
+    test_db_session.add_all([small, big])
+    test_db_session.commit()
+    return small, big
+
+
+def _enqueue(repo, tenant, count, prefix, **kwargs):
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        job = repo.create_job("video_process", f"{prefix}{i}", tenant_id=tenant.id, **kwargs)
+        job.created_at = base + timedelta(seconds=i)
+    repo.session.commit()
+
+
+class TestJobScheduling:
+    """Test suite for priority, fast lane and fair-share claiming."""
+
+    def test_fast_lane_is_claimed_first(self, test_db_session, tenants):
+        """Test interactive uploads skip ahead of a bulk backlog."""
+        repo = JobRepository(test_db_session)
+        small, big = tenants
+        _enqueue(repo, big, 20, "bulk")
+        repo.create_job("video_process", "upload", lane="interactive", tenant_id=small.id)
+
+        jobs = repo.claim_jobs("video_process", 1, "worker-a")
+
+        assert [j.target_id for j in jobs] == ["upload"]
+
+    def test_priority_orders_jobs_within_tenant(self, test_db_session, tenants):
+        """Test higher priority jobs of a tenant are claimed before older ones."""
+        repo = JobRepository(test_db_session)
+        small, _ = tenants
+        _enqueue(repo, small, 3, "normal")
+        repo.create_job("video_process", "urgent", priority=5, tenant_id=small.id)
+
+        jobs = repo.claim_jobs("video_process", 2, "worker-a")
+
+        assert [j.target_id for j in jobs] == ["urgent", "normal0"]
+
+    def test_backlog_does_not_starve_other_tenants(self, test_db_session, tenants):
+        """Test slots are shared between tenants with pending work."""
+        repo = JobRepository(test_db_session)
+        small, big = tenants
+        _enqueue(repo, big, 50, "big")
+        _enqueue(repo, small, 2, "small")
+
+        jobs = repo.claim_jobs("video_process", 3, "worker-a")
+
+        # Weight 2 vs 1: the big tenant gets two slots, the small tenant one
+        assert sorted(j.tenant_id for j in jobs) == sorted([big.id, big.id, small.id])
+
+    def test_batch_created_jobs_are_scheduled(self, test_db_session, tenants):
+        """Test jobs created with one multi-row insert get the usual queue defaults."""
+        repo = JobRepository(test_db_session)
+        created = repo.create_jobs_batch([
+            {"job_type": "video_process", "target_id": f"video{i}", "tenant_id": tenants[0].id}
+            for i in range(3)
+        ])
+
+        jobs = repo.claim_jobs("video_process", 5, "worker-a")
+
+        assert created == 3
+        assert sorted(j.target_id for j in jobs) == ["video0", "video1", "video2"]
+        assert all(j.lane == "bulk" and j.priority == 0 for j in jobs)
+
+    def test_fair_share_accounts_for_recent_service(self, test_db_session, tenants):
+        """Test a tenant that was just served yields the next slots."""
+        repo = JobRepository(test_db_session)
+        small, big = tenants
+        _enqueue(repo, big, 10, "big")
+        repo.claim_jobs("video_process", 4, "worker-a")
+        _enqueue(repo, small, 3, "small")
+
+        jobs = repo.claim_jobs("video_process", 2, "worker-b")
+
+        assert [j.tenant_id for j in jobs] == [small.id, small.id]
+
+    def test_unused_share_goes_to_other_tenants(self, test_db_session, tenants):
+        """Test slots a tenant cannot use are given to tenants with more work."""
+        repo = JobRepository(test_db_session)
+        small, big = tenants
+        _enqueue(repo, big, 10, "big")
+        _enqueue(repo, small, 1, "small")
+
+        jobs = repo.claim_jobs("video_process", 6, "worker-a")
+
+        assert len(jobs) == 6
+        assert sum(1 for j in jobs if j.tenant_id == small.id) == 1
@@ -8,7 +8,9 @@ from src.database.models import Base
 from src.database.monitoring import (
     enable_monitoring,
     get_query_metrics,
+    normalize_statement,
     reset_query_metrics,
+    track_queries,
 )
 
 
@@ -128,3 +130,37 @@ def test_slow_query_percentage_calculation():
     
     # With no queries, percentage should be 0
     assert metrics["slow_query_percentage"] == 0.0
+
+
+def test_normalize_statement():
+    """Test statements differing only in values normalize to the same text."""
+    assert normalize_statement(
+        "SELECT videos.id \nFROM videos \nWHERE videos.id IN (?, ?, ?) AND title = 'it''s' LIMIT 10"
+    ) == "SELECT videos.id FROM videos WHERE videos.id IN (?) AND title = ? LIMIT ?"
+    assert normalize_statement(
+        "SELECT a FROM t WHERE t.key_1 = %(key_1)s AND b IN (%(b_1_1)s, %(b_1_2)s)"
+    ) == "SELECT a FROM t WHERE t.key_1 = ? AND b IN (?)"
+    assert normalize_statement("INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4)") == (
+        "INSERT INTO t (a, b) VALUES (?)"
+    )
+    assert normalize_statement("SELECT x::text FROM t WHERE a = :a") == (
+        "SELECT x::text FROM t WHERE a = ?"
+    )
+
+
+def test_track_queries_counts_per_block(monitored_db_session):
+    """Test only queries inside the block are counted, grouped by statement."""
+    monitored_db_session.execute(text("SELECT 0"))
+
+    with track_queries() as stats:
+        for i in range(3):
+            monitored_db_session.execute(text("SELECT :i"), {"i": i})
+        monitored_db_session.execute(text("SELECT 'other', 1"))
+
+    monitored_db_session.execute(text("SELECT 0"))
+
+    assert stats.count == 4
+    assert stats.duration > 0
+    assert stats.statements == {"SELECT ?": 3, "SELECT ?, ?": 1}
+    assert stats.repeated(2) == {"SELECT ?": 3}
+    assert stats.repeated(3) == {}
@@ -0,0 +1,103 @@
+"""Tests for analytics log partition management."""
+
+from datetime import date
+from unittest.mock import MagicMock
+
+from sqlalchemy.exc import OperationalError
+
+from src.database import partitions
+from src.database.partitions import (
+    ANALYTICS_EVENTS,
+    API_USAGE_LOGS,
+    ensure_partitions,
+    expired_partitions,
+    is_partitioned,
+)
+
+
+class TestPartitionedTable:
+    """Test suite for partition ranges and names."""
+
+    def test_daily_partitions(self):
+        """Test day partitions are named after and bounded by their date."""
+        start = API_USAGE_LOGS.partition_start(date(2026, 12, 31))
+
+        assert API_USAGE_LOGS.partition_name(start) == "api_usage_logs_p20261231"
+        assert API_USAGE_LOGS.create_partition_ddl(start) == (
+            "CREATE TABLE IF NOT EXISTS api_usage_logs_p20261231 PARTITION OF api_usage_logs "
+            "FOR VALUES FROM ('2026-12-31') TO ('2027-01-01')"
+        )
+
+    def test_monthly_partitions(self):
+        """Test month partitions cover whole calendar months."""
+        start = ANALYTICS_EVENTS.partition_start(date(2026, 1, 31))
+
+        assert start == date(2026, 1, 1)
+        assert ANALYTICS_EVENTS.next_start(start) == date(2026, 2, 1)
+        assert ANALYTICS_EVENTS.parse_partition_name("analytics_events_p202601") == start
+        assert ANALYTICS_EVENTS.parse_partition_name("analytics_events_default") is None
+
+
+class TestPartitionMaintenance:
+    """Test suite for creating and expiring partitions."""
+
+    def test_expired_partitions_end_before_cutoff(self, monkeypatch):
+        """Test only partitions whose whole range is past retention expire."""
+        names = [
+            "api_usage_logs_default",
+            "api_usage_logs_p20261016",
+            "api_usage_logs_p20261017",
+            "api_usage_logs_p20261018",
+        ]
+        monkeypatch.setattr(partitions, "list_partitions", lambda session, table: names)
+
+        assert expired_partitions(None, API_USAGE_LOGS, date(2026, 10, 18)) == [
+            "api_usage_logs_p20261016",
+            "api_usage_logs_p20261017",
+        ]
+
+    def test_plain_tables_are_left_alone(self, test_db_session):
+        """Test nothing is partitioned or created outside PostgreSQL."""
+        assert not is_partitioned(test_db_session, API_USAGE_LOGS)
+        assert ensure_partitions(test_db_session, 7) == []
+
+    def test_rows_in_default_partition_are_moved(self, monkeypatch):
+        """Test a new partition takes over the default partition's rows for its range."""
+        monkeypatch.setattr(partitions, "PARTITIONED_TABLES", (API_USAGE_LOGS,))
+        monkeypatch.setattr(partitions, "is_partitioned", lambda session, table: True)
+        monkeypatch.setattr(partitions, "list_partitions", lambda session, table: [])
+        session = MagicMock()
+        session.execute.return_value.scalar.return_value = True
+
+        assert ensure_partitions(session, 0, today=date(2026, 10, 18)) == [
+            "api_usage_logs_p20261018"
+        ]
+
+        statements = [str(call.args[0]) for call in session.execute.call_args_list]
+        assert statements[1:] == [
+            "ALTER TABLE api_usage_logs DETACH PARTITION api_usage_logs_default",
+            API_USAGE_LOGS.create_partition_ddl(date(2026, 10, 18)),
+            "WITH moved AS (DELETE FROM api_usage_logs_default WHERE timestamp >= '2026-10-18' "
+            "AND timestamp < '2026-10-19' RETURNING *) INSERT INTO api_usage_logs "
+            "SELECT * FROM moved",
+            "ALTER TABLE api_usage_logs ATTACH PARTITION api_usage_logs_default DEFAULT",
+        ]
+        session.commit.assert_called_once()
+
+    def test_failing_table_does_not_block_others(self, monkeypatch):
+        """Test partitions of the remaining tables are created when one table fails."""
+        monkeypatch.setattr(partitions, "is_partitioned", lambda session, table: True)
+        monkeypatch.setattr(partitions, "list_partitions", lambda session, table: [])
+
+        def create_partition(session, table, start):
+            if table is API_USAGE_LOGS:
+                raise OperationalError("CREATE TABLE", {}, Exception("lock timeout"))
+
+        monkeypatch.setattr(partitions, "create_partition", create_partition)
+        session = MagicMock()
+
+        assert ensure_partitions(session, 0, today=date(2026, 10, 18)) == [
+            "analytics_events_p202610"
+        ]
+        session.rollback.assert_called_once()
+        session.commit.assert_called_once()
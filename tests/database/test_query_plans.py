@@ -0,0 +1,112 @@
+"""Tests for the query plan checks."""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from src.database.models import Base
+from src.database.query_plans import capture_statements, explain, sequential_scans
+from src.database.repositories import JobRepository, VideoRepository
+
+
+@pytest.fixture
+def connection():
+    """A connection to an empty SQLite schema."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.connect() as connection:
+        yield connection
+    engine.dispose()
+
+
+def _scans(connection, call):
+    with capture_statements(connection) as captured:
+        call()
+    return [
+        table
+        for statement in captured
+        for table in sequential_scans(explain(connection, statement), "sqlite")
+    ]
+
+
+class TestSequentialScans:
+    """Test suite for reading full scans out of plans."""
+
+    def test_postgres_plan_nodes(self):
+        """Test Seq Scan nodes are found at any depth and filtered by table."""
+        plan = [
+            {
+                "Plan": {
+                    "Node Type": "Limit",
+                    "Plans": [
+                        {
+                            "Node Type": "Nested Loop",
+                            "Plans": [
+                                {"Node Type": "Seq Scan", "Relation Name": "channels"},
+                                {"Node Type": "Index Scan", "Relation Name": "videos"},
+                                {"Node Type": "Seq Scan", "Relation Name": "match_results"},
+                            ],
+                        }
+                    ],
+                }
+            }
+        ]
+
+        assert sequential_scans(plan, "postgresql") == ["channels", "match_results"]
+        assert sequential_scans(plan, "postgresql", ["videos", "match_results"]) == [
+            "match_results"
+        ]
+
+    def test_sqlite_plan_rows(self):
+        """Test only table scans without an index count."""
+        plan = [
+            (2, 0, 0, "SCAN audio_fingerprints"),
+            (3, 0, 0, "SEARCH videos USING INDEX idx_videos_video_id (video_id=?)"),
+            (4, 0, 0, "SCAN processing_jobs USING INDEX idx_jobs_status_created"),
+            (5, 0, 0, "USE TEMP B-TREE FOR ORDER BY"),
+        ]
+
+        assert sequential_scans(plan, "sqlite") == ["audio_fingerprints"]
+
+
+class TestRepositoryPlans:
+    """Test suite for explaining repository queries."""
+
+    def test_indexed_lookups_do_not_scan(self, connection):
+        """Test lookups covered by model indexes search instead of scanning."""
+        session = Session(bind=connection)
+        video_repo, job_repo = VideoRepository(session), JobRepository(session)
+
+        def exists():
+            video_repo.check_fingerprints_exist(1, 22050, 2048, 512)
+
+        assert _scans(connection, exists) == []
+        assert _scans(connection, lambda: job_repo.get_pending_jobs("video_process")) == []
+
+    def test_missing_index_is_reported(self, connection):
+        """Test a lookup without an index scans until the index exists."""
+        video_repo = VideoRepository(Session(bind=connection))
+
+        def lookup():
+            video_repo.find_matching_fingerprints("abc")
+
+        connection.execute(text("DROP INDEX idx_fingerprints_hash"))
+        connection.execute(text("DROP INDEX idx_fingerprints_tenant_hash"))
+        assert _scans(connection, lookup) == ["audio_fingerprints"]
+
+        connection.execute(
+            text("CREATE INDEX idx_fingerprints_hash ON audio_fingerprints (fingerprint_hash)")
+        )
+        assert _scans(connection, lookup) == []
+
+    def test_only_queries_are_captured(self, connection):
+        """Test inserts and executemany batches are not captured for explaining."""
+        connection.execute(text("CREATE TABLE notes (body TEXT)"))
+        with capture_statements(connection) as captured:
+            connection.execute(text("INSERT INTO notes VALUES ('a')"))
+            connection.execute(
+                text("INSERT INTO notes VALUES (:body)"), [{"body": "b"}, {"body": "c"}]
+            )
+            connection.execute(text("SELECT body FROM notes"))
+
+        assert [statement.statement for statement in captured] == ["SELECT body FROM notes"]
@@ -1,6 +1,7 @@
 """Tests for channel ingestion with async orchestration."""
 
 import asyncio
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -182,9 +183,11 @@ class TestChannelIngester:
         mock_channel = MagicMock()
         mock_channel.id = 1
         mock_channel.channel_name = 'Test Channel'
+        mock_channel.sync_last_video_id = None  # Never synced: full listing
 
         mock_video_repo.get_channel_by_id.return_value = mock_channel
-        mock_video_repo.get_video_by_id.return_value = None  # New video
+        mock_video_repo.get_videos_by_ids.return_value = {}  # New video
+        mock_video_repo.insert_videos_batch.return_value = {'video1': 1}
 
         # Simulate job already exists using batch method
         mock_job_repo.jobs_exist_batch.return_value = {'video1'}
@@ -201,8 +204,8 @@ class TestChannelIngester:
             mock_job_repo.jobs_exist_batch.assert_called_once_with(
                 'video_process', ['video1'], statuses=['pending', 'running']
             )
-            # Verify create_job was NOT called since job exists
-            mock_job_repo.create_job.assert_not_called()
+            # Verify no job was queued since one exists
+            mock_job_repo.create_jobs_batch.assert_called_once_with([])
 
     @pytest.mark.asyncio
     async def test_batch_job_checking(self, ingester):
@@ -222,9 +225,13 @@ class TestChannelIngester:
         mock_channel = MagicMock()
         mock_channel.id = 1
         mock_channel.channel_name = 'Test Channel'
+        mock_channel.sync_last_video_id = None  # Never synced: full listing
 
         mock_video_repo.get_channel_by_id.return_value = mock_channel
-        mock_video_repo.get_video_by_id.return_value = None  # New videos
+        mock_video_repo.get_videos_by_ids.return_value = {}  # New videos
+        mock_video_repo.insert_videos_batch.side_effect = lambda rows: {
+            row['video_id']: i for i, row in enumerate(rows, 1)
+        }
 
         # Simulate some jobs exist (video2, video4)
         mock_job_repo.jobs_exist_batch.return_value = {'video2', 'video4'}
@@ -244,10 +251,10 @@ class TestChannelIngester:
             assert set(call_args[0][1]) == {'video1', 'video2', 'video3', 'video4', 'video5'}
             assert call_args[1]['statuses'] == ['pending', 'running']
 
-            # Verify create_job was called only for videos without existing jobs (1, 3, 5)
-            assert mock_job_repo.create_job.call_count == 3
-            created_video_ids = {call.kwargs['target_id'] for call in mock_job_repo.create_job.call_args_list}
-            assert created_video_ids == {'video1', 'video3', 'video5'}
+            # Verify jobs were queued in one batch, only for videos without existing jobs (1, 3, 5)
+            mock_job_repo.create_jobs_batch.assert_called_once()
+            jobs = mock_job_repo.create_jobs_batch.call_args.args[0]
+            assert {job['target_id'] for job in jobs} == {'video1', 'video3', 'video5'}
 
 
     @pytest.mark.asyncio
@@ -279,11 +286,15 @@ class TestChannelIngester:
         mock_channel = MagicMock()
         mock_channel.id = 1
         mock_channel.channel_name = 'Test Channel'
+        mock_channel.sync_last_video_id = None  # Never synced: full listing
 
         mock_video_repo.get_channel_by_id.return_value = mock_channel
         # All videos are new (don't exist)
-        mock_video_repo.get_video_by_id.return_value = None
-        mock_job_repo.job_exists.return_value = False
+        mock_video_repo.get_videos_by_ids.return_value = {}
+        mock_video_repo.insert_videos_batch.side_effect = lambda rows: {
+            row['video_id']: i for i, row in enumerate(rows, 1)
+        }
+        mock_job_repo.jobs_exist_batch.return_value = set()
 
         with (
             patch.object(ingester.video_processor, 'get_channel_videos', return_value=test_videos),
@@ -293,10 +304,166 @@ class TestChannelIngester:
             ingester._db_initialized = True
             await ingester.ingest_channel('test_channel', max_videos=3, dry_run=False)
 
-            # Verify create_video was called exactly 3 times (once per new video)
-            assert mock_video_repo.create_video.call_count == 3
-            # Verify create_job was called exactly 3 times (once per new video)
-            assert mock_job_repo.create_job.call_count == 3
+            # Verify all 3 videos and their jobs were written with one insert each
+            mock_video_repo.insert_videos_batch.assert_called_once()
+            assert len(mock_video_repo.insert_videos_batch.call_args.args[0]) == 3
+            assert len(mock_job_repo.create_jobs_batch.call_args.args[0]) == 3
+
+    @pytest.mark.asyncio
+    async def test_existing_videos_updated_in_one_batch(self, ingester):
+        """Test existing videos are diffed in one query and updated together."""
+        test_videos = [
+            {'id': f'video{i}', 'title': f'Test Video {i}', 'view_count': 1000, 'duration': 100}
+            for i in range(1, 4)
+        ]
+
+        mock_video_repo = MagicMock()
+        mock_job_repo = MagicMock()
+        mock_channel = MagicMock()
+        mock_channel.id = 1
+        mock_channel.channel_name = 'Test Channel'
+        mock_channel.sync_last_video_id = None  # Never synced: full listing
+        mock_video_repo.get_channel_by_id.return_value = mock_channel
+
+        stale = MagicMock(id=11, view_count=10, duration=100, processed=True)
+        current = MagicMock(id=12, view_count=1000, duration=100, processed=True)
+        mock_video_repo.get_videos_by_ids.return_value = {'video1': stale, 'video2': current}
+        # video3 was inserted by a concurrent sync in the meantime
+        mock_video_repo.insert_videos_batch.return_value = {}
+        mock_job_repo.jobs_exist_batch.return_value = set()
+
+        with (
+            patch.object(ingester.video_processor, 'get_channel_videos', return_value=test_videos),
+            patch('src.ingestion.channel_ingester.get_video_repository', return_value=mock_video_repo),
+            patch('src.ingestion.channel_ingester.get_job_repository', return_value=mock_job_repo),
+        ):
+            ingester._db_initialized = True
+            await ingester.ingest_channel('test_channel', dry_run=False)
+
+        mock_video_repo.get_videos_by_ids.assert_called_once_with(['video1', 'video2', 'video3'])
+        mock_video_repo.get_video_by_id.assert_not_called()
+        mock_video_repo.update_videos_batch.assert_called_once_with(
+            [{'id': 11, 'view_count': 1000, 'like_count': None, 'duration': 100}]
+        )
+        assert [row['video_id'] for row in mock_video_repo.insert_videos_batch.call_args.args[0]] == [
+            'video3'
+        ]
+        mock_job_repo.create_jobs_batch.assert_called_once_with([])
+
+    @pytest.mark.asyncio
+    async def test_routine_sync_only_fetches_new_uploads(self, ingester):
+        """Test a recently deep-synced channel lists only uploads after its watermark."""
+        new_videos = [
+            {'id': 'video9', 'title': 'Newest', 'upload_date': '20261017'},
+            {'id': 'video8', 'title': 'Newer', 'upload_date': '20261016'},
+        ]
+
+        mock_video_repo = MagicMock()
+        mock_job_repo = MagicMock()
+        mock_channel = MagicMock()
+        mock_channel.id = 1
+        mock_channel.channel_name = 'Test Channel'
+        mock_channel.sync_last_video_id = 'video7'
+        mock_channel.sync_last_upload_date = datetime(2026, 10, 1)
+        mock_channel.sync_etag = 'etag-old'
+        mock_channel.last_deep_sync = datetime.now(timezone.utc) - timedelta(hours=1)
+        mock_video_repo.get_channel_by_id.return_value = mock_channel
+        mock_video_repo.get_videos_by_ids.return_value = {}
+        mock_video_repo.insert_videos_batch.return_value = {'video9': 9, 'video8': 8}
+        mock_job_repo.jobs_exist_batch.return_value = set()
+
+        with (
+            patch.object(ingester.video_processor, 'get_channel_videos') as mock_full,
+            patch.object(
+                ingester.video_processor,
+                'get_new_channel_videos',
+                return_value=(new_videos, 'etag-new'),
+            ) as mock_new,
+            patch('src.ingestion.channel_ingester.get_video_repository', return_value=mock_video_repo),
+            patch('src.ingestion.channel_ingester.get_job_repository', return_value=mock_job_repo),
+        ):
+            ingester._db_initialized = True
+            await ingester.ingest_channel('test_channel', dry_run=False)
+
+        mock_full.assert_not_called()
+        mock_new.assert_called_once_with(
+            'test_channel', 'video7', datetime(2026, 10, 1), 'etag-old', None
+        )
+        assert mock_channel.sync_last_video_id == 'video9'
+        assert mock_channel.sync_last_upload_date == datetime(2026, 10, 17)
+        assert mock_channel.sync_etag == 'etag-new'
+        assert len(mock_job_repo.create_jobs_batch.call_args.args[0]) == 2
+
+    @pytest.mark.asyncio
+    async def test_capped_routine_sync_forces_deep_sync(self, ingester):
+        """Test a routine sync that hits max_videos keeps its watermark for a deep sync."""
+        new_videos = [
+            {'id': 'video9', 'title': 'Newest', 'upload_date': '20261017'},
+            {'id': 'video8', 'title': 'Newer', 'upload_date': '20261016'},
+        ]
+
+        mock_video_repo = MagicMock()
+        mock_job_repo = MagicMock()
+        mock_channel = MagicMock()
+        mock_channel.id = 1
+        mock_channel.sync_last_video_id = 'video7'
+        mock_channel.sync_last_upload_date = datetime(2026, 10, 1)
+        mock_channel.sync_etag = 'etag-old'
+        mock_channel.last_deep_sync = datetime.now(timezone.utc) - timedelta(hours=1)
+        mock_video_repo.get_channel_by_id.return_value = mock_channel
+        mock_video_repo.get_videos_by_ids.return_value = {}
+        mock_video_repo.insert_videos_batch.return_value = {'video9': 9, 'video8': 8}
+        mock_job_repo.jobs_exist_batch.return_value = set()
+
+        with (
+            patch.object(
+                ingester.video_processor,
+                'get_new_channel_videos',
+                return_value=(new_videos, 'etag-new'),
+            ),
+            patch('src.ingestion.channel_ingester.get_video_repository', return_value=mock_video_repo),
+            patch('src.ingestion.channel_ingester.get_job_repository', return_value=mock_job_repo),
+        ):
+            ingester._db_initialized = True
+            await ingester.ingest_channel('test_channel', max_videos=2, dry_run=False)
+
+        assert mock_channel.sync_last_video_id == 'video7'
+        assert mock_channel.sync_last_upload_date == datetime(2026, 10, 1)
+        assert mock_channel.sync_etag == 'etag-old'
+        assert mock_channel.last_deep_sync is None
+        assert ingester._needs_deep_sync(mock_channel)
+
+    @pytest.mark.asyncio
+    async def test_deep_sync_after_interval(self, ingester):
+        """Test the full listing runs again once the deep-sync interval has passed."""
+        mock_video_repo = MagicMock()
+        mock_channel = MagicMock()
+        mock_channel.id = 1
+        mock_channel.sync_last_video_id = 'video7'
+        mock_channel.sync_last_upload_date = datetime(2026, 10, 1)
+        mock_channel.last_deep_sync = datetime.now(timezone.utc) - timedelta(days=30)
+        mock_video_repo.get_channel_by_id.return_value = mock_channel
+        mock_video_repo.get_videos_by_ids.return_value = {}
+        mock_video_repo.insert_videos_batch.return_value = {}
+        mock_job_repo = MagicMock()
+        mock_job_repo.jobs_exist_batch.return_value = set()
+
+        with (
+            patch.object(
+                ingester.video_processor,
+                'get_channel_videos',
+                return_value=[{'id': 'video7', 'upload_date': '20261001'}],
+            ) as mock_full,
+            patch.object(ingester.video_processor, 'get_new_channel_videos') as mock_new,
+            patch('src.ingestion.channel_ingester.get_video_repository', return_value=mock_video_repo),
+            patch('src.ingestion.channel_ingester.get_job_repository', return_value=mock_job_repo),
+        ):
+            ingester._db_initialized = True
+            await ingester.ingest_channel('test_channel', dry_run=False)
+
+        mock_full.assert_called_once()
+        mock_new.assert_not_called()
+        assert datetime.now(timezone.utc) - mock_channel.last_deep_sync < timedelta(minutes=1)
 
     @pytest.mark.asyncio
     async def test_ingest_all_channels_summary(self, ingester):
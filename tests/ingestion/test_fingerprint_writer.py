@@ -0,0 +1,59 @@
+"""Tests for chunked, in-order fingerprint writes."""
+
+from unittest.mock import MagicMock
+
+from src.ingestion.fingerprint_writer import ChunkedFingerprintWriter
+
+
+def _writer(chunk_size):
+    video_repo = MagicMock()
+    video_repo.upsert_fingerprints.side_effect = len
+    return ChunkedFingerprintWriter(video_repo, chunk_size=chunk_size), video_repo
+
+
+def _written(video_repo):
+    return [[row["index"] for row in c.args[0]] for c in video_repo.upsert_fingerprints.call_args_list]
+
+
+class TestChunkedFingerprintWriter:
+    """Test suite for ChunkedFingerprintWriter."""
+
+    def test_writes_full_chunks_as_they_complete(self):
+        """Test a chunk is written once enough rows are ready, the rest on flush."""
+        writer, video_repo = _writer(chunk_size=2)
+
+        for index in range(5):
+            writer.add(index, {"index": index})
+        assert _written(video_repo) == [[0, 1], [2, 3]]
+
+        writer.flush()
+        assert _written(video_repo) == [[0, 1], [2, 3], [4]]
+        assert writer.written == 5
+
+    def test_out_of_order_results_are_written_in_segment_order(self):
+        """Test later segments wait for earlier ones so stored rows stay a prefix."""
+        writer, video_repo = _writer(chunk_size=2)
+
+        writer.add(2, {"index": 2})
+        writer.add(1, {"index": 1})
+        video_repo.upsert_fingerprints.assert_not_called()
+
+        writer.add(0, {"index": 0})
+        assert _written(video_repo) == [[0, 1, 2]]
+
+    def test_failed_segments_are_skipped(self):
+        """Test failed segments are counted and do not block later ones."""
+        writer, video_repo = _writer(chunk_size=10)
+
+        writer.add(1, {"index": 1})
+        writer.add(0, None)
+        writer.flush()
+
+        assert _written(video_repo) == [[1]]
+        assert writer.failed == 1
+
+    def test_flush_without_rows_does_not_write(self):
+        """Test flushing an empty writer is a no-op."""
+        writer, video_repo = _writer(chunk_size=2)
+        writer.flush()
+        video_repo.upsert_fingerprints.assert_not_called()
@@ -0,0 +1,142 @@
+"""Tests for throttled job progress reporting and the progress channel."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.database.progress import (
+    PROGRESS_CHANNEL,
+    ProgressChannel,
+    RedisProgressChannel,
+    progress_key,
+)
+from src.ingestion.job_progress import JobProgressReporter
+
+
+def _make_job(job_id):
+    job = MagicMock()
+    job.id = job_id
+    job.job_type = "video_process"
+    job.target_id = f"video{job_id}"
+    job.started_at = None
+    return job
+
+
+class FakeRedis:
+    """Minimal synchronous Redis stand-in for key/value and publish."""
+
+    def __init__(self):
+        self.values = {}
+        self.published = []
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value.encode()
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+@pytest.fixture
+def channel():
+    """Create an in-process progress channel."""
+    return ProgressChannel(ttl_seconds=60)
+
+
+class TestJobProgressReporter:
+    """Test suite for JobProgressReporter."""
+
+    def test_updates_are_throttled(self, channel):
+        """Test many small updates produce few database writes."""
+        job_repo = MagicMock()
+        reporter = JobProgressReporter(job_repo, channel, min_interval=60, min_delta=0.1)
+        job = _make_job(1)
+
+        for i in range(120):
+            reporter.update(job, (i + 1) / 120, f"Processed segment {i + 1}/120")
+
+        # One write per 10% of progress instead of one per segment
+        assert 9 <= job_repo.update_jobs_progress.call_count <= 11
+        job_repo.update_job_status.assert_not_called()
+
+    def test_every_update_is_published(self, channel):
+        """Test subscribers see every update even when writes are throttled."""
+        reporter = JobProgressReporter(MagicMock(), channel, min_interval=60, min_delta=1.0)
+        seen = []
+        unsubscribe = channel.subscribe(seen.append)
+        job = _make_job(1)
+
+        reporter.update(job, 0.25, "Segment 1")
+        reporter.update(job, 0.5, "Segment 2")
+        unsubscribe()
+        reporter.update(job, 0.75, "Segment 3")
+
+        assert [s["progress"] for s in seen] == [0.25, 0.5]
+        assert channel.get("video_process", "video1")["progress"] == 0.75
+
+    def test_pending_updates_of_all_jobs_are_batched(self, channel):
+        """Test one flush writes the latest progress of every job."""
+        job_repo = MagicMock()
+        reporter = JobProgressReporter(job_repo, channel, min_interval=60, min_delta=1.0)
+
+        reporter.update(_make_job(1), 0.1, "a")
+        reporter.update(_make_job(1), 0.2, "b")
+        reporter.update(_make_job(2), 0.3, "c")
+        reporter.flush()
+
+        job_repo.update_jobs_progress.assert_called_once_with({1: (0.2, "b"), 2: (0.3, "c")})
+
+    def test_finish_writes_immediately(self, channel):
+        """Test final states bypass throttling and replace pending progress."""
+        job_repo = MagicMock()
+        reporter = JobProgressReporter(job_repo, channel, min_interval=60, min_delta=1.0)
+        job = _make_job(1)
+
+        reporter.update(job, 0.5, "Halfway")
+        reporter.finish(job, "completed", 1.0, "Done")
+        reporter.flush()
+
+        job_repo.update_job_status.assert_called_once_with(1, "completed", 1.0, "Done", None)
+        job_repo.update_jobs_progress.assert_not_called()
+        snapshot = channel.get("video_process", "video1")
+        assert snapshot["status"] == "completed"
+        assert snapshot["completed_at"] is not None
+
+    def test_write_failure_does_not_raise(self, channel):
+        """Test a failed progress write does not fail the job."""
+        job_repo = MagicMock()
+        job_repo.update_jobs_progress.side_effect = Exception("database unavailable")
+        reporter = JobProgressReporter(job_repo, channel, min_interval=0, min_delta=0)
+
+        reporter.update(_make_job(1), 0.5, "Halfway")
+
+        assert reporter.writes == 0
+
+
+class TestProgressChannel:
+    """Test suite for the progress channel backends."""
+
+    def test_snapshots_expire(self):
+        """Test snapshots are only readable for their TTL."""
+        channel = ProgressChannel(ttl_seconds=10)
+        channel.publish(_make_job(1), "running", 0.5)
+
+        with patch("src.database.progress.time.time", return_value=10**12):
+            assert channel.get("video_process", "video1") is None
+
+    def test_unknown_target_returns_none(self, channel):
+        """Test reading a target without progress returns None."""
+        assert channel.get("video_process", "missing") is None
+
+    def test_redis_backend_stores_and_publishes(self):
+        """Test the Redis backend writes a key and publishes on the channel."""
+        redis_client = FakeRedis()
+        channel = RedisProgressChannel(redis_client, ttl_seconds=60)
+
+        channel.publish(_make_job(7), "running", 0.4, "Segmenting audio")
+
+        assert progress_key("video_process", "video7") in redis_client.values
+        assert redis_client.published[0][0] == PROGRESS_CHANNEL
+        assert channel.get("video_process", "video7")["current_step"] == "Segmenting audio"
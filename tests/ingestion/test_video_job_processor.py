@@ -1,5 +1,8 @@
 """Tests for VideoJobProcessor."""
 
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -33,7 +36,7 @@ class TestVideoJobProcessor:
         mock_video_repo = MagicMock()
 
         # Mock get_pending_jobs to raise an exception inside the try block
-        mock_job_repo.get_pending_jobs.side_effect = Exception("Database query failed")
+        mock_job_repo.claim_jobs.side_effect = Exception("Database query failed")
 
         with (
             patch(
@@ -58,7 +61,7 @@ class TestVideoJobProcessor:
         mock_video_repo = MagicMock()
 
         # Mock get_pending_jobs to return empty list (no jobs to process)
-        mock_job_repo.get_pending_jobs.return_value = []
+        mock_job_repo.claim_jobs.return_value = []
 
         with (
             patch(
@@ -77,8 +80,6 @@ class TestVideoJobProcessor:
     @pytest.mark.asyncio
     async def test_blocking_io_wrapped_with_asyncio_to_thread(self, processor):
         """Test that blocking I/O operations are wrapped with asyncio.to_thread."""
-        import asyncio
-        import json
         from unittest.mock import AsyncMock
 
         mock_job_repo = MagicMock()
@@ -88,13 +89,14 @@ class TestVideoJobProcessor:
 
         # Setup mock objects
         mock_job.id = 1
+        mock_job.job_type = "video_process"
         mock_job.target_id = "video123"
         mock_job.parameters = json.dumps({"url": "https://youtube.com/watch?v=video123"})
 
         mock_video.id = 1
         mock_video.processing_started = None
 
-        mock_job_repo.get_pending_jobs.return_value = [mock_job]
+        mock_job_repo.claim_jobs.return_value = [mock_job]
         mock_video_repo.get_video_by_id.return_value = mock_video
         mock_video_repo.check_fingerprints_exist.return_value = False
 
@@ -102,15 +104,25 @@ class TestVideoJobProcessor:
         mock_segments = [("seg1.wav", 0.0, 10.0)]
         mock_fingerprint = {
             "fingerprint_hash": "abc123",
+            "fingerprint_data": b"serialized",
             "confidence_score": 0.95,
             "peak_count": 100,
             "sample_rate": 22050,
+            "duration": 0.01,
         }
 
         with (
             patch("src.ingestion.channel_ingester.get_job_repository", return_value=mock_job_repo),
             patch("src.ingestion.channel_ingester.get_video_repository", return_value=mock_video_repo),
             patch("asyncio.to_thread", new_callable=AsyncMock) as mock_to_thread,
+            patch(
+                "src.ingestion.channel_ingester.get_fingerprint_pool",
+                return_value=ThreadPoolExecutor(max_workers=1),
+            ),
+            patch(
+                "src.ingestion.channel_ingester.fingerprint_segment",
+                MagicMock(return_value=mock_fingerprint),
+            ) as mock_fingerprint_segment,
         ):
             # Configure mock_to_thread to call the function directly (simulate async execution)
             async def fake_to_thread(func, *args, **kwargs):
@@ -122,8 +134,6 @@ class TestVideoJobProcessor:
             processor.video_processor.process_video_for_fingerprinting = MagicMock(
                 return_value=mock_segments
             )
-            processor.fingerprinter.extract_fingerprint = MagicMock(return_value=mock_fingerprint)
-            processor.fingerprinter.serialize_fingerprint = MagicMock(return_value=b"serialized")
             processor.video_processor.cleanup_segments = MagicMock()
 
             # Enable cleanup to test all three blocking operations
@@ -132,6 +142,157 @@ class TestVideoJobProcessor:
                 await processor.process_video_job(mock_job, mock_video_repo, mock_job_repo)
 
             # Verify asyncio.to_thread was called for blocking operations
-            # Should be called 3 times: process_video, extract_fingerprint, cleanup_segments
-            assert mock_to_thread.call_count == 3, f"Expected 3 calls to asyncio.to_thread, got {mock_to_thread.call_count}"
+            # Should be called 2 times: process_video, cleanup_segments
+            assert mock_to_thread.call_count == 2, f"Expected 2 calls to asyncio.to_thread, got {mock_to_thread.call_count}"
+            # Fingerprinting (CPU-bound) runs in the process pool instead
+            mock_fingerprint_segment.assert_called_once()
+
+
+    @pytest.mark.asyncio
+    async def test_segments_fingerprinted_in_parallel_in_order(self, processor):
+        """Test segments run concurrently in the pool and are inserted in segment order."""
+        job = MagicMock()
+        job.id = 1
+        job.job_type = "video_process"
+        job.target_id = "video123"
+        job.parameters = json.dumps({"url": "https://youtube.com/watch?v=video123"})
+        video = MagicMock()
+        video.id = 1
+        video_repo = MagicMock()
+        video_repo.get_video_by_id.return_value = video
+        video_repo.check_fingerprints_exist.return_value = False
+        video_repo.upsert_fingerprints.side_effect = len
+
+        segments = [(f"seg{i}.wav", i * 90.0, (i + 1) * 90.0) for i in range(4)]
+        processor.video_processor.process_video_for_fingerprinting = MagicMock(return_value=segments)
+
+        def fake_fingerprint_segment(segment_file, sample_rate, n_fft, hop_length):
+            index = int(segment_file[3])
+            if index == 2:
+                raise RuntimeError("corrupt segment")
+            # Earlier segments finish last
+            time.sleep(0.02 * (4 - index))
+            return {
+                "fingerprint_hash": segment_file,
+                "fingerprint_data": b"data",
+                "confidence_score": 0.9,
+                "peak_count": 10,
+                "sample_rate": sample_rate,
+                "duration": 0.01,
+            }
+
+        pool = ThreadPoolExecutor(max_workers=4)
+        with (
+            patch("src.ingestion.channel_ingester.get_fingerprint_pool", return_value=pool),
+            patch("src.ingestion.channel_ingester.fingerprint_segment", fake_fingerprint_segment),
+            patch("src.ingestion.channel_ingester.Config.CLEANUP_SEGMENTS_AFTER_PROCESSING", False),
+        ):
+            started = time.monotonic()
+            await processor.process_video_job(job, video_repo, MagicMock())
+            elapsed = time.monotonic() - started
+        pool.shutdown()
+
+        rows = [row for c in video_repo.upsert_fingerprints.call_args_list for row in c.args[0]]
+        assert [row["fingerprint_hash"] for row in rows] == ["seg0.wav", "seg1.wav", "seg3.wav"]
+        # Sequential execution would take 0.08 + 0.06 + 0.02 seconds
+        assert elapsed < 0.15
+
+    def test_partially_fingerprinted_video_resumes(self, processor):
+        """Test a video with some stored segments is only processed from the last one."""
+        job = MagicMock()
+        job.id = 1
+        job.job_type = "video_process"
+        job.target_id = "video123"
+        job.parameters = json.dumps({"url": "https://youtube.com/watch?v=video123"})
+        video = MagicMock()
+        video.id = 1
+        video.processed = False
+        video.duration = 900
+        video_repo = MagicMock()
+        video_repo.get_video_by_id.return_value = video
+        video_repo.check_fingerprints_exist.return_value = True
+        video_repo.get_fingerprint_resume_point.return_value = 270.0
+
+        prepared = processor.prepare_job(job, video_repo, MagicMock())
+
+        assert prepared == (video, "https://youtube.com/watch?v=video123", 270.0)
+
+    def test_fully_stored_video_completes_without_download(self, processor):
+        """Test a video whose segments were all stored before a crash is just completed."""
+        job = MagicMock()
+        job.id = 1
+        job.job_type = "video_process"
+        job.target_id = "video123"
+        job.parameters = json.dumps({"url": "https://youtube.com/watch?v=video123"})
+        video = MagicMock()
+        video.id = 1
+        video.processed = False
+        video.duration = 900
+        video_repo = MagicMock()
+        video_repo.get_video_by_id.return_value = video
+        video_repo.check_fingerprints_exist.return_value = True
+        video_repo.get_fingerprint_resume_point.return_value = 899.6
+        job_repo = MagicMock()
+
+        assert processor.prepare_job(job, video_repo, job_repo) is None
+        video_repo.mark_video_processed.assert_called_once_with(1, success=True)
+        assert job_repo.update_job_status.call_args.args[:2] == (1, "completed")
+
+    @pytest.mark.asyncio
+    async def test_resumed_video_of_unknown_duration_completes(self, processor):
+        """Test a resumed video with no audio after the resume point is completed, not failed."""
+        job = MagicMock()
+        job.id = 1
+        job.job_type = "video_process"
+        job.target_id = "video123"
+        job.parameters = json.dumps({"url": "https://youtube.com/watch?v=video123"})
+        video = MagicMock()
+        video.id = 1
+        video.processed = False
+        video.duration = None
+        video_repo = MagicMock()
+        video_repo.get_video_by_id.return_value = video
+        video_repo.check_fingerprints_exist.return_value = True
+        video_repo.get_fingerprint_resume_point.return_value = 900.0
+        job_repo = MagicMock()
+        processor.video_processor.process_video_for_fingerprinting = MagicMock(return_value=[])
+
+        await processor.process_video_job(job, video_repo, job_repo)
+
+        assert processor.video_processor.process_video_for_fingerprinting.call_args.kwargs == {
+            "start_time": 900.0
+        }
+        video_repo.mark_video_processed.assert_called_once_with(1, success=True)
+        assert job_repo.update_job_status.call_args.args[:2] == (1, "completed")
+
+    def test_claimed_batch_checks_fingerprints_once(self, processor):
+        """Test the fingerprint check for a batch of jobs runs once, not per job."""
+        jobs = []
+        for i in range(3):
+            job = MagicMock()
+            job.id = i
+            job.target_id = f"video{i}"
+            job.parameters = json.dumps({"url": f"https://youtube.com/watch?v=video{i}"})
+            jobs.append(job)
+        videos = {}
+        for i in range(3):
+            video = MagicMock()
+            video.id = 10 + i
+            video.processed = i == 0
+            videos[f"video{i}"] = video
+        video_repo = MagicMock()
+        video_repo.get_videos_by_ids.return_value = videos
+        video_repo.fingerprints_exist_for_videos.return_value = {10}
+        video_repo.get_video_by_id.side_effect = lambda video_id: videos[video_id]
+
+        fingerprinted = processor.find_fingerprinted_videos(jobs, video_repo)
+        prepared = [
+            processor.prepare_job(job, video_repo, MagicMock(), fingerprinted=fingerprinted)
+            for job in jobs
+        ]
 
+        assert fingerprinted == {"video0"}
+        assert video_repo.fingerprints_exist_for_videos.call_args.args[0] == [10, 11, 12]
+        video_repo.check_fingerprints_exist.assert_not_called()
+        assert prepared[0] is None
+        assert [p[2] for p in prepared[1:]] == [0.0, 0.0]
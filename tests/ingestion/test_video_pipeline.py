@@ -0,0 +1,281 @@
+"""Tests for the staged video processing pipeline."""
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.ingestion.channel_ingester import VideoJobProcessor
+from src.ingestion.job_lease import JobLeaseKeeper
+from src.ingestion.video_pipeline import VideoPipeline
+
+
+def _fake_fingerprint_segment(segment_file, sample_rate, n_fft, hop_length):
+    """Stand-in for the process pool worker function."""
+    if "bad" in segment_file:
+        raise RuntimeError("corrupt segment")
+    return {
+        "fingerprint_hash": f"hash-{segment_file}",
+        "fingerprint_data": b"data",
+        "confidence_score": 0.9,
+        "peak_count": 10,
+        "sample_rate": sample_rate,
+        "duration": 0.01,
+    }
+
+
+def _fake_download(url, start_time=0.0):
+    return url[-6:]
+
+
+def _make_job(job_id):
+    job = MagicMock()
+    job.id = job_id
+    job.job_type = "video_process"
+    job.target_id = f"video{job_id}"
+    job.parameters = json.dumps({"url": f"https://youtube.com/watch?v=video{job_id}"})
+    return job
+
+
+@pytest.fixture
+def repos():
+    """Create job and video repositories serving a fixed set of pending jobs."""
+    job_repo = MagicMock()
+    video_repo = MagicMock()
+    jobs = [_make_job(i) for i in range(1, 6)]
+    job_repo.claim_jobs.side_effect = [jobs, []]
+
+    def get_video(video_id):
+        video = MagicMock()
+        video.id = int(video_id.replace("video", ""))
+        return video
+
+    video_repo.get_video_by_id.side_effect = get_video
+    video_repo.check_fingerprints_exist.return_value = False
+    video_repo.upsert_fingerprints.side_effect = len
+    return job_repo, video_repo
+
+
+@pytest.fixture
+def processor():
+    """Create a processor whose blocking operations are mocked."""
+    processor = VideoJobProcessor()
+    processor.video_processor = MagicMock()
+    processor.video_processor.segment_audio.side_effect = lambda audio_file, start_offset=0.0: [
+        (f"{audio_file}-seg0.wav", 0.0, 90.0),
+        (f"{audio_file}-seg1.wav", 90.0, 180.0),
+    ]
+    return processor
+
+
+@pytest.fixture(autouse=True)
+def thread_pool():
+    """Run the fingerprint stage on threads with a fake worker function."""
+    pool = ThreadPoolExecutor(max_workers=4)
+    with (
+        patch("src.ingestion.channel_ingester.get_fingerprint_pool", return_value=pool),
+        patch("src.ingestion.channel_ingester.fingerprint_segment", _fake_fingerprint_segment),
+    ):
+        yield pool
+    pool.shutdown()
+
+
+def _completed_job_ids(job_repo):
+    return sorted(
+        c.args[0] for c in job_repo.update_job_status.call_args_list if c.args[1] == "completed"
+    )
+
+
+def _failed_job_ids(job_repo):
+    return sorted(
+        c.args[0] for c in job_repo.update_job_status.call_args_list if c.args[1] == "failed"
+    )
+
+
+class TestVideoPipeline:
+    """Test suite for VideoPipeline."""
+
+    @pytest.mark.asyncio
+    async def test_processes_all_jobs(self, processor, repos):
+        """Test every pending job is downloaded, fingerprinted and written."""
+        job_repo, video_repo = repos
+        processor.video_processor.download_video_audio.side_effect = _fake_download
+
+        completed = await VideoPipeline(processor, job_repo, video_repo).run()
+
+        assert completed == 5
+        assert _completed_job_ids(job_repo) == [1, 2, 3, 4, 5]
+        written = [
+            row for c in video_repo.upsert_fingerprints.call_args_list for row in c.args[0]
+        ]
+        assert len(written) == 10
+        # Segment order is preserved within each video
+        rows = [r for r in written if r["video_id"] == 3]
+        assert [r["start_time"] for r in rows] == [0.0, 90.0]
+
+    @pytest.mark.asyncio
+    async def test_downloads_overlap(self, processor, repos):
+        """Test several downloads run at the same time."""
+        job_repo, video_repo = repos
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def slow_download(url, start_time=0.0):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            return url[-6:]
+
+        processor.video_processor.download_video_audio.side_effect = slow_download
+
+        await VideoPipeline(processor, job_repo, video_repo, download_workers=3).run()
+
+        assert state["peak"] > 1
+        assert _completed_job_ids(job_repo) == [1, 2, 3, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_failed_download_does_not_stop_pipeline(self, processor, repos):
+        """Test a failing job is marked failed while the others complete."""
+        job_repo, video_repo = repos
+        processor.video_processor.download_video_audio.side_effect = (
+            lambda url, start_time=0.0: None if url.endswith("video2") else url[-6:]
+        )
+
+        pipeline = VideoPipeline(processor, job_repo, video_repo)
+        completed = await pipeline.run()
+
+        assert completed == 4
+        assert pipeline.failed == 1
+        assert _failed_job_ids(job_repo) == [2]
+
+    @pytest.mark.asyncio
+    async def test_failed_segments_are_skipped(self, processor, repos):
+        """Test segments that fail to fingerprint are left out of the write."""
+        job_repo, video_repo = repos
+        processor.video_processor.download_video_audio.side_effect = _fake_download
+        processor.video_processor.segment_audio.side_effect = lambda audio_file, start_offset=0.0: [
+            (f"{audio_file}-seg0.wav", 0.0, 90.0),
+            (f"{audio_file}-bad.wav", 90.0, 180.0),
+        ]
+
+        await VideoPipeline(processor, job_repo, video_repo).run()
+
+        written = [
+            row for c in video_repo.upsert_fingerprints.call_args_list for row in c.args[0]
+        ]
+        assert len(written) == 5
+        assert all(row["start_time"] == 0.0 for row in written)
+
+    @pytest.mark.asyncio
+    async def test_batch_write_failure_retries_per_video(self, processor, repos):
+        """Test a failed batched write falls back to writing video by video."""
+        job_repo, video_repo = repos
+        processor.video_processor.download_video_audio.side_effect = _fake_download
+
+        def create_batch(rows):
+            if any(row["video_id"] == 4 for row in rows):
+                raise RuntimeError("constraint violation")
+            return len(rows)
+
+        video_repo.upsert_fingerprints.side_effect = create_batch
+
+        pipeline = VideoPipeline(processor, job_repo, video_repo, write_batch_size=5)
+        await pipeline.run()
+
+        assert _failed_job_ids(job_repo) == [4]
+        assert _completed_job_ids(job_repo) == [1, 2, 3, 5]
+
+    @pytest.mark.asyncio
+    async def test_feeder_error_propagates(self, processor):
+        """Test a database error while claiming jobs stops the pipeline."""
+        job_repo = MagicMock()
+        job_repo.claim_jobs.side_effect = Exception("Database query failed")
+
+        with pytest.raises(Exception, match="Database query failed"):
+            await VideoPipeline(processor, job_repo, MagicMock()).run()
+
+    @pytest.mark.asyncio
+    async def test_job_with_lost_lease_is_abandoned(self, processor, repos):
+        """Test a job reclaimed by another worker is not written or failed."""
+        job_repo, video_repo = repos
+        job_repo.heartbeat_jobs.side_effect = lambda ids, worker_id: set(ids) - {3}
+
+        def slow_download(url, start_time=0.0):
+            time.sleep(0.05)
+            return url[-6:]
+
+        processor.video_processor.download_video_audio.side_effect = slow_download
+        leases = JobLeaseKeeper(job_repo, processor.worker_id, interval=0.01)
+
+        async with leases:
+            completed = await VideoPipeline(processor, job_repo, video_repo, leases=leases).run()
+
+        assert completed == 4
+        assert 3 not in _completed_job_ids(job_repo)
+        assert _failed_job_ids(job_repo) == []
+
+    @pytest.mark.asyncio
+    async def test_resumed_video_of_unknown_duration_completes(self, processor, repos):
+        """Test a resumed video with no audio after the resume point is completed, not failed."""
+        job_repo, video_repo = repos
+        video = MagicMock()
+        video.id = 1
+        video.processed = False
+        video.duration = None
+        video_repo.get_video_by_id.side_effect = None
+        video_repo.get_video_by_id.return_value = video
+        video_repo.get_fingerprint_resume_point.return_value = 900.0
+        job_repo.claim_jobs.side_effect = [[_make_job(1)], []]
+        processor.find_fingerprinted_videos = MagicMock(return_value={"video1"})
+        processor.video_processor.download_video_audio.side_effect = _fake_download
+        processor.video_processor.segment_audio.side_effect = None
+        processor.video_processor.segment_audio.return_value = []
+
+        pipeline = VideoPipeline(processor, job_repo, video_repo)
+        completed = await pipeline.run()
+
+        assert completed == 1
+        assert pipeline.failed == 0
+        assert processor.video_processor.segment_audio.call_args.kwargs == {"start_offset": 900.0}
+        video_repo.mark_video_processed.assert_called_once_with(1, success=True)
+        assert _completed_job_ids(job_repo) == [1]
+
+    @pytest.mark.asyncio
+    async def test_failed_completion_fails_job(self, processor, repos):
+        """Test a job whose completion fails is failed without stalling the pipeline."""
+        job_repo, video_repo = repos
+        job_repo.claim_jobs.side_effect = [[_make_job(i) for i in range(1, 11)], []]
+        processor.video_processor.download_video_audio.side_effect = _fake_download
+
+        def mark_video_processed(video_id, success=True, error_message=None):
+            if success and video_id in (2, 3):
+                raise RuntimeError("connection lost")
+
+        video_repo.mark_video_processed.side_effect = mark_video_processed
+
+        pipeline = VideoPipeline(processor, job_repo, video_repo, queue_size=1, write_batch_size=5)
+        completed = await asyncio.wait_for(pipeline.run(), timeout=5)
+
+        assert completed == 8
+        assert _failed_job_ids(job_repo) == [2, 3]
+        assert pipeline.leases.active == set()
+
+    @pytest.mark.asyncio
+    async def test_stage_error_with_full_queue_does_not_hang(self, processor, repos):
+        """Test a crashed stage stops the pipeline while the feeder waits on a full queue."""
+        job_repo, video_repo = repos
+        job_repo.claim_jobs.side_effect = [[_make_job(i) for i in range(1, 11)], []]
+        processor.video_processor.download_video_audio.side_effect = _fake_download
+
+        pipeline = VideoPipeline(processor, job_repo, video_repo, queue_size=1)
+        pipeline._write_batch = MagicMock(side_effect=RuntimeError("write stage crashed"))
+
+        with pytest.raises(RuntimeError, match="write stage crashed"):
+            await asyncio.wait_for(pipeline.run(), timeout=5)
@@ -3,9 +3,14 @@
 import os
 import tempfile
 import time
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.database.models import APIUsageLog, APIUsageRollup, Base
 from src.maintenance.cleanup import CleanupPolicy, CleanupService, CleanupStats
 
 
@@ -266,6 +271,70 @@ class TestCleanupService:
         mock_query.delete.assert_called_once()
         mock_session.commit.assert_called_once()
 
+    @patch("src.maintenance.cleanup.db_manager")
+    def test_cleanup_analytics_deletes_expired_rows(self, mock_db_manager):
+        """Test unpartitioned analytics logs and minute rollups past retention are deleted."""
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        mock_db_manager.get_session.return_value = session
+        now = datetime.now(UTC)
+        for days in (1, 40):
+            session.add(
+                APIUsageLog(
+                    endpoint="/videos",
+                    method="GET",
+                    status_code=200,
+                    timestamp=now - timedelta(days=days),
+                )
+            )
+            session.add(
+                APIUsageRollup(
+                    granularity="minute",
+                    bucket_start=now - timedelta(days=days),
+                    endpoint="/videos",
+                    status_code=200,
+                    request_count=1,
+                    response_time_sum=0,
+                    response_time_count=0,
+                )
+            )
+        session.commit()
+
+        policy = CleanupPolicy(
+            temp_files_days=7,
+            log_files_days=30,
+            completed_jobs_days=30,
+            failed_jobs_days=90,
+            api_usage_logs_days=30,
+        )
+        stats = CleanupService(policy=policy, dry_run=False).cleanup_analytics()
+
+        session = sessionmaker(bind=engine)()
+        assert stats.db_records_deleted == 1
+        assert stats.errors == 0
+        assert session.query(APIUsageLog).count() == 1
+        assert session.query(APIUsageRollup).count() == 1
+
+    @patch("src.maintenance.cleanup.delete_expired_default_rows", return_value=3)
+    @patch("src.maintenance.cleanup.drop_partitions")
+    @patch("src.maintenance.cleanup.expired_partitions")
+    @patch("src.maintenance.cleanup.is_partitioned", return_value=True)
+    @patch("src.maintenance.cleanup.db_manager")
+    def test_cleanup_analytics_drops_partitions_and_default_rows(
+        self, mock_db_manager, _, mock_expired, mock_drop, mock_delete_default
+    ):
+        """Test partitioned logs drop expired partitions and expired default-partition rows."""
+        mock_db_manager.get_session.return_value = MagicMock()
+        mock_expired.side_effect = lambda session, table, cutoff: [f"{table.name}_p20260101"]
+
+        stats = CleanupService(dry_run=False).cleanup_analytics()
+
+        assert stats.errors == 0
+        assert mock_drop.call_count == 2
+        assert mock_delete_default.call_count == 2
+        assert stats.db_records_deleted == 6
+
     @patch("src.maintenance.cleanup.db_manager")
     def test_cleanup_all(self, mock_db_manager):
         """Test cleanup_all method."""